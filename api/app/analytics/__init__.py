@@ -0,0 +1,32 @@
+"""Columnar (NumPy) analytics over inspection history.
+
+``fields`` names the inspection fields analytics reads and scores their enum
+values; ``columns`` turns raw inspection documents into parallel arrays with
+enums as small-int codes; ``metrics`` computes every metric over those arrays
+in one vectorized pass.
+
+Only ``fields`` is imported eagerly: the NumPy-backed names load on first
+access, so importing the app does not pay for NumPy until analytics runs.
+"""
+from .fields import PROJECTION, SCORES
+
+_LAZY = {
+    "InspectionColumns": ".columns",
+    "compute_metrics": ".metrics",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "InspectionColumns",
+    "PROJECTION",
+    "SCORES",
+    "compute_metrics",
+]
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+import numpy as np
+
+from .fields import DEFAULTS, SCORES
+
+
+_MS_PER_DAY = 86_400_000
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Motor hands BSON datetimes back naive (UTC); NumPy wants naive too.
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def to_day(value: datetime) -> float:
+    """Fractional days since the Unix epoch (UTC)."""
+    return float(np.datetime64(_naive_utc(value), "ms").astype(np.int64)) / _MS_PER_DAY
+
+
+def from_day(day: float) -> datetime:
+    return datetime.fromtimestamp(day * 86_400, tz=timezone.utc)
+
+
+@dataclass(frozen=True)
+class InspectionColumns:
+    """Inspection history as parallel arrays, sorted by ``(hive, day)``.
+
+    ``hive`` holds codes into ``hive_ids``; ``day`` is fractional days since
+    the epoch; the enum columns hold ``SCORES`` codes.
+    """
+
+    hive_ids: np.ndarray
+    hive: np.ndarray
+    day: np.ndarray
+    queen_seen: np.ndarray
+    varroa: np.ndarray
+    population: np.ndarray
+    brood_pattern: np.ndarray
+    honey_stores: np.ndarray
+    pollen_stores: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return int(self.day.shape[0])
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[dict]) -> "InspectionColumns":
+        """Build from raw documents fetched with ``PROJECTION``.
+
+        One Python pass copies values into flat lists (hive ids interned to
+        codes, enums looked up in ``SCORES``); everything after is NumPy.
+        """
+        hive_codes: Dict[str, int] = {}
+        hive, stamps, queen, varroa = [], [], [], []
+        enum_fields = tuple(DEFAULTS)
+        tables = [SCORES[f] for f in enum_fields]
+        fallbacks = [SCORES[f][DEFAULTS[f]] for f in enum_fields]
+        enums: list = [[] for _ in enum_fields]
+        for d in docs:
+            hive.append(hive_codes.setdefault(d["hive_id"], len(hive_codes)))
+            stamps.append(_naive_utc(d["inspection_date"]))
+            queen.append(bool(d.get("queen_seen")))
+            varroa.append(bool(d.get("varroa_mites_detected")))
+            for i, field in enumerate(enum_fields):
+                enums[i].append(tables[i].get(d.get(field), fallbacks[i]))
+
+        columns = dict(
+            hive=np.array(hive, dtype=np.int32),
+            day=np.array(stamps, dtype="datetime64[ms]").astype(np.int64) / _MS_PER_DAY,
+            queen_seen=np.array(queen, dtype=bool),
+            varroa=np.array(varroa, dtype=bool),
+            **{f: np.array(enums[i], dtype=np.int8) for i, f in enumerate(enum_fields)},
+        )
+        # Re-code hives in id order so results list hives deterministically.
+        hive_ids = np.array(list(hive_codes), dtype=object)
+        by_id = np.argsort(hive_ids)
+        recode = np.empty_like(by_id)
+        recode[by_id] = np.arange(by_id.shape[0])
+        hive_ids = hive_ids[by_id]
+        columns["hive"] = recode[columns["hive"]].astype(np.int32)
+        order = np.lexsort((columns["day"], columns["hive"]))
+        return cls(hive_ids=hive_ids, **{k: v[order] for k, v in columns.items()})
+
+    @classmethod
+    def empty(cls) -> "InspectionColumns":
+        return cls.from_documents([])
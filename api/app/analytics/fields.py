@@ -0,0 +1,43 @@
+"""Inspection fields analytics reads and the scores of their enum values.
+
+Kept free of NumPy so the repositories and the summary rollup can use them
+without importing the array stack.
+"""
+from typing import Dict
+
+
+# Ordinal small-int codes for the enum fields analytics reads. Higher is
+# better/stronger; also the scores behind the inspection summary averages.
+SCORES: Dict[str, Dict[str, int]] = {
+    "population": {
+        "VERY_WEAK": 1, "WEAK": 2, "MEDIUM": 3, "STRONG": 4, "VERY_STRONG": 5,
+    },
+    "brood_pattern": {
+        "NONE": 0, "POOR": 1, "SPOTTY": 2, "GOOD": 3, "EXCELLENT": 4,
+    },
+    "honey_stores": {
+        "NONE": 0, "VERY_LOW": 1, "LOW": 2, "ADEQUATE": 3, "GOOD": 4, "EXCELLENT": 5,
+    },
+}
+SCORES["pollen_stores"] = SCORES["honey_stores"]
+
+# Model defaults, for documents written before a field existed.
+DEFAULTS = {
+    "population": "MEDIUM",
+    "brood_pattern": "GOOD",
+    "honey_stores": "ADEQUATE",
+    "pollen_stores": "ADEQUATE",
+}
+
+# The only inspection fields analytics loads.
+PROJECTION = {
+    "_id": 0,
+    "hive_id": 1,
+    "inspection_date": 1,
+    "queen_seen": 1,
+    "varroa_mites_detected": 1,
+    "population": 1,
+    "brood_pattern": 1,
+    "honey_stores": 1,
+    "pollen_stores": 1,
+}
@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .columns import InspectionColumns, from_day
+
+
+def _opt(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 3)
+
+
+def _opt_list(values: np.ndarray) -> List[Optional[float]]:
+    """``_opt`` over a whole array without a per-element NumPy round trip."""
+    return [None if v != v else v for v in np.round(values, 3).tolist()]
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.full(num.shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _per_hive_slope(
+    cols: InspectionColumns, y: np.ndarray, mask: np.ndarray, n_hives: int
+) -> np.ndarray:
+    """Least-squares slope of ``y`` against ``day`` per hive over ``mask``
+    rows, in units per 30 days (``nan`` with fewer than two distinct days)."""
+    w = mask.astype(np.float64)
+    n = np.bincount(cols.hive, weights=w, minlength=n_hives)
+    mean_x = _ratio(np.bincount(cols.hive, weights=w * cols.day, minlength=n_hives), n)
+    xc = np.where(mask, cols.day - np.nan_to_num(mean_x)[cols.hive], 0.0)
+    sxx = np.bincount(cols.hive, weights=xc * xc, minlength=n_hives)
+    sxy = np.bincount(cols.hive, weights=xc * y, minlength=n_hives)
+    slope = np.full(n_hives, np.nan)
+    np.divide(sxy, sxx, out=slope, where=sxx > 1e-9)
+    return slope * 30.0
+
+
+def compute_metrics(
+    cols: InspectionColumns,
+    now_day: float,
+    window_days: int = 30,
+    windows: int = 12,
+    step_days: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Every analytics metric for ``cols`` in one vectorized pass.
+
+    Scope-wide series use rolling windows of ``window_days`` ending at
+    ``now_day``, ``now_day - step_days``, ... (``windows`` of them, oldest
+    first; ``step_days`` defaults to ``window_days``). Per-hive trends are
+    regression slopes over the same overall span.
+    """
+    step_days = step_days or window_days
+    n_hives = int(cols.hive_ids.shape[0])
+    span_start = now_day - (windows - 1) * step_days - window_days
+
+    # ---- Rolling scope-wide windows (prefix sums over day order) ----------
+    order = np.argsort(cols.day, kind="stable")
+    day_sorted = cols.day[order]
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        return np.concatenate(([0.0], np.cumsum(values[order], dtype=np.float64)))
+
+    sums = {
+        "varroa": prefix(cols.varroa),
+        "population": prefix(cols.population),
+        "brood_pattern": prefix(cols.brood_pattern),
+        "honey_stores": prefix(cols.honey_stores),
+        "pollen_stores": prefix(cols.pollen_stores),
+    }
+    ends = now_day - step_days * np.arange(windows - 1, -1, -1, dtype=np.float64)
+    starts = ends - window_days
+    hi = np.searchsorted(day_sorted, ends, side="right")
+    lo = np.searchsorted(day_sorted, starts, side="right")
+    counts = (hi - lo).astype(np.float64)
+    window_stats = {k: _ratio(v[hi] - v[lo], counts) for k, v in sums.items()}
+    window_rows: List[Dict[str, Any]] = [
+        {
+            "start": from_day(starts[i]),
+            "end": from_day(ends[i]),
+            "inspections": int(counts[i]),
+            "varroa_prevalence": _opt(window_stats["varroa"][i]),
+            "avg_population": _opt(window_stats["population"][i]),
+            "avg_brood_pattern": _opt(window_stats["brood_pattern"][i]),
+            "avg_honey_stores": _opt(window_stats["honey_stores"][i]),
+            "avg_pollen_stores": _opt(window_stats["pollen_stores"][i]),
+        }
+        for i in range(windows)
+    ]
+
+    # ---- Cadence -----------------------------------------------------------
+    same_hive = cols.hive[1:] == cols.hive[:-1]
+    intervals = np.diff(cols.day)[same_hive]
+    cadence = {
+        "mean_interval_days": _opt(intervals.mean()) if intervals.size else None,
+        "median_interval_days": _opt(np.median(intervals)) if intervals.size else None,
+    }
+
+    hive_rows: List[Dict[str, Any]] = []
+    if n_hives:
+        per_hive = np.bincount(cols.hive, minlength=n_hives)
+        first = np.concatenate(([0], np.cumsum(per_hive)[:-1]))
+        last = first + per_hive - 1
+        first_day, last_day = cols.day[first], cols.day[last]
+        mean_interval = _ratio(last_day - first_day, (per_hive - 1).astype(np.float64))
+
+        queen_day = np.maximum.reduceat(np.where(cols.queen_seen, cols.day, -np.inf), first)
+        since_queen = np.where(np.isfinite(queen_day), now_day - queen_day, np.nan)
+
+        recent = cols.day > now_day - window_days
+        recent_n = np.bincount(cols.hive, weights=recent, minlength=n_hives)
+        recent_varroa = np.bincount(
+            cols.hive, weights=recent & cols.varroa, minlength=n_hives
+        )
+        varroa_recent = _ratio(recent_varroa, recent_n)
+
+        in_span = cols.day > span_start
+        trends = {
+            field: _per_hive_slope(cols, getattr(cols, field).astype(np.float64), in_span, n_hives)
+            for field in ("population", "honey_stores", "pollen_stores")
+        }
+
+        columns = {
+            "hive_id": [str(h) for h in cols.hive_ids],
+            "inspections": per_hive.tolist(),
+            "last_inspection_date": [from_day(d) for d in last_day.tolist()],
+            "days_since_inspection": _opt_list(now_day - last_day),
+            "mean_interval_days": _opt_list(mean_interval),
+            "days_since_queen_seen": _opt_list(since_queen),
+            "varroa_prevalence": _opt_list(varroa_recent),
+            "population_latest": cols.population[last].tolist(),
+            "population_trend": _opt_list(trends["population"]),
+            "honey_stores_trend": _opt_list(trends["honey_stores"]),
+            "pollen_stores_trend": _opt_list(trends["pollen_stores"]),
+        }
+        hive_rows = [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    return {
+        "inspection_count": cols.size,
+        "hive_count": n_hives,
+        "cadence": cadence,
+        "windows": window_rows,
+        "hives": hive_rows,
+    }
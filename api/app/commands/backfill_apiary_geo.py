@@ -0,0 +1,28 @@
+"""Derive the GeoJSON ``geo`` point of apiaries written before it existed.
+
+    python -m app.commands.backfill_apiary_geo
+
+Apiaries without ``geo`` are invisible to nearby/within-area queries and
+regional alert broadcasts. Safe to re-run; only apiaries with coordinates
+and no point are touched.
+"""
+import asyncio
+
+from assistive_core import init_core, close_core
+
+from app.models import DOMAIN_DOCUMENTS
+from app.feed_sources import FEED_SOURCES
+from app.repositories import ApiaryRepository
+
+
+async def main() -> None:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        updated = await ApiaryRepository().backfill_geo()
+        print(f"Backfilled geo point on {updated} apiaries")
+    finally:
+        await close_core()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+"""Catalogue photos uploaded before the media catalog existed.
+
+    python -m app.commands.backfill_media
+
+Photos referenced by inspections and hives but missing from ``Media`` are
+neither protected by reference counts nor reclaimable by the media GC job.
+Safe to re-run; existing catalog entries are left as they are and only gain
+the references found.
+"""
+import asyncio
+
+from assistive_core import init_core, close_core
+
+from app.models import DOMAIN_DOCUMENTS
+from app.feed_sources import FEED_SOURCES
+from app.services import MediaService
+
+
+async def main() -> None:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        created = await MediaService().backfill()
+        print(f"Catalogued {created} photos")
+    finally:
+        await close_core()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Bulk-import inspections or tasks from an NDJSON or CSV file.
+
+    python -m app.commands.bulk_import inspections export.ndjson --user-id U
+    python -m app.commands.bulk_import tasks tasks.csv --user-id U [--notify]
+
+Same pipeline as ``POST /api/import/{kind}``: rows are validated and written
+in batches, bad rows are listed by line, and followers are not notified
+unless ``--notify`` is given. Prints the import report as JSON.
+"""
+import argparse
+import asyncio
+
+from assistive_core import init_core, close_core
+
+from app.models import DOMAIN_DOCUMENTS
+from app.feed_sources import FEED_SOURCES
+from app.services import BulkImporter
+from app.services.bulk_import import FORMATS, KINDS
+
+READ_CHUNK_BYTES = 1 << 20
+
+
+async def _chunks(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_CHUNK_BYTES):
+            yield chunk
+
+
+async def main(kind: str, path: str, user_id: str, fmt: str, notify: bool) -> None:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        report = await BulkImporter(notify=notify).run(kind, user_id, _chunks(path), fmt)
+        print(report.model_dump_json(by_alias=True, indent=2))
+    finally:
+        await close_core()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--user-id", required=True, help="Owner of the imported rows")
+    parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+    parser.add_argument("--notify", action="store_true", help="Announce rows to followers")
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    asyncio.run(main(args.kind, args.path, args.user_id, fmt, args.notify))
@@ -0,0 +1,41 @@
+"""Rebuild ``HiveInspectionSummary`` rollups from inspection history.
+
+    python -m app.commands.rebuild_inspection_summaries
+    python -m app.commands.rebuild_inspection_summaries --hive-id H --user-id U
+
+Needed once for data written before rollups existed, and safe to re-run
+whenever a summary is suspected to have drifted.
+"""
+import argparse
+import asyncio
+
+from assistive_core import init_core, close_core
+
+from app.models import DOMAIN_DOCUMENTS
+from app.feed_sources import FEED_SOURCES
+from app.services import InspectionSummaryService
+
+
+async def main(hive_id: str | None = None, user_id: str | None = None) -> None:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        service = InspectionSummaryService()
+        if hive_id:
+            summary = await service.rebuild(hive_id, user_id)
+            count = summary.inspection_count if summary else 0
+            print(f"Rebuilt summary for hive {hive_id} ({count} inspections)")
+        else:
+            built = await service.rebuild_all()
+            print(f"Rebuilt {built} hive inspection summaries")
+    finally:
+        await close_core()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hive-id", help="Rebuild a single hive (requires --user-id)")
+    parser.add_argument("--user-id", help="Owner of --hive-id's inspections")
+    args = parser.parse_args()
+    if bool(args.hive_id) != bool(args.user_id):
+        parser.error("--hive-id and --user-id must be given together")
+    asyncio.run(main(args.hive_id, args.user_id))
@@ -0,0 +1,29 @@
+"""Seed the demo apiaries, hives, alerts and recommendations.
+
+    python -m app.commands.seed
+
+A no-op when the apiaries collection already has data. Startup no longer
+seeds unless ``SEED_ON_STARTUP=true``, so run this once for a fresh local
+database.
+"""
+import argparse
+import asyncio
+
+from assistive_core import init_core, close_core
+
+from app.models import DOMAIN_DOCUMENTS
+from app.feed_sources import FEED_SOURCES
+from app.seed_data import seed_database
+
+
+async def main() -> None:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        await seed_database()
+    finally:
+        await close_core()
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    asyncio.run(main())
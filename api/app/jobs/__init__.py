@@ -0,0 +1,36 @@
+"""Background jobs run inside the API process (see ``scheduler.Scheduler``)."""
+from .scheduler import JobStats, PeriodicJob, Scheduler
+from .overdue import overdue_sweep_job, sweep_overdue_tasks
+from .recurrence import materialize_recurring_tasks, recurrence_job
+from .alerts import alert_engine_job, run_alert_engine
+from .recommendations import recommendation_job, regenerate_recommendations
+from .cascade import cascade_job, run_cascade
+from .media import collect_media_garbage, media_gc_job
+
+# Process-wide scheduler; the app lifespan starts and stops it.
+scheduler = Scheduler()
+scheduler.add(overdue_sweep_job())
+scheduler.add(recurrence_job())
+scheduler.add(alert_engine_job())
+scheduler.add(recommendation_job())
+scheduler.add(cascade_job())
+scheduler.add(media_gc_job())
+
+__all__ = [
+    "JobStats",
+    "PeriodicJob",
+    "Scheduler",
+    "scheduler",
+    "overdue_sweep_job",
+    "sweep_overdue_tasks",
+    "recurrence_job",
+    "materialize_recurring_tasks",
+    "alert_engine_job",
+    "run_alert_engine",
+    "recommendation_job",
+    "regenerate_recommendations",
+    "cascade_job",
+    "run_cascade",
+    "media_gc_job",
+    "collect_media_garbage",
+]
@@ -0,0 +1,24 @@
+"""Periodic alert evaluation.
+
+Runs ``AlertEngine`` over the hives that changed since its last pass (see
+``app.services.alert_engine``), so alerts no longer depend on a user loading
+the alert list.
+"""
+import os
+
+from app.services.alert_engine import AlertEngine
+
+from .scheduler import PeriodicJob
+
+ALERT_ENGINE_INTERVAL_SECONDS = float(
+    os.getenv("ALERT_ENGINE_INTERVAL_SECONDS", "600")
+)
+
+
+async def run_alert_engine() -> int:
+    """One incremental engine pass. Returns alerts raised plus resolved."""
+    return await AlertEngine().run()
+
+
+def alert_engine_job() -> PeriodicJob:
+    return PeriodicJob("alert_engine", run_alert_engine, ALERT_ENGINE_INTERVAL_SECONDS)
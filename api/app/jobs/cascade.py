@@ -0,0 +1,23 @@
+"""Background cascade of apiary and hive deletes.
+
+Drains the tombstones the delete endpoints leave (see
+``app.services.cascade_service``): dependents go in bounded batches, with
+progress saved on each tombstone so an interrupted pass picks up where it
+stopped.
+"""
+import os
+
+from app.services.cascade_service import CascadeService
+
+from .scheduler import PeriodicJob
+
+CASCADE_INTERVAL_SECONDS = float(os.getenv("CASCADE_INTERVAL_SECONDS", "30"))
+
+
+async def run_cascade() -> int:
+    """Returns the number of dependent documents removed or updated."""
+    return await CascadeService().run()
+
+
+def cascade_job() -> PeriodicJob:
+    return PeriodicJob("cascade", run_cascade, CASCADE_INTERVAL_SECONDS)
@@ -0,0 +1,22 @@
+"""Garbage collection of unreferenced photos.
+
+Deletes Bunny storage objects that no inspection or hive has referenced for
+the grace period (see ``app.services.media_service``). A pass handles one
+batch; objects whose delete fails go back into the catalog for the next.
+"""
+import os
+
+from app.services.media_service import MediaService
+
+from .scheduler import PeriodicJob
+
+MEDIA_GC_INTERVAL_SECONDS = float(os.getenv("MEDIA_GC_INTERVAL_SECONDS", "3600"))
+
+
+async def collect_media_garbage() -> int:
+    """Returns the number of objects deleted from storage."""
+    return await MediaService().collect_garbage()
+
+
+def media_gc_job() -> PeriodicJob:
+    return PeriodicJob("media_gc", collect_media_garbage, MEDIA_GC_INTERVAL_SECONDS)
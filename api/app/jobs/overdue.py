@@ -0,0 +1,28 @@
+"""Global overdue-task sweep.
+
+Replaces the per-user ``POST /tasks/mark-overdue`` write that clients issued
+before every task-list load. One ``update_many`` flips every past-due PENDING
+task to OVERDUE across all users, served by the ``(status, due_date)`` index.
+Read paths no longer depend on it having run: they treat a past-due PENDING
+task as overdue at query time (see ``TaskService``).
+"""
+import os
+
+from app.repositories import TaskRepository
+
+from .scheduler import PeriodicJob
+
+OVERDUE_SWEEP_INTERVAL_SECONDS = float(
+    os.getenv("OVERDUE_SWEEP_INTERVAL_SECONDS", "300")
+)
+
+
+async def sweep_overdue_tasks() -> int:
+    """Mark every past-due PENDING task OVERDUE. Returns the modified count."""
+    return await TaskRepository().mark_all_overdue()
+
+
+def overdue_sweep_job() -> PeriodicJob:
+    return PeriodicJob(
+        "overdue_tasks", sweep_overdue_tasks, OVERDUE_SWEEP_INTERVAL_SECONDS
+    )
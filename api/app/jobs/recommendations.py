@@ -0,0 +1,25 @@
+"""Periodic recommendation regeneration.
+
+Walks every hive through ``RecommendationGenerator``; hives whose inputs hash
+is unchanged are skipped, so a pass only rewrites what changed.
+"""
+import os
+
+from app.services.recommendation_generator import RecommendationGenerator
+
+from .scheduler import PeriodicJob
+
+RECOMMENDATION_INTERVAL_SECONDS = float(
+    os.getenv("RECOMMENDATION_INTERVAL_SECONDS", "900")
+)
+
+
+async def regenerate_recommendations() -> int:
+    """Returns the number of hives whose recommendations were rewritten."""
+    return await RecommendationGenerator().regenerate_all()
+
+
+def recommendation_job() -> PeriodicJob:
+    return PeriodicJob(
+        "recommendations", regenerate_recommendations, RECOMMENDATION_INTERVAL_SECONDS
+    )
@@ -0,0 +1,28 @@
+"""Rolling-horizon materialisation of recurring task series.
+
+Each pass only touches series roots with an occurrence due more than one
+interval inside ``now + RECURRENCE_HORIZON_DAYS`` and inserts just their new
+tail.
+"""
+import os
+from datetime import timedelta
+
+from app.services.recurrence_service import RecurrenceService
+
+from .scheduler import PeriodicJob
+
+RECURRENCE_INTERVAL_SECONDS = float(
+    os.getenv("RECURRENCE_INTERVAL_SECONDS", "3600")
+)
+
+
+async def materialize_recurring_tasks() -> int:
+    return await RecurrenceService().materialize_due(
+        min_lag=timedelta(seconds=RECURRENCE_INTERVAL_SECONDS)
+    )
+
+
+def recurrence_job() -> PeriodicJob:
+    return PeriodicJob(
+        "recurring_tasks", materialize_recurring_tasks, RECURRENCE_INTERVAL_SECONDS
+    )
@@ -0,0 +1,136 @@
+"""In-process periodic job runner, started/stopped by the app lifespan.
+
+Each ``PeriodicJob`` wraps an async ``run_once`` callable and re-runs it every
+``interval_seconds`` on its own asyncio task. A job failure is logged and the
+loop carries on — a background sweep must never take the worker down. Jobs
+with a non-positive interval are registered but never started, so a deploy can
+switch one off from the environment without a code change.
+
+Per-job counters (runs, failures, rows touched, last duration) live on
+``JobStats`` so they can be logged or exported without touching the database.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.models.base import utcnow
+
+logger = logging.getLogger(__name__)
+
+# A job body returns the number of documents it touched (0 when idle).
+JobFn = Callable[[], Awaitable[int]]
+
+# How many per-run row counts each job remembers for its recent-history view.
+_HISTORY = 50
+
+
+@dataclass
+class JobStats:
+    """Counters for one periodic job, updated after every run."""
+
+    runs: int = 0
+    failures: int = 0
+    last_run_at: Optional[datetime] = None
+    last_duration_ms: float = 0.0
+    last_touched: int = 0
+    total_touched: int = 0
+    recent_touched: Deque[int] = field(default_factory=lambda: deque(maxlen=_HISTORY))
+
+    def as_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration_ms": round(self.last_duration_ms, 2),
+            "last_touched": self.last_touched,
+            "total_touched": self.total_touched,
+            "recent_touched": list(self.recent_touched),
+        }
+
+
+class PeriodicJob:
+    """Runs ``fn`` every ``interval_seconds`` until stopped."""
+
+    def __init__(self, name: str, fn: JobFn, interval_seconds: float):
+        self.name = name
+        self.fn = fn
+        self.interval_seconds = interval_seconds
+        self.stats = JobStats()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    async def run_once(self) -> int:
+        """Run the job body once and record its stats. Never raises."""
+        started = time.perf_counter()
+        self.stats.last_run_at = utcnow()
+        try:
+            touched = await self.fn()
+        except Exception:
+            self.stats.failures += 1
+            logger.exception("Job %s failed", self.name)
+            touched = 0
+        self.stats.runs += 1
+        self.stats.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.stats.last_touched = touched
+        self.stats.total_touched += touched
+        self.stats.recent_touched.append(touched)
+        if touched:
+            logger.info(
+                "Job %s touched %d documents in %.1fms",
+                self.name, touched, self.stats.last_duration_ms,
+            )
+        return touched
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=f"job:{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+class Scheduler:
+    """Registry of periodic jobs with a single start/stop for the lifespan."""
+
+    def __init__(self):
+        self._jobs: Dict[str, PeriodicJob] = {}
+
+    def add(self, job: PeriodicJob) -> PeriodicJob:
+        self._jobs[job.name] = job
+        return job
+
+    def get(self, name: str) -> Optional[PeriodicJob]:
+        return self._jobs.get(name)
+
+    def jobs(self) -> List[PeriodicJob]:
+        return list(self._jobs.values())
+
+    def start(self) -> None:
+        for job in self._jobs.values():
+            job.start()
+
+    async def stop(self) -> None:
+        for job in self._jobs.values():
+            await job.stop()
+
+    def stats(self) -> dict:
+        return {name: job.stats.as_dict() for name, job in self._jobs.items()}
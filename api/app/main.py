@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+import time
+
+# Startup profile clock: started before the framework and SDK imports below.
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+from typing import Optional
 import os
 
+from pymongo import monitoring
+
 from assistive_core import (
     init_core,
     close_core,
@@ -16,6 +25,10 @@ from assistive_core import (
 from app.models import DOMAIN_DOCUMENTS
 from app.feed_sources import FEED_SOURCES
 from app.seed_data import seed_database
+from app.jobs import scheduler
+from app.services import image_processing
+from app.services.bunny_storage_service import bunny_storage
+from app import telemetry
 from app.routers import (
     apiaries_router,
     hives_router,
@@ -26,8 +39,21 @@ from app.routers import (
     inspections_router,
     photos_router,
     chat_router,
+    analytics_router,
+    imports_router,
+    exports_router,
 )
 
+startup = telemetry.StartupProfile(started=_IMPORT_STARTED)
+startup.record("imports", time.perf_counter() - _IMPORT_STARTED)
+
+# Demo data used to be seeded on every boot; it is now
+# ``python -m app.commands.seed``, or opt back in here for local development.
+SEED_ON_STARTUP = os.getenv("SEED_ON_STARTUP", "false").lower() == "true"
+
+# Registered before the Mongo client exists so it sees every command.
+monitoring.register(telemetry.command_listener)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -35,13 +61,25 @@ async def lifespan(app: FastAPI):
     print("Starting up...")
     # Wire both databases (shared identity + per-vertical) and register the
     # beekeeper feed sources via assistive-core.
-    await init_core(
-        vertical_documents=DOMAIN_DOCUMENTS,
-        feed_sources=FEED_SOURCES,
-    )
-    await seed_database()
+    with startup.phase("init_core"):
+        synced = await init_core(
+            vertical_documents=DOMAIN_DOCUMENTS,
+            feed_sources=FEED_SOURCES,
+        )
+    startup.notes["indexes"] = "synced" if any(synced.values()) else "unchanged, skipped"
+    if SEED_ON_STARTUP:
+        with startup.phase("seed"):
+            await seed_database()
+    # Periodic background jobs (global overdue sweep, ...).
+    with startup.phase("scheduler"):
+        scheduler.start()
+    startup.ready()
+    print(startup.report())
     yield
     print("Shutting down...")
+    await scheduler.stop()
+    await bunny_storage.aclose()
+    image_processing.shutdown_pool()
     await close_core()
 
 
@@ -61,7 +99,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# Added last so it wraps CORS too and times the whole request.
+app.add_middleware(telemetry.TimingMiddleware, registry=telemetry.registry)
 
 # Shared social substrate routers (auth/SSO, follow, feed, notifications, calendar).
 app.include_router(auth_router, prefix="/api")
@@ -80,6 +121,9 @@ app.include_router(tasks_router, prefix="/api")
 app.include_router(inspections_router, prefix="/api")
 app.include_router(photos_router, prefix="/api")
 app.include_router(chat_router, prefix="/api")
+app.include_router(analytics_router, prefix="/api")
+app.include_router(imports_router, prefix="/api")
+app.include_router(exports_router, prefix="/api")
 
 
 @app.get("/")
@@ -90,3 +134,17 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "healthy"}
+
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint. Set ``METRICS_TOKEN`` to require
+    ``Authorization: Bearer <token>``."""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(
+        telemetry.render() + startup.render(), media_type="text/plain; version=0.0.4"
+    )
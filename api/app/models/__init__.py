@@ -1,4 +1,4 @@
-from .apiary import Apiary, ApiaryStatus
+from .apiary import Apiary, ApiaryStatus, GeoPoint
 from .hive import (
     Hive,
     HiveStatus,
@@ -8,7 +8,12 @@ from .hive import (
     HoneyStores,
 )
 from .alert import Alert, AlertType, AlertSeverity
-from .recommendation import Recommendation, RecommendationType, Priority
+from .recommendation import (
+    Recommendation,
+    RecommendationState,
+    RecommendationType,
+    Priority,
+)
 from .task import (
     Task,
     TaskType,
@@ -18,6 +23,7 @@ from .task import (
 )
 from .inspection import (
     Inspection,
+    PhotoVariants,
     QueenCellStatus,
     BroodPattern,
     ColonyTemperament,
@@ -25,6 +31,14 @@ from .inspection import (
     HealthStatus,
     ResourceLevel,
 )
+from .job_state import JobState
+from .tombstone import Tombstone, TombstoneKind
+from .media import Media
+from .hive_inspection_summary import (
+    HiveInspectionSummary,
+    InspectionSnapshot,
+    MonthlyInspectionStats,
+)
 
 
 # Beekeeper's own domain documents. Passed to assistive_core.init_core() as
@@ -37,6 +51,11 @@ DOMAIN_DOCUMENTS = [
     Task,
     Alert,
     Recommendation,
+    RecommendationState,
+    HiveInspectionSummary,
+    JobState,
+    Tombstone,
+    Media,
 ]
 
 
@@ -44,6 +63,7 @@ __all__ = [
     "DOMAIN_DOCUMENTS",
     "Apiary",
     "ApiaryStatus",
+    "GeoPoint",
     "Hive",
     "HiveStatus",
     "ColonyStrength",
@@ -54,6 +74,7 @@ __all__ = [
     "AlertType",
     "AlertSeverity",
     "Recommendation",
+    "RecommendationState",
     "RecommendationType",
     "Priority",
     "Task",
@@ -62,10 +83,18 @@ __all__ = [
     "TaskPriority",
     "RecurrenceFrequency",
     "Inspection",
+    "PhotoVariants",
     "QueenCellStatus",
     "BroodPattern",
     "ColonyTemperament",
     "ColonyPopulation",
     "HealthStatus",
     "ResourceLevel",
+    "HiveInspectionSummary",
+    "InspectionSnapshot",
+    "MonthlyInspectionStats",
+    "JobState",
+    "Tombstone",
+    "TombstoneKind",
+    "Media",
 ]
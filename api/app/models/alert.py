@@ -1,8 +1,10 @@
 from enum import Enum as PyEnum
 from datetime import datetime
+from typing import Optional
 
 from beanie import Document
 from pydantic import Field
+from pymongo import IndexModel
 
 from .base import TimestampMixin
 
@@ -33,9 +35,28 @@ class Alert(Document, TimestampMixin):
     # Was comma-separated string in SQLAlchemy; real array in Mongo.
     hive_ids: list[str] = Field(default_factory=list)
     dismissed: bool = False
+    # Owner. None for shared alerts (weather, legacy data), which every user
+    # sees alongside their own.
+    user_id: Optional[str] = None
+
+    # Set on alerts raised by the rule engine (see services/alert_engine.py):
+    # the rule name and a fingerprint identifying the condition episode, so
+    # re-evaluating a hive never raises the same alert twice.
+    rule: Optional[str] = None
+    fingerprint: Optional[str] = None
+    resolved_at: Optional[datetime] = None
 
     class Settings:
         name = "alerts"
         indexes = [
-            [("dismissed", 1), ("timestamp", -1)],
+            # Owner-scoped and per-hive lists, newest first, keyset on _id
+            [("user_id", 1), ("dismissed", 1), ("timestamp", -1), ("_id", -1)],
+            [("hive_ids", 1), ("dismissed", 1), ("timestamp", -1), ("_id", -1)],
+            IndexModel(
+                [("fingerprint", 1)],
+                unique=True,
+                partialFilterExpression={"fingerprint": {"$type": "string"}},
+            ),
+            # Auto-resolving a rule's stale alerts for a batch of hives
+            [("rule", 1), ("hive_ids", 1), ("dismissed", 1)],
         ]
@@ -1,7 +1,9 @@
 from enum import Enum as PyEnum
-from typing import Optional
+from typing import List, Literal, Optional
 
 from beanie import Document
+from pydantic import BaseModel, model_validator
+from pymongo import GEOSPHERE, IndexModel
 
 from .base import TimestampMixin
 
@@ -12,6 +14,13 @@ class ApiaryStatus(str, PyEnum):
     ALERT = "ALERT"
 
 
+class GeoPoint(BaseModel):
+    """GeoJSON point. Coordinates are ``[longitude, latitude]``."""
+
+    type: Literal["Point"] = "Point"
+    coordinates: List[float]
+
+
 class Apiary(Document, TimestampMixin):
     id: str  # type: ignore[assignment]
     name: str
@@ -19,6 +28,26 @@ class Apiary(Document, TimestampMixin):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     status: ApiaryStatus = ApiaryStatus.HEALTHY
+    # Derived from latitude/longitude (see sync_geo) for the 2dsphere index;
+    # None when either coordinate is missing, which leaves the apiary out of
+    # the index.
+    geo: Optional[GeoPoint] = None
+
+    @model_validator(mode="after")
+    def _derive_geo(self) -> "Apiary":
+        self.sync_geo()
+        return self
+
+    def sync_geo(self) -> None:
+        """Recompute ``geo`` after latitude/longitude were assigned."""
+        if self.latitude is None or self.longitude is None:
+            self.geo = None
+        else:
+            self.geo = GeoPoint(coordinates=[self.longitude, self.latitude])
 
     class Settings:
         name = "apiaries"
+        indexes = [
+            # Nearby/within-area lookups and regional alert broadcast
+            IndexModel([("geo", GEOSPHERE)]),
+        ]
@@ -54,4 +54,9 @@ class Hive(Document, TimestampMixin):
 
     class Settings:
         name = "hives"
-        indexes = ["apiary_id"]
+        indexes = [
+            "apiary_id",
+            # Alert engine change cursor / inspection-due window
+            "updated_at",
+            "last_inspected",
+        ]
@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from beanie import Document
+from pydantic import BaseModel, Field
+
+from .base import TimestampMixin
+from .inspection import (
+    QueenCellStatus,
+    BroodPattern,
+    ColonyTemperament,
+    ColonyPopulation,
+    HealthStatus,
+    ResourceLevel,
+)
+
+
+class InspectionSnapshot(BaseModel):
+    """The trend-relevant fields of a hive's most recent inspection."""
+
+    inspection_id: str
+    inspection_date: datetime
+    queen_seen: bool = False
+    queen_cells: QueenCellStatus = QueenCellStatus.NONE
+    brood_pattern: BroodPattern = BroodPattern.GOOD
+    temperament: ColonyTemperament = ColonyTemperament.CALM
+    population: ColonyPopulation = ColonyPopulation.MEDIUM
+    health_status: HealthStatus = HealthStatus.HEALTHY
+    varroa_mites_detected: bool = False
+    honey_stores: ResourceLevel = ResourceLevel.ADEQUATE
+    pollen_stores: ResourceLevel = ResourceLevel.ADEQUATE
+    estimated_frames_covered: Optional[int] = None
+    estimated_brood_frames: Optional[int] = None
+
+
+class MonthlyInspectionStats(BaseModel):
+    """Additive per-month totals. Scores are ordinal sums (see
+    ``app.analytics.fields.SCORES``); averages are derived on read."""
+
+    inspections: int = 0
+    varroa_detections: int = 0
+    population_score: int = 0
+    brood_score: int = 0
+    honey_score: int = 0
+    pollen_score: int = 0
+    frames_covered: int = 0
+    frames_covered_samples: int = 0
+    brood_frames: int = 0
+    brood_frames_samples: int = 0
+
+
+class HiveInspectionSummary(Document, TimestampMixin):
+    """Rollup of one user's inspections of one hive, maintained on every
+    inspection write so trend views read a single document."""
+
+    # "<user_id>:<hive_id>" — see summary_id()
+    id: str  # type: ignore[assignment]
+    hive_id: str
+    user_id: str
+
+    inspection_count: int = 0
+    last_inspection: Optional[InspectionSnapshot] = None
+
+    # field name -> enum value -> number of inspections
+    counts: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+
+    varroa_detections: int = 0
+    varroa_current_streak: int = 0
+    varroa_longest_streak: int = 0
+    varroa_last_detected: Optional[datetime] = None
+    # Date of the first inspection in the current streak (None when 0).
+    varroa_streak_started: Optional[datetime] = None
+
+    # "YYYY-MM" -> totals
+    monthly: Dict[str, MonthlyInspectionStats] = Field(default_factory=dict)
+
+    @staticmethod
+    def summary_id(hive_id: str, user_id: str) -> str:
+        return f"{user_id}:{hive_id}"
+
+    class Settings:
+        name = "hive_inspection_summaries"
+        indexes = [
+            "hive_id",
+            # Per-user hive listing (route planner)
+            "user_id",
+            # Alert engine change cursor / inspection-due window
+            "updated_at",
+            "last_inspection.inspection_date",
+        ]
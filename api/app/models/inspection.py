@@ -1,9 +1,9 @@
 from enum import Enum as PyEnum
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from beanie import Document
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from .base import TimestampMixin, utcnow
 
@@ -59,6 +59,14 @@ class ResourceLevel(str, PyEnum):
     EXCELLENT = "EXCELLENT"
 
 
+class PhotoVariants(BaseModel):
+    """Resized copies of one inspection photo: variant name (see
+    ``app.services.image_processing.VARIANT_SIZES``) -> CDN URL."""
+
+    url: str
+    variants: Dict[str, str] = Field(default_factory=dict)
+
+
 class Inspection(Document, TimestampMixin):
     # Identity — keep as plain str (UUID-style) to match existing schema/routers
     id: str  # type: ignore[assignment]
@@ -110,6 +118,8 @@ class Inspection(Document, TimestampMixin):
 
     # Media and notes
     photos: list[str] = Field(default_factory=list)
+    # Resized copies of ``photos``, filled in from the media catalog
+    photo_variants: list[PhotoVariants] = Field(default_factory=list)
     notes: str = ""
     next_inspection_date: Optional[datetime] = None
 
@@ -124,7 +134,12 @@ class Inspection(Document, TimestampMixin):
             "hive_id",
             "user_id",
             [("hive_id", 1), ("inspection_date", -1)],
-            [("user_id", 1), ("inspection_date", -1)],
+            # Owner-scoped history, newest first; ``_id`` completes the
+            # keyset order so exports walk the index (in reverse) without a sort.
+            [("user_id", 1), ("inspection_date", -1), ("_id", -1)],
+            [("user_id", 1), ("hive_id", 1), ("inspection_date", -1), ("_id", -1)],
             # Feed query: visible records from followed users, newest first
             [("user_id", 1), ("is_public", 1), ("inspection_date", -1)],
+            # Analytics cache validation: newest write in a user's scope
+            [("user_id", 1), ("updated_at", -1)],
         ]
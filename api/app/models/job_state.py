@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from beanie import Document
+from pydantic import Field
+
+from .base import TimestampMixin
+
+
+class JobState(Document, TimestampMixin):
+    """Progress of an incremental background job, one document per job.
+
+    ``cursor`` is the high-water mark the next run resumes from; ``markers``
+    holds any secondary timestamps the job keeps (e.g. a slower sub-check).
+    """
+
+    # The job name, e.g. "alert_engine"
+    id: str  # type: ignore[assignment]
+    cursor: Optional[datetime] = None
+    markers: Dict[str, datetime] = Field(default_factory=dict)
+
+    class Settings:
+        name = "job_state"
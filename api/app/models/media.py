@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel
+
+from .base import TimestampMixin
+
+
+class Media(Document, TimestampMixin):
+    """One uploaded object in Bunny storage and who still points at it.
+
+    ``refs`` holds one entry per document whose fields carry ``url``
+    (``"inspection:<id>"``, ``"hive:<id>"`` — see ``ref()``), maintained by
+    ``MediaService``. ``unreferenced_since`` is set when ``refs`` becomes
+    empty (and on upload, before anything points at it); the media GC job
+    deletes the object once that is older than the grace period.
+    """
+
+    # Storage path, e.g. "inspections/20240101_120000_photo.jpg"
+    id: str  # type: ignore[assignment]
+    url: str
+    owner_id: str
+    # Unknown (None) for objects catalogued by the backfill command
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    content_type: Optional[str] = None
+    # Resized copies (variant name -> CDN URL), stored and collected with it
+    variants: Dict[str, str] = Field(default_factory=dict)
+    refs: List[str] = Field(default_factory=list)
+    unreferenced_since: Optional[datetime] = None
+
+    @property
+    def ref_count(self) -> int:
+        return len(self.refs)
+
+    @staticmethod
+    def ref(kind: str, document_id: str) -> str:
+        return f"{kind}:{document_id}"
+
+    class Settings:
+        name = "media"
+        indexes = [
+            IndexModel([("url", 1)], unique=True),
+            # Reference maintenance: everything a document points at
+            "refs",
+            # Upload de-duplication
+            [("owner_id", 1), ("sha256", 1)],
+            # GC candidates (null, i.e. referenced, sorts before any date)
+            "unreferenced_since",
+        ]
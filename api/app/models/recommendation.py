@@ -1,4 +1,6 @@
 from enum import Enum as PyEnum
+from datetime import datetime
+from typing import Optional
 
 from beanie import Document
 
@@ -25,7 +27,23 @@ class Recommendation(Document, TimestampMixin):
     title: str
     description: str
     priority: Priority = Priority.MEDIUM
+    # Set on recommendations derived by the generator (see
+    # services/recommendation_generator.py); None for client-posted ones.
+    rule: Optional[str] = None
 
     class Settings:
         name = "recommendations"
         indexes = ["hive_id"]
+
+
+class RecommendationState(Document, TimestampMixin):
+    """Memo of the inputs a hive's generated recommendations were derived
+    from; regeneration is skipped while the hash is unchanged."""
+
+    # The hive id
+    id: str  # type: ignore[assignment]
+    input_hash: str
+    generated_at: datetime
+
+    class Settings:
+        name = "recommendation_state"
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional
 
 from beanie import Document
+from pymongo import IndexModel
 
 from .base import TimestampMixin
 
@@ -93,6 +94,22 @@ class Task(Document, TimestampMixin):
     recurrence_end_date: Optional[datetime] = None
     recurrence_count: Optional[int] = None
 
+    # Series bookkeeping. The task a recurrence was created on is the series
+    # root (occurrence_index 0, series_id == id); materialised occurrences copy
+    # its schedule and carry ``series_start`` so the next date is computed
+    # from the instance alone. ``occurrence_key`` ("<series_id>:<index>") is
+    # unique, which makes re-materialising a window idempotent.
+    series_id: Optional[str] = None
+    series_start: Optional[datetime] = None
+    occurrence_index: Optional[int] = None
+    occurrence_key: Optional[str] = None
+    # Root only: next index to materialise and that occurrence's due date
+    # (everything due before it exists); ``recurrence_exhausted`` once the
+    # count / end date leaves nothing more to materialise.
+    recurrence_next_index: Optional[int] = None
+    recurrence_materialized_until: Optional[datetime] = None
+    recurrence_exhausted: bool = False
+
     # Association
     hive_id: Optional[str] = None
     apiary_id: Optional[str] = None
@@ -117,6 +134,21 @@ class Task(Document, TimestampMixin):
         indexes = [
             "hive_id",
             "apiary_id",
-            [("user_id", 1), ("due_date", 1)],
-            [("user_id", 1), ("status", 1)],
+            # Owner-scoped task queries (TaskRepository.query): equality
+            # prefix, then (due_date, _id) so the index also provides the
+            # keyset-pagination order without an in-memory sort.
+            [("user_id", 1), ("due_date", 1), ("_id", 1)],
+            [("user_id", 1), ("status", 1), ("due_date", 1), ("_id", 1)],
+            [("user_id", 1), ("hive_id", 1), ("due_date", 1), ("_id", 1)],
+            [("user_id", 1), ("apiary_id", 1), ("due_date", 1), ("_id", 1)],
+            [("user_id", 1), ("priority", 1), ("due_date", 1), ("_id", 1)],
+            # Global overdue sweep: status == PENDING AND due_date < now
+            [("status", 1), ("due_date", 1)],
+            # Recurrence: roots whose materialised horizon has fallen behind
+            [("occurrence_index", 1), ("recurrence_materialized_until", 1)],
+            IndexModel(
+                [("occurrence_key", 1)],
+                unique=True,
+                partialFilterExpression={"occurrence_key": {"$type": "string"}},
+            ),
         ]
@@ -0,0 +1,45 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+from typing import Dict, Optional
+
+from beanie import Document
+from pydantic import Field
+
+from .base import TimestampMixin
+
+
+class TombstoneKind(str, PyEnum):
+    APIARY = "apiary"
+    HIVE = "hive"
+
+
+class Tombstone(Document, TimestampMixin):
+    """A deleted apiary or hive whose dependents are still being removed.
+
+    The delete request writes this document and removes the parent; the
+    cascade job (``app.jobs.cascade``) then works through ``CascadeService``'s
+    steps for the kind in bounded batches. ``step`` is the next step to run,
+    so a restart resumes where the last run stopped. The tombstone is deleted
+    once every step has finished.
+    """
+
+    # "<kind>:<target_id>" — see tombstone_id()
+    id: str  # type: ignore[assignment]
+    kind: TombstoneKind
+    target_id: str
+    step: int = 0
+    # collection (or "media") -> documents removed/updated so far
+    progress: Dict[str, int] = Field(default_factory=dict)
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    @staticmethod
+    def tombstone_id(kind: TombstoneKind, target_id: str) -> str:
+        return f"{kind.value}:{target_id}"
+
+    class Settings:
+        name = "tombstones"
+        indexes = [
+            # Oldest-first work queue
+            "created_at",
+        ]
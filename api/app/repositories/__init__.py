@@ -1,15 +1,26 @@
 from .apiary_repository import ApiaryRepository
 from .hive_repository import HiveRepository
-from .alert_repository import AlertRepository
+from .alert_repository import AlertRepository, AlertQuery
 from .recommendation_repository import RecommendationRepository
-from .task_repository import TaskRepository
+from .task_repository import TaskRepository, TaskQuery
 from .inspection_repository import InspectionRepository
+from .hive_inspection_summary_repository import HiveInspectionSummaryRepository
+from .job_state_repository import JobStateRepository
+from .cascade_repository import CascadeRepository, StaleTombstone
+from .media_repository import MediaRepository
 
 __all__ = [
     "ApiaryRepository",
     "HiveRepository",
     "AlertRepository",
+    "AlertQuery",
     "RecommendationRepository",
     "TaskRepository",
+    "TaskQuery",
     "InspectionRepository",
+    "HiveInspectionSummaryRepository",
+    "JobStateRepository",
+    "CascadeRepository",
+    "StaleTombstone",
+    "MediaRepository",
 ]
@@ -1,5 +1,52 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError
+
+from assistive_core import find_one_and_set, request_cache
+
 from app.models import Alert
+from app.models.base import utcnow
+
+from .pagination import after_keyset, encode_keyset
+
+
+@dataclass
+class AlertQuery:
+    """Owner-scoped alert filter for ``AlertRepository.query``.
+
+    Matches the user's alerts plus shared (ownerless) ones. ``hive_ids``
+    matches alerts naming any of the hives; ``dismissed`` of None means both.
+    Results are newest first by ``(timestamp, _id)``; ``cursor`` is the
+    ``next_cursor`` of the previous page.
+    """
+
+    user_id: str
+    hive_ids: Optional[List[str]] = None
+    dismissed: Optional[bool] = None
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+
+
+def owner_filter(user_id: str) -> dict:
+    return {"user_id": {"$in": [user_id, None]}}
+
+
+def build_alert_filter(q: AlertQuery) -> dict:
+    """Translate an ``AlertQuery`` into one Mongo filter; the equality fields
+    lead so either the ``(hive_ids, dismissed, timestamp, _id)`` multikey or
+    the ``(user_id, dismissed, timestamp, _id)`` compound serves it."""
+    conditions: List[dict] = []
+    if q.hive_ids is not None:
+        conditions.append({"hive_ids": {"$in": q.hive_ids}})
+    conditions.append(owner_filter(q.user_id))
+    if q.dismissed is not None:
+        conditions.append({"dismissed": q.dismissed})
+    if q.cursor:
+        conditions.append(after_keyset("timestamp", q.cursor, descending=True))
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
 
 
 class AlertRepository:
@@ -9,16 +56,87 @@ class AlertRepository:
     async def get_active(self) -> List[Alert]:
         return await Alert.find(Alert.dismissed == False).to_list()  # noqa: E712
 
+    async def query(self, q: AlertQuery) -> Tuple[List[Alert], Optional[str]]:
+        """Returns ``(alerts, next_cursor)``; ``next_cursor`` is ``None`` on
+        the last page (or when ``q.limit`` is unset)."""
+        finder = Alert.find(build_alert_filter(q)).sort(
+            [("timestamp", DESCENDING), ("_id", DESCENDING)]
+        )
+        if q.limit is None:
+            return await finder.to_list(), None
+        # One extra row tells us whether another page exists.
+        alerts = await finder.limit(q.limit + 1).to_list()
+        if len(alerts) <= q.limit:
+            return alerts, None
+        alerts = alerts[: q.limit]
+        return alerts, encode_keyset(alerts[-1].timestamp, alerts[-1].id)
+
+    async def dismiss_many(
+        self,
+        user_id: str,
+        alert_ids: Optional[List[str]] = None,
+        hive_ids: Optional[List[str]] = None,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Dismiss the user's visible active alerts among ``alert_ids`` and/or
+        naming any of ``hive_ids`` in one ``update_many``. Returns the count."""
+        now = now or utcnow()
+        conditions: List[dict] = [owner_filter(user_id), {"dismissed": False}]
+        if alert_ids is not None:
+            conditions.append({"_id": {"$in": alert_ids}})
+        if hive_ids is not None:
+            conditions.append({"hive_ids": {"$in": hive_ids}})
+        result = await Alert.get_motor_collection().update_many(
+            {"$and": conditions},
+            {"$set": {"dismissed": True, "updated_at": now}},
+        )
+        return result.modified_count
+
     async def get_by_id(self, alert_id: str) -> Optional[Alert]:
-        return await Alert.get(alert_id)
+        return await request_cache.get_document(Alert, alert_id, lambda: Alert.get(alert_id))
 
     async def create(self, alert: Alert) -> Alert:
         await alert.insert()
         return alert
 
+    async def create_many(self, alerts: List[Alert]) -> int:
+        if not alerts:
+            return 0
+        result = await Alert.insert_many(alerts)
+        return len(result.inserted_ids)
+
     async def update(self, alert: Alert) -> Alert:
         await alert.save()
+        request_cache.remember(alert)
+        return alert
+
+    async def update_fields(
+        self, alert_id: str, user_id: str, fields: Dict[str, Any]
+    ) -> Optional[Alert]:
+        """Set ``fields`` on an alert the user can see (theirs or shared) in
+        one write; None when it is missing or someone else's."""
+        alert = await find_one_and_set(
+            Alert, {"_id": alert_id, "user_id": {"$in": [user_id, None]}}, fields
+        )
+        if alert:
+            request_cache.remember(alert)
         return alert
 
     async def delete(self, alert: Alert) -> None:
         await alert.delete()
+
+    async def bulk_write(self, operations: list) -> tuple[int, int]:
+        """Unordered bulk write of engine upserts/resolutions. Returns
+        ``(inserted, resolved)``. A concurrent run upserting the same
+        fingerprint loses the unique-index race harmlessly."""
+        if not operations:
+            return 0, 0
+        try:
+            result = await Alert.get_motor_collection().bulk_write(
+                operations, ordered=False
+            )
+            return result.upserted_count, result.modified_count
+        except BulkWriteError as e:
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+            return e.details.get("nUpserted", 0), e.details.get("nModified", 0)
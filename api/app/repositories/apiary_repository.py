@@ -1,20 +1,152 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from beanie.operators import In
+
+from assistive_core import find_one_and_set, request_cache
+
 from app.models import Apiary
 
+EARTH_RADIUS_KM = 6371.0088
+# ``Apiary.sync_geo`` as an aggregation expression, for partial updates.
+_GEO_FROM_COORDINATES = {
+    "$cond": [
+        {"$and": [{"$isNumber": "$latitude"}, {"$isNumber": "$longitude"}]},
+        {"type": "Point", "coordinates": ["$longitude", "$latitude"]},
+        None,
+    ]
+}
+
+
+def _point(latitude: float, longitude: float) -> dict:
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
 
 class ApiaryRepository:
     async def get_all(self) -> List[Apiary]:
         return await Apiary.find_all().to_list()
 
     async def get_by_id(self, apiary_id: str) -> Optional[Apiary]:
-        return await Apiary.get(apiary_id)
+        return await request_cache.get_document(Apiary, apiary_id, lambda: Apiary.get(apiary_id))
+
+    async def get_by_ids(self, apiary_ids: List[str]) -> List[Apiary]:
+        return await request_cache.get_documents(
+            Apiary, apiary_ids, lambda missing: Apiary.find(In(Apiary.id, missing)).to_list()
+        )
+
+    async def get_with_coordinates(self) -> List[Apiary]:
+        return await Apiary.find(
+            {"latitude": {"$ne": None}, "longitude": {"$ne": None}}
+        ).to_list()
+
+    async def get_near(
+        self, latitude: float, longitude: float, max_km: float, limit: int = 50
+    ) -> List[Tuple[Apiary, float]]:
+        """Apiaries within ``max_km``, nearest first, with their distance in
+        km (``$geoNear`` on the ``geo`` 2dsphere index)."""
+        pipeline = [
+            {
+                "$geoNear": {
+                    "near": _point(latitude, longitude),
+                    "key": "geo",
+                    "distanceField": "_distance_m",
+                    "maxDistance": max_km * 1000,
+                    "spherical": True,
+                }
+            },
+            {"$limit": limit},
+        ]
+        docs = await Apiary.get_motor_collection().aggregate(pipeline).to_list(length=None)
+        results = []
+        for doc in docs:
+            distance_m = doc.pop("_distance_m")
+            results.append((Apiary.model_validate(doc), distance_m / 1000))
+        return results
+
+    async def get_within_box(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        limit: int = 500,
+    ) -> List[Apiary]:
+        """Apiaries inside a bounding box (``$geoWithin`` a GeoJSON polygon).
+
+        Polygon edges are geodesics, so over large boxes the east and west
+        edges bow slightly away from the exact meridian lines."""
+        ring = [
+            [min_longitude, min_latitude],
+            [max_longitude, min_latitude],
+            [max_longitude, max_latitude],
+            [min_longitude, max_latitude],
+            [min_longitude, min_latitude],
+        ]
+        return await Apiary.find(
+            {"geo": {"$geoWithin": {"$geometry": {"type": "Polygon", "coordinates": [ring]}}}}
+        ).limit(limit).to_list()
+
+    async def get_ids_within_radius(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> List[str]:
+        """Ids of every apiary within ``radius_km`` (unordered, projected;
+        ``$geoWithin``/``$centerSphere`` on the 2dsphere index)."""
+        cursor = Apiary.get_motor_collection().find(
+            {
+                "geo": {
+                    "$geoWithin": {
+                        "$centerSphere": [[longitude, latitude], radius_km / EARTH_RADIUS_KM]
+                    }
+                }
+            },
+            {"_id": 1},
+        )
+        return [doc["_id"] async for doc in cursor]
+
+    async def backfill_geo(self) -> int:
+        """Derive ``geo`` for documents written before it existed. Returns the
+        number of apiaries updated."""
+        result = await Apiary.get_motor_collection().update_many(
+            {
+                "latitude": {"$type": "number"},
+                "longitude": {"$type": "number"},
+                "geo": None,
+            },
+            [
+                {
+                    "$set": {
+                        "geo": {
+                            "type": "Point",
+                            "coordinates": ["$longitude", "$latitude"],
+                        }
+                    }
+                }
+            ],
+        )
+        return result.modified_count
 
     async def create(self, apiary: Apiary) -> Apiary:
+        apiary.sync_geo()
         await apiary.insert()
         return apiary
 
     async def update(self, apiary: Apiary) -> Apiary:
+        apiary.sync_geo()
         await apiary.save()
+        request_cache.remember(apiary)
+        return apiary
+
+    async def update_fields(self, apiary_id: str, fields: Dict[str, Any]) -> Optional[Apiary]:
+        """Set ``fields`` in one write; None when the apiary does not exist.
+        A coordinate change recomputes ``geo`` server-side from the stored
+        values, as ``sync_geo`` would."""
+        derived = (
+            {"geo": _GEO_FROM_COORDINATES}
+            if "latitude" in fields or "longitude" in fields
+            else None
+        )
+        apiary = await find_one_and_set(Apiary, {"_id": apiary_id}, fields, derived=derived)
+        if apiary:
+            request_cache.remember(apiary)
         return apiary
 
     async def delete(self, apiary: Apiary) -> None:
@@ -0,0 +1,34 @@
+"""Bulk reads and writes of raw documents.
+
+Shared by the repositories behind bulk import and export. Documents are
+plain BSON dicts: imports set ``_id`` themselves and one failing document
+never stops the rest of the batch; exports walk a cursor in keyset order
+without building models.
+"""
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorCursor
+from pymongo.errors import BulkWriteError
+
+
+async def insert_unordered(collection: AsyncIOMotorCollection, docs: List[dict]) -> Dict[int, str]:
+    """Insert ``docs`` with ``ordered=False``. Returns ``{index: reason}``
+    for the documents that were not written."""
+    if not docs:
+        return {}
+    try:
+        await collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        return {
+            err["index"]: "duplicate id" if err.get("code") == 11000 else err.get("errmsg", "write failed")
+            for err in e.details.get("writeErrors", [])
+        }
+    return {}
+
+
+def find_in_keyset_order(
+    collection: AsyncIOMotorCollection, query: dict, field: str, batch_size: int
+) -> AsyncIOMotorCursor:
+    """Cursor over ``query`` in ascending ``(field, _id)`` order, fetching
+    ``batch_size`` documents per round trip."""
+    return collection.find(query).sort([(field, 1), ("_id", 1)]).batch_size(batch_size)
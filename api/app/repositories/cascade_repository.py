@@ -0,0 +1,123 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from beanie import Document
+from beanie.odm.utils.dump import get_dict
+from pymongo import ASCENDING, UpdateOne
+
+from app.models import Alert, Tombstone
+from app.models.base import utcnow
+
+
+class StaleTombstone(Exception):
+    """The tombstone moved on (another worker advanced or finished it) since
+    it was read."""
+
+
+class CascadeRepository:
+    """Tombstones plus the bounded batch reads/deletes the cascade job runs
+    against dependent collections."""
+
+    # --- tombstones ---
+
+    async def get(self, tombstone_id: str) -> Optional[Tombstone]:
+        return await Tombstone.get(tombstone_id)
+
+    async def create_many(self, tombstones: Sequence[Tombstone]) -> int:
+        """Insert tombstones that do not exist yet (a repeated delete or a
+        re-run apiary batch keeps the original's progress). Returns the
+        number created."""
+        if not tombstones:
+            return 0
+        result = await Tombstone.get_motor_collection().bulk_write(
+            [
+                UpdateOne({"_id": t.id}, {"$setOnInsert": get_dict(t, to_db=True)}, upsert=True)
+                for t in tombstones
+            ],
+            ordered=False,
+        )
+        return result.upserted_count
+
+    async def pending(self, limit: int, max_attempts: int) -> List[Tombstone]:
+        """Oldest first, skipping tombstones that kept failing."""
+        return (
+            await Tombstone.find({"attempts": {"$lt": max_attempts}})
+            .sort([("created_at", ASCENDING)])
+            .limit(limit)
+            .to_list()
+        )
+
+    async def record(
+        self,
+        tombstone: Tombstone,
+        name: str,
+        touched: int,
+        *,
+        finished: bool,
+    ) -> None:
+        """Persist one batch: ``touched`` added to ``progress[name]``, and
+        ``step`` advanced when the step is ``finished``. Mirrors the change
+        onto ``tombstone``.
+
+        Conditional on ``step`` still being the one read: the cascade job
+        runs in every API worker, and two workers finishing the same step
+        must advance it once, not skip the next one. Raises
+        ``StaleTombstone`` when another worker got there first."""
+        update: Dict[str, Any] = {"$inc": {f"progress.{name}": touched}}
+        if finished:
+            update["$set"] = {"step": tombstone.step + 1}
+        result = await Tombstone.get_motor_collection().update_one(
+            {"_id": tombstone.id, "step": tombstone.step}, update
+        )
+        if not result.matched_count:
+            raise StaleTombstone(tombstone.id)
+        tombstone.progress[name] = tombstone.progress.get(name, 0) + touched
+        if finished:
+            tombstone.step += 1
+
+    async def record_failure(self, tombstone: Tombstone, error: str) -> None:
+        await Tombstone.get_motor_collection().update_one(
+            {"_id": tombstone.id}, {"$inc": {"attempts": 1}, "$set": {"last_error": error}}
+        )
+
+    async def delete(self, tombstone: Tombstone) -> None:
+        await tombstone.delete()
+
+    # --- dependents ---
+
+    async def find_batch(
+        self, document: Type[Document], query: dict, limit: int, fields: Sequence[str] = ()
+    ) -> List[dict]:
+        """Up to ``limit`` raw documents matching ``query``: ``_id`` plus
+        ``fields``."""
+        projection = {name: 1 for name in fields}
+        cursor = document.get_motor_collection().find(query, projection or {"_id": 1})
+        return await cursor.limit(limit).to_list(length=limit)
+
+    async def delete_ids(self, document: Type[Document], ids: List[Any]) -> int:
+        if not ids:
+            return 0
+        result = await document.get_motor_collection().delete_many({"_id": {"$in": ids}})
+        return result.deleted_count
+
+    async def delete_matching(self, document: Type[Document], query: dict) -> int:
+        """One ``delete_many``, for dependents that are at most a handful of
+        documents per parent."""
+        result = await document.get_motor_collection().delete_many(query)
+        return result.deleted_count
+
+    async def pull_hive_from_alerts(self, hive_id: str) -> int:
+        """Drop ``hive_id`` from every alert's ``hive_ids``."""
+        result = await Alert.get_motor_collection().update_many(
+            {"hive_ids": hive_id}, {"$pull": {"hive_ids": hive_id}}
+        )
+        return result.modified_count
+
+    async def resolve_alerts(self, query: dict) -> int:
+        """Dismiss the active alerts matching ``query`` the way the alert
+        engine resolves them (``resolved_at`` set)."""
+        now = utcnow()
+        result = await Alert.get_motor_collection().update_many(
+            {**query, "dismissed": False},
+            {"$set": {"dismissed": True, "resolved_at": now, "updated_at": now}},
+        )
+        return result.modified_count
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.models import HiveInspectionSummary
+from app.models.base import utcnow
+
+
+class HiveInspectionSummaryRepository:
+    async def get(self, hive_id: str, user_id: str) -> Optional[HiveInspectionSummary]:
+        return await HiveInspectionSummary.get(
+            HiveInspectionSummary.summary_id(hive_id, user_id)
+        )
+
+    async def get_for_hives(self, hive_ids: List[str]) -> List[HiveInspectionSummary]:
+        return await HiveInspectionSummary.find(
+            {"hive_id": {"$in": hive_ids}}
+        ).to_list()
+
+    async def get_last_inspected(self, user_id: str) -> Dict[str, Optional[datetime]]:
+        """hive id -> date of the user's latest inspection, for every hive
+        the user has inspected (projected; ``user_id`` index)."""
+        cursor = HiveInspectionSummary.get_motor_collection().find(
+            {"user_id": user_id}, {"hive_id": 1, "last_inspection.inspection_date": 1}
+        )
+        return {
+            doc["hive_id"]: (doc.get("last_inspection") or {}).get("inspection_date")
+            async for doc in cursor
+        }
+
+    async def get_hive_ids_changed_since(self, since: datetime) -> List[str]:
+        return await HiveInspectionSummary.get_motor_collection().distinct(
+            "hive_id", {"updated_at": {"$gt": since}}
+        )
+
+    async def get_hive_ids_last_inspected_between(
+        self, start: datetime, end: datetime
+    ) -> List[str]:
+        return await HiveInspectionSummary.get_motor_collection().distinct(
+            "hive_id",
+            {"last_inspection.inspection_date": {"$gte": start, "$lt": end}},
+        )
+
+    async def apply(
+        self,
+        hive_id: str,
+        user_id: str,
+        inc: Dict[str, int],
+        set_: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Atomically add ``inc`` (dotted paths) and set ``set_``, creating the
+        summary on first write."""
+        now = utcnow()
+        update: Dict[str, Any] = {
+            "$set": {**(set_ or {}), "updated_at": now},
+            "$setOnInsert": {"hive_id": hive_id, "user_id": user_id, "created_at": now},
+        }
+        if inc:
+            update["$inc"] = inc
+        await HiveInspectionSummary.get_motor_collection().update_one(
+            {"_id": HiveInspectionSummary.summary_id(hive_id, user_id)},
+            update,
+            upsert=True,
+        )
+
+    async def replace(self, summary: HiveInspectionSummary) -> HiveInspectionSummary:
+        summary.updated_at = utcnow()
+        await summary.save()
+        return summary
+
+    async def delete(self, hive_id: str, user_id: str) -> None:
+        await HiveInspectionSummary.find_one(
+            {"_id": HiveInspectionSummary.summary_id(hive_id, user_id)}
+        ).delete()
+
+    async def delete_except(self, summary_ids: List[str]) -> int:
+        """Drop summaries whose hive/user pair no longer has inspections."""
+        result = await HiveInspectionSummary.get_motor_collection().delete_many(
+            {"_id": {"$nin": summary_ids}}
+        )
+        return result.deleted_count
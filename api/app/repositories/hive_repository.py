@@ -1,4 +1,7 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from beanie.operators import In
+from assistive_core import find_one_and_set, request_cache
 from app.models import Hive
 
 
@@ -7,17 +10,61 @@ class HiveRepository:
         return await Hive.find_all().to_list()
 
     async def get_by_id(self, hive_id: str) -> Optional[Hive]:
-        return await Hive.get(hive_id)
+        return await request_cache.get_document(Hive, hive_id, lambda: Hive.get(hive_id))
 
     async def get_by_apiary_id(self, apiary_id: str) -> List[Hive]:
         return await Hive.find(Hive.apiary_id == apiary_id).to_list()
 
+    async def get_by_ids(self, hive_ids: List[str]) -> List[Hive]:
+        return await request_cache.get_documents(
+            Hive, hive_ids, lambda missing: Hive.find(In(Hive.id, missing)).to_list()
+        )
+
+    async def count_by_apiary_id(self, apiary_id: str) -> int:
+        """Cached for the request; any hive write drops it."""
+        return await request_cache.cached_query(
+            Hive.get_settings().name,
+            ("count_by_apiary", apiary_id),
+            lambda: Hive.find(Hive.apiary_id == apiary_id).count(),
+        )
+
+    async def get_ids_by_apiary_ids(self, apiary_ids: List[str]) -> List[dict]:
+        """``{_id, apiary_id}`` pairs for the given apiaries (projected)."""
+        cursor = Hive.get_motor_collection().find(
+            {"apiary_id": {"$in": apiary_ids}}, {"apiary_id": 1}
+        )
+        return await cursor.to_list(length=None)
+
+    async def get_ids_changed_since(self, since: datetime) -> List[str]:
+        return await Hive.get_motor_collection().distinct(
+            "_id", {"updated_at": {"$gt": since}}
+        )
+
+    async def get_ids_last_inspected_between(
+        self, start: datetime, end: datetime
+    ) -> List[str]:
+        return await Hive.get_motor_collection().distinct(
+            "_id", {"last_inspected": {"$gte": start, "$lt": end}}
+        )
+
+    async def get_all_ids(self) -> List[str]:
+        return await Hive.get_motor_collection().distinct("_id")
+
     async def create(self, hive: Hive) -> Hive:
         await hive.insert()
         return hive
 
     async def update(self, hive: Hive) -> Hive:
         await hive.save()
+        request_cache.remember(hive)
+        return hive
+
+    async def update_fields(self, hive_id: str, fields: Dict[str, Any]) -> Optional[Hive]:
+        """Set ``fields`` (and ``updated_at``, which feeds the alert engine's
+        change cursor) in one write; None when the hive does not exist."""
+        hive = await find_one_and_set(Hive, {"_id": hive_id}, fields)
+        if hive:
+            request_cache.remember(hive)
         return hive
 
     async def delete(self, hive: Hive) -> None:
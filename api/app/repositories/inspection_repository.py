@@ -1,7 +1,13 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from beanie.operators import In
+from assistive_core import find_one_and_set, read_collection, request_cache
+from app.analytics import PROJECTION
 from app.models import Inspection
+from app.models.base import utcnow
+
+from .bulk import find_in_keyset_order, insert_unordered
+from .pagination import after_keyset
 
 
 class InspectionRepository:
@@ -9,7 +15,7 @@ class InspectionRepository:
         return await Inspection.find_all().sort(-Inspection.inspection_date).to_list()
 
     async def get_by_id(self, inspection_id: str) -> Optional[Inspection]:
-        return await Inspection.get(inspection_id)
+        return await request_cache.get_document(Inspection, inspection_id, lambda: Inspection.get(inspection_id))
 
     async def get_by_user_id(self, user_id: str) -> List[Inspection]:
         return (
@@ -35,12 +41,86 @@ class InspectionRepository:
             .to_list()
         )
 
+    async def get_history_for_summary(self, hive_id: str, user_id: str) -> List[Inspection]:
+        """A hive's inspections oldest first, in the order the summary rollup
+        treats as chronological (ties broken by creation time)."""
+        return (
+            await Inspection.find(
+                Inspection.hive_id == hive_id,
+                Inspection.user_id == user_id,
+            )
+            .sort(+Inspection.inspection_date, +Inspection.created_at)
+            .to_list()
+        )
+
+    async def get_varroa_timeline(self, hive_id: str, user_id: str) -> List[dict]:
+        """``_id`` / date / varroa flag only, in summary order — enough to
+        recompute streaks without loading full inspections."""
+        cursor = Inspection.get_motor_collection().find(
+            {"hive_id": hive_id, "user_id": user_id},
+            {"inspection_date": 1, "varroa_mites_detected": 1},
+        ).sort([("inspection_date", 1), ("created_at", 1)])
+        return await cursor.to_list(length=None)
+
+    @staticmethod
+    def _analytics_filter(user_id: str, hive_ids: Optional[List[str]]) -> dict:
+        query: dict = {"user_id": user_id}
+        if hive_ids is not None:
+            query["hive_id"] = {"$in": hive_ids}
+        return query
+
+    async def get_analytics_rows(
+        self, user_id: str, hive_ids: Optional[List[str]] = None
+    ) -> List[dict]:
+        """Raw documents with only the analytics columns (no model
+        validation — this is the bulk path for ``InspectionColumns``). Read
+        with the analytics read preference."""
+        cursor = read_collection(Inspection, "analytics").find(
+            self._analytics_filter(user_id, hive_ids), PROJECTION, batch_size=10_000
+        )
+        return await cursor.to_list(length=None)
+
+    async def get_last_modified(
+        self, user_id: str, hive_ids: Optional[List[str]] = None
+    ) -> Tuple[int, Optional[datetime]]:
+        """``(count, newest updated_at)`` for a scope: changes whenever an
+        inspection in it is created, edited or deleted. Uses the same read
+        preference as ``get_analytics_rows`` so both see one replica's view."""
+        collection = read_collection(Inspection, "analytics")
+        query = self._analytics_filter(user_id, hive_ids)
+        count = await collection.count_documents(query)
+        newest = await collection.find_one(
+            query, {"updated_at": 1}, sort=[("updated_at", -1)]
+        )
+        return count, newest.get("updated_at") if newest else None
+
+    async def get_hive_user_pairs(self) -> List[Tuple[str, str]]:
+        """Every distinct ``(hive_id, user_id)`` with at least one inspection."""
+        rows = await Inspection.get_motor_collection().aggregate(
+            [{"$group": {"_id": {"hive_id": "$hive_id", "user_id": "$user_id"}}}]
+        ).to_list(length=None)
+        return [(row["_id"]["hive_id"], row["_id"]["user_id"]) for row in rows]
+
     async def get_latest_for_hive(self, hive_id: str) -> Optional[Inspection]:
         return await Inspection.find_one(
             Inspection.hive_id == hive_id,
             sort=[(Inspection.inspection_date, -1)],
         )
 
+    async def get_latest_for_hives(self, hive_ids: List[str]) -> List[Inspection]:
+        """The most recent inspection of each hive (any user). The
+        ``$sort``/``$group $first`` pair walks ``(hive_id, inspection_date)``."""
+        rows = await Inspection.get_motor_collection().aggregate(
+            [
+                {"$match": {"hive_id": {"$in": hive_ids}}},
+                {"$sort": {"hive_id": 1, "inspection_date": -1}},
+                {"$group": {"_id": "$hive_id", "latest": {"$first": "$_id"}}},
+            ]
+        ).to_list(length=None)
+        if not rows:
+            return []
+        return await Inspection.find(In(Inspection.id, [r["latest"] for r in rows])).to_list()
+
     async def get_recent(self, user_id: str, limit: int = 10) -> List[Inspection]:
         return (
             await Inspection.find(Inspection.user_id == user_id)
@@ -63,13 +143,68 @@ class InspectionRepository:
             .to_list()
         )
 
+    async def insert_documents(self, docs: List[dict]) -> Dict[int, str]:
+        """Bulk import: unordered insert of encoded documents. Returns the
+        failures by index."""
+        return await insert_unordered(Inspection.get_motor_collection(), docs)
+
+    def iter_export(
+        self,
+        user_id: str,
+        batch_size: int,
+        hive_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ):
+        """Raw inspection documents oldest first in ``(inspection_date, _id)``
+        order, resuming strictly after ``cursor``. Raises ``ValueError`` on a
+        malformed cursor."""
+        conditions: List[dict] = [{"user_id": user_id}]
+        if hive_id is not None:
+            conditions.append({"hive_id": hive_id})
+        window: dict = {}
+        if since is not None:
+            window["$gte"] = since
+        if until is not None:
+            window["$lte"] = until
+        if window:
+            conditions.append({"inspection_date": window})
+        if cursor:
+            conditions.append(after_keyset("inspection_date", cursor, descending=False))
+        return find_in_keyset_order(
+            Inspection.get_motor_collection(),
+            {"$and": conditions},
+            "inspection_date",
+            batch_size,
+        )
+
     async def create(self, inspection: Inspection) -> Inspection:
         await inspection.insert()
         return inspection
 
     async def update(self, inspection: Inspection) -> Inspection:
         await inspection.save()
+        request_cache.remember(inspection)
         return inspection
 
+    async def update_fields(
+        self, inspection_id: str, user_id: str, fields: Dict[str, Any]
+    ) -> Optional[Tuple[Inspection, Inspection]]:
+        """Set ``fields`` on the user's inspection in one write. Returns
+        ``(before, after)`` (summary maintenance needs the old values), or
+        None when the inspection is missing or someone else's."""
+        fields = {**fields, "updated_at": utcnow()}
+        before = await find_one_and_set(
+            Inspection, {"_id": inspection_id, "user_id": user_id}, fields, return_before=True
+        )
+        if not before:
+            return None
+        # Validated, not model_copy'd: ``fields`` holds BSON-ready values
+        # (e.g. ``photo_variants`` as dicts) that must load as models.
+        after = Inspection.model_validate({**before.model_dump(), **fields})
+        request_cache.remember(after)
+        return before, after
+
     async def delete(self, inspection: Inspection) -> None:
         await inspection.delete()
@@ -0,0 +1,13 @@
+from app.models import JobState
+from app.models.base import utcnow
+
+
+class JobStateRepository:
+    async def get(self, name: str) -> JobState:
+        """The job's saved state, or a fresh (never-run) one."""
+        return await JobState.get(name) or JobState(id=name)
+
+    async def save(self, state: JobState) -> JobState:
+        state.updated_at = utcnow()
+        await state.save()
+        return state
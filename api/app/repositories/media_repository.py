@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from beanie.odm.utils.dump import get_dict
+from pymongo import ASCENDING, UpdateMany, UpdateOne
+
+from app.models import Media
+from app.models.base import utcnow
+
+
+class MediaRepository:
+    async def get(self, path: str) -> Optional[Media]:
+        return await Media.get(path)
+
+    async def find_by_urls(self, urls: Sequence[str]) -> List[Media]:
+        if not urls:
+            return []
+        return await Media.find({"url": {"$in": list(urls)}}).to_list()
+
+    async def find_duplicate(self, owner_id: str, sha256: str) -> Optional[Media]:
+        return await Media.find_one(Media.owner_id == owner_id, Media.sha256 == sha256)
+
+    async def create(self, media: Media) -> Media:
+        await media.insert()
+        return media
+
+    async def restart_grace(self, media: Media) -> None:
+        """An unreferenced upload handed out again: restart its GC clock."""
+        if not media.refs:
+            media.unreferenced_since = utcnow()
+            await Media.get_motor_collection().update_one(
+                {"_id": media.id, "refs": {"$size": 0}},
+                {"$set": {"unreferenced_since": media.unreferenced_since}},
+            )
+
+    async def attach(self, ref: str, urls: Sequence[str]) -> int:
+        """Add ``ref`` to the catalogued media among ``urls`` (others, e.g.
+        external URLs, are ignored). Returns the number matched."""
+        if not urls:
+            return 0
+        result = await Media.get_motor_collection().update_many(
+            {"url": {"$in": list(urls)}},
+            {"$addToSet": {"refs": ref}, "$set": {"unreferenced_since": None}},
+        )
+        return result.matched_count
+
+    async def attach_many(self, urls_by_ref: Dict[str, Sequence[str]]) -> int:
+        """``attach`` for many documents in one round trip (bulk import).
+        Returns the number of media changed."""
+        operations = [
+            UpdateMany(
+                {"url": {"$in": list(urls)}},
+                {"$addToSet": {"refs": ref}, "$set": {"unreferenced_since": None}},
+            )
+            for ref, urls in urls_by_ref.items()
+            if urls
+        ]
+        if not operations:
+            return 0
+        result = await Media.get_motor_collection().bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def detach(self, refs: Sequence[str], keep_urls: Sequence[str] = ()) -> int:
+        """Remove ``refs`` from every media carrying them, except those at
+        ``keep_urls``; media left with no refs start their GC grace period.
+        Returns the number of media changed."""
+        if not refs:
+            return 0
+        collection = Media.get_motor_collection()
+        query: dict = {"refs": {"$in": list(refs)}}
+        if keep_urls:
+            query["url"] = {"$nin": list(keep_urls)}
+        ids = [doc["_id"] async for doc in collection.find(query, {"_id": 1})]
+        if not ids:
+            return 0
+        await collection.update_many({"_id": {"$in": ids}}, {"$pull": {"refs": {"$in": list(refs)}}})
+        await collection.update_many(
+            {"_id": {"$in": ids}, "refs": {"$size": 0}},
+            {"$set": {"unreferenced_since": utcnow()}},
+        )
+        return len(ids)
+
+    async def gc_candidates(self, cutoff: datetime, limit: int) -> List[str]:
+        """Paths unreferenced since before ``cutoff``, oldest first."""
+        cursor = (
+            Media.get_motor_collection()
+            .find({"unreferenced_since": {"$lt": cutoff}, "refs": {"$size": 0}}, {"_id": 1})
+            .sort("unreferenced_since", ASCENDING)
+            .limit(limit)
+        )
+        return [doc["_id"] async for doc in cursor]
+
+    async def claim(self, path: str, cutoff: datetime) -> Optional[dict]:
+        """Remove the catalog entry if it is still collectable (nothing
+        attached since it was selected). Returns the raw entry, for
+        ``restore`` should the storage delete fail."""
+        return await Media.get_motor_collection().find_one_and_delete(
+            {"_id": path, "refs": {"$size": 0}, "unreferenced_since": {"$lt": cutoff}}
+        )
+
+    async def restore(self, entries: List[dict]) -> None:
+        if entries:
+            await Media.get_motor_collection().insert_many(entries, ordered=False)
+
+    async def delete(self, media: Media) -> None:
+        await media.delete()
+
+    async def create_many(self, media: Sequence[Media]) -> int:
+        """Catalogue entries that do not exist yet (backfill). Returns the
+        number created."""
+        if not media:
+            return 0
+        result = await Media.get_motor_collection().bulk_write(
+            [
+                UpdateOne({"_id": m.id}, {"$setOnInsert": get_dict(m, to_db=True)}, upsert=True)
+                for m in media
+            ],
+            ordered=False,
+        )
+        return result.upserted_count
@@ -0,0 +1,38 @@
+"""Opaque keyset cursors shared by the paginated repositories.
+
+A cursor encodes the sort key and ``_id`` of the last row of a page; the next
+page's filter resumes strictly after it.
+"""
+import base64
+from datetime import datetime, timezone
+from typing import Tuple
+
+
+def encode_keyset(value: datetime, doc_id: str) -> str:
+    if value.tzinfo is not None:
+        # Mongo stores naive UTC; keep the cursor in the same form.
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    raw = f"{value.isoformat()}|{doc_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_keyset(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of ``encode_keyset``. Raises ``ValueError`` when malformed."""
+    try:
+        value, doc_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(value), doc_id
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def after_keyset(field: str, cursor: str, descending: bool) -> dict:
+    """Filter clause for rows strictly after ``cursor`` in ``(field, _id)``
+    order."""
+    after_value, after_id = decode_keyset(cursor)
+    op = "$lt" if descending else "$gt"
+    return {
+        "$or": [
+            {field: {op: after_value}},
+            {field: after_value, "_id": {op: after_id}},
+        ]
+    }
@@ -1,5 +1,12 @@
-from typing import List, Optional
-from app.models import Recommendation
+from typing import Any, Dict, List, Optional
+
+from beanie.odm.utils.dump import get_dict
+from pymongo import DeleteMany, ReplaceOne
+
+from assistive_core import find_one_and_set, request_cache
+
+from app.models import Recommendation, RecommendationState
+from app.models.base import utcnow
 
 
 class RecommendationRepository:
@@ -10,7 +17,7 @@ class RecommendationRepository:
         return await Recommendation.find(Recommendation.hive_id == hive_id).to_list()
 
     async def get_by_id(self, recommendation_id: str) -> Optional[Recommendation]:
-        return await Recommendation.get(recommendation_id)
+        return await request_cache.get_document(Recommendation, recommendation_id, lambda: Recommendation.get(recommendation_id))
 
     async def create(self, recommendation: Recommendation) -> Recommendation:
         await recommendation.insert()
@@ -18,7 +25,68 @@ class RecommendationRepository:
 
     async def update(self, recommendation: Recommendation) -> Recommendation:
         await recommendation.save()
+        request_cache.remember(recommendation)
+        return recommendation
+
+    async def update_fields(
+        self, recommendation_id: str, fields: Dict[str, Any]
+    ) -> Optional[Recommendation]:
+        """Set ``fields`` in one write; None when the recommendation does not
+        exist."""
+        recommendation = await find_one_and_set(
+            Recommendation, {"_id": recommendation_id}, fields
+        )
+        if recommendation:
+            request_cache.remember(recommendation)
         return recommendation
 
     async def delete(self, recommendation: Recommendation) -> None:
         await recommendation.delete()
+
+    async def get_input_hashes(self, hive_ids: List[str]) -> Dict[str, str]:
+        """``hive_id -> input_hash`` of the last generation, where there was one."""
+        cursor = RecommendationState.get_motor_collection().find(
+            {"_id": {"$in": hive_ids}}, {"input_hash": 1}
+        )
+        return {row["_id"]: row["input_hash"] async for row in cursor}
+
+    async def replace_generated(
+        self, hive_id: str, recommendations: List[Recommendation], input_hash: str
+    ) -> None:
+        """Swap in a hive's generated recommendations.
+
+        Generated ids are deterministic per (hive, rule), so one ordered bulk
+        write replaces each document in place and deletes the rules that no
+        longer fire: a concurrent ``get_by_hive_id`` sees every rule either
+        before or after, never a duplicate or an empty gap. Client-posted
+        recommendations (``rule`` unset) are untouched. The memo is written
+        last, so an interrupted swap is simply redone on the next run.
+        """
+        now = utcnow()
+        operations: list = []
+        for recommendation in recommendations:
+            recommendation.updated_at = now
+            operations.append(
+                ReplaceOne(
+                    {"_id": recommendation.id},
+                    get_dict(recommendation, to_db=True),
+                    upsert=True,
+                )
+            )
+        operations.append(
+            DeleteMany(
+                {
+                    "hive_id": hive_id,
+                    "rule": {"$ne": None, "$nin": [r.rule for r in recommendations]},
+                }
+            )
+        )
+        await Recommendation.get_motor_collection().bulk_write(operations, ordered=True)
+        await RecommendationState.get_motor_collection().update_one(
+            {"_id": hive_id},
+            {
+                "$set": {"input_hash": input_hash, "generated_at": now, "updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            },
+            upsert=True,
+        )
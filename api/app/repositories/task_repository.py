@@ -1,21 +1,113 @@
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 
-from beanie.operators import In, Or, Set
+from beanie.odm.utils.dump import get_dict
+from beanie.operators import In, LTE, NE, Or, Set
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 
-from app.models import Task, TaskStatus
+from assistive_core import find_one_and_set, request_cache
+
+from app.models import Task, TaskStatus, TaskPriority, TaskType
+
+from .bulk import find_in_keyset_order, insert_unordered
+from .pagination import after_keyset, decode_keyset, encode_keyset
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+@dataclass
+class TaskQuery:
+    """Composable task filter for ``TaskRepository.query``.
+
+    Every set field narrows the result (AND). List fields match any of their
+    values. Results are ordered by ``(due_date, _id)`` so ``cursor`` (the
+    ``next_cursor`` of the previous page) resumes exactly after the last row.
+    """
+
+    user_id: str
+    statuses: List[TaskStatus] = field(default_factory=list)
+    hive_id: Optional[str] = None
+    apiary_id: Optional[str] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    priorities: List[TaskPriority] = field(default_factory=list)
+    task_types: List[TaskType] = field(default_factory=list)
+    descending: bool = False
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+
+
+def encode_cursor(task: Task) -> str:
+    """Opaque keyset cursor for the row ``task``."""
+    return encode_keyset(task.due_date, task.id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of ``encode_cursor``. Raises ``ValueError`` when malformed."""
+    return decode_keyset(cursor)
+
+
+def _status_filter(statuses: List[TaskStatus], now: datetime) -> Optional[dict]:
+    """Status clause with overdue derived at query time: OVERDUE also matches
+    past-due PENDING tasks, and PENDING alone excludes them."""
+    if not statuses:
+        return None
+    wanted = set(statuses)
+    clauses = []
+    plain = [s for s in statuses if s not in (TaskStatus.PENDING, TaskStatus.OVERDUE)]
+    if TaskStatus.PENDING in wanted and TaskStatus.OVERDUE in wanted:
+        plain += [TaskStatus.PENDING, TaskStatus.OVERDUE]
+    elif TaskStatus.PENDING in wanted:
+        clauses.append({"status": TaskStatus.PENDING, "due_date": {"$gte": now}})
+    elif TaskStatus.OVERDUE in wanted:
+        plain.append(TaskStatus.OVERDUE)
+        clauses.append({"status": TaskStatus.PENDING, "due_date": {"$lt": now}})
+    if plain:
+        clauses.append({"status": {"$in": plain}})
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def build_task_filter(q: TaskQuery, now: Optional[datetime] = None) -> dict:
+    """Translate a ``TaskQuery`` into one Mongo filter document.
+
+    Equality fields come first so the planner can use the owner-scoped
+    ``(user_id, <field>, due_date, _id)`` compounds.
+    """
+    now = now or _utcnow()
+    conditions: List[dict] = [{"user_id": q.user_id}]
+    if q.hive_id is not None:
+        conditions.append({"hive_id": q.hive_id})
+    if q.apiary_id is not None:
+        conditions.append({"apiary_id": q.apiary_id})
+    if q.priorities:
+        conditions.append({"priority": {"$in": list(q.priorities)}})
+    if q.task_types:
+        conditions.append({"task_type": {"$in": list(q.task_types)}})
+    status_clause = _status_filter(q.statuses, now)
+    if status_clause:
+        conditions.append(status_clause)
+    due: dict = {}
+    if q.due_after is not None:
+        due["$gte"] = q.due_after
+    if q.due_before is not None:
+        due["$lte"] = q.due_before
+    if due:
+        conditions.append({"due_date": due})
+    if q.cursor:
+        conditions.append(after_keyset("due_date", q.cursor, q.descending))
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
 class TaskRepository:
     async def get_all(self) -> List[Task]:
         return await Task.find_all().to_list()
 
     async def get_by_id(self, task_id: str) -> Optional[Task]:
-        return await Task.get(task_id)
+        return await request_cache.get_document(Task, task_id, lambda: Task.get(task_id))
 
     async def get_by_user_id(self, user_id: str) -> List[Task]:
         return await Task.find(Task.user_id == user_id).to_list()
@@ -23,15 +115,83 @@ class TaskRepository:
     async def get_by_hive_id(self, hive_id: str) -> List[Task]:
         return await Task.find(Task.hive_id == hive_id).to_list()
 
+    async def get_open_for_hives(self, hive_ids: List[str]) -> List[Task]:
+        """Tasks on the given hives that are not completed or cancelled."""
+        return await Task.find(
+            In(Task.hive_id, hive_ids),
+            In(Task.status, [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.OVERDUE]),
+        ).to_list()
+
     async def get_by_apiary_id(self, apiary_id: str) -> List[Task]:
         return await Task.find(Task.apiary_id == apiary_id).to_list()
 
+    async def query(
+        self, q: TaskQuery, now: Optional[datetime] = None
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Run a combined filter as a single indexed query.
+
+        Returns ``(tasks, next_cursor)``; ``next_cursor`` is ``None`` on the last
+        page (or when ``q.limit`` is unset).
+        """
+        direction = DESCENDING if q.descending else ASCENDING
+        finder = Task.find(build_task_filter(q, now)).sort(
+            [("due_date", direction), ("_id", direction)]
+        )
+        if q.limit is None:
+            return await finder.to_list(), None
+        # One extra row tells us whether another page exists.
+        tasks = await finder.limit(q.limit + 1).to_list()
+        if len(tasks) <= q.limit:
+            return tasks, None
+        tasks = tasks[: q.limit]
+        return tasks, encode_cursor(tasks[-1])
+
+    async def get_by_hive_for_user(self, hive_id: str, user_id: str) -> List[Task]:
+        """The user's tasks for a hive, soonest first (``(user_id, hive_id,
+        due_date, _id)`` index; other users' tasks on a shared hive are never read)."""
+        return (
+            await Task.find(Task.user_id == user_id, Task.hive_id == hive_id)
+            .sort(Task.due_date)
+            .to_list()
+        )
+
+    async def get_by_apiary_for_user(self, apiary_id: str, user_id: str) -> List[Task]:
+        """The user's tasks for an apiary, soonest first (``(user_id,
+        apiary_id, due_date, _id)`` index)."""
+        return (
+            await Task.find(Task.user_id == user_id, Task.apiary_id == apiary_id)
+            .sort(Task.due_date)
+            .to_list()
+        )
+
     async def get_by_status(self, user_id: str, status: TaskStatus) -> List[Task]:
         return await Task.find(
             Task.user_id == user_id,
             Task.status == status,
         ).to_list()
 
+    async def get_by_effective_status(
+        self, user_id: str, status: TaskStatus, now: Optional[datetime] = None
+    ) -> List[Task]:
+        """Status filter with overdue derived at query time: OVERDUE also
+        matches past-due PENDING tasks, and PENDING excludes them."""
+        now = now or _utcnow()
+        if status == TaskStatus.OVERDUE:
+            return await Task.find(
+                Task.user_id == user_id,
+                Or(
+                    Task.status == TaskStatus.OVERDUE,
+                    {"status": TaskStatus.PENDING, "due_date": {"$lt": now}},
+                ),
+            ).sort(Task.due_date).to_list()
+        if status == TaskStatus.PENDING:
+            return await Task.find(
+                Task.user_id == user_id,
+                Task.status == TaskStatus.PENDING,
+                Task.due_date >= now,
+            ).sort(Task.due_date).to_list()
+        return await self.get_by_status(user_id, status)
+
     async def get_pending_and_overdue(self, user_id: str) -> List[Task]:
         return (
             await Task.find(
@@ -45,6 +205,42 @@ class TaskRepository:
             .to_list()
         )
 
+    async def get_schedulable(self, user_id: str) -> List[Task]:
+        """Open weather-dependent tasks the optimizer may move."""
+        return await Task.find(
+            Task.user_id == user_id,
+            In(Task.status, [TaskStatus.PENDING, TaskStatus.OVERDUE]),
+            Task.weather_dependent == True,  # noqa: E712
+        ).to_list()
+
+    async def set_due_dates(
+        self, user_id: str, due_dates: Dict[str, datetime], now: Optional[datetime] = None
+    ) -> int:
+        """Move tasks to new due dates in one unordered bulk write. Only the
+        owner's still-open tasks are touched; a rescheduled OVERDUE task goes
+        back to PENDING. Returns the number of tasks modified."""
+        if not due_dates:
+            return 0
+        now = now or _utcnow()
+        open_statuses = [TaskStatus.PENDING.value, TaskStatus.OVERDUE.value]
+        result = await Task.get_motor_collection().bulk_write(
+            [
+                UpdateOne(
+                    {"_id": task_id, "user_id": user_id, "status": {"$in": open_statuses}},
+                    {
+                        "$set": {
+                            "due_date": due,
+                            "status": TaskStatus.PENDING.value,
+                            "updated_at": now,
+                        }
+                    },
+                )
+                for task_id, due in due_dates.items()
+            ],
+            ordered=False,
+        )
+        return result.modified_count
+
     async def get_upcoming(self, user_id: str, days: int = 7) -> List[Task]:
         end_date = _utcnow() + timedelta(days=days)
         return (
@@ -58,12 +254,17 @@ class TaskRepository:
         )
 
     async def get_overdue(self, user_id: str) -> List[Task]:
+        # Overdue is a query-time predicate: past-due open tasks match whether
+        # or not the background sweep has flipped them to OVERDUE yet.
         now = _utcnow()
         return (
             await Task.find(
                 Task.user_id == user_id,
                 Task.due_date < now,
-                In(Task.status, [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]),
+                In(
+                    Task.status,
+                    [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.OVERDUE],
+                ),
             )
             .sort(Task.due_date)
             .to_list()
@@ -83,12 +284,47 @@ class TaskRepository:
             .to_list()
         )
 
+    async def insert_documents(self, docs: List[dict]) -> Dict[int, str]:
+        """Bulk import: unordered insert of encoded documents. Returns the
+        failures by index."""
+        return await insert_unordered(Task.get_motor_collection(), docs)
+
+    def iter_export(
+        self,
+        user_id: str,
+        batch_size: int,
+        hive_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ):
+        """Raw task documents in ``(due_date, _id)`` order (the owner-scoped
+        keyset indexes), resuming strictly after ``cursor``. Raises
+        ``ValueError`` on a malformed cursor."""
+        query = TaskQuery(
+            user_id=user_id, hive_id=hive_id, due_after=since, due_before=until, cursor=cursor
+        )
+        return find_in_keyset_order(
+            Task.get_motor_collection(), build_task_filter(query), "due_date", batch_size
+        )
+
     async def create(self, task: Task) -> Task:
         await task.insert()
         return task
 
     async def update(self, task: Task) -> Task:
         await task.save()
+        request_cache.remember(task)
+        return task
+
+    async def update_fields(
+        self, task_id: str, user_id: str, fields: Dict[str, Any]
+    ) -> Optional[Task]:
+        """Set ``fields`` on the user's task in one write; None when the task
+        is missing or someone else's."""
+        task = await find_one_and_set(Task, {"_id": task_id, "user_id": user_id}, fields)
+        if task:
+            request_cache.remember(task)
         return task
 
     async def delete(self, task: Task) -> None:
@@ -108,3 +344,92 @@ class TaskRepository:
             Task.status == TaskStatus.PENDING,
         ).update(Set({Task.status: TaskStatus.OVERDUE}))
         return result.modified_count if result else 0
+
+    async def mark_all_overdue(self, now: Optional[datetime] = None) -> int:
+        """Mark past-due pending tasks as overdue for ALL users in one
+        ``update_many`` (served by the ``(status, due_date)`` index). Returns
+        modified count."""
+        now = now or _utcnow()
+        result = await Task.find(
+            Task.status == TaskStatus.PENDING,
+            Task.due_date < now,
+        ).update(Set({Task.status: TaskStatus.OVERDUE, Task.updated_at: now}))
+        return result.modified_count if result else 0
+
+    # ------------------------------------------------------------------ #
+    # Recurring series
+    # ------------------------------------------------------------------ #
+    async def get_series_roots_behind(self, until: datetime, limit: int = 500) -> List[Task]:
+        """Live series roots whose next unmaterialised occurrence is due by
+        ``until``, furthest behind first (never-materialised roots, with no
+        date, sort first), so a backlog over ``limit`` drains in order."""
+        return (
+            await Task.find(
+                Task.occurrence_index == 0,
+                NE(Task.recurrence_frequency, None),
+                NE(Task.recurrence_exhausted, True),
+                Or(
+                    LTE(Task.recurrence_materialized_until, until),
+                    Task.recurrence_materialized_until == None,  # noqa: E711
+                ),
+            )
+            .sort([("recurrence_materialized_until", ASCENDING)])
+            .limit(limit)
+            .to_list()
+        )
+
+    async def get_series_roots(self, user_id: str) -> List[Task]:
+        """Every recurring series root owned by ``user_id``."""
+        return await Task.find(
+            Task.user_id == user_id,
+            Task.occurrence_index == 0,
+            NE(Task.recurrence_frequency, None),
+        ).to_list()
+
+    async def insert_occurrences(self, tasks: List[Task]) -> int:
+        """Bulk-insert occurrences, unordered; already-present occurrence keys
+        are skipped (unique index). Returns the number actually inserted."""
+        if not tasks:
+            return 0
+        try:
+            result = await Task.insert_many(tasks, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # 11000 = duplicate occurrence_key: already materialised, fine.
+            others = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+            if others:
+                raise
+            return e.details.get("nInserted", 0)
+
+    async def upsert_occurrence(self, task: Task) -> bool:
+        """Insert one occurrence unless its key already exists. Returns True
+        when a new document was written."""
+        doc = get_dict(task, to_db=True)
+        result = await Task.get_motor_collection().update_one(
+            {"occurrence_key": task.occurrence_key},
+            {"$setOnInsert": doc},
+            upsert=True,
+        )
+        return result.upserted_id is not None
+
+    async def set_materialized(
+        self, root_id: str, next_index: int, next_due: Optional[datetime]
+    ) -> None:
+        """Record the next occurrence to materialise; ``next_due`` None means
+        the series is exhausted."""
+        await Task.find_one(Task.id == root_id).update(
+            Set(
+                {
+                    Task.recurrence_next_index: next_index,
+                    Task.recurrence_materialized_until: next_due,
+                    Task.recurrence_exhausted: next_due is None,
+                }
+            )
+        )
+
+    async def advance_next_index(self, root_id: str, next_index: int) -> None:
+        """Move the root's ``recurrence_next_index`` forward (never back) past
+        an occurrence created outside materialisation."""
+        await Task.get_motor_collection().update_one(
+            {"_id": root_id}, {"$max": {"recurrence_next_index": next_index}}
+        )
@@ -7,6 +7,9 @@ from .tasks import router as tasks_router
 from .inspections import router as inspections_router
 from .photos import router as photos_router
 from .chat import router as chat_router
+from .analytics import router as analytics_router
+from .imports import router as imports_router
+from .exports import router as exports_router
 
 __all__ = [
     "apiaries_router",
@@ -18,4 +21,7 @@ __all__ = [
     "inspections_router",
     "photos_router",
     "chat_router",
+    "analytics_router",
+    "imports_router",
+    "exports_router",
 ]
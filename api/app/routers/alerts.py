@@ -1,45 +1,97 @@
-from fastapi import APIRouter, status
-from typing import List
+from fastapi import APIRouter, Depends, Query, Response, status
+from typing import List, Optional
 
 from app.services import AlertService
-from app.schemas import AlertCreate, AlertUpdate, AlertResponse
+from app.schemas import (
+    AlertCreate,
+    AlertUpdate,
+    AlertResponse,
+    AlertDismissRequest,
+    AlertDismissResponse,
+    AlertBroadcastRequest,
+    AlertBroadcastResponse,
+)
+from assistive_core import User, get_current_user
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
 
 
 @router.get("", response_model=List[AlertResponse])
-async def get_alerts():
-    """Get all alerts"""
+async def get_alerts(
+    response: Response,
+    hive_id: Optional[str] = Query(None, description="Alerts naming this hive"),
+    apiary_id: Optional[str] = Query(None, description="Alerts naming any hive in this apiary"),
+    dismissed: Optional[bool] = Query(None, description="Filter by dismissed state"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+):
+    """List the user's alerts (plus shared ones), newest first. With
+    ``limit``, the next page's cursor is returned in the ``X-Next-Cursor``
+    header (absent on the last page)."""
     service = AlertService()
-    return await service.get_all_alerts()
+    alerts, next_cursor = await service.list_alerts(
+        current_user.id,
+        hive_id=hive_id,
+        apiary_id=apiary_id,
+        dismissed=dismissed,
+        limit=limit,
+        cursor=cursor,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return alerts
 
 
 @router.get("/active", response_model=List[AlertResponse])
-async def get_active_alerts():
+async def get_active_alerts(current_user: User = Depends(get_current_user)):
     """Get all active (non-dismissed) alerts"""
     service = AlertService()
-    return await service.get_active_alerts()
+    return await service.get_active_alerts(current_user.id)
+
+
+@router.post("/dismiss", response_model=AlertDismissResponse)
+async def dismiss_alerts(
+    request: AlertDismissRequest, current_user: User = Depends(get_current_user)
+):
+    """Dismiss many alerts at once (by id and/or by hive or apiary)"""
+    service = AlertService()
+    return await service.dismiss_alerts(request, current_user.id)
+
+
+@router.post(
+    "/broadcast", response_model=AlertBroadcastResponse, status_code=status.HTTP_201_CREATED
+)
+async def broadcast_alert(
+    request: AlertBroadcastRequest, current_user: User = Depends(get_current_user)
+):
+    """Alert every apiary within a radius of a point (one shared alert per
+    apiary, naming its hives)"""
+    service = AlertService()
+    return await service.broadcast(request)
 
 
 @router.get("/{alert_id}", response_model=AlertResponse)
-async def get_alert(alert_id: str):
+async def get_alert(alert_id: str, current_user: User = Depends(get_current_user)):
     """Get a specific alert by ID"""
     service = AlertService()
-    return await service.get_alert(alert_id)
+    return await service.get_alert(alert_id, current_user.id)
 
 
 @router.post("", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
-async def create_alert(alert: AlertCreate):
+async def create_alert(alert: AlertCreate, current_user: User = Depends(get_current_user)):
     """Create a new alert"""
     import uuid
 
     alert_id = str(uuid.uuid4())
     service = AlertService()
-    return await service.create_alert(alert, alert_id)
+    return await service.create_alert(alert, alert_id, current_user.id)
 
 
 @router.patch("/{alert_id}", response_model=AlertResponse)
-async def update_alert(alert_id: str, alert: AlertUpdate):
+async def update_alert(
+    alert_id: str, alert: AlertUpdate, current_user: User = Depends(get_current_user)
+):
     """Update an alert (e.g., dismiss it)"""
     service = AlertService()
-    return await service.update_alert(alert_id, alert)
+    return await service.update_alert(alert_id, alert, current_user.id)
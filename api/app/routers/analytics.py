@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+
+from app.services import AnalyticsService
+from app.schemas import AnalyticsResponse
+from assistive_core import User, get_current_user
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+class WindowParams:
+    """Rolling-window shape shared by every analytics scope."""
+
+    def __init__(
+        self,
+        window_days: int = Query(30, ge=1, le=365, description="Window length in days"),
+        windows: int = Query(12, ge=1, le=104, description="Number of windows"),
+        step_days: Optional[int] = Query(
+            None, ge=1, le=365, description="Days between window ends (default: window length)"
+        ),
+    ):
+        self.window_days = window_days
+        self.windows = windows
+        self.step_days = step_days
+
+    def as_kwargs(self) -> dict:
+        return {
+            "window_days": self.window_days,
+            "windows": self.windows,
+            "step_days": self.step_days,
+        }
+
+
+@router.get("", response_model=AnalyticsResponse)
+async def get_user_analytics(
+    params: WindowParams = Depends(),
+    current_user: User = Depends(get_current_user),
+):
+    service = AnalyticsService()
+    return await service.for_user(current_user.id, **params.as_kwargs())
+
+
+@router.get("/apiaries/{apiary_id}", response_model=AnalyticsResponse)
+async def get_apiary_analytics(
+    apiary_id: str,
+    params: WindowParams = Depends(),
+    current_user: User = Depends(get_current_user),
+):
+    service = AnalyticsService()
+    return await service.for_apiary(apiary_id, current_user.id, **params.as_kwargs())
+
+
+@router.get("/hives/{hive_id}", response_model=AnalyticsResponse)
+async def get_hive_analytics(
+    hive_id: str,
+    params: WindowParams = Depends(),
+    current_user: User = Depends(get_current_user),
+):
+    service = AnalyticsService()
+    return await service.for_hive(hive_id, current_user.id, **params.as_kwargs())
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import List, Optional
 
 from app.services import ApiaryService
-from app.schemas import ApiaryCreate, ApiaryUpdate, ApiaryResponse
+from app.schemas import ApiaryCreate, ApiaryUpdate, ApiaryResponse, ApiaryNearbyResponse
 
 router = APIRouter(prefix="/apiaries", tags=["apiaries"])
 
@@ -14,6 +14,31 @@ async def get_apiaries():
     return await service.get_all_apiaries()
 
 
+@router.get("/nearby", response_model=List[ApiaryNearbyResponse])
+async def get_nearby_apiaries(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lon: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=1000),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Apiaries within ``radius_km`` of ``lat``/``lon`` (nearest first, with
+    distances), or inside the ``min_*``/``max_*`` bounding box"""
+    service = ApiaryService()
+    box = (min_lat, min_lon, max_lat, max_lon)
+    if lat is not None and lon is not None and all(v is None for v in box):
+        return await service.get_nearby(lat, lon, radius_km, limit)
+    if lat is None and lon is None and all(v is not None for v in box):
+        return await service.get_within_box(*box, limit)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Provide lat and lon, or min_lat, min_lon, max_lat and max_lon",
+    )
+
+
 @router.get("/{apiary_id}", response_model=ApiaryResponse)
 async def get_apiary(apiary_id: str):
     """Get a specific apiary by ID"""
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from anthropic import Anthropic
 import os
 import uuid
 from datetime import datetime
@@ -21,6 +20,10 @@ def get_anthropic_client():
                 status_code=500,
                 detail="ANTHROPIC_API_KEY not configured. Please add it to your .env file.",
             )
+        # Imported on first use: the SDK is slow to import and most workers
+        # never serve a chat request.
+        from anthropic import Anthropic
+
         anthropic_client = Anthropic(api_key=api_key)
     return anthropic_client
 
@@ -0,0 +1,40 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+
+from app.services import BulkExporter
+from app.services.bulk_export import MEDIA_TYPES
+from assistive_core import User, get_current_user
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/{kind}")
+async def bulk_export(
+    kind: Literal["inspections", "tasks"],
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    hive_id: Optional[str] = Query(None, description="Only this hive's rows"),
+    since: Optional[datetime] = Query(
+        None, description="Inspection date / task due date on or after"
+    ),
+    until: Optional[datetime] = Query(
+        None, description="Inspection date / task due date on or before"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="cursor of the last row received, to resume an export"
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream the user's inspections (by inspection date) or tasks (by due
+    date), oldest first, as NDJSON or CSV. Every row carries a ``cursor``;
+    pass the last one received to continue after an interruption."""
+    exporter = BulkExporter()
+    chunks = exporter.stream(
+        kind, current_user.id, format, hive_id=hive_id, since=since, until=until, cursor=cursor
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'},
+    )
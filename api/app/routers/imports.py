@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Literal, Optional
+
+from app.services import BulkImporter
+from app.schemas import ImportReport
+from assistive_core import User, get_current_user
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+@router.post("/{kind}", response_model=ImportReport)
+async def bulk_import(
+    kind: Literal["inspections", "tasks"],
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = Query(
+        None, description="Body format (default: from Content-Type, else ndjson)"
+    ),
+    notify: bool = Query(False, description="Announce each imported row to followers"),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream NDJSON or CSV rows into the user's inspections or tasks.
+
+    Rows are validated and written in batches; invalid rows are reported by
+    line without aborting the import. Follower notifications are off unless
+    ``notify`` is set."""
+    fmt = format
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = "csv" if "csv" in content_type else "ndjson"
+    importer = BulkImporter(notify=notify)
+    return await importer.run(kind, current_user.id, request.stream(), fmt)
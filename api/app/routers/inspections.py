@@ -2,7 +2,12 @@ from fastapi import APIRouter, Depends, status, Query
 from typing import List, Optional
 
 from app.services import InspectionService
-from app.schemas import InspectionCreate, InspectionUpdate, InspectionResponse
+from app.schemas import (
+    InspectionCreate,
+    InspectionUpdate,
+    InspectionResponse,
+    HiveInspectionSummaryResponse,
+)
 from assistive_core import User, get_current_user
 
 router = APIRouter(prefix="/inspections", tags=["inspections"])
@@ -41,6 +46,17 @@ async def get_latest_hive_inspection(
     return await service.get_latest_for_hive(hive_id, current_user.id)
 
 
+@router.get("/hive/{hive_id}/summary", response_model=HiveInspectionSummaryResponse)
+async def get_hive_inspection_summary(
+    hive_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Last inspection, value counts, varroa streaks and monthly trends for a
+    hive, read from one maintained rollup document."""
+    service = InspectionService()
+    return await service.get_hive_summary(hive_id, current_user.id)
+
+
 @router.get("/{inspection_id}", response_model=InspectionResponse)
 async def get_inspection(
     inspection_id: str,
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Form
 
 from assistive_core import User, get_current_user
-from app.services.bunny_storage_service import bunny_storage
+from app.services import MediaService
 from app.services.ai_analysis_service import ai_analysis_service
 
 router = APIRouter(prefix="/photos", tags=["photos"])
@@ -21,7 +21,9 @@ async def upload_photo(
         folder: The folder to store the file in (default: "inspections")
 
     Returns:
-        Dictionary with the CDN URL of the uploaded photo
+        Dictionary with the CDN URL and storage path of the uploaded photo
+        and the CDN URLs of its resized variants (e.g. "thumb").
+        Re-uploading identical bytes returns the existing photo.
     """
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
@@ -41,11 +43,15 @@ async def upload_photo(
 
     # Upload to Bunny.net
     try:
-        cdn_url = await bunny_storage.upload_photo(
-            file_content=file_content, filename=file.filename or "photo.jpg", folder=folder
+        media = await MediaService().upload(
+            content=file_content,
+            filename=file.filename or "photo.jpg",
+            folder=folder,
+            owner_id=current_user.id,
+            content_type=file.content_type,
         )
 
-        if not cdn_url:
+        if not media:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to upload photo to storage",
@@ -53,7 +59,9 @@ async def upload_photo(
 
         return {
             "success": True,
-            "url": cdn_url,
+            "url": media.url,
+            "path": media.id,
+            "variants": media.variants,
             "filename": file.filename,
             "size": len(file_content),
         }
@@ -121,7 +129,11 @@ async def delete_photo(
     current_user: User = Depends(get_current_user),
 ):
     """
-    Delete a photo from Bunny.net storage
+    Delete one of the user's uploads from Bunny.net storage
+
+    Only photos nothing references any more can be deleted (409 otherwise);
+    photos released by deleted inspections and hives are also reclaimed by
+    the media GC job.
 
     Args:
         file_path: The path of the file to delete (e.g., "inspections/20240101_120000_photo.jpg")
@@ -130,14 +142,7 @@ async def delete_photo(
         Success message
     """
     try:
-        success = await bunny_storage.delete_photo(file_path)
-
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete photo from storage",
-            )
-
+        await MediaService().delete(file_path, current_user.id)
         return {"success": True, "message": "Photo deleted successfully"}
 
     except ValueError as e:
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, status, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query
+from typing import List, Optional
 
-from app.services import RecommendationService
+from app.services import RecommendationGenerator, RecommendationService
 from app.schemas import (
     RecommendationCreate,
     RecommendationUpdate,
     RecommendationResponse,
+    RecommendationGenerateResponse,
 )
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
@@ -18,6 +19,23 @@ async def get_recommendations(hive_id: str = Query(...)):
     return await service.get_recommendations_by_hive(hive_id)
 
 
+@router.post("/generate", response_model=RecommendationGenerateResponse)
+async def generate_recommendations(
+    hive_id: Optional[str] = Query(None),
+    apiary_id: Optional[str] = Query(None),
+):
+    """Regenerate recommendations for a hive or every hive in an apiary.
+    Hives whose inputs are unchanged since the last run are skipped."""
+    generator = RecommendationGenerator()
+    if hive_id is not None:
+        return await generator.regenerate_hive(hive_id)
+    if apiary_id is not None:
+        return await generator.regenerate_apiary(apiary_id)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Provide hive_id or apiary_id"
+    )
+
+
 @router.post(
     "", response_model=RecommendationResponse, status_code=status.HTTP_201_CREATED
 )
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, status, Query
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from typing import List, Optional
 
-from app.services import TaskService
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse
-from app.models import TaskStatus
+from app.services import RoutePlanner, TaskService, TaskScheduleService
+from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskSchedulePlan, RoutePlan
+from app.models import TaskStatus, TaskPriority, TaskType
+from app.repositories import TaskQuery
 from assistive_core import User, get_current_user
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -11,23 +13,55 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.get("", response_model=List[TaskResponse])
 async def get_tasks(
-    task_status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
+    response: Response,
+    task_status: Optional[List[TaskStatus]] = Query(
+        None, description="Filter by task status (repeatable)"
+    ),
     hive_id: Optional[str] = Query(None, description="Filter by hive ID"),
     apiary_id: Optional[str] = Query(None, description="Filter by apiary ID"),
     upcoming_days: Optional[int] = Query(None, description="Get tasks due in next X days"),
+    due_after: Optional[datetime] = Query(None, description="Due on or after"),
+    due_before: Optional[datetime] = Query(None, description="Due on or before"),
+    priority: Optional[List[TaskPriority]] = Query(
+        None, description="Filter by priority (repeatable)"
+    ),
+    task_type: Optional[List[TaskType]] = Query(
+        None, description="Filter by task type (repeatable)"
+    ),
+    descending: bool = Query(False, description="Latest due date first"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(get_current_user),
 ):
+    """List tasks. All filters combine (AND) into one indexed query, ordered
+    by due date. With ``limit``, the next page's cursor is returned in the
+    ``X-Next-Cursor`` header (absent on the last page)."""
+    statuses = list(task_status or [])
+    if upcoming_days is not None:
+        horizon = datetime.now(timezone.utc) + timedelta(days=upcoming_days)
+        due_before = min(due_before, horizon) if due_before else horizon
+        if not statuses:
+            # "Upcoming" means still open, whether or not it has gone overdue.
+            statuses = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.OVERDUE]
+
+    query = TaskQuery(
+        user_id=current_user.id,
+        statuses=statuses,
+        hive_id=hive_id,
+        apiary_id=apiary_id,
+        due_after=due_after,
+        due_before=due_before,
+        priorities=list(priority or []),
+        task_types=list(task_type or []),
+        descending=descending,
+        limit=limit,
+        cursor=cursor,
+    )
     service = TaskService()
-    if hive_id:
-        return await service.get_tasks_by_hive(hive_id, current_user.id)
-    elif apiary_id:
-        return await service.get_tasks_by_apiary(apiary_id, current_user.id)
-    elif task_status:
-        return await service.get_tasks_by_status(current_user.id, task_status)
-    elif upcoming_days is not None:
-        return await service.get_upcoming_tasks(current_user.id, upcoming_days)
-    else:
-        return await service.get_all_tasks(current_user.id)
+    tasks, next_cursor = await service.query_tasks(query)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tasks
 
 
 @router.get("/pending", response_model=List[TaskResponse])
@@ -42,6 +76,40 @@ async def get_overdue_tasks(current_user: User = Depends(get_current_user)):
     return await service.get_overdue_tasks(current_user.id)
 
 
+@router.post("/schedule", response_model=TaskSchedulePlan)
+async def schedule_tasks(
+    horizon_hours: int = Query(72, ge=1, le=168, description="Hours of forecast to plan over"),
+    apply: bool = Query(False, description="Write the proposed slots as due dates"),
+    current_user: User = Depends(get_current_user),
+):
+    """Fit the user's open weather-dependent tasks into forecast windows that
+    meet each task's minimum temperature, duration and priority. Returns the
+    proposed plan; with ``apply`` the slots are saved as new due dates."""
+    service = TaskScheduleService()
+    return await service.optimize(current_user.id, horizon_hours=horizon_hours, apply=apply)
+
+
+@router.get("/route", response_model=RoutePlan)
+async def plan_route(
+    day: Optional[date] = Query(None, description="Day to plan (default: today, UTC)"),
+    start_lat: Optional[float] = Query(None, ge=-90, le=90),
+    start_lon: Optional[float] = Query(None, ge=-180, le=180),
+    current_user: User = Depends(get_current_user),
+):
+    """Order the apiary visits for a day's due tasks and inspections to keep
+    driving short. With ``start_lat``/``start_lon`` the route begins there."""
+    if (start_lat is None) != (start_lon is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide both start_lat and start_lon",
+        )
+    start = (start_lat, start_lon) if start_lat is not None else None
+    planner = RoutePlanner()
+    return await planner.plan(
+        current_user.id, day or datetime.now(timezone.utc).date(), start
+    )
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: str, current_user: User = Depends(get_current_user)):
     service = TaskService()
@@ -79,8 +147,10 @@ async def delete_task(task_id: str, current_user: User = Depends(get_current_use
     await service.delete_task(task_id, current_user.id)
 
 
-@router.post("/mark-overdue", status_code=status.HTTP_200_OK)
+@router.post("/mark-overdue", status_code=status.HTTP_200_OK, deprecated=True)
 async def mark_overdue(current_user: User = Depends(get_current_user)):
+    """Deprecated: overdue is now derived at read time and swept globally in
+    the background. Kept so older clients don't break."""
     service = TaskService()
     count = await service.mark_overdue_tasks(current_user.id)
     return {"message": f"Marked {count} tasks as overdue"}
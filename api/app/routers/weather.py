@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from typing import List, Optional
+
 from app.services import WeatherService
 from app.schemas import WeatherResponse
 
@@ -6,7 +8,16 @@ router = APIRouter(prefix="/weather", tags=["weather"])
 
 
 @router.get("", response_model=WeatherResponse)
-def get_weather():
-    """Get current weather conditions"""
+async def get_weather(apiary_id: Optional[str] = Query(None)):
+    """Get current weather conditions (live for ``apiary_id``)"""
+    service = WeatherService()
+    if apiary_id is None:
+        return service.get_current_weather()
+    return await service.get_apiary_weather(apiary_id)
+
+
+@router.get("/apiaries", response_model=List[WeatherResponse])
+async def get_apiary_weather():
+    """Current weather for every apiary with coordinates"""
     service = WeatherService()
-    return service.get_current_weather()
+    return await service.get_all_apiary_weather()
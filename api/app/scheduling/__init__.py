@@ -0,0 +1,16 @@
+"""Weather-aware task scheduling.
+
+``optimizer`` assigns tasks to feasible hourly slots of a forecast with a
+greedy pass followed by time-bounded local search. It is pure: callers load
+tasks and forecasts and apply the resulting plan.
+"""
+from .optimizer import Assignment, HourForecast, Plan, PlanTask, duration_hours, solve
+
+__all__ = [
+    "Assignment",
+    "HourForecast",
+    "Plan",
+    "PlanTask",
+    "duration_hours",
+    "solve",
+]
@@ -0,0 +1,280 @@
+"""Weather-aware task slot assignment.
+
+Time is an hourly grid starting at ``origin`` (the current hour). A task of
+``duration_hours`` may start at hour ``s`` when every hour in ``[s, s + d)``
+is inside the working day and its location's forecast is dry, calm enough
+and at or above the task's minimum temperature. The beekeeper does one task
+at a time, so assigned intervals never overlap.
+
+Cost of starting a task at ``s`` is ``weight * (s + LATE_FACTOR * late)``:
+sooner is better, and hours past the task's current due date cost more.
+Leaving a task unplanned costs ``weight * UNPLANNED_FACTOR * horizon``.
+
+``solve`` places tasks greedily (heaviest, then most constrained first) and
+then improves the plan by local search — re-placing each task at its best
+free start and ejecting a single blocker from a better start — until no
+move helps or the time budget runs out.
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+LATE_FACTOR = 4.0
+UNPLANNED_FACTOR = 10.0
+
+
+@dataclass(frozen=True)
+class HourForecast:
+    start: datetime
+    temperature_c: Optional[float] = None
+    wind_speed_ms: Optional[float] = None
+    wet: bool = False
+
+
+@dataclass(frozen=True)
+class PlanTask:
+    id: str
+    location: Optional[str]
+    weight: float
+    due: datetime
+    duration_hours: int = 1
+    minimum_temperature: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Assignment:
+    task_id: str
+    start: datetime
+    end: datetime
+    # Coldest forecast hour in the slot
+    temperature_c: Optional[float]
+
+
+@dataclass
+class Plan:
+    assignments: List[Assignment]
+    # task id -> reason
+    unplanned: Dict[str, str]
+    cost: float
+    iterations: int = 0
+    solve_ms: float = 0.0
+
+
+@dataclass
+class _Candidate:
+    task: PlanTask
+    # Feasible starts, ascending, with their cost
+    starts: List[Tuple[int, float]] = field(default_factory=list)
+    unplanned_cost: float = 0.0
+
+
+def _grid(
+    forecast: Sequence[HourForecast], origin: datetime, horizon: int
+) -> Dict[int, HourForecast]:
+    grid = {}
+    for hour in forecast:
+        index = int((hour.start - origin).total_seconds() // 3600)
+        if 0 <= index < horizon:
+            grid[index] = hour
+    return grid
+
+
+def _hour_ok(hour: Optional[HourForecast], task: PlanTask, day: Tuple[int, int], max_wind: float) -> bool:
+    if hour is None or hour.wet:
+        return False
+    if not day[0] <= hour.start.hour < day[1]:
+        return False
+    if hour.wind_speed_ms is not None and hour.wind_speed_ms > max_wind:
+        return False
+    if task.minimum_temperature is not None:
+        if hour.temperature_c is None or hour.temperature_c < task.minimum_temperature:
+            return False
+    return True
+
+
+def _candidate(
+    task: PlanTask,
+    grid: Dict[int, HourForecast],
+    origin: datetime,
+    horizon: int,
+    day: Tuple[int, int],
+    max_wind: float,
+) -> _Candidate:
+    ok = [_hour_ok(grid.get(i), task, day, max_wind) for i in range(horizon)]
+    due_index = (task.due - origin).total_seconds() / 3600
+    cand = _Candidate(task, unplanned_cost=task.weight * UNPLANNED_FACTOR * horizon)
+    run = 0
+    # ``run`` counts consecutive feasible hours ending at i
+    for i in range(horizon):
+        run = run + 1 if ok[i] else 0
+        if run >= task.duration_hours:
+            start = i - task.duration_hours + 1
+            late = max(0.0, start + task.duration_hours - due_index)
+            cand.starts.append((start, task.weight * (start + LATE_FACTOR * late)))
+    return cand
+
+
+class _State:
+    def __init__(self, horizon: int):
+        self.occupied: List[Optional[str]] = [None] * horizon
+        self.placed: Dict[str, int] = {}
+
+    def free(self, start: int, duration: int) -> bool:
+        return all(self.occupied[h] is None for h in range(start, start + duration))
+
+    def place(self, task: PlanTask, start: int) -> None:
+        for h in range(start, start + task.duration_hours):
+            self.occupied[h] = task.id
+        self.placed[task.id] = start
+
+    def remove(self, task: PlanTask) -> None:
+        start = self.placed.pop(task.id)
+        for h in range(start, start + task.duration_hours):
+            self.occupied[h] = None
+
+    def blockers(self, start: int, duration: int) -> set:
+        return {self.occupied[h] for h in range(start, start + duration)} - {None}
+
+
+def _cost_of(cand: _Candidate, start: Optional[int]) -> float:
+    if start is None:
+        return cand.unplanned_cost
+    for s, cost in cand.starts:
+        if s == start:
+            return cost
+    raise ValueError(start)
+
+
+def _best_free(cand: _Candidate, state: _State) -> Optional[Tuple[int, float]]:
+    # Starts are ascending and cost is non-decreasing in the start hour.
+    for start, cost in cand.starts:
+        if state.free(start, cand.task.duration_hours):
+            return start, cost
+    return None
+
+
+def solve(
+    tasks: Sequence[PlanTask],
+    forecasts: Dict[str, Sequence[HourForecast]],
+    origin: datetime,
+    horizon_hours: int,
+    day: Tuple[int, int] = (9, 18),
+    max_wind_ms: float = 8.0,
+    time_budget: float = 0.5,
+) -> Plan:
+    started = time.perf_counter()
+    deadline = started + time_budget
+    grids = {loc: _grid(hours, origin, horizon_hours) for loc, hours in forecasts.items()}
+    cands: Dict[str, _Candidate] = {}
+    unplanned: Dict[str, str] = {}
+    for task in tasks:
+        grid = grids.get(task.location) if task.location else None
+        if grid is None:
+            unplanned[task.id] = "No forecast for the task's apiary"
+            continue
+        cand = _candidate(task, grid, origin, horizon_hours, day, max_wind_ms)
+        if not cand.starts:
+            unplanned[task.id] = "No suitable weather window in the horizon"
+            continue
+        cands[task.id] = cand
+
+    state = _State(horizon_hours)
+    # Greedy: heaviest first, then earliest due, then fewest options.
+    order = sorted(
+        cands.values(), key=lambda c: (-c.task.weight, c.task.due, len(c.starts))
+    )
+    for cand in order:
+        best = _best_free(cand, state)
+        if best is not None:
+            state.place(cand.task, best[0])
+
+    iterations = 0
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        iterations += 1
+        for cand in order:
+            if time.perf_counter() >= deadline:
+                break
+            task = cand.task
+            current = state.placed.get(task.id)
+            current_cost = _cost_of(cand, current)
+            # Move: best free start once this task is lifted out.
+            if current is not None:
+                state.remove(task)
+            best = _best_free(cand, state)
+            if best is not None and best[1] < current_cost - 1e-9:
+                state.place(task, best[0])
+                improved = True
+                continue
+            if current is not None:
+                state.place(task, current)
+            # Eject: take a better start held by exactly one other task and
+            # re-place that task wherever it fits best.
+            for start, cost in cand.starts:
+                if cost >= current_cost - 1e-9:
+                    break
+                blockers = state.blockers(start, task.duration_hours)
+                if len(blockers) != 1 or task.id in blockers:
+                    continue
+                other = cands[next(iter(blockers))]
+                other_start = state.placed[other.task.id]
+                before = current_cost + _cost_of(other, other_start)
+                if current is not None:
+                    state.remove(task)
+                state.remove(other.task)
+                if not state.free(start, task.duration_hours):
+                    # The blocker's lift did not clear the window.
+                    state.place(other.task, other_start)
+                    if current is not None:
+                        state.place(task, current)
+                    continue
+                state.place(task, start)
+                moved = _best_free(other, state)
+                after = cost + (moved[1] if moved else other.unplanned_cost)
+                if after < before - 1e-9:
+                    if moved:
+                        state.place(other.task, moved[0])
+                    improved = True
+                    break
+                state.remove(task)
+                state.place(other.task, other_start)
+                if current is not None:
+                    state.place(task, current)
+
+    assignments = []
+    total = 0.0
+    for cand in cands.values():
+        start = state.placed.get(cand.task.id)
+        total += _cost_of(cand, start)
+        if start is None:
+            unplanned[cand.task.id] = "Every suitable window is taken by higher-value tasks"
+            continue
+        grid = grids[cand.task.location]
+        temps = [
+            grid[h].temperature_c
+            for h in range(start, start + cand.task.duration_hours)
+            if grid[h].temperature_c is not None
+        ]
+        assignments.append(
+            Assignment(
+                task_id=cand.task.id,
+                start=origin + timedelta(hours=start),
+                end=origin + timedelta(hours=start + cand.task.duration_hours),
+                temperature_c=min(temps) if temps else None,
+            )
+        )
+    assignments.sort(key=lambda a: a.start)
+    return Plan(
+        assignments=assignments,
+        unplanned=unplanned,
+        cost=total,
+        iterations=iterations,
+        solve_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def duration_hours(minutes: Optional[int]) -> int:
+    return max(1, math.ceil((minutes or 60) / 60))
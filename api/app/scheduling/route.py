@@ -0,0 +1,83 @@
+"""Visit ordering over apiaries (an open-path TSP).
+
+Distances are great-circle (haversine) kilometres computed for all pairs in
+one vectorized pass. ``solve_route`` builds a nearest-neighbour tour — from
+the fixed start when there is one, otherwise from every node, keeping the
+shortest — and then applies 2-opt segment reversals until no reversal
+shortens the path. Apiary counts per day are small (tens), so the
+``O(n^2)`` passes finish in milliseconds.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def distance_matrix(points: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """Pairwise haversine distances (km) between ``(lat, lon)`` points."""
+    if not len(points):
+        return np.zeros((0, 0))
+    coords = np.radians(np.asarray(points, dtype=float))
+    lat, lon = coords[:, 0:1], coords[:, 1:2]
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(order: Sequence[int], matrix: np.ndarray) -> float:
+    return float(sum(matrix[a, b] for a, b in zip(order, order[1:])))
+
+
+def nearest_neighbour(matrix: np.ndarray, start: int) -> List[int]:
+    n = len(matrix)
+    order = [start]
+    unvisited = set(range(n)) - {start}
+    while unvisited:
+        last = order[-1]
+        nxt = min(unvisited, key=lambda j: (matrix[last, j], j))
+        order.append(nxt)
+        unvisited.remove(nxt)
+    return order
+
+
+def two_opt(order: List[int], matrix: np.ndarray, fixed_start: bool = True) -> List[int]:
+    """Reverse segments while that shortens the open path. With
+    ``fixed_start`` the first node never moves."""
+    order = list(order)
+    n = len(order)
+    first = 1 if fixed_start else 0
+    improved = True
+    while improved:
+        improved = False
+        for i in range(first, n - 1):
+            for j in range(i + 1, n):
+                # Edges (i-1, i) and (j, j+1) become (i-1, j) and (i, j+1);
+                # a missing neighbour (path end) contributes nothing.
+                before = after = 0.0
+                if i > 0:
+                    before += matrix[order[i - 1], order[i]]
+                    after += matrix[order[i - 1], order[j]]
+                if j < n - 1:
+                    before += matrix[order[j], order[j + 1]]
+                    after += matrix[order[i], order[j + 1]]
+                if after < before - 1e-9:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def solve_route(matrix: np.ndarray, start: Optional[int] = None) -> List[int]:
+    """Visit order over all nodes of ``matrix``, beginning at ``start`` when
+    given."""
+    n = len(matrix)
+    if n == 0:
+        return []
+    if start is not None:
+        return two_opt(nearest_neighbour(matrix, start), matrix, fixed_start=True)
+    best = min(
+        (nearest_neighbour(matrix, s) for s in range(n)),
+        key=lambda order: path_length(order, matrix),
+    )
+    return two_opt(best, matrix, fixed_start=False)
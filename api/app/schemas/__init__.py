@@ -1,35 +1,99 @@
-from .apiary import ApiaryCreate, ApiaryUpdate, ApiaryResponse
+from .apiary import ApiaryCreate, ApiaryUpdate, ApiaryResponse, ApiaryNearbyResponse
 from .hive import HiveCreate, HiveUpdate, HiveResponse
-from .alert import AlertCreate, AlertUpdate, AlertResponse
+from .alert import (
+    AlertCreate,
+    AlertUpdate,
+    AlertResponse,
+    AlertDismissRequest,
+    AlertDismissResponse,
+    AlertBroadcastRequest,
+    AlertBroadcastResponse,
+)
 from .recommendation import (
     RecommendationCreate,
     RecommendationUpdate,
     RecommendationResponse,
+    RecommendationGenerateResponse,
 )
 from .weather import WeatherResponse, WeatherCondition
-from .task import TaskCreate, TaskUpdate, TaskResponse, RecurrenceData
-from .inspection import InspectionCreate, InspectionUpdate, InspectionResponse
+from .task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    RecurrenceData,
+    TaskScheduleSlot,
+    TaskScheduleUnplanned,
+    TaskSchedulePlan,
+    RouteStop,
+    RouteUnrouted,
+    RoutePlan,
+)
+from .analytics import (
+    AnalyticsResponse,
+    AnalyticsWindow,
+    CadenceStats,
+    HiveAnalytics,
+)
+from .inspection import (
+    InspectionCreate,
+    InspectionUpdate,
+    InspectionResponse,
+    InspectionSnapshotResponse,
+    PhotoVariantsResponse,
+    MonthlyInspectionTrend,
+    HiveInspectionSummaryResponse,
+)
+from .bulk_import import (
+    InspectionImportRow,
+    TaskImportRow,
+    ImportRowError,
+    ImportReport,
+)
 
 __all__ = [
     "ApiaryCreate",
     "ApiaryUpdate",
     "ApiaryResponse",
+    "ApiaryNearbyResponse",
     "HiveCreate",
     "HiveUpdate",
     "HiveResponse",
     "AlertCreate",
     "AlertUpdate",
     "AlertResponse",
+    "AlertDismissRequest",
+    "AlertDismissResponse",
+    "AlertBroadcastRequest",
+    "AlertBroadcastResponse",
     "RecommendationCreate",
     "RecommendationUpdate",
     "RecommendationResponse",
+    "RecommendationGenerateResponse",
     "WeatherResponse",
     "WeatherCondition",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
     "RecurrenceData",
+    "TaskScheduleSlot",
+    "TaskScheduleUnplanned",
+    "TaskSchedulePlan",
+    "RouteStop",
+    "RouteUnrouted",
+    "RoutePlan",
     "InspectionCreate",
     "InspectionUpdate",
     "InspectionResponse",
+    "InspectionSnapshotResponse",
+    "PhotoVariantsResponse",
+    "MonthlyInspectionTrend",
+    "HiveInspectionSummaryResponse",
+    "AnalyticsResponse",
+    "AnalyticsWindow",
+    "CadenceStats",
+    "HiveAnalytics",
+    "InspectionImportRow",
+    "TaskImportRow",
+    "ImportRowError",
+    "ImportReport",
 ]
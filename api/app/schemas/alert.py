@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, List
 from app.models import AlertType, AlertSeverity
@@ -35,5 +35,41 @@ class AlertResponse(AlertBase):
     timestamp: datetime
     hive_ids: Optional[List[str]] = None
     dismissed: bool
+    # None for shared alerts
+    user_id: Optional[str] = None
+    # Engine-raised alerts only
+    rule: Optional[str] = None
+    resolved_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True, alias_generator=to_camel, populate_by_name=True)
+
+
+class AlertDismissRequest(BaseModel):
+    """Bulk dismiss: the listed alerts and/or every alert naming the hive or
+    the apiary's hives."""
+
+    alert_ids: Optional[List[str]] = Field(None, max_length=500)
+    hive_id: Optional[str] = None
+    apiary_id: Optional[str] = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class AlertDismissResponse(BaseModel):
+    dismissed: int
+
+
+class AlertBroadcastRequest(AlertBase):
+    """Raise an alert on every hive of every apiary within ``radius_km`` of
+    a point (e.g. a swarm sighting)."""
+
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    radius_km: float = Field(10, gt=0, le=200)
+
+
+class AlertBroadcastResponse(BaseModel):
+    apiary_ids: List[str]
+    alerts: int
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
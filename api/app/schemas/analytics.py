@@ -0,0 +1,65 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+
+
+def to_camel(string: str) -> str:
+    """Convert snake_case to camelCase"""
+    words = string.split('_')
+    return words[0] + ''.join(word.capitalize() for word in words[1:])
+
+
+class CadenceStats(BaseModel):
+    """Days between consecutive inspections of the same hive"""
+    mean_interval_days: Optional[float] = None
+    median_interval_days: Optional[float] = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class AnalyticsWindow(BaseModel):
+    """Scope-wide metrics for one rolling window. Averages use the ordinal
+    codes (population 1-5, brood pattern 0-4, stores 0-5)."""
+    start: datetime
+    end: datetime
+    inspections: int
+    varroa_prevalence: Optional[float] = None
+    avg_population: Optional[float] = None
+    avg_brood_pattern: Optional[float] = None
+    avg_honey_stores: Optional[float] = None
+    avg_pollen_stores: Optional[float] = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class HiveAnalytics(BaseModel):
+    """Per-hive metrics. Trends are least-squares slopes in codes per 30 days
+    over the analysed span; varroa prevalence covers the latest window."""
+    hive_id: str
+    inspections: int
+    last_inspection_date: datetime
+    days_since_inspection: Optional[float] = None
+    mean_interval_days: Optional[float] = None
+    days_since_queen_seen: Optional[float] = None
+    varroa_prevalence: Optional[float] = None
+    population_latest: int
+    population_trend: Optional[float] = None
+    honey_stores_trend: Optional[float] = None
+    pollen_stores_trend: Optional[float] = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class AnalyticsResponse(BaseModel):
+    """Schema for colony analytics over a user, apiary or hive scope"""
+    scope: str
+    scope_id: Optional[str] = None
+    generated_at: datetime
+    last_modified: Optional[datetime] = None
+    inspection_count: int
+    hive_count: int
+    cadence: CadenceStats
+    windows: List[AnalyticsWindow]
+    hives: List[HiveAnalytics]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
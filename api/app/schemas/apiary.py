@@ -38,3 +38,8 @@ class ApiaryResponse(ApiaryBase):
     hive_count: int = Field(..., serialization_alias="hiveCount")
 
     model_config = ConfigDict(from_attributes=True, alias_generator=to_camel, populate_by_name=True)
+
+
+class ApiaryNearbyResponse(ApiaryResponse):
+    # Set for radius searches; None for bounding-box searches
+    distance_km: Optional[float] = Field(None, serialization_alias="distanceKm")
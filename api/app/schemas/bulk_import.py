@@ -0,0 +1,56 @@
+from pydantic import BaseModel, ConfigDict, model_validator
+from datetime import datetime
+from typing import List, Optional
+from app.models import TaskStatus
+
+from .inspection import InspectionCreate
+from .task import TaskCreate
+
+
+def to_camel(string: str) -> str:
+    """Convert snake_case to camelCase"""
+    words = string.split('_')
+    return words[0] + ''.join(word.capitalize() for word in words[1:])
+
+
+class InspectionImportRow(InspectionCreate):
+    """One imported inspection. ``id`` is optional; supplying the source
+    system's id makes re-running an import skip rows already written."""
+    id: Optional[str] = None
+
+
+class TaskImportRow(TaskCreate):
+    """One imported task, including historical status."""
+    id: Optional[str] = None
+    status: TaskStatus = TaskStatus.PENDING
+    completed_date: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def _not_recurring(self) -> "TaskImportRow":
+        if self.recurrence_frequency is not None:
+            raise ValueError(
+                "recurring tasks are not supported by bulk import; create them with POST /tasks"
+            )
+        return self
+
+
+class ImportRowError(BaseModel):
+    # 1-based line of the input (for CSV, the record's first line)
+    line: int
+    errors: List[str]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class ImportReport(BaseModel):
+    kind: str
+    received: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    # More rows failed than the report lists
+    errors_truncated: bool = False
+    summaries_rebuilt: int = 0
+    elapsed_ms: float
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
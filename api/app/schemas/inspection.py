@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from app.models import (
     QueenCellStatus,
     BroodPattern,
@@ -8,6 +8,8 @@ from app.models import (
     ColonyPopulation,
     HealthStatus,
     ResourceLevel,
+    InspectionSnapshot,
+    PhotoVariants,
 )
 
 
@@ -114,11 +116,56 @@ class InspectionUpdate(BaseModel):
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
 
 
+class PhotoVariantsResponse(PhotoVariants):
+    """Resized copies of one photo, for list views that only need a thumbnail"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class InspectionResponse(InspectionBase):
     """Schema for inspection responses"""
     id: str
     user_id: str
+    photo_variants: list[PhotoVariantsResponse] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True, alias_generator=to_camel, populate_by_name=True)
+
+
+class InspectionSnapshotResponse(InspectionSnapshot):
+    """Most recent inspection as held by the hive summary"""
+
+    model_config = ConfigDict(from_attributes=True, alias_generator=to_camel, populate_by_name=True)
+
+
+class MonthlyInspectionTrend(BaseModel):
+    """One month of a hive's inspection trends. Averages use ordinal scores
+    (population 1-5, brood pattern 0-4, stores 0-5)."""
+    month: str
+    inspections: int
+    varroa_detections: int
+    avg_population: Optional[float] = None
+    avg_brood_pattern: Optional[float] = None
+    avg_honey_stores: Optional[float] = None
+    avg_pollen_stores: Optional[float] = None
+    avg_frames_covered: Optional[float] = None
+    avg_brood_frames: Optional[float] = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class HiveInspectionSummaryResponse(BaseModel):
+    """Schema for a hive's inspection rollup"""
+    hive_id: str
+    inspection_count: int
+    last_inspection: Optional[InspectionSnapshotResponse] = None
+    counts: Dict[str, Dict[str, int]]
+    varroa_detections: int
+    varroa_current_streak: int
+    varroa_longest_streak: int
+    varroa_last_detected: Optional[datetime] = None
+    monthly: List[MonthlyInspectionTrend]
+    updated_at: datetime
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 from app.models import RecommendationType, Priority
 
@@ -33,5 +35,12 @@ class RecommendationUpdate(BaseModel):
 
 class RecommendationResponse(RecommendationBase):
     id: str
+    # Set on generated recommendations
+    rule: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True, alias_generator=to_camel, populate_by_name=True)
+
+
+class RecommendationGenerateResponse(BaseModel):
+    regenerated: int
+    unchanged: int
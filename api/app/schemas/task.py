@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from app.models import TaskType, TaskStatus, TaskPriority, RecurrenceFrequency
 
 
@@ -78,8 +78,88 @@ class TaskResponse(TaskBase):
     recurrence_interval: Optional[int] = None
     recurrence_end_date: Optional[datetime] = None
     recurrence_count: Optional[int] = None
+    series_id: Optional[str] = None
+    occurrence_index: Optional[int] = None
+    # True for occurrences projected at query time and not stored.
+    is_virtual: bool = False
     user_id: str
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True, alias_generator=to_camel, populate_by_name=True)
+
+
+class TaskScheduleSlot(BaseModel):
+    """A proposed time slot for one weather-dependent task"""
+    task_id: str
+    title: str
+    apiary_id: Optional[str] = None
+    priority: TaskPriority
+    current_due_date: datetime
+    proposed_start: datetime
+    proposed_end: datetime
+    minimum_temperature: Optional[float] = None
+    forecast_temperature_c: Optional[float] = None
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class TaskScheduleUnplanned(BaseModel):
+    task_id: str
+    title: str
+    reason: str
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class TaskSchedulePlan(BaseModel):
+    """Result of the weather-aware scheduling optimizer"""
+    slots: List[TaskScheduleSlot]
+    unplanned: List[TaskScheduleUnplanned]
+    horizon_start: datetime
+    horizon_hours: int
+    cost: float
+    solve_ms: float
+    applied: bool = False
+    updated: int = 0
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class RouteStop(BaseModel):
+    """One apiary visit in a day's route"""
+    order: int
+    apiary_id: str
+    apiary_name: str
+    latitude: float
+    longitude: float
+    distance_km: float
+    travel_minutes: float
+    arrival_minutes: float
+    service_minutes: int
+    task_ids: List[str]
+    inspection_hive_ids: List[str]
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class RouteUnrouted(BaseModel):
+    """Due work that could not be placed on the map"""
+    apiary_id: Optional[str] = None
+    task_ids: List[str]
+    inspection_hive_ids: List[str]
+    reason: str
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class RoutePlan(BaseModel):
+    """Visit order across apiaries for one day's due tasks and inspections"""
+    day: date
+    stops: List[RouteStop]
+    unrouted: List[RouteUnrouted]
+    total_distance_km: float
+    total_travel_minutes: float
+    total_service_minutes: int
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 from enum import Enum
 
@@ -17,10 +19,16 @@ class WeatherCondition(str, Enum):
 
 
 class WeatherResponse(BaseModel):
+    # Fahrenheit / mph, as the clients display them
     temperature: int
     humidity: int
     wind_speed: int
     condition: WeatherCondition
     description: str
+    # Set on live (per-apiary) weather
+    apiary_id: Optional[str] = None
+    temperature_c: Optional[float] = None
+    wind_speed_ms: Optional[float] = None
+    source: Optional[str] = None
 
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
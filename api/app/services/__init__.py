@@ -5,6 +5,17 @@ from .recommendation_service import RecommendationService
 from .weather_service import WeatherService
 from .task_service import TaskService
 from .inspection_service import InspectionService
+from .recurrence_service import RecurrenceService
+from .inspection_summary_service import InspectionSummaryService
+from .analytics_service import AnalyticsService
+from .alert_engine import AlertEngine
+from .recommendation_generator import RecommendationGenerator
+from .task_schedule_service import TaskScheduleService
+from .route_planner import RoutePlanner
+from .bulk_import import BulkImporter
+from .bulk_export import BulkExporter
+from .cascade_service import CascadeService
+from .media_service import MediaService
 
 __all__ = [
     "ApiaryService",
@@ -14,4 +25,15 @@ __all__ = [
     "WeatherService",
     "TaskService",
     "InspectionService",
+    "RecurrenceService",
+    "InspectionSummaryService",
+    "AnalyticsService",
+    "AlertEngine",
+    "RecommendationGenerator",
+    "TaskScheduleService",
+    "RoutePlanner",
+    "BulkImporter",
+    "BulkExporter",
+    "CascadeService",
+    "MediaService",
 ]
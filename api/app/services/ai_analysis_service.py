@@ -2,7 +2,6 @@ import os
 import base64
 import httpx
 from typing import Dict, List, Optional
-from anthropic import Anthropic
 
 
 class AIAnalysisService:
@@ -10,7 +9,16 @@ class AIAnalysisService:
 
     def __init__(self):
         self.api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        self.client = Anthropic(api_key=self.api_key) if self.api_key else None
+        self._client = None
+
+    @property
+    def client(self):
+        """Anthropic client, created (and the SDK imported) on first use."""
+        if self._client is None and self.api_key:
+            from anthropic import Anthropic
+
+            self._client = Anthropic(api_key=self.api_key)
+        return self._client
 
     async def analyze_hive_photo(
         self, image_url: str, analysis_type: str = "general"
@@ -0,0 +1,368 @@
+"""Rule-based alert generation, evaluated over hives in batches.
+
+Each hive rule looks at a hive and one beekeeper's ``HiveInspectionSummary``
+of it (latest inspection snapshot, varroa streak) and returns at most one
+``Finding``, owned by that beekeeper. A
+finding's fingerprint names the condition *episode* — e.g. swarm cells seen
+in inspection X — so re-evaluating the same hive upserts onto the existing
+alert (unique ``fingerprint`` index) instead of raising a duplicate, and a
+dismissed alert stays dismissed until a new episode starts. Engine alerts for
+an evaluated hive whose fingerprint no longer fires are resolved.
+
+Runs are incremental: only hives whose hive or summary document changed since
+the saved cursor, or whose inspection-due threshold fell inside the elapsed
+interval, are evaluated. Weather thresholds are checked per apiary on their
+own, slower cadence.
+"""
+import asyncio
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from pymongo import UpdateMany, UpdateOne
+
+from assistive_core import weather_client
+
+from app.models import (
+    AlertSeverity,
+    AlertType,
+    Apiary,
+    Hive,
+    HiveInspectionSummary,
+    QueenCellStatus,
+)
+from app.models.base import utcnow
+from app.repositories import (
+    AlertRepository,
+    ApiaryRepository,
+    HiveInspectionSummaryRepository,
+    HiveRepository,
+    JobStateRepository,
+)
+
+
+INSPECTION_DUE_DAYS = int(os.getenv("ALERT_INSPECTION_DUE_DAYS", "14"))
+VARROA_STREAK_THRESHOLD = int(os.getenv("ALERT_VARROA_STREAK", "2"))
+WEATHER_CHECK_HOURS = float(os.getenv("ALERT_WEATHER_CHECK_HOURS", "6"))
+WEATHER_FROST_C = float(os.getenv("ALERT_WEATHER_FROST_C", "2"))
+WEATHER_HEAT_C = float(os.getenv("ALERT_WEATHER_HEAT_C", "35"))
+WEATHER_WIND_MS = float(os.getenv("ALERT_WEATHER_WIND_MS", "12"))
+ALERT_BATCH_SIZE = int(os.getenv("ALERT_BATCH_SIZE", "500"))
+
+ENGINE_JOB = "alert_engine"
+WEATHER_RULE = "weather"
+# Re-read a little before the cursor so a write committed while the previous
+# run was querying is not skipped; re-evaluation is idempotent.
+CURSOR_OVERLAP = timedelta(seconds=60)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Motor hands BSON datetimes back naive (UTC).
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class HiveContext:
+    hive: Hive
+    summary: Optional[HiveInspectionSummary]
+    now: datetime
+
+    @property
+    def user_id(self) -> Optional[str]:
+        # Hives have no owner; the alert goes to whoever inspects the hive.
+        return self.summary.user_id if self.summary else None
+
+    def fingerprint(self, rule: str, episode: str) -> str:
+        return f"{rule}:{self.hive.id}:{self.user_id or '*'}:{episode}"
+
+    @property
+    def last_inspected(self) -> datetime:
+        last = _as_utc(self.hive.last_inspected)
+        if self.summary and self.summary.last_inspection:
+            last = max(last, _as_utc(self.summary.last_inspection.inspection_date))
+        return last
+
+
+@dataclass
+class Finding:
+    rule: str
+    fingerprint: str
+    type: AlertType
+    severity: AlertSeverity
+    title: str
+    message: str
+    hive_ids: List[str] = field(default_factory=list)
+    user_id: Optional[str] = None
+
+
+HiveRule = Callable[[HiveContext], Optional[Finding]]
+
+
+def swarm_cells_rule(ctx: HiveContext) -> Optional[Finding]:
+    last = ctx.summary.last_inspection if ctx.summary else None
+    if last is None or last.queen_cells != QueenCellStatus.SWARM_CELLS:
+        return None
+    return Finding(
+        rule="swarm_cells",
+        fingerprint=ctx.fingerprint("swarm_cells", last.inspection_id),
+        type=AlertType.SWARM_WARNING,
+        severity=AlertSeverity.CRITICAL,
+        title=f"Swarm cells in {ctx.hive.name}",
+        message="The latest inspection found swarm cells. Split the colony or "
+        "remove the cells before the prime swarm leaves.",
+        hive_ids=[ctx.hive.id],
+        user_id=ctx.user_id,
+    )
+
+
+def varroa_streak_rule(ctx: HiveContext) -> Optional[Finding]:
+    summary = ctx.summary
+    if summary is None or summary.varroa_current_streak < VARROA_STREAK_THRESHOLD:
+        return None
+    started = summary.varroa_streak_started
+    episode = _as_utc(started).date().isoformat() if started else "unknown"
+    return Finding(
+        rule="varroa_streak",
+        fingerprint=ctx.fingerprint("varroa_streak", episode),
+        type=AlertType.VARROA_MITE,
+        severity=AlertSeverity.WARNING,
+        title=f"Persistent varroa in {ctx.hive.name}",
+        message=f"Varroa mites detected in the last {summary.varroa_current_streak} "
+        "inspections in a row. Consider a mite count and treatment.",
+        hive_ids=[ctx.hive.id],
+        user_id=ctx.user_id,
+    )
+
+
+def inspection_due_rule(ctx: HiveContext) -> Optional[Finding]:
+    last = ctx.last_inspected
+    days = (ctx.now - last).days
+    if days < INSPECTION_DUE_DAYS:
+        return None
+    return Finding(
+        rule="inspection_due",
+        fingerprint=ctx.fingerprint("inspection_due", last.date().isoformat()),
+        type=AlertType.INSPECTION_DUE,
+        severity=AlertSeverity.INFO,
+        title=f"{ctx.hive.name} is due an inspection",
+        message=f"Last inspected {days} days ago.",
+        hive_ids=[ctx.hive.id],
+        user_id=ctx.user_id,
+    )
+
+
+HIVE_RULES: Dict[str, HiveRule] = {
+    "swarm_cells": swarm_cells_rule,
+    "varroa_streak": varroa_streak_rule,
+    "inspection_due": inspection_due_rule,
+}
+
+
+def forecast_hazards(forecast: dict) -> Dict[str, float]:
+    """Threshold checks over a 24h forecast (fields are optional upstream).
+    Maps each crossed hazard (frost/heat/wind) to its extreme value."""
+    hours = forecast.get("hours") or []
+    temps = [h["temperature_c"] for h in hours if h.get("temperature_c") is not None]
+    winds = [h["wind_speed_ms"] for h in hours if h.get("wind_speed_ms") is not None]
+    hazards: Dict[str, float] = {}
+    if temps and min(temps) <= WEATHER_FROST_C:
+        hazards["frost"] = min(temps)
+    if temps and max(temps) >= WEATHER_HEAT_C:
+        hazards["heat"] = max(temps)
+    if winds and max(winds) >= WEATHER_WIND_MS:
+        hazards["wind"] = max(winds)
+    return hazards
+
+
+_WEATHER_MESSAGES = {
+    "frost": ("Frost forecast at {name}",
+              "Temperatures down to {value}°C in the next 24 hours. "
+              "Avoid opening hives and check winter stores."),
+    "heat": ("Heat forecast at {name}",
+             "Temperatures up to {value}°C in the next 24 hours. "
+             "Make sure colonies have shade, ventilation and water."),
+    "wind": ("High winds forecast at {name}",
+             "Gusts up to {value} m/s in the next 24 hours. "
+             "Strap down hives and postpone inspections."),
+}
+
+
+def weather_findings(
+    apiary: Apiary, hive_ids: List[str], forecast: dict, now: datetime
+) -> List[Finding]:
+    day = now.date().isoformat()
+    findings = []
+    for kind, value in forecast_hazards(forecast).items():
+        title, message = _WEATHER_MESSAGES[kind]
+        findings.append(
+            Finding(
+                rule=WEATHER_RULE,
+                fingerprint=f"{WEATHER_RULE}:{apiary.id}:{kind}:{day}",
+                type=AlertType.WEATHER_WARNING,
+                severity=AlertSeverity.WARNING,
+                title=title.format(name=apiary.name),
+                message=message.format(value=value),
+                hive_ids=hive_ids,
+            )
+        )
+    return findings
+
+
+def upsert_operation(finding: Finding, now: datetime) -> UpdateOne:
+    """Insert the alert unless its fingerprint already exists (active or
+    dismissed)."""
+    return UpdateOne(
+        {"fingerprint": finding.fingerprint},
+        {
+            "$setOnInsert": {
+                "_id": str(uuid.uuid4()),
+                "type": finding.type.value,
+                "title": finding.title,
+                "message": finding.message,
+                "severity": finding.severity.value,
+                "timestamp": now,
+                "hive_ids": finding.hive_ids,
+                "user_id": finding.user_id,
+                "dismissed": False,
+                "rule": finding.rule,
+                "fingerprint": finding.fingerprint,
+                "created_at": now,
+                "updated_at": now,
+            }
+        },
+        upsert=True,
+    )
+
+
+def resolve_operation(query: dict, current: Iterable[str], now: datetime) -> UpdateMany:
+    """Dismiss matching engine alerts whose fingerprint is no longer firing.
+    ``query`` may constrain ``fingerprint`` itself (e.g. an apiary prefix), so
+    the clauses are combined rather than merged."""
+    return UpdateMany(
+        {"$and": [query, {"fingerprint": {"$nin": sorted(current)}, "dismissed": False}]},
+        {"$set": {"dismissed": True, "resolved_at": now, "updated_at": now}},
+    )
+
+
+def plan_hive_operations(
+    contexts: List[HiveContext], rules: Dict[str, HiveRule], now: datetime
+) -> list:
+    """Bulk operations for one batch: an upsert per finding plus one
+    resolution per rule covering every evaluated hive."""
+    hive_ids = [ctx.hive.id for ctx in contexts]
+    operations: list = []
+    for name, rule in rules.items():
+        firing: Set[str] = set()
+        for ctx in contexts:
+            finding = rule(ctx)
+            if finding is not None:
+                firing.add(finding.fingerprint)
+                operations.append(upsert_operation(finding, now))
+        operations.append(
+            resolve_operation({"rule": name, "hive_ids": {"$in": hive_ids}}, firing, now)
+        )
+    return operations
+
+
+class AlertEngine:
+    def __init__(self, rules: Optional[Dict[str, HiveRule]] = None, weather=weather_client):
+        self.alerts = AlertRepository()
+        self.apiaries = ApiaryRepository()
+        self.hives = HiveRepository()
+        self.summaries = HiveInspectionSummaryRepository()
+        self.state = JobStateRepository()
+        self.rules = rules if rules is not None else HIVE_RULES
+        self.weather = weather
+
+    async def run(self, now: Optional[datetime] = None) -> int:
+        """One incremental pass. Returns alerts raised plus alerts resolved."""
+        now = now or utcnow()
+        state = await self.state.get(ENGINE_JOB)
+        cursor = _as_utc(state.cursor) if state.cursor else None
+        hive_ids = await self.changed_hive_ids(cursor, now)
+        touched = await self.evaluate_hives(hive_ids, now)
+
+        weather_at = state.markers.get(WEATHER_RULE)
+        if weather_at is None or now - _as_utc(weather_at) >= timedelta(hours=WEATHER_CHECK_HOURS):
+            touched += await self.evaluate_weather(now)
+            state.markers[WEATHER_RULE] = now
+
+        state.cursor = now
+        await self.state.save(state)
+        return touched
+
+    async def changed_hive_ids(self, since: Optional[datetime], now: datetime) -> List[str]:
+        """Hives that need re-evaluation since the last run (all on the first)."""
+        if since is None:
+            return await self.hives.get_all_ids()
+        changed_after = since - CURSOR_OVERLAP
+        due = timedelta(days=INSPECTION_DUE_DAYS)
+        batches = await asyncio.gather(
+            self.hives.get_ids_changed_since(changed_after),
+            self.summaries.get_hive_ids_changed_since(changed_after),
+            # Hives whose due threshold was crossed during the elapsed interval
+            self.hives.get_ids_last_inspected_between(changed_after - due, now - due),
+            self.summaries.get_hive_ids_last_inspected_between(
+                changed_after - due, now - due
+            ),
+        )
+        return sorted(set().union(*batches))
+
+    async def evaluate_hives(self, hive_ids: List[str], now: datetime) -> int:
+        touched = 0
+        for start in range(0, len(hive_ids), ALERT_BATCH_SIZE):
+            batch = hive_ids[start:start + ALERT_BATCH_SIZE]
+            hives = await self.hives.get_by_ids(batch)
+            if not hives:
+                continue
+            by_hive: Dict[str, List[HiveInspectionSummary]] = {}
+            for summary in await self.summaries.get_for_hives(batch):
+                by_hive.setdefault(summary.hive_id, []).append(summary)
+            # One context per beekeeper inspecting the hive; a hive nobody has
+            # inspected yet is evaluated once, unowned.
+            contexts = [
+                HiveContext(hive, summary, now)
+                for hive in hives
+                for summary in by_hive.get(hive.id) or [None]
+            ]
+            raised, resolved = await self.alerts.bulk_write(
+                plan_hive_operations(contexts, self.rules, now)
+            )
+            touched += raised + resolved
+        return touched
+
+    async def evaluate_weather(self, now: datetime) -> int:
+        if self.weather is None:
+            return 0
+        apiaries = await self.apiaries.get_with_coordinates()
+        if not apiaries:
+            return 0
+        hives_by_apiary: Dict[str, List[str]] = {}
+        for row in await self.hives.get_ids_by_apiary_ids([a.id for a in apiaries]):
+            hives_by_apiary.setdefault(row["apiary_id"], []).append(row["_id"])
+
+        forecasts = await self.weather.get_forecast_batch(
+            [(a.latitude, a.longitude) for a in apiaries], hours=24
+        )
+        operations: list = []
+        for apiary, forecast in zip(apiaries, forecasts):
+            if forecast is None:
+                # Unknown weather: leave this apiary's alerts as they are.
+                continue
+            findings = weather_findings(apiary, hives_by_apiary.get(apiary.id, []), forecast, now)
+            operations.extend(upsert_operation(f, now) for f in findings)
+            operations.append(
+                resolve_operation(
+                    {"rule": WEATHER_RULE, "fingerprint": {"$regex": f"^{WEATHER_RULE}:{re.escape(apiary.id)}:"}},
+                    [f.fingerprint for f in findings],
+                    now,
+                )
+            )
+        raised, resolved = await self.alerts.bulk_write(operations)
+        return raised + resolved
+
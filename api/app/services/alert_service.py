@@ -1,32 +1,67 @@
-from typing import List
+import uuid
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
 
 from app.models import Alert
-from app.repositories import AlertRepository
-from app.schemas import AlertCreate, AlertUpdate, AlertResponse
+from app.models.base import utcnow
+from app.repositories import AlertQuery, AlertRepository, ApiaryRepository, HiveRepository
+from app.schemas import (
+    AlertCreate,
+    AlertUpdate,
+    AlertResponse,
+    AlertDismissRequest,
+    AlertDismissResponse,
+    AlertBroadcastRequest,
+    AlertBroadcastResponse,
+)
 
 
 class AlertService:
     def __init__(self):
         self.repository = AlertRepository()
+        self.hives = HiveRepository()
+        self.apiaries = ApiaryRepository()
 
-    async def get_all_alerts(self) -> List[AlertResponse]:
-        alerts = await self.repository.get_all()
-        return [AlertResponse.model_validate(alert) for alert in alerts]
-
-    async def get_active_alerts(self) -> List[AlertResponse]:
-        alerts = await self.repository.get_active()
-        return [AlertResponse.model_validate(alert) for alert in alerts]
-
-    async def get_alert(self, alert_id: str) -> AlertResponse:
-        alert = await self.repository.get_by_id(alert_id)
-        if not alert:
+    async def list_alerts(
+        self,
+        user_id: str,
+        hive_id: Optional[str] = None,
+        apiary_id: Optional[str] = None,
+        dismissed: Optional[bool] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[AlertResponse], Optional[str]]:
+        """The user's (and shared) alerts, newest first, optionally narrowed
+        to a hive or to the hives of an apiary."""
+        hive_ids = await self._scope_hive_ids(hive_id, apiary_id)
+        if hive_ids == []:
+            return [], None
+        query = AlertQuery(
+            user_id=user_id, hive_ids=hive_ids, dismissed=dismissed, limit=limit, cursor=cursor
+        )
+        try:
+            alerts, next_cursor = await self.repository.query(query)
+        except ValueError:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Alert not found"
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
             )
+        return [AlertResponse.model_validate(alert) for alert in alerts], next_cursor
+
+    async def get_all_alerts(self, user_id: str) -> List[AlertResponse]:
+        alerts, _ = await self.list_alerts(user_id)
+        return alerts
+
+    async def get_active_alerts(self, user_id: str) -> List[AlertResponse]:
+        alerts, _ = await self.list_alerts(user_id, dismissed=False)
+        return alerts
+
+    async def get_alert(self, alert_id: str, user_id: str) -> AlertResponse:
+        alert = await self._get_visible(alert_id, user_id)
         return AlertResponse.model_validate(alert)
 
-    async def create_alert(self, alert_data: AlertCreate, alert_id: str) -> AlertResponse:
+    async def create_alert(
+        self, alert_data: AlertCreate, alert_id: str, user_id: str
+    ) -> AlertResponse:
         alert = Alert(
             id=alert_id,
             type=alert_data.type,
@@ -36,20 +71,85 @@ class AlertService:
             timestamp=alert_data.timestamp,
             hive_ids=alert_data.hive_ids or [],
             dismissed=False,
+            user_id=user_id,
         )
         created_alert = await self.repository.create(alert)
         return AlertResponse.model_validate(created_alert)
 
-    async def update_alert(self, alert_id: str, alert_data: AlertUpdate) -> AlertResponse:
+    async def update_alert(
+        self, alert_id: str, alert_data: AlertUpdate, user_id: str
+    ) -> AlertResponse:
+        update_data = alert_data.model_dump(exclude_unset=True)
+        updated_alert = await self.repository.update_fields(alert_id, user_id, update_data)
+        if not updated_alert:
+            # Raises the 404 or 403; only this path pays a second read.
+            await self._get_visible(alert_id, user_id)
+        return AlertResponse.model_validate(updated_alert)
+
+    async def dismiss_alerts(
+        self, request: AlertDismissRequest, user_id: str
+    ) -> AlertDismissResponse:
+        """Dismiss many alerts in one write instead of one PATCH each."""
+        if request.alert_ids is None and request.hive_id is None and request.apiary_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide alertIds, hiveId or apiaryId",
+            )
+        hive_ids = await self._scope_hive_ids(request.hive_id, request.apiary_id)
+        if hive_ids == [] or request.alert_ids == []:
+            return AlertDismissResponse(dismissed=0)
+        count = await self.repository.dismiss_many(
+            user_id, alert_ids=request.alert_ids, hive_ids=hive_ids
+        )
+        return AlertDismissResponse(dismissed=count)
+
+    async def broadcast(self, request: AlertBroadcastRequest) -> AlertBroadcastResponse:
+        """One shared alert per apiary within the radius, naming its hives.
+        Apiaries without hives have nothing to attach the alert to."""
+        apiary_ids = await self.apiaries.get_ids_within_radius(
+            request.latitude, request.longitude, request.radius_km
+        )
+        hives_by_apiary: Dict[str, List[str]] = {}
+        if apiary_ids:
+            for row in await self.hives.get_ids_by_apiary_ids(apiary_ids):
+                hives_by_apiary.setdefault(row["apiary_id"], []).append(row["_id"])
+        now = utcnow()
+        alerts = [
+            Alert(
+                id=str(uuid.uuid4()),
+                type=request.type,
+                title=request.title,
+                message=request.message,
+                severity=request.severity,
+                timestamp=now,
+                hive_ids=hive_ids,
+            )
+            for hive_ids in hives_by_apiary.values()
+        ]
+        created = await self.repository.create_many(alerts)
+        return AlertBroadcastResponse(apiary_ids=sorted(hives_by_apiary), alerts=created)
+
+    async def _get_visible(self, alert_id: str, user_id: str) -> Alert:
         alert = await self.repository.get_by_id(alert_id)
         if not alert:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Alert not found"
             )
+        if alert.user_id is not None and alert.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this alert",
+            )
+        return alert
 
-        update_data = alert_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(alert, key, value)
-
-        updated_alert = await self.repository.update(alert)
-        return AlertResponse.model_validate(updated_alert)
+    async def _scope_hive_ids(
+        self, hive_id: Optional[str], apiary_id: Optional[str]
+    ) -> Optional[List[str]]:
+        """Hive ids an apiary/hive filter resolves to (None when unfiltered)."""
+        if apiary_id is None:
+            return [hive_id] if hive_id is not None else None
+        rows = await self.hives.get_ids_by_apiary_ids([apiary_id])
+        hive_ids = [row["_id"] for row in rows]
+        if hive_id is not None:
+            hive_ids = [h for h in hive_ids if h == hive_id]
+        return hive_ids
@@ -0,0 +1,110 @@
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Hashable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.repositories import ApiaryRepository, HiveRepository, InspectionRepository
+from app.schemas import AnalyticsResponse
+
+if TYPE_CHECKING:
+    from app.analytics.columns import InspectionColumns
+
+
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+
+
+class ColumnCache:
+    """LRU of loaded ``InspectionColumns`` keyed by scope and validated by the
+    scope's last-modified version, so only a changed scope is reloaded.
+
+    Columns are cached rather than finished results: loading from Mongo is the
+    slow part, and metrics relative to "now" stay current for free.
+    """
+
+    def __init__(self, max_entries: int = ANALYTICS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, InspectionColumns]]" = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable, version: Hashable) -> Optional["InspectionColumns"]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, version: Hashable, columns: "InspectionColumns") -> None:
+        self._entries[key] = (version, columns)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+column_cache = ColumnCache()
+
+
+class AnalyticsService:
+    def __init__(self, cache: Optional[ColumnCache] = None):
+        self.repository = InspectionRepository()
+        self.apiaries = ApiaryRepository()
+        self.hives = HiveRepository()
+        self.cache = cache if cache is not None else column_cache
+
+    async def for_user(self, user_id: str, **params) -> AnalyticsResponse:
+        return await self._analyze("user", None, user_id, None, **params)
+
+    async def for_apiary(self, apiary_id: str, user_id: str, **params) -> AnalyticsResponse:
+        apiary = await self.apiaries.get_by_id(apiary_id)
+        if not apiary:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Apiary not found"
+            )
+        hives = await self.hives.get_by_apiary_id(apiary_id)
+        hive_ids = sorted(hive.id for hive in hives)
+        return await self._analyze("apiary", apiary_id, user_id, hive_ids, **params)
+
+    async def for_hive(self, hive_id: str, user_id: str, **params) -> AnalyticsResponse:
+        return await self._analyze("hive", hive_id, user_id, [hive_id], **params)
+
+    async def _analyze(
+        self,
+        scope: str,
+        scope_id: Optional[str],
+        user_id: str,
+        hive_ids: Optional[List[str]],
+        window_days: int = 30,
+        windows: int = 12,
+        step_days: Optional[int] = None,
+    ) -> AnalyticsResponse:
+        # NumPy loads on the first analytics request, not at app startup.
+        from app.analytics.columns import InspectionColumns, to_day
+        from app.analytics.metrics import compute_metrics
+
+        count, last_modified = await self.repository.get_last_modified(user_id, hive_ids)
+        key = (scope, scope_id, user_id)
+        # The hive list is part of the version: moving a hive between
+        # apiaries changes an apiary's scope without touching inspections.
+        version = (count, last_modified, tuple(hive_ids) if hive_ids is not None else None)
+        columns = self.cache.get(key, version)
+        if columns is None:
+            rows = await self.repository.get_analytics_rows(user_id, hive_ids)
+            columns = InspectionColumns.from_documents(rows)
+            self.cache.put(key, version, columns)
+
+        now = datetime.now(timezone.utc)
+        metrics = compute_metrics(
+            columns, to_day(now), window_days=window_days, windows=windows, step_days=step_days
+        )
+        return AnalyticsResponse(
+            scope=scope,
+            scope_id=scope_id,
+            generated_at=now,
+            last_modified=last_modified,
+            **metrics,
+        )
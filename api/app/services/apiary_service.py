@@ -1,10 +1,12 @@
 from collections import Counter
-from typing import List
+from typing import List, Optional
 from fastapi import HTTPException, status
 
-from app.models import Apiary, Hive
-from app.repositories import ApiaryRepository
-from app.schemas import ApiaryCreate, ApiaryUpdate, ApiaryResponse
+from app.models import Apiary, Hive, TombstoneKind
+from app.repositories import ApiaryRepository, HiveRepository
+from app.schemas import ApiaryCreate, ApiaryUpdate, ApiaryResponse, ApiaryNearbyResponse
+
+from .cascade_service import CascadeService
 
 
 def _to_response(apiary: Apiary, hive_count: int) -> ApiaryResponse:
@@ -13,9 +15,23 @@ def _to_response(apiary: Apiary, hive_count: int) -> ApiaryResponse:
     )
 
 
+def _to_nearby(
+    apiary: Apiary, hive_count: int, distance_km: Optional[float] = None
+) -> ApiaryNearbyResponse:
+    return ApiaryNearbyResponse.model_validate(
+        {
+            **apiary.model_dump(),
+            "hive_count": hive_count,
+            "distance_km": round(distance_km, 3) if distance_km is not None else None,
+        }
+    )
+
+
 class ApiaryService:
     def __init__(self):
         self.repository = ApiaryRepository()
+        self.hives = HiveRepository()
+        self.cascade = CascadeService()
 
     async def get_all_apiaries(self) -> List[ApiaryResponse]:
         apiaries = await self.repository.get_all()
@@ -24,13 +40,49 @@ class ApiaryService:
         counts = Counter(h.apiary_id for h in hives)
         return [_to_response(a, counts.get(a.id, 0)) for a in apiaries]
 
+    async def get_nearby(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[ApiaryNearbyResponse]:
+        """Apiaries within ``radius_km`` of a point, nearest first."""
+        found = await self.repository.get_near(latitude, longitude, radius_km, limit)
+        counts = await self._hive_counts([apiary.id for apiary, _ in found])
+        return [
+            _to_nearby(apiary, counts.get(apiary.id, 0), distance)
+            for apiary, distance in found
+        ]
+
+    async def get_within_box(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        limit: int,
+    ) -> List[ApiaryNearbyResponse]:
+        if min_latitude >= max_latitude or min_longitude >= max_longitude:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Bounding box minimums must be below its maximums",
+            )
+        found = await self.repository.get_within_box(
+            min_latitude, min_longitude, max_latitude, max_longitude, limit
+        )
+        counts = await self._hive_counts([apiary.id for apiary in found])
+        return [_to_nearby(apiary, counts.get(apiary.id, 0)) for apiary in found]
+
+    async def _hive_counts(self, apiary_ids: List[str]) -> Counter:
+        if not apiary_ids:
+            return Counter()
+        rows = await self.hives.get_ids_by_apiary_ids(apiary_ids)
+        return Counter(row["apiary_id"] for row in rows)
+
     async def get_apiary(self, apiary_id: str) -> ApiaryResponse:
         apiary = await self.repository.get_by_id(apiary_id)
         if not apiary:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Apiary not found"
             )
-        count = await Hive.find(Hive.apiary_id == apiary_id).count()
+        count = await self.hives.count_by_apiary_id(apiary_id)
         return _to_response(apiary, count)
 
     async def create_apiary(self, apiary_data: ApiaryCreate, apiary_id: str) -> ApiaryResponse:
@@ -39,18 +91,13 @@ class ApiaryService:
         return _to_response(created_apiary, 0)
 
     async def update_apiary(self, apiary_id: str, apiary_data: ApiaryUpdate) -> ApiaryResponse:
-        apiary = await self.repository.get_by_id(apiary_id)
-        if not apiary:
+        update_data = apiary_data.model_dump(exclude_unset=True)
+        updated_apiary = await self.repository.update_fields(apiary_id, update_data)
+        if not updated_apiary:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Apiary not found"
             )
-
-        update_data = apiary_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(apiary, key, value)
-
-        updated_apiary = await self.repository.update(apiary)
-        count = await Hive.find(Hive.apiary_id == apiary_id).count()
+        count = await self.hives.count_by_apiary_id(apiary_id)
         return _to_response(updated_apiary, count)
 
     async def delete_apiary(self, apiary_id: str) -> None:
@@ -59,4 +106,7 @@ class ApiaryService:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Apiary not found"
             )
+        # Its hives (and through them everything they own) and tasks are
+        # removed by the cascade job.
+        await self.cascade.tombstone(TombstoneKind.APIARY, apiary.id)
         await self.repository.delete(apiary)
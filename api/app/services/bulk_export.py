@@ -0,0 +1,121 @@
+"""Streaming export of inspections and tasks.
+
+Documents are read straight off a Motor cursor (``EXPORT_BATCH_SIZE`` per
+round trip) in keyset order and written out as NDJSON or CSV, one chunk per
+batch, so memory use does not grow with the size of the history. Rows use
+the API's camelCase field names and read-time statuses (a past-due pending
+task is exported as OVERDUE, as the task endpoints report it), and lists in
+CSV cells are JSON (the bulk import accepts either format back as-is;
+read-only fields are ignored). Each row carries a ``cursor``: passing the
+last one received resumes an interrupted export right after that row.
+"""
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+from app.repositories import InspectionRepository, TaskRepository
+from app.repositories.pagination import decode_keyset, encode_keyset
+from app.schemas import InspectionResponse, TaskResponse
+
+from .task_service import derive_overdue
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@dataclass(frozen=True)
+class ExportKind:
+    schema: Type[BaseModel]
+    # Keyset sort field (also the date-range field)
+    field: str
+    # Read-time adjustment applied to each row, given the export's start time
+    derive: Optional[Callable[[Any, datetime], Any]] = None
+
+
+KINDS: Dict[str, ExportKind] = {
+    "inspections": ExportKind(InspectionResponse, "inspection_date"),
+    "tasks": ExportKind(TaskResponse, "due_date", derive_overdue),
+}
+
+
+def csv_columns(schema: Type[BaseModel]) -> List[str]:
+    return [field.alias or name for name, field in schema.model_fields.items()] + ["cursor"]
+
+
+def csv_cell(value: Any) -> str:
+    """Missing values are empty cells; lists and objects are JSON."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+class BulkExporter:
+    def __init__(self, batch_size: int = EXPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.repositories = {"inspections": InspectionRepository(), "tasks": TaskRepository()}
+
+    def stream(
+        self,
+        kind: str,
+        user_id: str,
+        fmt: str = "ndjson",
+        hive_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Encoded export chunks. Argument errors raise here, before the
+        response starts streaming."""
+        if cursor:
+            try:
+                decode_keyset(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+        spec = KINDS[kind]
+        docs = self.repositories[kind].iter_export(
+            user_id, self.batch_size, hive_id=hive_id, since=since, until=until, cursor=cursor
+        )
+        return self._encode(spec, docs, fmt)
+
+    async def _encode(self, spec: ExportKind, docs, fmt: str) -> AsyncIterator[bytes]:
+        columns = csv_columns(spec.schema)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if fmt == "csv":
+            writer.writerow(columns)
+        rows = 0
+        now = datetime.now(timezone.utc)
+        async for doc in docs:
+            keyset = encode_keyset(doc[spec.field], doc["_id"])
+            doc["id"] = doc.pop("_id")
+            response = spec.schema.model_validate(doc)
+            if spec.derive is not None:
+                response = spec.derive(response, now)
+            row = response.model_dump(mode="json", by_alias=True)
+            row["cursor"] = keyset
+            if fmt == "csv":
+                writer.writerow([csv_cell(row.get(column)) for column in columns])
+            else:
+                buffer.write(json.dumps(row))
+                buffer.write("\n")
+            rows += 1
+            if rows % self.batch_size == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
@@ -0,0 +1,336 @@
+"""Streaming bulk import of inspections and tasks.
+
+Input arrives as a stream of byte chunks in NDJSON (one JSON object per
+line) or CSV (header row; empty cells fall back to defaults; list cells
+are JSON, as the bulk export writes them). Rows are
+validated ``IMPORT_CHUNK_ROWS`` at a time with one ``TypeAdapter`` call per
+chunk, encoded straight to BSON-ready dicts and written with unordered
+``insert_many`` batches, at most ``IMPORT_WRITE_CONCURRENCY`` in flight so
+parsing overlaps the writes. A bad row is reported by line and never stops
+the import.
+
+Bulk writes skip the per-write hooks of the regular create endpoints:
+inspection summaries are rebuilt once per touched hive at the end, media
+references and variant manifests are written per batch (one lookup before
+the insert, one bulk attach after it), and follower notifications
+(``announce``) are only sent when asked for.
+"""
+import asyncio
+import csv
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from assistive_core import announce
+
+from app.models import Inspection, Task
+from app.models.base import utcnow
+from app.repositories import InspectionRepository, TaskRepository
+from app.schemas import ImportReport, ImportRowError, InspectionImportRow, TaskImportRow
+
+from .inspection_summary_service import InspectionSummaryService
+from .media_service import INSPECTION, MediaService
+
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "2000"))
+IMPORT_WRITE_CONCURRENCY = int(os.getenv("IMPORT_WRITE_CONCURRENCY", "4"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+IMPORT_SUMMARY_CONCURRENCY = int(os.getenv("IMPORT_SUMMARY_CONCURRENCY", "8"))
+
+FORMATS = ("ndjson", "csv")
+
+
+def _document_defaults(document: Type[BaseModel], row: Type[BaseModel]) -> Dict[str, Any]:
+    """Defaults of the stored fields an import row does not carry."""
+    skip = set(row.model_fields) | {"id", "revision_id", "user_id", "created_at", "updated_at"}
+    return {
+        name: field.get_default(call_default_factory=True)
+        for name, field in document.model_fields.items()
+        if name not in skip and not field.is_required()
+    }
+
+
+def _is_container(annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    if origin is Union:
+        return any(_is_container(arg) for arg in get_args(annotation))
+    return origin in (list, dict) or annotation in (list, dict)
+
+
+def _json_fields(row: Type[BaseModel]) -> FrozenSet[str]:
+    """Input keys (alias and name) of list/object fields, which CSV cells
+    carry as JSON."""
+    return frozenset(
+        key
+        for name, field in row.model_fields.items()
+        if _is_container(field.annotation)
+        for key in (name, field.alias or name)
+    )
+
+
+@dataclass(frozen=True)
+class ImportKind:
+    document: Type[BaseModel]
+    adapter: TypeAdapter
+    defaults: Dict[str, Any]
+    json_fields: FrozenSet[str]
+
+
+KINDS: Dict[str, ImportKind] = {
+    "inspections": ImportKind(
+        Inspection,
+        TypeAdapter(List[InspectionImportRow]),
+        _document_defaults(Inspection, InspectionImportRow),
+        _json_fields(InspectionImportRow),
+    ),
+    "tasks": ImportKind(
+        Task,
+        TypeAdapter(List[TaskImportRow]),
+        _document_defaults(Task, TaskImportRow),
+        _json_fields(TaskImportRow),
+    ),
+}
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into ``(line number, line)`` without the newline."""
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            number += 1
+            yield number, line.rstrip(b"\r")
+    if buffer.strip():
+        yield number + 1, buffer.rstrip(b"\r")
+
+
+def _decode(line: bytes, number: int) -> str:
+    text = line.decode("utf-8")
+    # Spreadsheet exports often start with a byte-order mark.
+    return text.lstrip("\ufeff") if number == 1 else text
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """``(line, row dict)`` per non-blank line, or ``(line, error str)``."""
+    async for number, line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(_decode(line, number))
+        except (UnicodeDecodeError, ValueError) as e:
+            yield number, f"invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, "expected a JSON object"
+            continue
+        yield number, row
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """``(line, row dict)`` per CSV record (header row first), or
+    ``(line, error str)``. Quoted cells may span lines; empty cells are
+    omitted so the field default applies."""
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    start = 0
+    async for number, line in _lines(chunks):
+        try:
+            text = _decode(line, number)
+        except UnicodeDecodeError as e:
+            yield number, f"invalid UTF-8: {e}"
+            continue
+        if not record:
+            start = number
+        record.append(text)
+        # An odd number of quotes means a quoted cell continues on the next line.
+        if sum(part.count('"') for part in record) % 2:
+            continue
+        joined = "\n".join(record)
+        record = []
+        if not joined.strip():
+            continue
+        try:
+            cells = next(csv.reader([joined]))
+        except csv.Error as e:
+            yield start, f"invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [cell.strip() for cell in cells]
+            continue
+        if len(cells) > len(header):
+            yield start, f"expected {len(header)} columns, got {len(cells)}"
+            continue
+        yield start, {key: value for key, value in zip(header, cells) if value != ""}
+    if record:
+        yield start, "unterminated quoted cell"
+
+
+def decode_json_cells(row: Dict[str, Any], fields: FrozenSet[str]) -> Dict[str, Any]:
+    """Parse the JSON cells of a CSV row's list/object fields. A cell that
+    is not valid JSON is left as text for validation to report."""
+    for key in fields & row.keys():
+        try:
+            row[key] = json.loads(row[key])
+        except ValueError:
+            pass
+    return row
+
+
+def _row_errors(error: ValidationError) -> Dict[int, List[str]]:
+    """Validation messages keyed by the row's index in the chunk."""
+    by_row: Dict[int, List[str]] = {}
+    for item in error.errors(include_url=False):
+        index, *field = item["loc"]
+        # Model-level (after-validator) errors carry no field path.
+        location = ".".join(str(part) for part in field if not str(part).startswith("function-"))
+        message = item["msg"].removeprefix("Value error, ")
+        by_row.setdefault(index, []).append(f"{location}: {message}" if location else message)
+    return by_row
+
+
+class BulkImporter:
+    def __init__(self, notify: bool = False):
+        self.notify = notify
+        self.repositories = {"inspections": InspectionRepository(), "tasks": TaskRepository()}
+        self.summaries = InspectionSummaryService()
+        self.media = MediaService()
+
+    async def run(
+        self, kind: str, user_id: str, chunks: AsyncIterator[bytes], fmt: str = "ndjson"
+    ) -> ImportReport:
+        started = time.perf_counter()
+        spec = KINDS[kind]
+        self._kind = kind
+        self._user_id = user_id
+        self._errors: List[ImportRowError] = []
+        self._failed = 0
+        self._inserted = 0
+        self._hive_ids: set = set()
+        # Kept only when notifying; a large import must not hold every row.
+        self._announce: List[dict] = []
+        self._limit = asyncio.Semaphore(IMPORT_WRITE_CONCURRENCY)
+        writes: List[asyncio.Task] = []
+
+        received = 0
+        batch: List[Tuple[int, dict]] = []
+        rows = parse_csv(chunks) if fmt == "csv" else parse_ndjson(chunks)
+        async for number, row in rows:
+            received += 1
+            if isinstance(row, str):
+                self._fail(number, [row])
+                continue
+            if fmt == "csv":
+                row = decode_json_cells(row, spec.json_fields)
+            batch.append((number, row))
+            if len(batch) >= IMPORT_CHUNK_ROWS:
+                writes.append(await self._flush(spec, batch))
+                batch = []
+        if batch:
+            writes.append(await self._flush(spec, batch))
+        await asyncio.gather(*writes)
+
+        rebuilt = 0
+        if kind == "inspections":
+            rebuilt = await self._rebuild_summaries()
+        for doc in self._announce:
+            await announce(spec.document.model_validate(doc))
+
+        self._errors.sort(key=lambda e: e.line)
+        return ImportReport(
+            kind=kind,
+            received=received,
+            inserted=self._inserted,
+            failed=self._failed,
+            errors=self._errors,
+            errors_truncated=self._failed > len(self._errors),
+            summaries_rebuilt=rebuilt,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    def _fail(self, line: int, errors: List[str]) -> None:
+        self._failed += 1
+        if len(self._errors) < IMPORT_MAX_ERRORS:
+            self._errors.append(ImportRowError(line=line, errors=errors))
+
+    async def _flush(self, spec: ImportKind, batch: List[Tuple[int, dict]]) -> asyncio.Task:
+        """Validate a chunk and start its write once a write slot is free."""
+        try:
+            valid = list(zip(batch, spec.adapter.validate_python([row for _, row in batch])))
+        except ValidationError as e:
+            bad = _row_errors(e)
+            for index, messages in sorted(bad.items()):
+                self._fail(batch[index][0], messages)
+            batch = [item for index, item in enumerate(batch) if index not in bad]
+            valid = list(zip(batch, spec.adapter.validate_python([row for _, row in batch])))
+
+        now = utcnow()
+        lines, docs = [], []
+        for (number, _), model in valid:
+            fields = model.model_dump()
+            doc_id = fields.pop("id") or str(uuid.uuid4())
+            doc = {
+                **spec.defaults,
+                **fields,
+                "_id": doc_id,
+                "user_id": self._user_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            lines.append(number)
+            docs.append(doc)
+        if self._kind == "inspections":
+            variants = await self.media.variants_by_url(url for doc in docs for url in doc["photos"])
+            for doc in docs:
+                doc["photo_variants"] = [
+                    {"url": url, "variants": variants[url]} for url in doc["photos"] if url in variants
+                ]
+
+        await self._limit.acquire()
+        return asyncio.ensure_future(self._write(lines, docs))
+
+    async def _write(self, lines: List[int], docs: List[dict]) -> None:
+        try:
+            failures = await self.repositories[self._kind].insert_documents(docs)
+        finally:
+            self._limit.release()
+        for index, reason in failures.items():
+            self._fail(lines[index], [reason])
+        written = [doc for index, doc in enumerate(docs) if index not in failures]
+        self._inserted += len(written)
+        self._hive_ids.update(doc["hive_id"] for doc in written if doc.get("hive_id"))
+        if self._kind == "inspections":
+            # Unreferenced photos are garbage-collected; these are in use now.
+            await self.media.attach_many(
+                INSPECTION, {doc["_id"]: doc["photos"] for doc in written if doc["photos"]}
+            )
+        if self.notify:
+            self._announce.extend(written)
+
+    async def _rebuild_summaries(self) -> int:
+        hive_ids = sorted(self._hive_ids)
+        limit = asyncio.Semaphore(IMPORT_SUMMARY_CONCURRENCY)
+
+        async def rebuild(hive_id: str) -> None:
+            async with limit:
+                await self.summaries.rebuild(hive_id, self._user_id)
+
+        await asyncio.gather(*(rebuild(hive_id) for hive_id in hive_ids))
+        return len(hive_ids)
@@ -1,6 +1,8 @@
+import asyncio
 import os
+import uuid
 import httpx
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -12,6 +14,33 @@ class BunnyStorageService:
         self.api_key = os.getenv("BUNNY_API_KEY", "")
         self.cdn_url = os.getenv("BUNNY_CDN_URL", "")
         self.storage_url = f"https://storage.bunnycdn.com/{self.storage_zone}"
+        # Upper bound on concurrent storage requests (bulk deletes queue
+        # behind it instead of opening a connection each).
+        self.max_connections = int(os.getenv("BUNNY_MAX_CONNECTIONS", "10"))
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key and self.storage_zone)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created on first use and closed by the
+        app lifespan."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=30.0,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def upload_photo(
         self, file_content: bytes, filename: str, folder: str = "inspections"
@@ -27,12 +56,13 @@ class BunnyStorageService:
         Returns:
             The CDN URL of the uploaded file, or None if upload failed
         """
-        if not self.api_key or not self.storage_zone:
+        if not self.configured:
             raise ValueError("Bunny.net credentials not configured")
 
-        # Generate unique filename with timestamp
+        # Generate unique filename with timestamp (plus a random part: the
+        # path is the media catalog key)
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{filename}"
+        unique_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{filename}"
         file_path = f"{folder}/{unique_filename}"
 
         # Upload to Bunny.net
@@ -42,20 +72,19 @@ class BunnyStorageService:
             "Content-Type": "application/octet-stream",
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.put(
-                    upload_url, content=file_content, headers=headers, timeout=30.0
-                )
-                response.raise_for_status()
+        try:
+            response = await self.client.put(
+                upload_url, content=file_content, headers=headers, timeout=30.0
+            )
+            response.raise_for_status()
 
-                # Return CDN URL
-                cdn_url = f"{self.cdn_url}/{file_path}"
-                return cdn_url
+            # Return CDN URL
+            cdn_url = f"{self.cdn_url}/{file_path}"
+            return cdn_url
 
-            except httpx.HTTPError as e:
-                print(f"Failed to upload to Bunny.net: {e}")
-                return None
+        except httpx.HTTPError as e:
+            print(f"Failed to upload to Bunny.net: {e}")
+            return None
 
     async def delete_photo(self, file_path: str) -> bool:
         """
@@ -65,22 +94,53 @@ class BunnyStorageService:
             file_path: The path of the file to delete (e.g., "inspections/20240101_120000_photo.jpg")
 
         Returns:
-            True if deletion was successful, False otherwise
+            True if deletion was successful (or the file was already gone),
+            False otherwise
         """
-        if not self.api_key or not self.storage_zone:
+        if not self.configured:
             raise ValueError("Bunny.net credentials not configured")
 
         delete_url = f"{self.storage_url}/{file_path}"
         headers = {"AccessKey": self.api_key}
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.delete(delete_url, headers=headers, timeout=10.0)
-                response.raise_for_status()
+        try:
+            response = await self.client.delete(delete_url, headers=headers, timeout=10.0)
+            if response.status_code == 404:
                 return True
-            except httpx.HTTPError as e:
-                print(f"Failed to delete from Bunny.net: {e}")
-                return False
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            print(f"Failed to delete from Bunny.net: {e}")
+            return False
+
+    async def delete_photos(self, file_paths: List[str]) -> Dict[str, bool]:
+        """
+        Delete many photos concurrently over the shared connection pool
+
+        Args:
+            file_paths: The paths of the files to delete
+
+        Returns:
+            Each path mapped to whether its deletion succeeded
+        """
+        results = await asyncio.gather(*(self.delete_photo(path) for path in file_paths))
+        return dict(zip(file_paths, results))
+
+    def path_for_url(self, url: str) -> Optional[str]:
+        """
+        Storage path of a CDN URL returned by upload_photo
+
+        Args:
+            url: The CDN URL of the file
+
+        Returns:
+            The path to pass to delete_photo, or None if the URL is not served
+            from this storage zone
+        """
+        prefix = f"{self.cdn_url}/"
+        if not self.cdn_url or not url.startswith(prefix):
+            return None
+        return url[len(prefix):]
 
 
 # Singleton instance
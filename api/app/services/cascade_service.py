@@ -0,0 +1,228 @@
+"""Cascading deletes for apiaries and hives, run in the background.
+
+Deleting a parent writes a ``Tombstone`` and removes the parent document, so
+the request returns without touching its dependents. The cascade job then
+works through the kind's steps, oldest tombstone first:
+
+  hive:   the hive itself (if a crash left it), inspections (releasing
+          their photos), tasks, recommendations, the recommendation memo,
+          the inspection summaries, the hive's engine alerts (resolved) and
+          ``Alert.hive_ids`` ($pull), then the hive's own media reference;
+  apiary: the apiary itself, its hives (each becomes a hive tombstone),
+          its tasks, then its active weather alerts (resolved; the alert
+          engine only evaluates apiaries that still exist).
+
+Photos are not deleted here: releasing a reference leaves the object to the
+media GC job once nothing else points at it (see ``media_service``).
+
+Batched steps delete at most ``CASCADE_BATCH_SIZE`` documents per round
+trip and a run stops after ``CASCADE_MAX_BATCHES`` batches, so one large
+apiary cannot hold the worker. Progress is saved after every batch, and
+every step is idempotent, so a killed run resumes from its tombstone. A
+tombstone that fails ``CASCADE_MAX_ATTEMPTS`` times is left in place with
+its ``last_error`` for an operator.
+"""
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Tuple
+
+from app.models import (
+    Apiary,
+    Hive,
+    HiveInspectionSummary,
+    Inspection,
+    Recommendation,
+    RecommendationState,
+    Task,
+    Tombstone,
+    TombstoneKind,
+)
+from app.repositories import CascadeRepository, StaleTombstone
+
+from .alert_engine import HIVE_RULES, WEATHER_RULE
+from .media_service import HIVE, INSPECTION, MediaService
+
+logger = logging.getLogger(__name__)
+
+CASCADE_BATCH_SIZE = int(os.getenv("CASCADE_BATCH_SIZE", "500"))
+CASCADE_MAX_BATCHES = int(os.getenv("CASCADE_MAX_BATCHES", "50"))
+CASCADE_MAX_ATTEMPTS = int(os.getenv("CASCADE_MAX_ATTEMPTS", "10"))
+
+
+# A step runs one batch for the tombstone and returns the documents touched;
+# it advances ``tombstone.step`` (via ``CascadeRepository.record``) once it
+# has nothing left to do.
+StepFn = Callable[[Tombstone], Awaitable[int]]
+
+
+@dataclass
+class Step:
+    name: str
+    run: StepFn
+
+
+class CascadeService:
+    def __init__(
+        self,
+        batch_size: int = CASCADE_BATCH_SIZE,
+        max_batches: int = CASCADE_MAX_BATCHES,
+        max_attempts: int = CASCADE_MAX_ATTEMPTS,
+    ):
+        self.repository = CascadeRepository()
+        self.media = MediaService()
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.max_attempts = max_attempts
+        self.steps = {
+            TombstoneKind.HIVE: [
+                Step("hives", self._delete_target(Hive)),
+                Step("inspections", self._delete_inspections),
+                Step("tasks", self._delete_batch(Task, "hive_id")),
+                Step("recommendations", self._delete_batch(Recommendation, "hive_id")),
+                Step("recommendation_state", self._delete_target(RecommendationState)),
+                Step("hive_inspection_summaries", self._delete_all(HiveInspectionSummary, "hive_id")),
+                Step("alerts", self._pull_from_alerts),
+                Step("media", self._release_hive_media),
+            ],
+            TombstoneKind.APIARY: [
+                Step("apiaries", self._delete_target(Apiary)),
+                Step("hives", self._delete_hives),
+                Step("tasks", self._delete_batch(Task, "apiary_id")),
+                Step("weather_alerts", self._resolve_weather_alerts),
+            ],
+        }
+
+    async def tombstone(self, kind: TombstoneKind, target_id: str) -> None:
+        """Queue the cascade for a parent that is about to be deleted."""
+        await self.repository.create_many([self._new(kind, target_id)])
+
+    async def run(self) -> int:
+        """Advance pending tombstones until none are left or the batch budget
+        is spent. Returns the number of documents touched."""
+        touched = 0
+        budget = self.max_batches
+        for tombstone in await self.repository.pending(self.max_batches, self.max_attempts):
+            if budget <= 0:
+                break
+            try:
+                done, spent = await self._advance(tombstone, budget)
+            except StaleTombstone:
+                # Another worker is on it; its progress is saved, not ours.
+                logger.info("Cascade for %s advanced elsewhere, skipping", tombstone.id)
+                budget -= 1
+                continue
+            except Exception as e:
+                logger.exception("Cascade for %s failed", tombstone.id)
+                await self.repository.record_failure(tombstone, str(e) or type(e).__name__)
+                budget -= 1
+                continue
+            budget -= spent
+            touched += done
+        return touched
+
+    async def _advance(self, tombstone: Tombstone, budget: int) -> Tuple[int, int]:
+        """Run ``tombstone``'s remaining steps, at most ``budget`` batches.
+        Returns (documents touched, batches spent); deletes the tombstone
+        when its last step finishes."""
+        steps = self.steps[tombstone.kind]
+        touched = spent = 0
+        while tombstone.step < len(steps) and spent < budget:
+            touched += await steps[tombstone.step].run(tombstone)
+            spent += 1
+        if tombstone.step >= len(steps):
+            await self.repository.delete(tombstone)
+            logger.info("Cascade for %s finished: %s", tombstone.id, tombstone.progress)
+        return touched, spent
+
+    @staticmethod
+    def _new(kind: TombstoneKind, target_id: str) -> Tombstone:
+        return Tombstone(id=Tombstone.tombstone_id(kind, target_id), kind=kind, target_id=target_id)
+
+    def _step_name(self, tombstone: Tombstone) -> str:
+        return self.steps[tombstone.kind][tombstone.step].name
+
+    # --- steps ---
+
+    def _delete_target(self, document) -> StepFn:
+        """The document whose ``_id`` is the target (the parent, or a memo
+        keyed by it)."""
+
+        async def run(tombstone: Tombstone) -> int:
+            count = await self.repository.delete_ids(document, [tombstone.target_id])
+            await self.repository.record(tombstone, self._step_name(tombstone), count, finished=True)
+            return count
+
+        return run
+
+    def _delete_all(self, document, field: str) -> StepFn:
+        async def run(tombstone: Tombstone) -> int:
+            count = await self.repository.delete_matching(document, {field: tombstone.target_id})
+            await self.repository.record(tombstone, self._step_name(tombstone), count, finished=True)
+            return count
+
+        return run
+
+    def _delete_batch(self, document, field: str) -> StepFn:
+        async def run(tombstone: Tombstone) -> int:
+            rows = await self.repository.find_batch(
+                document, {field: tombstone.target_id}, self.batch_size
+            )
+            count = await self.repository.delete_ids(document, [row["_id"] for row in rows])
+            finished = len(rows) < self.batch_size
+            await self.repository.record(tombstone, self._step_name(tombstone), count, finished=finished)
+            return count
+
+        return run
+
+    async def _delete_inspections(self, tombstone: Tombstone) -> int:
+        rows = await self.repository.find_batch(
+            Inspection, {"hive_id": tombstone.target_id}, self.batch_size, ["photos"]
+        )
+        # Released first: a crash after this re-releases (a no-op) rather
+        # than losing the references of already-deleted inspections.
+        released = await self.media.release(
+            INSPECTION, [row["_id"] for row in rows if row.get("photos")]
+        )
+        if released:
+            await self.repository.record(tombstone, "media", released, finished=False)
+        count = await self.repository.delete_ids(Inspection, [row["_id"] for row in rows])
+        finished = len(rows) < self.batch_size
+        await self.repository.record(tombstone, "inspections", count, finished=finished)
+        return count
+
+    async def _delete_hives(self, tombstone: Tombstone) -> int:
+        rows = await self.repository.find_batch(
+            Hive, {"apiary_id": tombstone.target_id}, self.batch_size
+        )
+        await self.repository.create_many([self._new(TombstoneKind.HIVE, row["_id"]) for row in rows])
+        count = await self.repository.delete_ids(Hive, [row["_id"] for row in rows])
+        finished = len(rows) < self.batch_size
+        await self.repository.record(tombstone, "hives", count, finished=finished)
+        return count
+
+    async def _pull_from_alerts(self, tombstone: Tombstone) -> int:
+        # Resolved first: the engine only resolves alerts of hives it still
+        # loads, and once the id is pulled nothing would match them.
+        count = await self.repository.resolve_alerts(
+            {"rule": {"$in": sorted(HIVE_RULES)}, "hive_ids": tombstone.target_id}
+        )
+        count += await self.repository.pull_hive_from_alerts(tombstone.target_id)
+        await self.repository.record(tombstone, "alerts", count, finished=True)
+        return count
+
+    async def _resolve_weather_alerts(self, tombstone: Tombstone) -> int:
+        count = await self.repository.resolve_alerts(
+            {
+                "rule": WEATHER_RULE,
+                "fingerprint": {"$regex": f"^{WEATHER_RULE}:{re.escape(tombstone.target_id)}:"},
+            }
+        )
+        await self.repository.record(tombstone, "weather_alerts", count, finished=True)
+        return count
+
+    async def _release_hive_media(self, tombstone: Tombstone) -> int:
+        count = await self.media.release(HIVE, [tombstone.target_id])
+        await self.repository.record(tombstone, "media", count, finished=True)
+        return count
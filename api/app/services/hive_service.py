@@ -1,14 +1,19 @@
 from typing import List
 from fastapi import HTTPException, status
 
-from app.models import Hive, HiveStatus
+from app.models import Hive, HiveStatus, TombstoneKind
 from app.repositories import HiveRepository
 from app.schemas import HiveCreate, HiveUpdate, HiveResponse
 
+from .cascade_service import CascadeService
+from .media_service import HIVE, MediaService
+
 
 class HiveService:
     def __init__(self):
         self.repository = HiveRepository()
+        self.cascade = CascadeService()
+        self.media = MediaService()
 
     async def get_all_hives(self) -> List[HiveResponse]:
         hives = await self.repository.get_all()
@@ -29,20 +34,18 @@ class HiveService:
     async def create_hive(self, hive_data: HiveCreate, hive_id: str) -> HiveResponse:
         hive = Hive(id=hive_id, status=HiveStatus.STRONG, **hive_data.model_dump())
         created_hive = await self.repository.create(hive)
+        await self.media.attach(HIVE, created_hive.id, [created_hive.image_url])
         return HiveResponse.model_validate(created_hive)
 
     async def update_hive(self, hive_id: str, hive_data: HiveUpdate) -> HiveResponse:
-        hive = await self.repository.get_by_id(hive_id)
-        if not hive:
+        update_data = hive_data.model_dump(exclude_unset=True)
+        updated_hive = await self.repository.update_fields(hive_id, update_data)
+        if not updated_hive:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Hive not found"
             )
-
-        update_data = hive_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(hive, key, value)
-
-        updated_hive = await self.repository.update(hive)
+        if "image_url" in update_data:
+            await self.media.sync(HIVE, hive_id, [updated_hive.image_url])
         return HiveResponse.model_validate(updated_hive)
 
     async def delete_hive(self, hive_id: str) -> None:
@@ -51,4 +54,7 @@ class HiveService:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Hive not found"
             )
+        # Inspections, tasks, recommendations, alert links and media
+        # references are removed by the cascade job.
+        await self.cascade.tombstone(TombstoneKind.HIVE, hive.id)
         await self.repository.delete(hive)
@@ -0,0 +1,123 @@
+"""Resized variants of uploaded photos, rendered in a process pool.
+
+Decoding and resizing a multi-megabyte JPEG is CPU-bound, so it runs in a
+``ProcessPoolExecutor`` (``IMAGE_WORKERS`` processes, created on first use
+and shut down by the app lifespan) rather than on the event loop.
+
+``process_image`` renders one variant per ``VARIANT_SIZES`` entry no wider
+or taller than its bound (never upscaled), in ``IMAGE_VARIANT_FORMAT``.
+EXIF orientation is applied to the pixels and all metadata (GPS included)
+is dropped; an original that carried EXIF is re-encoded without it too.
+Requires Pillow; undecodable input yields no variants.
+"""
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_VARIANT_FORMAT = os.getenv("IMAGE_VARIANT_FORMAT", "WEBP").upper()
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+
+# name -> longest edge in pixels
+VARIANT_SIZES = {"thumb": 160, "small": 480, "large": 1280}
+
+CONTENT_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg", "PNG": "image/png"}
+EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+
+
+@dataclass
+class Variant:
+    name: str
+    width: int
+    height: int
+    content: bytes
+    content_type: str
+    extension: str
+
+
+@dataclass
+class ProcessedImage:
+    variants: List[Variant] = field(default_factory=list)
+    # The original re-encoded without metadata; None when it had none and
+    # can be stored as uploaded.
+    original: Optional[bytes] = None
+
+
+def process_image(content: bytes) -> ProcessedImage:
+    """Render the variants of one image. Runs in a worker process."""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(content)) as image:
+        source_format = image.format
+        has_exif = bool(image.getexif())
+        image = ImageOps.exif_transpose(image)
+
+        original = None
+        if has_exif and source_format in CONTENT_TYPES:
+            original = _encode(image, source_format, quality=95)
+
+        variants = []
+        for name, edge in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            variants.append(
+                Variant(
+                    name=name,
+                    width=resized.width,
+                    height=resized.height,
+                    content=_encode(resized, IMAGE_VARIANT_FORMAT, IMAGE_VARIANT_QUALITY),
+                    content_type=CONTENT_TYPES[IMAGE_VARIANT_FORMAT],
+                    extension=EXTENSIONS[IMAGE_VARIANT_FORMAT],
+                )
+            )
+    return ProcessedImage(variants=variants, original=original)
+
+
+def _encode(image, image_format: str, quality: int) -> bytes:
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    # Pillow writes no EXIF unless asked to.
+    image.save(buffer, format=image_format, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _pool
+
+
+async def render_variants(content: bytes) -> ProcessedImage:
+    """``process_image`` in the worker pool. An image that cannot be
+    processed (not decodable, Pillow missing) gets no variants rather than
+    failing the upload."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_pool(), process_image, content)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge image); start a fresh pool next time.
+        logger.exception("Image worker pool broke")
+        shutdown_pool()
+        return ProcessedImage()
+    except Exception:
+        logger.exception("Could not render image variants")
+        return ProcessedImage()
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
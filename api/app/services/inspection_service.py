@@ -5,12 +5,22 @@ from assistive_core import announce
 
 from app.models import Inspection
 from app.repositories import InspectionRepository
-from app.schemas import InspectionCreate, InspectionUpdate, InspectionResponse
+from app.schemas import (
+    InspectionCreate,
+    InspectionUpdate,
+    InspectionResponse,
+    HiveInspectionSummaryResponse,
+)
+
+from .inspection_summary_service import InspectionSummaryService
+from .media_service import INSPECTION, MediaService
 
 
 class InspectionService:
     def __init__(self):
         self.repository = InspectionRepository()
+        self.summaries = InspectionSummaryService()
+        self.media = MediaService()
 
     async def get_all_inspections(self, user_id: str) -> List[InspectionResponse]:
         inspections = await self.repository.get_by_user_id(user_id)
@@ -47,6 +57,11 @@ class InspectionService:
             )
         return InspectionResponse.model_validate(inspection)
 
+    async def get_hive_summary(
+        self, hive_id: str, user_id: str
+    ) -> HiveInspectionSummaryResponse:
+        return await self.summaries.get_summary(hive_id, user_id)
+
     async def get_recent_inspections(self, user_id: str, limit: int = 10) -> List[InspectionResponse]:
         inspections = await self.repository.get_recent(user_id, limit)
         return [InspectionResponse.model_validate(inspection) for inspection in inspections]
@@ -57,9 +72,12 @@ class InspectionService:
         inspection = Inspection(
             id=inspection_id,
             user_id=user_id,
+            photo_variants=await self.media.variants_for(inspection_data.photos),
             **inspection_data.model_dump(),
         )
         created_inspection = await self.repository.create(inspection)
+        await self.summaries.record_created(created_inspection)
+        await self.media.attach(INSPECTION, created_inspection.id, created_inspection.photos)
 
         # Registry-driven, best-effort follower fan-out (content + visibility
         # come from the inspection FeedSource; announce() never raises).
@@ -70,22 +88,27 @@ class InspectionService:
     async def update_inspection(
         self, inspection_id: str, inspection_data: InspectionUpdate, user_id: str
     ) -> InspectionResponse:
-        inspection = await self.repository.get_by_id(inspection_id)
-        if not inspection:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Inspection not found"
-            )
-        if inspection.user_id != user_id:
+        update_data = inspection_data.model_dump(exclude_unset=True)
+        if "photos" in update_data:
+            # Same write as the photos themselves.
+            manifest = await self.media.variants_for(update_data["photos"] or [])
+            update_data["photo_variants"] = [entry.model_dump() for entry in manifest]
+        updated = await self.repository.update_fields(inspection_id, user_id, update_data)
+        if not updated:
+            # Missing or not the caller's; only this path pays a second read.
+            if not await self.repository.get_by_id(inspection_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Inspection not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to modify this inspection",
             )
 
-        update_data = inspection_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(inspection, key, value)
-
-        updated_inspection = await self.repository.update(inspection)
+        before, updated_inspection = updated
+        await self.summaries.record_updated(before, updated_inspection)
+        if "photos" in update_data:
+            await self.media.sync(INSPECTION, inspection_id, updated_inspection.photos)
         return InspectionResponse.model_validate(updated_inspection)
 
     async def delete_inspection(self, inspection_id: str, user_id: str) -> None:
@@ -100,3 +123,5 @@ class InspectionService:
                 detail="Not authorized to delete this inspection",
             )
         await self.repository.delete(inspection)
+        await self.summaries.record_deleted(inspection)
+        await self.media.release(INSPECTION, [inspection.id])
@@ -0,0 +1,327 @@
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.analytics import SCORES
+from app.models import (
+    Inspection,
+    HiveInspectionSummary,
+    InspectionSnapshot,
+    MonthlyInspectionStats,
+)
+from app.repositories import InspectionRepository, HiveInspectionSummaryRepository
+from app.schemas import HiveInspectionSummaryResponse, MonthlyInspectionTrend
+
+logger = logging.getLogger(__name__)
+
+
+# Enum-valued inspection fields whose value distribution is counted.
+COUNTED_FIELDS = (
+    "queen_cells",
+    "brood_pattern",
+    "temperament",
+    "population",
+    "health_status",
+    "honey_stores",
+    "pollen_stores",
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Motor hands BSON datetimes back naive (UTC).
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _value(field) -> str:
+    return getattr(field, "value", field)
+
+
+def month_key(value: datetime) -> str:
+    return _as_utc(value).strftime("%Y-%m")
+
+
+def contribution(inspection: Inspection, sign: int = 1) -> Dict[str, int]:
+    """``$inc`` paths one inspection adds to its summary (``sign=-1`` removes
+    it). Every additive field of the rollup comes from here, so incremental
+    maintenance and a full rebuild always agree."""
+    inc: Dict[str, int] = {"inspection_count": sign}
+    for name in COUNTED_FIELDS:
+        inc[f"counts.{name}.{_value(getattr(inspection, name))}"] = sign
+    month = f"monthly.{month_key(inspection.inspection_date)}"
+    inc[f"{month}.inspections"] = sign
+    if inspection.varroa_mites_detected:
+        inc["varroa_detections"] = sign
+        inc[f"{month}.varroa_detections"] = sign
+    inc[f"{month}.population_score"] = sign * SCORES["population"][_value(inspection.population)]
+    inc[f"{month}.brood_score"] = sign * SCORES["brood_pattern"][_value(inspection.brood_pattern)]
+    inc[f"{month}.honey_score"] = sign * SCORES["honey_stores"][_value(inspection.honey_stores)]
+    inc[f"{month}.pollen_score"] = sign * SCORES["pollen_stores"][_value(inspection.pollen_stores)]
+    if inspection.estimated_frames_covered is not None:
+        inc[f"{month}.frames_covered"] = sign * inspection.estimated_frames_covered
+        inc[f"{month}.frames_covered_samples"] = sign
+    if inspection.estimated_brood_frames is not None:
+        inc[f"{month}.brood_frames"] = sign * inspection.estimated_brood_frames
+        inc[f"{month}.brood_frames_samples"] = sign
+    return inc
+
+
+def merge(*incs: Dict[str, int]) -> Dict[str, int]:
+    """Sum ``$inc`` documents, dropping paths that cancel out."""
+    total: Counter = Counter()
+    for inc in incs:
+        total.update(inc)
+    return {path: amount for path, amount in total.items() if amount}
+
+
+def varroa_streaks(flags: Iterable[bool]) -> Tuple[int, int]:
+    """``(current, longest)`` run of consecutive varroa detections, given the
+    flags in chronological order."""
+    current = longest = 0
+    for detected in flags:
+        current = current + 1 if detected else 0
+        longest = max(longest, current)
+    return current, longest
+
+
+def snapshot(inspection: Inspection) -> InspectionSnapshot:
+    return InspectionSnapshot(
+        inspection_id=inspection.id,
+        **inspection.model_dump(include=set(InspectionSnapshot.model_fields) - {"inspection_id"}),
+    )
+
+
+def _is_after(inspection: Inspection, last: Optional[InspectionSnapshot]) -> bool:
+    return last is None or _as_utc(inspection.inspection_date) >= _as_utc(last.inspection_date)
+
+
+def summarize(hive_id: str, user_id: str, history: List[Inspection]) -> HiveInspectionSummary:
+    """Build a summary from a hive's full history (oldest first)."""
+    summary = HiveInspectionSummary(
+        id=HiveInspectionSummary.summary_id(hive_id, user_id),
+        hive_id=hive_id,
+        user_id=user_id,
+    )
+    for path, amount in merge(*(contribution(i) for i in history)).items():
+        head, *rest = path.split(".")
+        if head == "counts":
+            field, value = rest
+            summary.counts.setdefault(field, {})[value] = amount
+        elif head == "monthly":
+            month, field = rest
+            stats = summary.monthly.setdefault(month, MonthlyInspectionStats())
+            setattr(stats, field, amount)
+        else:
+            setattr(summary, head, amount)
+    summary.varroa_current_streak, summary.varroa_longest_streak = varroa_streaks(
+        i.varroa_mites_detected for i in history
+    )
+    detected = [i.inspection_date for i in history if i.varroa_mites_detected]
+    summary.varroa_last_detected = detected[-1] if detected else None
+    if summary.varroa_current_streak:
+        summary.varroa_streak_started = history[-summary.varroa_current_streak].inspection_date
+    if history:
+        summary.last_inspection = snapshot(history[-1])
+    return summary
+
+
+def _average(total: int, samples: int) -> Optional[float]:
+    return round(total / samples, 2) if samples else None
+
+
+def _to_response(summary: HiveInspectionSummary) -> HiveInspectionSummaryResponse:
+    trends = [
+        MonthlyInspectionTrend(
+            month=month,
+            inspections=stats.inspections,
+            varroa_detections=stats.varroa_detections,
+            avg_population=_average(stats.population_score, stats.inspections),
+            avg_brood_pattern=_average(stats.brood_score, stats.inspections),
+            avg_honey_stores=_average(stats.honey_score, stats.inspections),
+            avg_pollen_stores=_average(stats.pollen_score, stats.inspections),
+            avg_frames_covered=_average(stats.frames_covered, stats.frames_covered_samples),
+            avg_brood_frames=_average(stats.brood_frames, stats.brood_frames_samples),
+        )
+        for month, stats in sorted(summary.monthly.items())
+        if stats.inspections > 0
+    ]
+    counts = {
+        field: {value: n for value, n in values.items() if n > 0}
+        for field, values in summary.counts.items()
+    }
+    return HiveInspectionSummaryResponse(
+        hive_id=summary.hive_id,
+        inspection_count=summary.inspection_count,
+        last_inspection=summary.last_inspection,
+        counts=counts,
+        varroa_detections=summary.varroa_detections,
+        varroa_current_streak=summary.varroa_current_streak,
+        varroa_longest_streak=summary.varroa_longest_streak,
+        varroa_last_detected=summary.varroa_last_detected,
+        monthly=trends,
+        updated_at=summary.updated_at,
+    )
+
+
+class InspectionSummaryService:
+    """Keeps ``HiveInspectionSummary`` in step with inspection writes.
+
+    Additive fields move by ``$inc`` deltas. The order-dependent ones (last
+    inspection, varroa streaks) are advanced in O(1) when the write is the
+    newest inspection, and re-derived from a projected timeline otherwise
+    (back-dated entries, edits to dates or varroa, deleting the latest).
+    """
+
+    def __init__(self):
+        self.repository = HiveInspectionSummaryRepository()
+        self.inspections = InspectionRepository()
+
+    async def get_summary(self, hive_id: str, user_id: str) -> HiveInspectionSummaryResponse:
+        summary = await self.repository.get(hive_id, user_id)
+        if summary is None:
+            # Hives with history from before rollups existed build on first read.
+            summary = await self.rebuild(hive_id, user_id)
+        if summary is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No inspections found for this hive",
+            )
+        return _to_response(summary)
+
+    async def record_created(self, inspection: Inspection) -> None:
+        await self._maintain(inspection, self._on_created, inspection)
+
+    async def record_updated(self, before: Inspection, after: Inspection) -> None:
+        await self._maintain(after, self._on_updated, before, after)
+
+    async def record_deleted(self, inspection: Inspection) -> None:
+        await self._maintain(inspection, self._on_deleted, inspection)
+
+    async def rebuild(self, hive_id: str, user_id: str) -> Optional[HiveInspectionSummary]:
+        """Recompute one summary from history; ``None`` (and no document) when
+        the hive has no inspections left."""
+        history = await self.inspections.get_history_for_summary(hive_id, user_id)
+        if not history:
+            await self.repository.delete(hive_id, user_id)
+            return None
+        return await self.repository.replace(summarize(hive_id, user_id, history))
+
+    async def rebuild_all(self) -> int:
+        """Recompute every summary and drop orphans. Returns the number built.
+
+        Run while writes are quiet: a write landing mid-rebuild of its hive
+        can be overwritten (the next rebuild or lazy read repairs it).
+        """
+        pairs = await self.inspections.get_hive_user_pairs()
+        for hive_id, user_id in pairs:
+            await self.rebuild(hive_id, user_id)
+        await self.repository.delete_except(
+            [HiveInspectionSummary.summary_id(h, u) for h, u in pairs]
+        )
+        return len(pairs)
+
+    async def _maintain(self, inspection: Inspection, handler, *args) -> None:
+        # The rollup is derived data: a failed update must not fail the
+        # inspection write. Dropping the summary makes the next read rebuild it.
+        try:
+            await handler(*args)
+        except Exception:
+            logger.exception("Inspection summary update failed for hive %s", inspection.hive_id)
+            try:
+                await self.repository.delete(inspection.hive_id, inspection.user_id)
+            except Exception:
+                logger.exception("Could not drop the summary of hive %s", inspection.hive_id)
+
+    async def _on_created(self, inspection: Inspection) -> None:
+        summary = await self.repository.get(inspection.hive_id, inspection.user_id)
+        if summary is None:
+            await self.rebuild(inspection.hive_id, inspection.user_id)
+            return
+        if not _is_after(inspection, summary.last_inspection):
+            await self.repository.apply(
+                inspection.hive_id, inspection.user_id, contribution(inspection)
+            )
+            await self._refresh_timeline(inspection.hive_id, inspection.user_id)
+            return
+        current = summary.varroa_current_streak + 1 if inspection.varroa_mites_detected else 0
+        fields = {
+            "last_inspection": snapshot(inspection).model_dump(),
+            "varroa_current_streak": current,
+            "varroa_longest_streak": max(summary.varroa_longest_streak, current),
+        }
+        if inspection.varroa_mites_detected:
+            fields["varroa_last_detected"] = inspection.inspection_date
+            if current == 1:
+                fields["varroa_streak_started"] = inspection.inspection_date
+        else:
+            fields["varroa_streak_started"] = None
+        await self.repository.apply(
+            inspection.hive_id, inspection.user_id, contribution(inspection), fields
+        )
+
+    async def _on_updated(self, before: Inspection, after: Inspection) -> None:
+        summary = await self.repository.get(after.hive_id, after.user_id)
+        if summary is None:
+            await self.rebuild(after.hive_id, after.user_id)
+            return
+        await self.repository.apply(
+            after.hive_id,
+            after.user_id,
+            merge(contribution(before, -1), contribution(after)),
+        )
+        was_last = (
+            summary.last_inspection is not None
+            and summary.last_inspection.inspection_id == after.id
+        )
+        reordered = (
+            _as_utc(before.inspection_date) != _as_utc(after.inspection_date)
+            or before.varroa_mites_detected != after.varroa_mites_detected
+        )
+        if was_last or reordered:
+            await self._refresh_timeline(after.hive_id, after.user_id)
+
+    async def _on_deleted(self, inspection: Inspection) -> None:
+        summary = await self.repository.get(inspection.hive_id, inspection.user_id)
+        if summary is None:
+            await self.rebuild(inspection.hive_id, inspection.user_id)
+            return
+        if summary.inspection_count <= 1:
+            await self.rebuild(inspection.hive_id, inspection.user_id)
+            return
+        await self.repository.apply(
+            inspection.hive_id, inspection.user_id, contribution(inspection, -1)
+        )
+        was_last = (
+            summary.last_inspection is not None
+            and summary.last_inspection.inspection_id == inspection.id
+        )
+        if was_last or inspection.varroa_mites_detected:
+            await self._refresh_timeline(inspection.hive_id, inspection.user_id)
+
+    async def _refresh_timeline(self, hive_id: str, user_id: str) -> None:
+        """Re-derive last inspection and varroa streaks from the projected
+        (id, date, varroa) timeline."""
+        timeline = await self.inspections.get_varroa_timeline(hive_id, user_id)
+        if not timeline:
+            await self.repository.delete(hive_id, user_id)
+            return
+        current, longest = varroa_streaks(
+            row.get("varroa_mites_detected", False) for row in timeline
+        )
+        detected = [row["inspection_date"] for row in timeline if row.get("varroa_mites_detected")]
+        fields = {
+            "varroa_current_streak": current,
+            "varroa_longest_streak": longest,
+            "varroa_last_detected": detected[-1] if detected else None,
+            "varroa_streak_started": (
+                timeline[-current]["inspection_date"] if current else None
+            ),
+        }
+        latest = await self.inspections.get_by_id(timeline[-1]["_id"])
+        if latest is not None:
+            fields["last_inspection"] = snapshot(latest).model_dump()
+        await self.repository.apply(hive_id, user_id, {}, fields)
@@ -0,0 +1,217 @@
+"""Media catalog: every upload, who references it, and garbage collection.
+
+``/photos/upload`` records each object (path, size, sha256, owner) in
+``Media``. An identical re-upload by the same owner returns the existing
+object instead of storing a copy. Each upload also gets resized variants
+(``image_processing``), uploaded alongside it; inspections carry a manifest
+of them (``photo_variants``) so list views can fetch thumbnails only.
+Inspections (``photos``) and hives
+(``image_url``) keep their references in sync through ``attach`` / ``sync``
+/ ``release``. References are a set per media, so a photo shared by two
+records survives until both let go.
+
+``collect_garbage`` (the ``media_gc`` job) deletes objects that have had no
+references for ``MEDIA_GC_GRACE_HOURS``. The grace period covers the gap
+between uploading a photo and saving the inspection that uses it. Storage
+deletes go out concurrently over the storage client's connection pool, and
+an object's variants go with it.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+from app.models import Hive, Inspection, Media, PhotoVariants
+from app.models.base import utcnow
+from app.repositories import MediaRepository
+from app.services.bunny_storage_service import bunny_storage
+from app.services.image_processing import render_variants
+
+logger = logging.getLogger(__name__)
+
+MEDIA_GC_GRACE_HOURS = float(os.getenv("MEDIA_GC_GRACE_HOURS", "24"))
+MEDIA_GC_BATCH_SIZE = int(os.getenv("MEDIA_GC_BATCH_SIZE", "200"))
+
+INSPECTION = "inspection"
+HIVE = "hive"
+
+
+class MediaService:
+    def __init__(self):
+        self.repository = MediaRepository()
+        self.storage = bunny_storage
+        self.render = render_variants
+
+    async def upload(
+        self,
+        content: bytes,
+        filename: str,
+        folder: str,
+        owner_id: str,
+        content_type: Optional[str] = None,
+    ) -> Optional[Media]:
+        """Store ``content`` and its variants and catalogue them, or return
+        the owner's existing copy of the same bytes. None when the storage
+        upload of the original failed; a variant that failed to upload is
+        left out."""
+        digest = hashlib.sha256(content).hexdigest()
+        existing = await self.repository.find_duplicate(owner_id, digest)
+        if existing:
+            await self.repository.restart_grace(existing)
+            return existing
+
+        processed = await self.render(content)
+        original = processed.original or content
+        stem = filename.rsplit(".", 1)[0]
+        # Original and variants upload concurrently over the shared pool.
+        url, *variant_urls = await asyncio.gather(
+            self.storage.upload_photo(file_content=original, filename=filename, folder=folder),
+            *(
+                self.storage.upload_photo(
+                    file_content=variant.content,
+                    filename=f"{stem}_{variant.name}.{variant.extension}",
+                    folder=folder,
+                )
+                for variant in processed.variants
+            ),
+        )
+        variants = {
+            variant.name: variant_url
+            for variant, variant_url in zip(processed.variants, variant_urls)
+            if variant_url
+        }
+        if not url:
+            await self.storage.delete_photos(self._paths(variants.values()))
+            return None
+        media = Media(
+            id=self.storage.path_for_url(url) or url,
+            url=url,
+            owner_id=owner_id,
+            size=len(original),
+            sha256=digest,
+            content_type=content_type,
+            variants=variants,
+            unreferenced_since=utcnow(),
+        )
+        return await self.repository.create(media)
+
+    async def delete(self, path: str, user_id: str) -> None:
+        """Delete an unreferenced upload of the user's from storage and the
+        catalog."""
+        media = await self.repository.get(path)
+        if not media:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found"
+            )
+        if media.owner_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to delete this photo",
+            )
+        if media.refs:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Photo is still referenced",
+            )
+        results = await self.storage.delete_photos([path, *self._paths(media.variants.values())])
+        if not all(results.values()):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to delete photo from storage",
+            )
+        await self.repository.delete(media)
+
+    async def variants_for(self, urls: Sequence[str]) -> List[PhotoVariants]:
+        """The variant manifest of ``urls``, in their order; photos without
+        catalogued variants are left out."""
+        variants = await self.variants_by_url(urls)
+        return [PhotoVariants(url=url, variants=variants[url]) for url in urls if url in variants]
+
+    async def variants_by_url(self, urls: Iterable[Optional[str]]) -> Dict[str, Dict[str, str]]:
+        """Catalogued variants of ``urls``, for those that have any."""
+        media = await self.repository.find_by_urls(sorted({u for u in urls if u}))
+        return {m.url: m.variants for m in media if m.variants}
+
+    def _paths(self, urls: Iterable[str]) -> List[str]:
+        return [path for url in urls if (path := self.storage.path_for_url(url))]
+
+    # --- references ---
+
+    async def attach(self, kind: str, document_id: str, urls: Iterable[Optional[str]]) -> None:
+        """A new document now points at ``urls``."""
+        await self.repository.attach(Media.ref(kind, document_id), [u for u in urls if u])
+
+    async def attach_many(self, kind: str, urls_by_id: Dict[str, Iterable[Optional[str]]]) -> None:
+        """``attach`` for a batch of new documents in one round trip."""
+        await self.repository.attach_many(
+            {Media.ref(kind, i): [u for u in urls if u] for i, urls in urls_by_id.items()}
+        )
+
+    async def sync(self, kind: str, document_id: str, urls: Iterable[Optional[str]]) -> None:
+        """The document's media references are now exactly ``urls``."""
+        ref = Media.ref(kind, document_id)
+        urls = [u for u in urls if u]
+        await self.repository.detach([ref], keep_urls=urls)
+        await self.repository.attach(ref, urls)
+
+    async def release(self, kind: str, document_ids: Sequence[str]) -> int:
+        """The documents are gone; drop whatever they referenced."""
+        return await self.repository.detach([Media.ref(kind, i) for i in document_ids])
+
+    # --- garbage collection ---
+
+    async def collect_garbage(
+        self, grace_hours: float = MEDIA_GC_GRACE_HOURS, batch_size: int = MEDIA_GC_BATCH_SIZE
+    ) -> int:
+        """Delete one batch of long-unreferenced objects. Returns the number
+        deleted from storage."""
+        if not self.storage.configured:
+            return 0
+        cutoff = utcnow() - timedelta(hours=grace_hours)
+        claimed: List[dict] = []
+        for path in await self.repository.gc_candidates(cutoff, batch_size):
+            # Re-checked atomically: a reference attached since selection wins.
+            entry = await self.repository.claim(path, cutoff)
+            if entry:
+                claimed.append(entry)
+        if not claimed:
+            return 0
+        paths = {
+            entry["_id"]: [entry["_id"], *self._paths((entry.get("variants") or {}).values())]
+            for entry in claimed
+        }
+        results = await self.storage.delete_photos([p for group in paths.values() for p in group])
+        # Restored whole: deleting an already-deleted variant again is harmless.
+        failed = [entry for entry in claimed if not all(results.get(p) for p in paths[entry["_id"]])]
+        # Back into the catalog, to be retried by the next pass.
+        await self.repository.restore(failed)
+        if failed:
+            logger.warning("Media GC could not delete %d objects", len(failed))
+        return len(claimed) - len(failed)
+
+    # --- backfill ---
+
+    async def backfill(self) -> int:
+        """Catalogue photos referenced by inspections and hives that predate
+        the catalog, so their references are tracked and GC can reclaim
+        them. Returns the number of entries created."""
+        created = 0
+        async for inspection in Inspection.find(Inspection.photos != []):
+            created += await self._catalogue(INSPECTION, inspection.id, inspection.photos, inspection.user_id)
+        async for hive in Hive.find(Hive.image_url != None):  # noqa: E711
+            created += await self._catalogue(HIVE, hive.id, [hive.image_url], "")
+        return created
+
+    async def _catalogue(self, kind: str, document_id: str, urls: List[str], owner_id: str) -> int:
+        entries = [
+            Media(id=path, url=url, owner_id=owner_id, unreferenced_since=utcnow())
+            for url in urls
+            if (path := self.storage.path_for_url(url))
+        ]
+        created = await self.repository.create_many(entries)
+        await self.attach(kind, document_id, urls)
+        return created
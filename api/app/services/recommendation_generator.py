@@ -0,0 +1,334 @@
+"""Server-side recommendation generation.
+
+Each hive's recommendations are derived from its latest inspection, its open
+tasks and the 24h forecast for its apiary. Those inputs are first reduced to
+the *facts* the rules read (``hive_facts``); the facts are hashed, and a hive
+whose hash matches the stored ``RecommendationState`` is skipped, so a
+periodic pass only rewrites hives whose inspection, task set or weather
+outlook actually changed. Changed hives are written with bounded concurrency
+and swapped in per hive (``RecommendationRepository.replace_generated``).
+"""
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from assistive_core import weather_client
+
+from app.models import (
+    BroodPattern,
+    ColonyPopulation,
+    HealthStatus,
+    Hive,
+    Inspection,
+    Priority,
+    QueenCellStatus,
+    Recommendation,
+    RecommendationType,
+    ResourceLevel,
+    Task,
+    TaskStatus,
+)
+from app.models.base import utcnow
+from app.repositories import (
+    ApiaryRepository,
+    HiveRepository,
+    InspectionRepository,
+    RecommendationRepository,
+    TaskRepository,
+)
+from app.schemas import RecommendationGenerateResponse
+from app.services.alert_engine import INSPECTION_DUE_DAYS, forecast_hazards
+
+
+RECOMMENDATION_WORKERS = int(os.getenv("RECOMMENDATION_WORKERS", "8"))
+RECOMMENDATION_BATCH_SIZE = int(os.getenv("RECOMMENDATION_BATCH_SIZE", "200"))
+DUE_SOON_DAYS = 7
+# Bump when the rules below change so every hive regenerates once.
+RULES_VERSION = 1
+
+_LOW_STORES = {ResourceLevel.NONE, ResourceLevel.VERY_LOW, ResourceLevel.LOW}
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Motor hands BSON datetimes back naive (UTC).
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class RecommendationDraft:
+    rule: str
+    type: RecommendationType
+    title: str
+    description: str
+    priority: Priority = Priority.MEDIUM
+
+
+def hive_facts(
+    inspection: Optional[Inspection],
+    tasks: List[Task],
+    hazards: Optional[Dict[str, float]],
+    now: datetime,
+) -> dict:
+    """Everything the rules read, as plain JSON-able values. Time-relative
+    inputs are reduced to flags so the facts (and hash) only change when a
+    recommendation could."""
+    facts: dict = {"version": RULES_VERSION, "inspection": None}
+    if inspection is not None:
+        last = _as_utc(inspection.inspection_date)
+        facts["inspection"] = {
+            "date": last.date().isoformat(),
+            "due": (now - last).days >= INSPECTION_DUE_DAYS,
+            "queen_seen": inspection.queen_seen,
+            "eggs_seen": inspection.eggs_seen,
+            "queen_cells": inspection.queen_cells.value,
+            "brood_pattern": inspection.brood_pattern.value,
+            "population": inspection.population.value,
+            "health_status": inspection.health_status.value,
+            "varroa": inspection.varroa_mites_detected,
+            "treated": inspection.treatment_applied,
+            "honey_stores": inspection.honey_stores.value,
+        }
+    soon = now + timedelta(days=DUE_SOON_DAYS)
+    overdue, due_soon = [], []
+    for task in tasks:
+        due = _as_utc(task.due_date)
+        if task.status == TaskStatus.OVERDUE or due < now:
+            overdue.append(task.title)
+        elif due <= soon:
+            due_soon.append(task.title)
+    facts["overdue_tasks"] = sorted(overdue)
+    facts["due_soon_tasks"] = sorted(due_soon)
+    facts["weather"] = sorted(hazards) if hazards is not None else None
+    return facts
+
+
+def input_hash(facts: dict) -> str:
+    canonical = json.dumps(facts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def derive_recommendations(facts: dict) -> List[RecommendationDraft]:
+    """The rules. Pure: the same facts always give the same drafts."""
+    drafts: List[RecommendationDraft] = []
+    inspection = facts["inspection"]
+    concerns = bool(facts["overdue_tasks"])
+
+    if inspection is None:
+        drafts.append(RecommendationDraft(
+            "inspect", RecommendationType.INFO, "Record a first inspection",
+            "No inspections have been recorded for this hive yet.", Priority.MEDIUM))
+    else:
+        if inspection["due"]:
+            concerns = True
+            drafts.append(RecommendationDraft(
+                "inspect", RecommendationType.ACTION_REQUIRED, "Inspection due",
+                f"Last inspected on {inspection['date']}.", Priority.MEDIUM))
+
+        cells = inspection["queen_cells"]
+        if cells == QueenCellStatus.SWARM_CELLS.value:
+            concerns = True
+            drafts.append(RecommendationDraft(
+                "swarm", RecommendationType.ACTION_REQUIRED, "Swarm cells present",
+                "Split the colony or remove the swarm cells before the prime swarm leaves.",
+                Priority.HIGH))
+        elif cells == QueenCellStatus.SUPERSEDURE_CELLS.value:
+            concerns = True
+            drafts.append(RecommendationDraft(
+                "swarm", RecommendationType.WARNING, "Colony is superseding",
+                "Leave the supersedure cells and check for a laying queen in three weeks.",
+                Priority.MEDIUM))
+
+        if not inspection["queen_seen"] and not inspection["eggs_seen"]:
+            concerns = True
+            drafts.append(RecommendationDraft(
+                "queen", RecommendationType.WARNING, "Check queen status",
+                "Neither the queen nor eggs were seen at the last inspection.",
+                Priority.HIGH))
+
+        if inspection["varroa"]:
+            concerns = True
+            if inspection["treated"]:
+                drafts.append(RecommendationDraft(
+                    "varroa", RecommendationType.INFO, "Monitor varroa after treatment",
+                    "Do a mite count once the treatment period ends.", Priority.LOW))
+            else:
+                drafts.append(RecommendationDraft(
+                    "varroa", RecommendationType.ACTION_REQUIRED, "Treat for varroa",
+                    "Varroa mites were seen and no treatment was recorded.", Priority.HIGH))
+
+        if inspection["honey_stores"] in {level.value for level in _LOW_STORES}:
+            concerns = True
+            drafts.append(RecommendationDraft(
+                "stores", RecommendationType.ACTION_REQUIRED, "Feed the colony",
+                "Honey stores are low; feed syrup or fondant.", Priority.HIGH))
+
+        if inspection["health_status"] in (
+            HealthStatus.CONCERNING.value,
+            HealthStatus.NEEDS_ATTENTION.value,
+            HealthStatus.CRITICAL.value,
+        ):
+            concerns = True
+            drafts.append(RecommendationDraft(
+                "health", RecommendationType.WARNING, "Colony health needs attention",
+                "The last inspection flagged the colony's health.",
+                Priority.HIGH if inspection["health_status"] == HealthStatus.CRITICAL.value
+                else Priority.MEDIUM))
+
+        if not concerns and inspection["population"] in (
+            ColonyPopulation.STRONG.value, ColonyPopulation.VERY_STRONG.value
+        ) and inspection["brood_pattern"] in (
+            BroodPattern.GOOD.value, BroodPattern.EXCELLENT.value
+        ):
+            drafts.append(RecommendationDraft(
+                "thriving", RecommendationType.POSITIVE, "Colony is thriving",
+                "Strong population and a good brood pattern. Consider adding a super.",
+                Priority.LOW))
+
+    if facts["overdue_tasks"]:
+        titles = ", ".join(facts["overdue_tasks"])
+        drafts.append(RecommendationDraft(
+            "tasks", RecommendationType.WARNING,
+            f"{len(facts['overdue_tasks'])} overdue task(s)", f"Overdue: {titles}.",
+            Priority.MEDIUM))
+    elif facts["due_soon_tasks"]:
+        titles = ", ".join(facts["due_soon_tasks"])
+        drafts.append(RecommendationDraft(
+            "tasks", RecommendationType.INFO,
+            f"{len(facts['due_soon_tasks'])} task(s) due this week", f"Coming up: {titles}.",
+            Priority.LOW))
+
+    weather = facts["weather"] or []
+    if "frost" in weather or "wind" in weather:
+        drafts.append(RecommendationDraft(
+            "weather", RecommendationType.INFO, "Keep the hive closed",
+            "Frost or high winds are forecast in the next 24 hours; postpone inspections.",
+            Priority.LOW))
+    elif "heat" in weather:
+        drafts.append(RecommendationDraft(
+            "weather", RecommendationType.INFO, "Hot weather ahead",
+            "Make sure the colony has shade, ventilation and water nearby.", Priority.LOW))
+    return drafts
+
+
+class RecommendationGenerator:
+    def __init__(self, weather=weather_client, workers: int = RECOMMENDATION_WORKERS):
+        self.recommendations = RecommendationRepository()
+        self.apiaries = ApiaryRepository()
+        self.hives = HiveRepository()
+        self.inspections = InspectionRepository()
+        self.tasks = TaskRepository()
+        self.weather = weather
+        self.workers = workers
+
+    async def regenerate_hive(self, hive_id: str) -> RecommendationGenerateResponse:
+        hives = await self.hives.get_by_ids([hive_id])
+        if not hives:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Hive not found"
+            )
+        regenerated, unchanged = await self.regenerate(hives)
+        return RecommendationGenerateResponse(regenerated=regenerated, unchanged=unchanged)
+
+    async def regenerate_apiary(self, apiary_id: str) -> RecommendationGenerateResponse:
+        if not await self.apiaries.get_by_id(apiary_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Apiary not found"
+            )
+        hives = await self.hives.get_by_apiary_id(apiary_id)
+        regenerated, unchanged = await self.regenerate(hives)
+        return RecommendationGenerateResponse(regenerated=regenerated, unchanged=unchanged)
+
+    async def regenerate_all(self) -> int:
+        """Every hive, in batches. Returns the number of hives rewritten."""
+        hive_ids = await self.hives.get_all_ids()
+        written = 0
+        for start in range(0, len(hive_ids), RECOMMENDATION_BATCH_SIZE):
+            hives = await self.hives.get_by_ids(hive_ids[start:start + RECOMMENDATION_BATCH_SIZE])
+            written += (await self.regenerate(hives))[0]
+        return written
+
+    async def regenerate(
+        self, hives: List[Hive], now: Optional[datetime] = None
+    ) -> Tuple[int, int]:
+        """Regenerate ``hives`` whose inputs changed. Returns
+        ``(regenerated, unchanged)``."""
+        if not hives:
+            return 0, 0
+        now = now or utcnow()
+        hive_ids = [hive.id for hive in hives]
+        latest, open_tasks, hashes, hazards = await asyncio.gather(
+            self.inspections.get_latest_for_hives(hive_ids),
+            self.tasks.get_open_for_hives(hive_ids),
+            self.recommendations.get_input_hashes(hive_ids),
+            self._hazards_by_apiary({hive.apiary_id for hive in hives}),
+        )
+        inspection_by_hive = {inspection.hive_id: inspection for inspection in latest}
+        tasks_by_hive: Dict[str, List[Task]] = {}
+        for task in open_tasks:
+            tasks_by_hive.setdefault(task.hive_id, []).append(task)
+
+        changed = []
+        for hive in hives:
+            facts = hive_facts(
+                inspection_by_hive.get(hive.id),
+                tasks_by_hive.get(hive.id, []),
+                hazards.get(hive.apiary_id),
+                now,
+            )
+            digest = input_hash(facts)
+            if hashes.get(hive.id) != digest:
+                changed.append((hive, facts, digest))
+
+        limit = asyncio.Semaphore(self.workers)
+
+        async def write(hive: Hive, facts: dict, digest: str) -> None:
+            async with limit:
+                await self.recommendations.replace_generated(
+                    hive.id, _documents(hive.id, derive_recommendations(facts)), digest
+                )
+
+        await asyncio.gather(*(write(*item) for item in changed))
+        return len(changed), len(hives) - len(changed)
+
+    async def _hazards_by_apiary(self, apiary_ids: set) -> Dict[str, Dict[str, float]]:
+        """Forecast hazards per apiary with coordinates; an apiary without
+        coordinates or whose fetch failed is left out (weather unknown)."""
+        if self.weather is None or not apiary_ids:
+            return {}
+        apiaries = [
+            apiary
+            for apiary in await self.apiaries.get_by_ids(sorted(apiary_ids))
+            if apiary.latitude is not None and apiary.longitude is not None
+        ]
+        forecasts = await self.weather.get_forecast_batch(
+            [(apiary.latitude, apiary.longitude) for apiary in apiaries], hours=24
+        )
+        return {
+            apiary.id: forecast_hazards(forecast)
+            for apiary, forecast in zip(apiaries, forecasts)
+            if forecast is not None
+        }
+
+
+def _documents(hive_id: str, drafts: List[RecommendationDraft]) -> List[Recommendation]:
+    # Deterministic ids: one document per (hive, rule), replaced in place.
+    return [
+        Recommendation(
+            id=f"{hive_id}:{draft.rule}",
+            hive_id=hive_id,
+            type=draft.type,
+            title=draft.title,
+            description=draft.description,
+            priority=draft.priority,
+            rule=draft.rule,
+        )
+        for draft in drafts
+    ]
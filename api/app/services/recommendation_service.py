@@ -26,18 +26,15 @@ class RecommendationService:
     async def update_recommendation(
         self, recommendation_id: str, recommendation_data: RecommendationUpdate
     ) -> RecommendationResponse:
-        recommendation = await self.repository.get_by_id(recommendation_id)
-        if not recommendation:
+        update_data = recommendation_data.model_dump(exclude_unset=True)
+        updated_recommendation = await self.repository.update_fields(
+            recommendation_id, update_data
+        )
+        if not updated_recommendation:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Recommendation not found",
             )
-
-        update_data = recommendation_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(recommendation, key, value)
-
-        updated_recommendation = await self.repository.update(recommendation)
         return RecommendationResponse.model_validate(updated_recommendation)
 
     async def delete_recommendation(self, recommendation_id: str) -> None:
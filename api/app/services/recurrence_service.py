@@ -0,0 +1,236 @@
+"""Recurring-task expansion.
+
+A task created with ``recurrence_frequency`` becomes the root of a series.
+Occurrences are materialised lazily as real ``Task`` documents only within a
+rolling horizon (``RECURRENCE_HORIZON_DAYS``): the root remembers the next
+index to materialise and how far it has got, so each pass only generates the
+new tail, inserted in one unordered bulk write. Every occurrence carries a
+unique ``occurrence_key`` ("<series_id>:<index>"), so a repeated or concurrent
+pass can never double-insert.
+
+The root stores the due date of its next unmaterialised occurrence, so the
+job only selects series with something to add; one whose count or end date
+is used up is marked exhausted and never selected again.
+
+Beyond the horizon nothing is stored: ``expand_virtual`` projects occurrences
+at query time for long ranges. Completing an occurrence spawns its successor
+from the instance's own ``series_start`` / ``occurrence_index`` in a single
+upsert, without reading the rest of the series.
+
+Occurrence dates are always computed from ``series_start`` (not chained from
+the previous date), so month-end clamping never drifts: a series starting on
+Jan 31 runs Feb 28/29, Mar 31, Apr 30, ...
+"""
+import calendar
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from app.models import Task, TaskStatus, RecurrenceFrequency
+from app.repositories import TaskRepository
+
+RECURRENCE_HORIZON_DAYS = int(os.getenv("RECURRENCE_HORIZON_DAYS", "30"))
+
+_NO_LIMIT = datetime.max.replace(tzinfo=timezone.utc)
+
+# Upper bound on occurrences generated per series per pass (a DAILY series
+# with a huge horizon must not turn into an unbounded insert).
+MAX_OCCURRENCES_PER_PASS = 366
+
+# (unit, multiplier) per frequency; months cover quarterly/yearly.
+_STEPS = {
+    RecurrenceFrequency.DAILY: ("days", 1),
+    RecurrenceFrequency.WEEKLY: ("days", 7),
+    RecurrenceFrequency.BIWEEKLY: ("days", 14),
+    RecurrenceFrequency.MONTHLY: ("months", 1),
+    RecurrenceFrequency.QUARTERLY: ("months", 3),
+    RecurrenceFrequency.YEARLY: ("months", 12),
+}
+
+# Fields an occurrence inherits from the series root.
+_INHERITED = (
+    "title",
+    "description",
+    "task_type",
+    "hive_id",
+    "apiary_id",
+    "user_id",
+    "priority",
+    "estimated_duration_minutes",
+    "weather_dependent",
+    "minimum_temperature",
+    "notes",
+    "is_public",
+    "recurrence_frequency",
+    "recurrence_interval",
+    "recurrence_end_date",
+    "recurrence_count",
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Motor hands BSON datetimes back naive (UTC).
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def occurrence_date(
+    start: datetime, frequency: RecurrenceFrequency, interval: int, index: int
+) -> datetime:
+    """Due date of occurrence ``index`` (0 = ``start``) of a series."""
+    unit, multiplier = _STEPS[RecurrenceFrequency(frequency)]
+    steps = index * max(interval or 1, 1) * multiplier
+    if unit == "days":
+        return start + timedelta(days=steps)
+    return _add_months(start, steps)
+
+
+def _within_limits(task: Task, index: int, due: datetime) -> bool:
+    if task.recurrence_count is not None and index >= task.recurrence_count:
+        return False
+    if task.recurrence_end_date is not None and due > _as_utc(task.recurrence_end_date):
+        return False
+    return True
+
+
+def iter_occurrences(
+    task: Task, first_index: int, until: datetime
+) -> Iterator[Tuple[int, datetime]]:
+    """Yield ``(index, due_date)`` from ``first_index`` while due <= ``until``
+    and the series' count / end-date limits allow."""
+    start = _as_utc(task.series_start or task.due_date)
+    until = _as_utc(until)
+    index = first_index
+    while True:
+        due = occurrence_date(
+            start, task.recurrence_frequency, task.recurrence_interval or 1, index
+        )
+        if due > until or not _within_limits(task, index, due):
+            return
+        yield index, due
+        index += 1
+
+
+def occurrence_key(series_id: str, index: int) -> str:
+    return f"{series_id}:{index}"
+
+
+def build_occurrence(
+    template: Task, index: int, due: datetime, task_id: Optional[str] = None
+) -> Task:
+    """An unsaved occurrence of ``template``'s series at ``index``."""
+    series_id = template.series_id or template.id
+    series_start = _as_utc(template.series_start or template.due_date)
+    data = {field: getattr(template, field) for field in _INHERITED}
+    reminder_date = None
+    if template.reminder_date is not None:
+        offset = _as_utc(template.reminder_date) - _as_utc(template.due_date)
+        reminder_date = due + offset
+    key = occurrence_key(series_id, index)
+    return Task(
+        id=task_id or str(uuid.uuid4()),
+        due_date=due,
+        reminder_date=reminder_date,
+        status=TaskStatus.PENDING,
+        series_id=series_id,
+        series_start=series_start,
+        occurrence_index=index,
+        occurrence_key=key,
+        **data,
+    )
+
+
+def start_series(task: Task) -> None:
+    """Stamp series bookkeeping onto a freshly-built recurring root task."""
+    task.series_id = task.id
+    task.series_start = task.due_date
+    task.occurrence_index = 0
+    task.occurrence_key = occurrence_key(task.id, 0)
+    task.recurrence_next_index = 1
+    task.recurrence_materialized_until = task.due_date
+
+
+class RecurrenceService:
+    def __init__(self, horizon_days: int = RECURRENCE_HORIZON_DAYS):
+        self.repository = TaskRepository()
+        self.horizon_days = horizon_days
+
+    def horizon(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)) + timedelta(days=self.horizon_days)
+
+    async def materialize_series(
+        self, root: Task, now: Optional[datetime] = None
+    ) -> int:
+        """Materialise ``root``'s occurrences up to the rolling horizon.
+        Incremental: starts at the root's ``recurrence_next_index``. Returns the
+        number of occurrences inserted."""
+        until = self.horizon(now)
+        next_index = root.recurrence_next_index or 1
+        occurrences = []
+        for index, due in iter_occurrences(root, next_index, until):
+            occurrences.append(build_occurrence(root, index, due))
+            if len(occurrences) >= MAX_OCCURRENCES_PER_PASS:
+                break
+        inserted = await self.repository.insert_occurrences(occurrences)
+        if occurrences:
+            next_index = occurrences[-1].occurrence_index + 1
+        following = next(iter_occurrences(root, next_index, _NO_LIMIT), None)
+        await self.repository.set_materialized(
+            root.id, next_index, following[1] if following else None
+        )
+        return inserted
+
+    async def materialize_due(
+        self, now: Optional[datetime] = None, min_lag: timedelta = timedelta(0)
+    ) -> int:
+        """Advance every series with an occurrence due inside the horizon
+        (job body). ``min_lag`` skips series that are only that far behind:
+        the job passes its interval, so a series is caught up once it is an
+        interval behind rather than rewritten on every pass."""
+        roots = await self.repository.get_series_roots_behind(self.horizon(now) - min_lag)
+        total = 0
+        for root in roots:
+            total += await self.materialize_series(root, now)
+        return total
+
+    async def spawn_next(self, occurrence: Task) -> Optional[Task]:
+        """Ensure the occurrence after ``occurrence`` exists (O(1): one upsert,
+        no series scan). Returns it, or ``None`` when the series has ended."""
+        if occurrence.recurrence_frequency is None or occurrence.occurrence_index is None:
+            return None
+        index = occurrence.occurrence_index + 1
+        for _, due in iter_occurrences(occurrence, index, _NO_LIMIT):
+            nxt = build_occurrence(occurrence, index, due)
+            await self.repository.upsert_occurrence(nxt)
+            # The successor may lie past the horizon: move the root on so
+            # ``expand_virtual`` does not project a second copy of it.
+            await self.repository.advance_next_index(nxt.series_id, index + 1)
+            return nxt
+        return None
+
+    async def expand_virtual(
+        self, user_id: str, start: datetime, end: datetime
+    ) -> List[Task]:
+        """Unsaved occurrences in ``[start, end]`` beyond each series'
+        materialised horizon, computed at query time for long ranges."""
+        start, end = _as_utc(start), _as_utc(end)
+        virtual: List[Task] = []
+        for root in await self.repository.get_series_roots(user_id):
+            first = root.recurrence_next_index or 1
+            for index, due in iter_occurrences(root, first, end):
+                if due >= start:
+                    # Virtual ids are the stable occurrence key (never stored).
+                    key = occurrence_key(root.series_id or root.id, index)
+                    virtual.append(build_occurrence(root, index, due, task_id=key))
+        virtual.sort(key=lambda t: t.due_date)
+        return virtual
@@ -0,0 +1,197 @@
+"""Day route planning across apiaries.
+
+Due work for a day is the user's open tasks due by the end of that day plus
+every hive the user has inspected whose last inspection is at least
+``INSPECTION_DUE_DAYS`` old by then. Work is grouped into one stop per
+apiary; stops are ordered with ``app.scheduling.route`` (nearest neighbour +
+2-opt over haversine distances) and timed with ``estimated_duration_minutes``.
+
+The distance matrix covers every apiary the user works in (open tasks and
+inspected hives), so it is the same from one day to the next. It is cached
+per user in-process and rebuilt when that set of apiaries or any of their
+coordinates changes.
+
+NumPy and ``app.scheduling.route`` are imported when a route is planned, so
+app startup does not load them.
+"""
+import os
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from app.models import Apiary, TaskType
+from app.repositories import (
+    ApiaryRepository,
+    HiveInspectionSummaryRepository,
+    HiveRepository,
+    TaskRepository,
+)
+from app.schemas import RoutePlan, RouteStop, RouteUnrouted
+from app.services.alert_engine import INSPECTION_DUE_DAYS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ROUTE_INSPECTION_MINUTES = int(os.getenv("ROUTE_INSPECTION_MINUTES", "30"))
+ROUTE_DEFAULT_TASK_MINUTES = int(os.getenv("ROUTE_DEFAULT_TASK_MINUTES", "30"))
+ROUTE_SPEED_KMH = float(os.getenv("ROUTE_SPEED_KMH", "50"))
+ROUTE_MATRIX_CACHE_USERS = int(os.getenv("ROUTE_MATRIX_CACHE_USERS", "256"))
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class DistanceMatrixCache:
+    """Bounded LRU of per-user distance matrices, keyed by a fingerprint of
+    the apiaries' ids and coordinates."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {"hits": 0, "builds": 0}
+
+    def get(self, user_id: str, apiaries: Sequence[Apiary]) -> Tuple[Dict[str, int], "np.ndarray"]:
+        """``(apiary id -> row, matrix)`` for ``apiaries`` (all with coordinates)."""
+        from app.scheduling.route import distance_matrix
+
+        fingerprint = tuple(sorted((a.id, a.latitude, a.longitude) for a in apiaries))
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] == fingerprint:
+            self._entries.move_to_end(user_id)
+            self.stats["hits"] += 1
+            return entry[1], entry[2]
+        self.stats["builds"] += 1
+        index = {apiary_id: i for i, (apiary_id, _, _) in enumerate(fingerprint)}
+        matrix = distance_matrix([(lat, lon) for _, lat, lon in fingerprint])
+        self._entries[user_id] = (fingerprint, index, matrix)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+        return index, matrix
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+route_matrix_cache = DistanceMatrixCache(ROUTE_MATRIX_CACHE_USERS)
+
+
+class _Stop:
+    def __init__(self):
+        self.task_ids: List[str] = []
+        self.hive_ids: List[str] = []
+        self.minutes = 0
+
+
+class RoutePlanner:
+    def __init__(self, cache: DistanceMatrixCache = route_matrix_cache):
+        self.tasks = TaskRepository()
+        self.summaries = HiveInspectionSummaryRepository()
+        self.hives = HiveRepository()
+        self.apiaries = ApiaryRepository()
+        self.cache = cache
+
+    async def plan(
+        self, user_id: str, day: date, start: Optional[Tuple[float, float]] = None
+    ) -> RoutePlan:
+        import numpy as np
+
+        from app.scheduling.route import distance_matrix, solve_route
+
+        end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        tasks = await self.tasks.get_pending_and_overdue(user_id)
+        last_inspected = await self.summaries.get_last_inspected(user_id)
+
+        hive_ids = {t.hive_id for t in tasks if t.hive_id and not t.apiary_id}
+        hive_ids |= set(last_inspected)
+        hive_apiary = (
+            {h.id: h.apiary_id for h in await self.hives.get_by_ids(list(hive_ids))}
+            if hive_ids else {}
+        )
+        apiary_ids = {t.apiary_id for t in tasks if t.apiary_id} | set(hive_apiary.values())
+        apiaries = {a.id: a for a in await self.apiaries.get_by_ids(list(apiary_ids))}
+        mapped = [a for a in apiaries.values() if a.latitude is not None and a.longitude is not None]
+        index, matrix = self.cache.get(user_id, mapped)
+
+        # Group the day's work per apiary (None: no known location).
+        work: Dict[Optional[str], _Stop] = {}
+        inspection_tasks = set()
+        for task in tasks:
+            if _as_utc(task.due_date) >= end:
+                continue
+            apiary_id = task.apiary_id or hive_apiary.get(task.hive_id)
+            stop = work.setdefault(apiary_id, _Stop())
+            stop.task_ids.append(task.id)
+            stop.minutes += task.estimated_duration_minutes or ROUTE_DEFAULT_TASK_MINUTES
+            if task.task_type == TaskType.INSPECTION and task.hive_id:
+                inspection_tasks.add(task.hive_id)
+        due_before = end - timedelta(days=INSPECTION_DUE_DAYS)
+        for hive_id, last in sorted(last_inspected.items()):
+            # A scheduled inspection task already covers (and times) the visit.
+            if last is None or hive_id in inspection_tasks or hive_id not in hive_apiary:
+                continue
+            if _as_utc(last) <= due_before:
+                stop = work.setdefault(hive_apiary[hive_id], _Stop())
+                stop.hive_ids.append(hive_id)
+                stop.minutes += ROUTE_INSPECTION_MINUTES
+
+        unrouted = []
+        routable = []
+        for apiary_id, stop in work.items():
+            if apiary_id in index:
+                routable.append(apiary_id)
+                continue
+            reason = "No apiary" if apiary_id is None or apiary_id not in apiaries else (
+                "Apiary has no coordinates")
+            unrouted.append(RouteUnrouted(apiary_id=apiary_id, task_ids=stop.task_ids,
+                                          inspection_hive_ids=stop.hive_ids, reason=reason))
+        routable.sort()
+
+        rows = [index[a] for a in routable]
+        sub = matrix[np.ix_(rows, rows)]
+        # Distance from the start point to each stop (zero without one).
+        lead = np.zeros(len(routable))
+        if start is not None and routable:
+            points = [start] + [(apiaries[a].latitude, apiaries[a].longitude) for a in routable]
+            lead = distance_matrix(points)[0, 1:]
+            with_start = np.block([[np.zeros((1, 1)), lead[None, :]], [lead[:, None], sub]])
+            order = [i - 1 for i in solve_route(with_start, start=0)[1:]]
+        else:
+            order = solve_route(sub)
+
+        stops = []
+        clock = total_km = total_travel = 0.0
+        for position, node in enumerate(order, start=1):
+            km = float(lead[node] if position == 1 else sub[order[position - 2], node])
+            travel = km / ROUTE_SPEED_KMH * 60
+            clock += travel
+            apiary = apiaries[routable[node]]
+            stop = work[apiary.id]
+            stops.append(RouteStop(
+                order=position,
+                apiary_id=apiary.id,
+                apiary_name=apiary.name,
+                latitude=apiary.latitude,
+                longitude=apiary.longitude,
+                distance_km=round(km, 2),
+                travel_minutes=round(travel, 1),
+                arrival_minutes=round(clock, 1),
+                service_minutes=stop.minutes,
+                task_ids=stop.task_ids,
+                inspection_hive_ids=stop.hive_ids,
+            ))
+            clock += stop.minutes
+            total_km += km
+            total_travel += travel
+
+        return RoutePlan(
+            day=day,
+            stops=stops,
+            unrouted=unrouted,
+            total_distance_km=round(total_km, 2),
+            total_travel_minutes=round(total_travel, 1),
+            total_service_minutes=sum(s.service_minutes for s in stops),
+        )
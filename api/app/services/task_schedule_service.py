@@ -0,0 +1,180 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from assistive_core import weather_client
+
+from app.models import Task, TaskPriority
+from app.repositories import ApiaryRepository, HiveRepository, TaskRepository
+from app.scheduling import HourForecast, PlanTask, duration_hours, solve
+from app.schemas import TaskSchedulePlan, TaskScheduleSlot, TaskScheduleUnplanned
+
+SCHEDULE_HORIZON_HOURS = int(os.getenv("SCHEDULE_HORIZON_HOURS", "72"))
+SCHEDULE_MAX_HORIZON_HOURS = 168
+# Working day, in UTC hours (the API has no per-user timezone).
+SCHEDULE_DAY_START_HOUR = int(os.getenv("SCHEDULE_DAY_START_HOUR", "9"))
+SCHEDULE_DAY_END_HOUR = int(os.getenv("SCHEDULE_DAY_END_HOUR", "18"))
+SCHEDULE_MAX_WIND_MS = float(os.getenv("SCHEDULE_MAX_WIND_MS", "8"))
+SCHEDULE_TIME_BUDGET_SECONDS = float(os.getenv("SCHEDULE_TIME_BUDGET_SECONDS", "0.5"))
+
+PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 1.0,
+    TaskPriority.MEDIUM: 2.0,
+    TaskPriority.HIGH: 4.0,
+    TaskPriority.URGENT: 8.0,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _is_wet(code: Optional[int]) -> bool:
+    # WMO codes: drizzle/rain 51-67, showers 80-82, thunderstorm 95+
+    if code is None:
+        return False
+    return 51 <= code <= 67 or 80 <= code <= 82 or code >= 95
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return _as_utc(value)
+    if isinstance(value, str):
+        try:
+            return _as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return None
+    return None
+
+
+def forecast_hours(forecast: Optional[dict], origin: datetime) -> List[HourForecast]:
+    """Hourly entries of an upstream forecast. Entries without a parseable
+    ``time`` are taken as consecutive hours from ``origin``."""
+    hours = []
+    for i, entry in enumerate((forecast or {}).get("hours") or []):
+        start = _parse_time(entry.get("time")) or origin + timedelta(hours=i)
+        hours.append(
+            HourForecast(
+                start=start.replace(minute=0, second=0, microsecond=0),
+                temperature_c=entry.get("temperature_c"),
+                wind_speed_ms=entry.get("wind_speed_ms"),
+                wet=_is_wet(entry.get("weather_code")),
+            )
+        )
+    return hours
+
+
+class TaskScheduleService:
+    """Proposes (and optionally applies) due dates for a user's open
+    weather-dependent tasks from the cached forecast of each task's apiary."""
+
+    def __init__(self, weather=weather_client):
+        self.tasks = TaskRepository()
+        self.hives = HiveRepository()
+        self.apiaries = ApiaryRepository()
+        self.weather = weather
+
+    async def optimize(
+        self,
+        user_id: str,
+        horizon_hours: int = SCHEDULE_HORIZON_HOURS,
+        apply: bool = False,
+        now: Optional[datetime] = None,
+    ) -> TaskSchedulePlan:
+        now = now or datetime.now(timezone.utc)
+        origin = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        horizon_hours = max(1, min(horizon_hours, SCHEDULE_MAX_HORIZON_HOURS))
+
+        tasks = await self.tasks.get_schedulable(user_id)
+        apiary_of = await self._apiary_ids(tasks)
+        forecasts = await self._forecasts(set(apiary_of.values()), origin, horizon_hours)
+
+        plan = solve(
+            [
+                PlanTask(
+                    id=task.id,
+                    location=apiary_of.get(task.id),
+                    weight=PRIORITY_WEIGHTS.get(task.priority, 1.0),
+                    due=_as_utc(task.due_date),
+                    duration_hours=duration_hours(task.estimated_duration_minutes),
+                    minimum_temperature=task.minimum_temperature,
+                )
+                for task in tasks
+            ],
+            forecasts,
+            origin,
+            horizon_hours,
+            day=(SCHEDULE_DAY_START_HOUR, SCHEDULE_DAY_END_HOUR),
+            max_wind_ms=SCHEDULE_MAX_WIND_MS,
+            time_budget=SCHEDULE_TIME_BUDGET_SECONDS,
+        )
+
+        by_id = {task.id: task for task in tasks}
+        slots = [
+            TaskScheduleSlot(
+                task_id=a.task_id,
+                title=by_id[a.task_id].title,
+                apiary_id=apiary_of.get(a.task_id),
+                priority=by_id[a.task_id].priority,
+                current_due_date=_as_utc(by_id[a.task_id].due_date),
+                proposed_start=a.start,
+                proposed_end=a.end,
+                minimum_temperature=by_id[a.task_id].minimum_temperature,
+                forecast_temperature_c=a.temperature_c,
+            )
+            for a in plan.assignments
+        ]
+        unplanned = [
+            TaskScheduleUnplanned(task_id=task_id, title=by_id[task_id].title, reason=reason)
+            for task_id, reason in plan.unplanned.items()
+        ]
+
+        updated = 0
+        if apply:
+            updated = await self.tasks.set_due_dates(
+                user_id, {slot.task_id: slot.proposed_start for slot in slots}, now
+            )
+        return TaskSchedulePlan(
+            slots=slots,
+            unplanned=unplanned,
+            horizon_start=origin,
+            horizon_hours=horizon_hours,
+            cost=round(plan.cost, 2),
+            solve_ms=round(plan.solve_ms, 2),
+            applied=apply,
+            updated=updated,
+        )
+
+    async def _apiary_ids(self, tasks: List[Task]) -> Dict[str, str]:
+        """task id -> apiary id, falling back to the hive's apiary."""
+        result = {task.id: task.apiary_id for task in tasks if task.apiary_id}
+        hive_ids = list({task.hive_id for task in tasks if not task.apiary_id and task.hive_id})
+        if hive_ids:
+            hive_apiary = {hive.id: hive.apiary_id for hive in await self.hives.get_by_ids(hive_ids)}
+            for task in tasks:
+                if task.id not in result and task.hive_id in hive_apiary:
+                    result[task.id] = hive_apiary[task.hive_id]
+        return result
+
+    async def _forecasts(
+        self, apiary_ids: set, origin: datetime, horizon_hours: int
+    ) -> Dict[str, List[HourForecast]]:
+        if not apiary_ids or self.weather is None:
+            return {}
+        apiaries = [
+            a
+            for a in await self.apiaries.get_by_ids(sorted(apiary_ids))
+            if a.latitude is not None and a.longitude is not None
+        ]
+        # One extra hour covers the partial hour before ``origin``.
+        raw = await self.weather.get_forecast_batch(
+            [(a.latitude, a.longitude) for a in apiaries], hours=horizon_hours + 1
+        )
+        forecasts = {}
+        for apiary, forecast in zip(apiaries, raw):
+            hours = forecast_hours(forecast, origin - timedelta(hours=1))
+            if hours:
+                forecasts[apiary.id] = hours
+        return forecasts
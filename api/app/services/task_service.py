@@ -1,20 +1,64 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 
 from assistive_core import announce
 
 from app.models import Task, TaskStatus
-from app.repositories import TaskRepository
+from app.repositories import TaskRepository, TaskQuery
 from app.schemas import TaskCreate, TaskUpdate, TaskResponse
 
+from .recurrence_service import RecurrenceService, start_series
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Motor hands BSON datetimes back naive (UTC); make them comparable to now.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def derive_overdue(response: TaskResponse, now: Optional[datetime] = None) -> TaskResponse:
+    """Report a past-due PENDING task as OVERDUE.
+
+    Overdue is derived at read time so reads (and exports) never depend on
+    the background sweep (or a client-issued write) having run first.
+    """
+    if response.status == TaskStatus.PENDING and _as_utc(response.due_date) < (
+        now or datetime.now(timezone.utc)
+    ):
+        response.status = TaskStatus.OVERDUE
+    return response
+
+
+def _to_response(task: Task) -> TaskResponse:
+    return derive_overdue(TaskResponse.model_validate(task))
+
+
+def _matches(task: Task, query: TaskQuery) -> bool:
+    """In-memory twin of ``build_task_filter`` for query-time (virtual)
+    occurrences, which are always PENDING and in the future."""
+    if query.hive_id is not None and task.hive_id != query.hive_id:
+        return False
+    if query.apiary_id is not None and task.apiary_id != query.apiary_id:
+        return False
+    if query.priorities and task.priority not in query.priorities:
+        return False
+    if query.task_types and task.task_type not in query.task_types:
+        return False
+    if query.statuses and TaskStatus.PENDING not in query.statuses:
+        return False
+    return True
+
 
 class TaskService:
     def __init__(self):
         self.repository = TaskRepository()
+        self.recurrence = RecurrenceService()
 
     async def get_all_tasks(self, user_id: str) -> List[TaskResponse]:
         tasks = await self.repository.get_by_user_id(user_id)
-        return [TaskResponse.model_validate(task) for task in tasks]
+        return [_to_response(task) for task in tasks]
 
     async def get_task(self, task_id: str, user_id: str) -> TaskResponse:
         task = await self.repository.get_by_id(task_id)
@@ -27,35 +71,79 @@ class TaskService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to access this task",
             )
-        return TaskResponse.model_validate(task)
+        return _to_response(task)
 
     async def get_tasks_by_status(
         self, user_id: str, task_status: TaskStatus
     ) -> List[TaskResponse]:
-        tasks = await self.repository.get_by_status(user_id, task_status)
-        return [TaskResponse.model_validate(task) for task in tasks]
+        tasks = await self.repository.get_by_effective_status(user_id, task_status)
+        return [_to_response(task) for task in tasks]
 
     async def get_pending_tasks(self, user_id: str) -> List[TaskResponse]:
         tasks = await self.repository.get_pending_and_overdue(user_id)
-        return [TaskResponse.model_validate(task) for task in tasks]
+        return [_to_response(task) for task in tasks]
 
     async def get_upcoming_tasks(self, user_id: str, days: int = 7) -> List[TaskResponse]:
         tasks = await self.repository.get_upcoming(user_id, days)
-        return [TaskResponse.model_validate(task) for task in tasks]
+        responses = [_to_response(task) for task in tasks]
+        now = datetime.now(timezone.utc)
+        return await self._with_virtual(
+            responses, TaskQuery(user_id=user_id), now, now + timedelta(days=days)
+        )
+
+    async def query_tasks(
+        self, query: TaskQuery
+    ) -> Tuple[List[TaskResponse], Optional[str]]:
+        """Combined-filter task list. Returns ``(tasks, next_cursor)``."""
+        try:
+            tasks, next_cursor = await self.repository.query(query)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        responses = [_to_response(task) for task in tasks]
+        # Only unpaginated windows mix in query-time occurrences; a keyset page
+        # must stay a pure index read.
+        if query.limit is None and query.cursor is None and query.due_before is not None:
+            now = datetime.now(timezone.utc)
+            start = max(now, _as_utc(query.due_after)) if query.due_after else now
+            responses = await self._with_virtual(
+                responses, query, start, _as_utc(query.due_before)
+            )
+        return responses, next_cursor
+
+    async def _with_virtual(
+        self,
+        responses: List[TaskResponse],
+        query: TaskQuery,
+        start: datetime,
+        end: datetime,
+    ) -> List[TaskResponse]:
+        """Past the materialised horizon, recurring series are expanded at
+        query time rather than stored."""
+        if end <= self.recurrence.horizon():
+            return responses
+        virtual = await self.recurrence.expand_virtual(query.user_id, start, end)
+        for task in virtual:
+            if not _matches(task, query):
+                continue
+            response = _to_response(task)
+            response.is_virtual = True
+            responses.append(response)
+        responses.sort(key=lambda r: _as_utc(r.due_date), reverse=query.descending)
+        return responses
 
     async def get_overdue_tasks(self, user_id: str) -> List[TaskResponse]:
         tasks = await self.repository.get_overdue(user_id)
-        return [TaskResponse.model_validate(task) for task in tasks]
+        return [_to_response(task) for task in tasks]
 
     async def get_tasks_by_hive(self, hive_id: str, user_id: str) -> List[TaskResponse]:
-        tasks = await self.repository.get_by_hive_id(hive_id)
-        user_tasks = [task for task in tasks if task.user_id == user_id]
-        return [TaskResponse.model_validate(task) for task in user_tasks]
+        tasks = await self.repository.get_by_hive_for_user(hive_id, user_id)
+        return [_to_response(task) for task in tasks]
 
     async def get_tasks_by_apiary(self, apiary_id: str, user_id: str) -> List[TaskResponse]:
-        tasks = await self.repository.get_by_apiary_id(apiary_id)
-        user_tasks = [task for task in tasks if task.user_id == user_id]
-        return [TaskResponse.model_validate(task) for task in user_tasks]
+        tasks = await self.repository.get_by_apiary_for_user(apiary_id, user_id)
+        return [_to_response(task) for task in tasks]
 
     async def create_task(
         self, task_data: TaskCreate, task_id: str, user_id: str
@@ -66,34 +154,34 @@ class TaskService:
             status=TaskStatus.PENDING,
             **task_data.model_dump(),
         )
+        if task.recurrence_frequency is not None:
+            start_series(task)
         created_task = await self.repository.create(task)
+        if created_task.recurrence_frequency is not None:
+            await self.recurrence.materialize_series(created_task)
 
         # Registry-driven, best-effort follower fan-out (content + visibility
         # come from the task FeedSource; announce() never raises).
         await announce(created_task)
 
-        return TaskResponse.model_validate(created_task)
+        return _to_response(created_task)
 
     async def update_task(
         self, task_id: str, task_data: TaskUpdate, user_id: str
     ) -> TaskResponse:
-        task = await self.repository.get_by_id(task_id)
-        if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-            )
-        if task.user_id != user_id:
+        update_data = task_data.model_dump(exclude_unset=True)
+        updated_task = await self.repository.update_fields(task_id, user_id, update_data)
+        if not updated_task:
+            # Missing or not the caller's; only this path pays a second read.
+            if not await self.repository.get_by_id(task_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to modify this task",
             )
-
-        update_data = task_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(task, key, value)
-
-        updated_task = await self.repository.update(task)
-        return TaskResponse.model_validate(updated_task)
+        return _to_response(updated_task)
 
     async def complete_task(self, task_id: str, user_id: str) -> TaskResponse:
         task = await self.repository.get_by_id(task_id)
@@ -107,7 +195,9 @@ class TaskService:
                 detail="Not authorized to modify this task",
             )
         completed_task = await self.repository.mark_as_completed(task)
-        return TaskResponse.model_validate(completed_task)
+        # Recurring: make sure the next occurrence exists (one upsert).
+        await self.recurrence.spawn_next(completed_task)
+        return _to_response(completed_task)
 
     async def delete_task(self, task_id: str, user_id: str) -> None:
         task = await self.repository.get_by_id(task_id)
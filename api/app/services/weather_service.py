@@ -1,9 +1,65 @@
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+
+from assistive_core import weather_client
+
+from app.models import Apiary
+from app.repositories import ApiaryRepository
 from app.schemas import WeatherResponse, WeatherCondition
 
 
+# WMO weather interpretation codes (as reported upstream) -> our conditions
+def _condition(code: Optional[int]) -> WeatherCondition:
+    if code is None or code == 0:
+        return WeatherCondition.SUNNY
+    if code in (1, 2):
+        return WeatherCondition.PARTLY_CLOUDY
+    if code >= 95:
+        return WeatherCondition.STORMY
+    if 51 <= code <= 67 or 80 <= code <= 82:
+        return WeatherCondition.RAINY
+    return WeatherCondition.CLOUDY
+
+
+def _advice(temp_c: Optional[float], wind_ms: Optional[float], condition: WeatherCondition) -> str:
+    if condition in (WeatherCondition.RAINY, WeatherCondition.STORMY):
+        return "Wet weather: keep hives closed today."
+    if temp_c is not None and temp_c < 13:
+        return "Too cool to open hives without chilling the brood."
+    if wind_ms is not None and wind_ms > 7:
+        return "Windy: bees will be defensive, postpone inspections if you can."
+    return "Good conditions for hive work. The bees will be calm and active today."
+
+
+def to_weather_response(data: dict, apiary_id: Optional[str] = None) -> WeatherResponse:
+    """Map an upstream current-conditions dict (all fields optional)."""
+    temp_c = data.get("temperature_c")
+    wind_ms = data.get("wind_speed_ms")
+    humidity = data.get("relative_humidity", data.get("humidity"))
+    condition = _condition(data.get("weather_code"))
+    advice = _advice(temp_c, wind_ms, condition)
+    summary = data.get("weather_description")
+    return WeatherResponse(
+        temperature=round(temp_c * 9 / 5 + 32) if temp_c is not None else 0,
+        humidity=round(humidity) if humidity is not None else 0,
+        wind_speed=round(wind_ms * 2.23694) if wind_ms is not None else 0,
+        condition=condition,
+        description=f"{summary}. {advice}" if summary else advice,
+        apiary_id=apiary_id,
+        temperature_c=temp_c,
+        wind_speed_ms=wind_ms,
+        source=data.get("source"),
+    )
+
+
 class WeatherService:
+    def __init__(self, client=weather_client):
+        self.client = client
+        self.apiaries = ApiaryRepository()
+
     def get_current_weather(self) -> WeatherResponse:
-        """Returns mock weather data. In production, this would call a real weather API."""
+        """Returns mock weather data; used when no apiary is given."""
         return WeatherResponse(
             temperature=72,
             humidity=10,
@@ -11,3 +67,36 @@ class WeatherService:
             condition=WeatherCondition.SUNNY,
             description="Good conditions for hive work. The bees will be calm and active today.",
         )
+
+    async def get_apiary_weather(self, apiary_id: str) -> WeatherResponse:
+        apiary = await self.apiaries.get_by_id(apiary_id)
+        if not apiary:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Apiary not found"
+            )
+        if apiary.latitude is None or apiary.longitude is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Apiary has no coordinates",
+            )
+        data = await self.client.get_current_weather(apiary.latitude, apiary.longitude)
+        if data is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Weather service unavailable",
+            )
+        return to_weather_response(data, apiary.id)
+
+    async def get_all_apiary_weather(self) -> List[WeatherResponse]:
+        """Current weather for every apiary with coordinates, fetched as one
+        batch (nearby apiaries share a cached upstream call). Apiaries whose
+        weather is unavailable are left out."""
+        apiaries: List[Apiary] = await self.apiaries.get_with_coordinates()
+        results = await self.client.get_current_weather_batch(
+            [(apiary.latitude, apiary.longitude) for apiary in apiaries]
+        )
+        return [
+            to_weather_response(data, apiary.id)
+            for apiary, data in zip(apiaries, results)
+            if data is not None
+        ]
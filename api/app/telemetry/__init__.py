@@ -0,0 +1,52 @@
+"""Request and MongoDB instrumentation.
+
+``TimingMiddleware`` times each request and adds a ``Server-Timing`` header;
+``MongoCommandListener`` charges every MongoDB command to the request that
+issued it and aggregates slow queries by filter shape. Both feed
+``registry``; ``render()`` adds assistive-core's connection-pool and
+request-cache counters
+and produces the Prometheus text served at ``/metrics``. ``StartupProfile``
+times the phases of a worker's startup. ``explain`` holds the plan analysis
+used by the index advisor benchmark.
+"""
+import os
+
+from assistive_core import pool_metrics, request_cache_metrics
+
+from .explain import PlanStats, QueryRecorder, analyze_explain, covering_index, suggest_index
+from .middleware import TimingMiddleware
+from .mongo import MongoCommandListener, RequestStats, current_request, filter_shape
+from .registry import MetricsRegistry, render_pools, render_request_cache
+from .startup import StartupProfile
+
+METRICS_SLOW_QUERIES = int(os.getenv("METRICS_SLOW_QUERIES", "20"))
+
+registry = MetricsRegistry(slow_query_limit=METRICS_SLOW_QUERIES)
+command_listener = MongoCommandListener(registry)
+
+
+def render() -> str:
+    return (
+        registry.render()
+        + render_pools(pool_metrics())
+        + render_request_cache(request_cache_metrics())
+    )
+
+
+__all__ = [
+    "MetricsRegistry",
+    "MongoCommandListener",
+    "PlanStats",
+    "QueryRecorder",
+    "RequestStats",
+    "StartupProfile",
+    "TimingMiddleware",
+    "analyze_explain",
+    "command_listener",
+    "covering_index",
+    "current_request",
+    "filter_shape",
+    "registry",
+    "render",
+    "suggest_index",
+]
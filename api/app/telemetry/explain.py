@@ -0,0 +1,230 @@
+"""Explain-plan analysis behind ``benchmarks/index_advisor.py``.
+
+``QueryRecorder`` is a pymongo command listener, like ``MongoCommandListener``,
+that keeps the read commands issued inside ``recording(label)``. The advisor
+therefore explains the exact filters and sorts the repositories build, not a
+hand-copied version of them. ``analyze_explain`` reduces an
+``executionStats`` explain to the facts worth flagging; ``suggest_index``
+proposes an equality, sort, range compound index for a command.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+from .mongo import filter_shape
+
+EXPLAINABLE_COMMANDS = ("find", "aggregate", "count", "distinct")
+# Session/transport fields the driver adds; the explain command rejects or
+# ignores them.
+_TRANSPORT_FIELDS = {
+    "$db", "lsid", "$clusterTime", "$readPreference", "txnNumber", "signature", "readConcern",
+}
+# Plan children, across the classic and slot-based (queryPlan) formats.
+_CHILD_STAGES = ("inputStage", "queryPlan", "thenStage", "elseStage", "outerStage", "innerStage")
+_GEO_OPERATORS = {"$geoWithin", "$geoIntersects", "$near", "$nearSphere"}
+
+IndexKey = List[Tuple[str, int]]
+
+
+@dataclass
+class CapturedQuery:
+    database: str
+    collection: str
+    command_name: str
+    command: dict
+    shape: str
+    labels: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """Identity of the query shape: filter shape plus sort keys."""
+        sort = self.command.get("sort") or {}
+        return f"{self.collection} {self.command_name} {self.shape} sort={json.dumps(list(sort.items()))}"
+
+
+class QueryRecorder(monitoring.CommandListener):
+    """Keeps the explainable commands issued while a label is set,
+    de-duplicated by shape (``labels`` lists every caller of a shape)."""
+
+    def __init__(self):
+        self.label: Optional[str] = None
+        self.queries: Dict[str, CapturedQuery] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def recording(self, label: str) -> Iterator[None]:
+        self.label = label
+        try:
+            yield
+        finally:
+            self.label = None
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        label = self.label
+        if label is None or event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        command = {k: v for k, v in event.command.items() if k not in _TRANSPORT_FIELDS}
+        query = CapturedQuery(
+            event.database_name,
+            command.get(event.command_name),
+            event.command_name,
+            command,
+            filter_shape(event.command_name, command),
+        )
+        with self._lock:
+            query = self.queries.setdefault(query.key, query)
+            if label not in query.labels:
+                query.labels.append(label)
+
+    def succeeded(self, event) -> None:
+        pass
+
+    def failed(self, event) -> None:
+        pass
+
+
+@dataclass
+class PlanStats:
+    stages: List[str]
+    indexes: List[str]
+    keys_examined: int
+    docs_examined: int
+    returned: int
+    collscan: bool
+    in_memory_sort: bool
+
+    @property
+    def examined_per_returned(self) -> float:
+        return max(self.keys_examined, self.docs_examined) / max(self.returned, 1)
+
+    def flags(self, max_ratio: float = 10.0, min_examined: int = 100) -> List[str]:
+        """``collscan``, ``in_memory_sort`` and ``poor_selectivity`` (more
+        than ``max_ratio`` keys or documents read per row returned, once at
+        least ``min_examined`` were read)."""
+        flags = []
+        if self.collscan:
+            flags.append("collscan")
+        if self.in_memory_sort:
+            flags.append("in_memory_sort")
+        examined = max(self.keys_examined, self.docs_examined)
+        if examined >= min_examined and self.examined_per_returned > max_ratio:
+            flags.append("poor_selectivity")
+        return flags
+
+
+def _find(doc: Any, key: str) -> Any:
+    """First value stored under ``key`` anywhere in ``doc`` (explain output
+    nests it differently for find, aggregate and sharded clusters)."""
+    if isinstance(doc, dict):
+        if key in doc:
+            return doc[key]
+        children = doc.values()
+    elif isinstance(doc, list):
+        children = doc
+    else:
+        return None
+    for child in children:
+        found = _find(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _plan_stages(plan: Any) -> Iterator[dict]:
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan
+    for key in _CHILD_STAGES:
+        yield from _plan_stages(plan.get(key))
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+def analyze_explain(explain: dict) -> PlanStats:
+    """Summarise an ``explain`` run with ``executionStats`` verbosity."""
+    planner = _find(explain, "queryPlanner") or {}
+    stages = list(_plan_stages(planner.get("winningPlan", {})))
+    execution = _find(explain, "executionStats") or {}
+    names = [stage["stage"] for stage in stages]
+    # An aggregate $sort that was not pushed into the query layer runs as a
+    # separate blocking pipeline stage.
+    pipeline_sort = any("$sort" in stage for stage in explain.get("stages", []) or [])
+    return PlanStats(
+        stages=names,
+        indexes=[stage["indexName"] for stage in stages if "indexName" in stage],
+        keys_examined=execution.get("totalKeysExamined", 0),
+        docs_examined=execution.get("totalDocsExamined", 0),
+        returned=execution.get("nReturned", 0),
+        collscan="COLLSCAN" in names,
+        in_memory_sort="SORT" in names or pipeline_sort,
+    )
+
+
+def _filter_and_sort(command_name: str, command: dict) -> Tuple[dict, dict]:
+    if command_name == "find":
+        return command.get("filter") or {}, command.get("sort") or {}
+    if command_name in ("count", "distinct"):
+        return command.get("query") or {}, {}
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        if pipeline and "$match" in pipeline[0]:
+            following = pipeline[1] if len(pipeline) > 1 else {}
+            return pipeline[0]["$match"], following.get("$sort") or {}
+    return {}, {}
+
+
+def _conjuncts(spec: dict) -> Iterator[Tuple[str, Any]]:
+    """``(field, condition)`` pairs ANDed at the top level; ``$or`` branches
+    are skipped (they are planned per branch)."""
+    for name, condition in spec.items():
+        if name == "$and":
+            for clause in condition:
+                yield from _conjuncts(clause)
+        elif not name.startswith("$"):
+            yield name, condition
+
+
+def suggest_index(command_name: str, command: dict) -> Optional[IndexKey]:
+    """An equality, sort, range compound index for ``command``: exact-match
+    fields first, then the sort keys, then range predicates. ``$in`` counts
+    as equality unless the query also sorts, where it behaves as a range.
+    None when there is nothing to index (empty filter, geo queries)."""
+    spec, sort = _filter_and_sort(command_name, command)
+    equality: List[str] = []
+    ranges: List[str] = []
+    for name, condition in _conjuncts(spec):
+        # Anything but a literal, $eq or (unsorted) $in is a range here.
+        operators = (
+            {op for op in condition if op.startswith("$")} if isinstance(condition, dict) else set()
+        )
+        if operators & _GEO_OPERATORS:
+            return None
+        if not operators or operators == {"$eq"} or (operators == {"$in"} and not sort):
+            target = equality
+        else:
+            target = ranges
+        if name not in equality and name not in ranges:
+            target.append(name)
+    key: IndexKey = [(name, 1) for name in equality]
+    key += [
+        (name, direction if isinstance(direction, int) else 1)  # {"$meta": ...} sorts
+        for name, direction in sort.items()
+        if name not in equality
+    ]
+    used = {name for name, _ in key}
+    key += [(name, 1) for name in ranges if name not in used]
+    return key or None
+
+
+def covering_index(suggestion: IndexKey, indexes: Sequence[IndexKey]) -> Optional[IndexKey]:
+    """An existing index that starts with ``suggestion`` (so adding it would
+    not help; the planner chose not to use the one that exists)."""
+    for index in indexes:
+        if [tuple(part) for part in index[: len(suggestion)]] == [tuple(p) for p in suggestion]:
+            return index
+    return None
@@ -0,0 +1,65 @@
+"""ASGI middleware timing every HTTP request.
+
+Records latency per route template (``/api/hives/{hive_id}``, never the raw
+path) plus the request's MongoDB command count and DB time, and reports both
+to the client in a ``Server-Timing`` header. The header is written when the
+response starts, so for streamed bodies it covers the work done up to the
+first byte; the histograms cover the whole request.
+
+Each request also runs in an assistive-core ``request_scope()``: the
+identity map and query cache that repositories consult. Its hits, one
+round trip saved each, are reported with the DB numbers.
+"""
+import time
+
+from assistive_core import request_scope
+
+from .mongo import RequestStats, current_request
+from .registry import MetricsRegistry
+
+
+class TimingMiddleware:
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.commands} commands", '
+                    f'cache;desc="{cache.hits} hits"'
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with request_scope() as cache:
+                await self.app(scope, receive, send_timed)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - started,
+                stats.commands,
+                stats.db_seconds,
+                cache.hits,
+            )
@@ -0,0 +1,102 @@
+"""pymongo command listener feeding the metrics registry.
+
+Motor runs pymongo on executor threads but copies the caller's context into
+them, so the listener sees the ``RequestStats`` the timing middleware put in
+``current_request`` and can charge each command to the request that issued
+it. Commands outside a request (jobs, startup) only feed the global
+per-command metrics.
+"""
+import json
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+from .registry import MetricsRegistry
+
+SHAPE_MAX_CHARS = 300
+
+
+class RequestStats:
+    def __init__(self):
+        self.commands = 0
+        self.db_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.commands += 1
+            self.db_seconds += seconds
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _shape(value: Any) -> Any:
+    """``value`` with every literal replaced by ``"?"``; keys and operators
+    are kept, so queries differing only in ids share a shape."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        documents = [_shape(item) for item in value if isinstance(item, dict)]
+        # A list of literals ($in, coordinates) collapses to one marker.
+        return documents or "?"
+    return "?"
+
+
+def filter_shape(command_name: str, command: dict) -> str:
+    """The filter (or pipeline stages) of a read/write command, values
+    stripped; empty for commands without one (inserts, getMore, admin)."""
+    if command_name in ("find", "distinct"):
+        spec: Any = command.get("filter", command.get("query", {}))
+    elif command_name == "findAndModify":
+        spec = command.get("query", {})
+    elif command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or []
+        spec = statements[0].get("q", {}) if statements else {}
+    elif command_name == "count":
+        spec = command.get("query", {})
+    elif command_name == "aggregate":
+        spec = [
+            {name: _shape(body) if name in ("$match", "$geoNear") else "..."}
+            for stage in command.get("pipeline", [])
+            for name, body in stage.items()
+        ]
+        return json.dumps(spec, separators=(",", ":"), default=str)[:SHAPE_MAX_CHARS]
+    else:
+        return ""
+    return json.dumps(_shape(spec), separators=(",", ":"), default=str)[:SHAPE_MAX_CHARS]
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._started: Dict[Tuple[Any, int], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = event.command.get(event.command_name)
+        collection = collection if isinstance(collection, str) else ""
+        if event.command_name == "getMore":
+            collection = event.command.get("collection", "")
+        shape = filter_shape(event.command_name, event.command)
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (collection, shape)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool) -> None:
+        with self._lock:
+            collection, shape = self._started.pop(
+                (event.connection_id, event.request_id), ("", "")
+            )
+        seconds = event.duration_micros / 1e6
+        self.registry.observe_command(event.command_name, collection, shape, seconds, failed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.add(seconds)
@@ -0,0 +1,232 @@
+"""In-process metric store rendered in the Prometheus text format.
+
+Histograms are cumulative-bucket counters keyed by a label tuple. Slow
+queries are aggregated per filter shape (values stripped) so one hot query
+pattern is a single entry however many ids it was called with. Observations
+come from request tasks and from Motor's executor threads (command
+listener), so every update takes the registry lock.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Labels, Tuple[List[int], float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        counts, total = self._series.get(labels) or ([0] * (len(self.buckets) + 1), 0.0)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._series[labels] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            base = _labels(self.labels, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{base}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base.rstrip(',')}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{base.rstrip(',')}}} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Labels, values: Labels) -> str:
+    """``a="x",b="y",`` (trailing comma, so ``le`` can follow)."""
+    return "".join(f'{n}="{_escape(v)}",' for n, v in zip(names, values))
+
+
+@dataclass
+class SlowQuery:
+    command: str
+    collection: str
+    shape: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass
+class MetricsRegistry:
+    slow_query_limit: int = 20
+    # Distinct shapes tracked; the fastest are dropped past this.
+    shape_capacity: int = 500
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __post_init__(self):
+        self.request_seconds = Histogram(
+            "http_request_duration_seconds",
+            "Request latency by route template",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.request_db_seconds = Histogram(
+            "http_request_db_seconds",
+            "Time spent in MongoDB commands per request",
+            ("method", "route"),
+            LATENCY_BUCKETS,
+        )
+        self.request_db_commands = Histogram(
+            "http_request_db_commands",
+            "MongoDB commands issued per request",
+            ("method", "route"),
+            COUNT_BUCKETS,
+        )
+        self.request_cache_hits = Histogram(
+            "http_request_cache_hits",
+            "Lookups served by the request cache (round trips saved) per request",
+            ("method", "route"),
+            COUNT_BUCKETS,
+        )
+        self.command_seconds = Histogram(
+            "mongodb_command_duration_seconds",
+            "MongoDB command latency",
+            ("command", "collection"),
+            LATENCY_BUCKETS,
+        )
+        self.command_failures: Dict[Labels, int] = {}
+        self.slow_queries: Dict[Tuple[str, str, str], SlowQuery] = {}
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        db_commands: int,
+        db_seconds: float,
+        cache_hits: int = 0,
+    ) -> None:
+        with self.lock:
+            self.request_seconds.observe((method, route, str(status)), seconds)
+            self.request_db_seconds.observe((method, route), db_seconds)
+            self.request_db_commands.observe((method, route), db_commands)
+            self.request_cache_hits.observe((method, route), cache_hits)
+
+    def observe_command(
+        self, command: str, collection: str, shape: str, seconds: float, failed: bool = False
+    ) -> None:
+        with self.lock:
+            self.command_seconds.observe((command, collection), seconds)
+            if failed:
+                key = (command, collection)
+                self.command_failures[key] = self.command_failures.get(key, 0) + 1
+            if not shape:
+                return
+            entry = self.slow_queries.get((command, collection, shape))
+            if entry is None:
+                if len(self.slow_queries) >= self.shape_capacity:
+                    fastest = min(self.slow_queries, key=lambda k: self.slow_queries[k].max_seconds)
+                    del self.slow_queries[fastest]
+                entry = self.slow_queries[(command, collection, shape)] = SlowQuery(
+                    command, collection, shape
+                )
+            entry.count += 1
+            entry.total_seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+
+    def slowest(self) -> List[SlowQuery]:
+        with self.lock:
+            entries = sorted(self.slow_queries.values(), key=lambda q: q.max_seconds, reverse=True)
+        return entries[: self.slow_query_limit]
+
+    def render(self) -> str:
+        slowest = self.slowest()
+        with self.lock:
+            lines = []
+            for histogram in (
+                self.request_seconds,
+                self.request_db_seconds,
+                self.request_db_commands,
+                self.request_cache_hits,
+                self.command_seconds,
+            ):
+                lines += histogram.render()
+            lines += [
+                "# HELP mongodb_command_failures_total Failed MongoDB commands",
+                "# TYPE mongodb_command_failures_total counter",
+            ]
+            for key, count in sorted(self.command_failures.items()):
+                base = _labels(("command", "collection"), key).rstrip(",")
+                lines.append(f"mongodb_command_failures_total{{{base}}} {count}")
+        names = ("command", "collection", "shape")
+        lines += [
+            "# HELP mongodb_slow_query_max_seconds Slowest observed run per query shape",
+            "# TYPE mongodb_slow_query_max_seconds gauge",
+        ]
+        for q in slowest:
+            base = _labels(names, (q.command, q.collection, q.shape)).rstrip(",")
+            lines.append(f"mongodb_slow_query_max_seconds{{{base}}} {q.max_seconds:.6f}")
+        lines += [
+            "# HELP mongodb_slow_query_calls_total Calls per slow query shape",
+            "# TYPE mongodb_slow_query_calls_total counter",
+        ]
+        for q in slowest:
+            base = _labels(names, (q.command, q.collection, q.shape)).rstrip(",")
+            lines.append(f"mongodb_slow_query_calls_total{{{base}}} {q.count}")
+        return "\n".join(lines) + "\n"
+
+
+POOL_GAUGES = (
+    ("mongodb_pool_max_size", "gauge", "max_size", "Configured maximum pool size"),
+    ("mongodb_pool_open_connections", "gauge", "open", "Open pooled connections"),
+    ("mongodb_pool_in_use_connections", "gauge", "in_use", "Connections checked out"),
+    ("mongodb_pool_checkouts_total", "counter", "checkouts", "Successful checkouts"),
+    ("mongodb_pool_checkout_failures_total", "counter", "checkout_failures", "Failed checkouts"),
+    ("mongodb_pool_checkout_timeouts_total", "counter", "checkout_timeouts",
+     "Checkouts that timed out waiting for a connection"),
+    ("mongodb_pool_checkout_wait_seconds_total", "counter", "wait_seconds_total",
+     "Time spent waiting to check out a connection"),
+    ("mongodb_pool_checkout_wait_seconds_max", "gauge", "wait_seconds_max",
+     "Longest single checkout wait"),
+    ("mongodb_pool_cleared_total", "counter", "cleared", "Pool clears (server errors)"),
+)
+
+
+def render_pools(pools: List[dict]) -> str:
+    """Pool snapshots (``assistive_core.pool_metrics()``) as Prometheus
+    series labelled by client and server address."""
+    lines = []
+    for name, kind, key, help in POOL_GAUGES:
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+        for pool in pools:
+            base = _labels(("client", "address"), (pool["client"], pool["address"])).rstrip(",")
+            lines.append(f"{name}{{{base}}} {pool[key]:g}")
+    return "\n".join(lines) + "\n"
+
+
+def render_request_cache(totals: dict) -> str:
+    """Process-wide request-cache counters
+    (``assistive_core.request_cache_metrics()``)."""
+    lines = []
+    for key, help in (
+        ("hits", "Lookups served by the request cache"),
+        ("misses", "Request-cache lookups that went to the database"),
+        ("invalidations", "Request-cache collection invalidations by writes"),
+    ):
+        name = f"request_cache_{key}_total"
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} counter", f"{name} {totals[key]}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,61 @@
+"""Where a worker's time to ready goes.
+
+``app.main`` starts the clock before its first import and records each
+startup phase (imports, ``init_core``, seeding, scheduler) as it finishes.
+``report()`` is the one-line summary printed when the worker is ready;
+``render()`` exports the same numbers for ``/metrics``.
+"""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class StartupProfile:
+    started: float = field(default_factory=time.perf_counter)
+    # Phase -> seconds, in the order first recorded; a re-run lifespan
+    # (tests) overwrites rather than appends.
+    phases: Dict[str, float] = field(default_factory=dict)
+    # Free-form facts shown after the timings, e.g. index sync outcome.
+    notes: Dict[str, str] = field(default_factory=dict)
+    ready_seconds: Optional[float] = None
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def ready(self) -> float:
+        """Mark the worker ready; returns seconds since ``started``."""
+        self.ready_seconds = time.perf_counter() - self.started
+        return self.ready_seconds
+
+    def report(self) -> str:
+        total = self.ready_seconds if self.ready_seconds is not None else time.perf_counter() - self.started
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()]
+        parts += [f"{key}: {value}" for key, value in self.notes.items()]
+        return f"Ready in {total * 1000:.0f}ms ({', '.join(parts)})"
+
+    def render(self) -> str:
+        lines = [
+            "# HELP app_startup_phase_seconds Time spent in each startup phase",
+            "# TYPE app_startup_phase_seconds gauge",
+        ]
+        lines += [
+            f'app_startup_phase_seconds{{phase="{name}"}} {seconds:.6f}'
+            for name, seconds in self.phases.items()
+        ]
+        if self.ready_seconds is not None:
+            lines += [
+                "# HELP app_startup_seconds Time from first import to ready",
+                "# TYPE app_startup_seconds gauge",
+                f"app_startup_seconds {self.ready_seconds:.6f}",
+            ]
+        return "\n".join(lines) + "\n"
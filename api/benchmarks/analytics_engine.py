@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Analytics engine benchmark
+
+Times InspectionColumns.from_documents (the per-load cost, cached per scope
+version) and compute_metrics (paid on every request) over synthetic
+inspection documents. No database needed; the compute target is <100ms for
+100k inspections on one core.
+
+    python benchmarks/analytics_engine.py [inspections] [hives]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.analytics import InspectionColumns, compute_metrics  # noqa: E402
+from app.analytics.columns import SCORES, to_day  # noqa: E402
+
+
+def _documents(n, hives, now):
+    rng = random.Random(42)
+    populations = list(SCORES["population"])
+    broods = list(SCORES["brood_pattern"])
+    stores = list(SCORES["honey_stores"])
+    for _ in range(n):
+        yield {
+            "hive_id": f"hive-{rng.randrange(hives)}",
+            "inspection_date": now - timedelta(minutes=rng.randrange(60 * 24 * 730)),
+            "queen_seen": rng.random() < 0.6,
+            "varroa_mites_detected": rng.random() < 0.15,
+            "population": rng.choice(populations),
+            "brood_pattern": rng.choice(broods),
+            "honey_stores": rng.choice(stores),
+            "pollen_stores": rng.choice(stores),
+        }
+
+
+def _time_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    hives = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    now = datetime(2026, 10, 1)
+    docs = list(_documents(n, hives, now))
+
+    load_p50, load_max = _time_ms(lambda: InspectionColumns.from_documents(docs), 3)
+    cols = InspectionColumns.from_documents(docs)
+    now_day = to_day(now)
+    compute_metrics(cols, now_day)  # warm-up
+    compute_p50, compute_max = _time_ms(lambda: compute_metrics(cols, now_day), 20)
+
+    print(f"{n} inspections across {hives} hives")
+    print(f"  columns  p50 {load_p50:7.1f}ms  max {load_max:7.1f}ms  (once per scope version)")
+    print(f"  metrics  p50 {compute_p50:7.1f}ms  max {compute_max:7.1f}ms  (per request)")
+
+
+if __name__ == "__main__":
+    main()
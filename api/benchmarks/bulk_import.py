@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Bulk import throughput benchmark
+
+Generates synthetic NDJSON inspections spread over a few hundred hives,
+streams them through ``BulkImporter`` into a throwaway database in 1 MB
+chunks and reports rows/s, plus how long the per-hive summary rebuild took
+as part of the run. The target is 10k+ inspections/s on a local mongod.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/bulk_import.py
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGODB_DB", "beekeeper_bench")
+os.environ.setdefault("IDENTITY_DB", "assistive_identity_bench")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from assistive_core import init_core, close_core  # noqa: E402
+
+from app.feed_sources import FEED_SOURCES  # noqa: E402
+from app.models import DOMAIN_DOCUMENTS, HiveInspectionSummary, Inspection  # noqa: E402
+from app.services.bulk_import import BulkImporter  # noqa: E402
+
+ROWS = int(os.getenv("BENCH_ROWS", "100000"))
+HIVES = int(os.getenv("BENCH_HIVES", "300"))
+CHUNK_BYTES = 1 << 20
+
+
+def _ndjson(now):
+    rng = random.Random(42)
+    hives = [str(uuid.uuid4()) for _ in range(HIVES)]
+    lines = []
+    for _ in range(ROWS):
+        lines.append(json.dumps({
+            "hiveId": rng.choice(hives),
+            "inspectionDate": (now - timedelta(days=rng.randint(0, 3650))).isoformat(),
+            "durationMinutes": rng.randint(10, 60),
+            "queenSeen": rng.random() < 0.6,
+            "eggsSeen": rng.random() < 0.7,
+            "healthStatus": rng.choice(["HEALTHY", "HEALTHY", "CONCERNING"]),
+            "notes": "bench",
+        }))
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def _chunks(data):
+    for offset in range(0, len(data), CHUNK_BYTES):
+        yield data[offset:offset + CHUNK_BYTES]
+
+
+async def main():
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    user_id = str(uuid.uuid4())
+    data = _ndjson(datetime.now(timezone.utc))
+    print(f"{ROWS} inspections across {HIVES} hives, {len(data) / 1e6:.1f} MB NDJSON\n")
+    try:
+        started = time.perf_counter()
+        report = await BulkImporter().run("inspections", user_id, _chunks(data))
+        seconds = time.perf_counter() - started
+        print(f"inserted           {report.inserted}")
+        print(f"failed             {report.failed}")
+        print(f"summaries rebuilt  {report.summaries_rebuilt}")
+        print(f"elapsed            {seconds:.2f}s")
+        print(f"throughput         {report.inserted / seconds:,.0f} rows/s")
+    finally:
+        await Inspection.get_motor_collection().delete_many({"user_id": user_id})
+        await HiveInspectionSummary.get_motor_collection().delete_many({"user_id": user_id})
+        await close_core()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Index advisor: explain every repository query shape
+
+Runs each read query in ``app/repositories`` and the assistive-core
+repositories/services against the seeded bench databases
+(``benchmarks/synthetic_data.py``), with a sample user that has the most
+history. The commands they send are captured by a pymongo listener, so the
+filters and sorts are exactly what the code builds. Each distinct shape is
+then re-run under ``explain`` with ``executionStats``. Explain never
+executes writes, but only reads are captured anyway.
+
+A shape is flagged for a COLLSCAN, an in-memory SORT, or reading more than
+``--max-ratio`` index keys or documents per row returned. Flagged shapes get
+an equality, sort, range compound index suggestion, or the name of an
+existing index that already fits but was not chosen.
+
+Each run is written to ``benchmarks/baselines/explain-<commit>.json``, or to
+``--save``. ``--compare`` exits 1 when a shape picks up a flag that it did
+not have in the earlier baseline; ``--strict`` exits 1 on any flag.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/synthetic_data.py --reset
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/index_advisor.py --compare benchmarks/baselines/explain-abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+os.environ.setdefault("MONGODB_DB", "beekeeper_bench")
+os.environ.setdefault("IDENTITY_DB", "assistive_identity_bench")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pymongo import monitoring  # noqa: E402
+
+from assistive_core import (  # noqa: E402
+    EventRepository,
+    FollowRepository,
+    NotificationRepository,
+    User,
+    close_core,
+    feed_service,
+    follow_service,
+    get_client,
+    get_identity_client,
+    init_core,
+    settings,
+)
+from assistive_core.auth.service import get_user_by_email  # noqa: E402
+
+from app.feed_sources import FEED_SOURCES  # noqa: E402
+from app.models import DOMAIN_DOCUMENTS, Hive, Inspection, TaskPriority, TaskStatus  # noqa: E402
+from app.repositories import (  # noqa: E402
+    AlertQuery,
+    AlertRepository,
+    ApiaryRepository,
+    HiveInspectionSummaryRepository,
+    HiveRepository,
+    InspectionRepository,
+    RecommendationRepository,
+    TaskQuery,
+    TaskRepository,
+)
+from app.telemetry import QueryRecorder, analyze_explain, covering_index, suggest_index  # noqa: E402
+
+from load_test import BASELINE_DIR, git_commit  # noqa: E402
+
+recorder = QueryRecorder()
+# Registered before init_core creates the client so it sees every command.
+monitoring.register(recorder)
+
+
+@dataclass
+class Sample:
+    """Arguments for the queries: the seeded user with the most inspections."""
+
+    user_id: str
+    email: str
+    hive_id: str
+    apiary_id: str
+    hive_ids: List[str]
+    followed_ids: List[str]
+    now: datetime
+
+    @classmethod
+    async def load(cls) -> "Sample":
+        busiest = await Inspection.get_motor_collection().aggregate([
+            {"$group": {"_id": "$user_id", "n": {"$sum": 1}}},
+            {"$sort": {"n": -1}},
+            {"$limit": 1},
+        ]).to_list(length=1)
+        if not busiest:
+            raise SystemExit("No inspections found; run benchmarks/synthetic_data.py first")
+        user_id = busiest[0]["_id"]
+        hive_ids = sorted(
+            await Inspection.get_motor_collection().distinct("hive_id", {"user_id": user_id})
+        )
+        hive = await Hive.get(hive_ids[0])
+        user = await User.get(user_id)
+        return cls(
+            user_id=user_id,
+            email=user.email if user else "",
+            hive_id=hive.id,
+            apiary_id=hive.apiary_id,
+            hive_ids=hive_ids,
+            followed_ids=await follow_service.get_following_ids(user_id) or [user_id],
+            now=datetime.now(timezone.utc),
+        )
+
+
+async def _drain(rows) -> None:
+    async for _ in rows:
+        pass
+
+
+alerts = AlertRepository()
+apiaries = ApiaryRepository()
+hives = HiveRepository()
+summaries = HiveInspectionSummaryRepository()
+inspections = InspectionRepository()
+recommendations = RecommendationRepository()
+tasks = TaskRepository()
+
+# (label, call) pairs; each call issues one or more read commands.
+QUERIES = [
+    ("AlertRepository.query", lambda s: alerts.query(
+        AlertQuery(user_id=s.user_id, dismissed=False, limit=50))),
+    ("AlertRepository.query[hives]", lambda s: alerts.query(
+        AlertQuery(user_id=s.user_id, hive_ids=s.hive_ids, limit=50))),
+    ("ApiaryRepository.get_within_box", lambda s: apiaries.get_within_box(51.0, -2.0, 53.0, 0.0)),
+    ("ApiaryRepository.get_near", lambda s: apiaries.get_near(52.0, -1.0, 25)),
+    ("HiveRepository.get_by_apiary_id", lambda s: hives.get_by_apiary_id(s.apiary_id)),
+    ("HiveRepository.get_ids_changed_since", lambda s: hives.get_ids_changed_since(
+        s.now - timedelta(days=1))),
+    ("HiveRepository.get_ids_last_inspected_between", lambda s: hives.get_ids_last_inspected_between(
+        s.now - timedelta(days=30), s.now)),
+    ("HiveInspectionSummaryRepository.get_for_hives", lambda s: summaries.get_for_hives(s.hive_ids)),
+    ("HiveInspectionSummaryRepository.get_last_inspected", lambda s: summaries.get_last_inspected(
+        s.user_id)),
+    ("HiveInspectionSummaryRepository.get_hive_ids_changed_since",
+     lambda s: summaries.get_hive_ids_changed_since(s.now - timedelta(days=1))),
+    ("HiveInspectionSummaryRepository.get_hive_ids_last_inspected_between",
+     lambda s: summaries.get_hive_ids_last_inspected_between(s.now - timedelta(days=30), s.now)),
+    ("InspectionRepository.get_by_hive_and_user", lambda s: inspections.get_by_hive_and_user(
+        s.hive_id, s.user_id)),
+    ("InspectionRepository.get_history_for_summary", lambda s: inspections.get_history_for_summary(
+        s.hive_id, s.user_id)),
+    ("InspectionRepository.get_varroa_timeline", lambda s: inspections.get_varroa_timeline(
+        s.hive_id, s.user_id)),
+    ("InspectionRepository.get_analytics_rows", lambda s: inspections.get_analytics_rows(s.user_id)),
+    ("InspectionRepository.get_analytics_rows[hives]", lambda s: inspections.get_analytics_rows(
+        s.user_id, s.hive_ids[:2])),
+    ("InspectionRepository.get_last_modified", lambda s: inspections.get_last_modified(s.user_id)),
+    ("InspectionRepository.get_latest_for_hive", lambda s: inspections.get_latest_for_hive(s.hive_id)),
+    ("InspectionRepository.get_latest_for_hives", lambda s: inspections.get_latest_for_hives(
+        s.hive_ids)),
+    ("InspectionRepository.get_recent", lambda s: inspections.get_recent(s.user_id)),
+    ("InspectionRepository.get_feed", lambda s: inspections.get_feed(s.followed_ids)),
+    ("InspectionRepository.iter_export", lambda s: _drain(inspections.iter_export(
+        s.user_id, 500, since=s.now - timedelta(days=365)))),
+    ("RecommendationRepository.get_by_hive_id", lambda s: recommendations.get_by_hive_id(s.hive_id)),
+    ("RecommendationRepository.get_input_hashes", lambda s: recommendations.get_input_hashes(
+        s.hive_ids)),
+    ("TaskRepository.query", lambda s: tasks.query(TaskQuery(user_id=s.user_id, limit=50))),
+    ("TaskRepository.query[status]", lambda s: tasks.query(
+        TaskQuery(user_id=s.user_id, statuses=[TaskStatus.PENDING], limit=50))),
+    ("TaskRepository.query[hive]", lambda s: tasks.query(
+        TaskQuery(user_id=s.user_id, hive_id=s.hive_id, limit=50))),
+    ("TaskRepository.query[apiary]", lambda s: tasks.query(
+        TaskQuery(user_id=s.user_id, apiary_id=s.apiary_id, limit=50))),
+    ("TaskRepository.query[priority]", lambda s: tasks.query(
+        TaskQuery(user_id=s.user_id, priorities=[TaskPriority.HIGH], limit=50))),
+    ("TaskRepository.query[window]", lambda s: tasks.query(TaskQuery(
+        user_id=s.user_id, due_after=s.now, due_before=s.now + timedelta(days=14), limit=50))),
+    ("TaskRepository.get_by_hive_for_user", lambda s: tasks.get_by_hive_for_user(
+        s.hive_id, s.user_id)),
+    ("TaskRepository.get_by_apiary_for_user", lambda s: tasks.get_by_apiary_for_user(
+        s.apiary_id, s.user_id)),
+    ("TaskRepository.get_by_effective_status[overdue]", lambda s: tasks.get_by_effective_status(
+        s.user_id, TaskStatus.OVERDUE)),
+    ("TaskRepository.get_by_effective_status[pending]", lambda s: tasks.get_by_effective_status(
+        s.user_id, TaskStatus.PENDING)),
+    ("TaskRepository.get_pending_and_overdue", lambda s: tasks.get_pending_and_overdue(s.user_id)),
+    ("TaskRepository.get_schedulable", lambda s: tasks.get_schedulable(s.user_id)),
+    ("TaskRepository.get_upcoming", lambda s: tasks.get_upcoming(s.user_id)),
+    ("TaskRepository.get_overdue", lambda s: tasks.get_overdue(s.user_id)),
+    ("TaskRepository.get_open_for_hives", lambda s: tasks.get_open_for_hives(s.hive_ids)),
+    ("TaskRepository.get_feed", lambda s: tasks.get_feed(s.followed_ids)),
+    ("TaskRepository.get_series_roots_behind", lambda s: tasks.get_series_roots_behind(s.now)),
+    ("TaskRepository.get_series_roots", lambda s: tasks.get_series_roots(s.user_id)),
+    ("TaskRepository.iter_export", lambda s: _drain(tasks.iter_export(s.user_id, 500))),
+    # assistive-core
+    ("get_user_by_email", lambda s: get_user_by_email(s.email)),
+    ("FollowRepository.get_following", lambda s: FollowRepository().get_following(s.user_id)),
+    ("FollowRepository.get_followers", lambda s: FollowRepository().get_followers(s.user_id)),
+    ("FollowService.search_users", lambda s: follow_service.search_users("Bench 1", s.user_id)),
+    ("NotificationRepository.get_by_user_id", lambda s: NotificationRepository().get_by_user_id(
+        s.user_id)),
+    ("EventRepository.get_by_user_id", lambda s: EventRepository().get_by_user_id(s.user_id)),
+    ("EventRepository.get_calendar", lambda s: EventRepository().get_calendar(
+        [s.user_id, *s.followed_ids], s.now - timedelta(days=30), s.now)),
+    ("FeedService.get_feed", lambda s: feed_service.get_feed(s.user_id)),
+]
+
+
+def _database(name: str):
+    client = get_identity_client() if name == settings.IDENTITY_DB else get_client()
+    return client[name]
+
+
+async def explain_all(max_ratio: float, min_examined: int) -> dict:
+    sample = await Sample.load()
+    for label, call in QUERIES:
+        with recorder.recording(label):
+            await call(sample)
+
+    index_keys = {}
+    results = {}
+    for key, query in sorted(recorder.queries.items()):
+        database = _database(query.database)
+        if query.collection not in index_keys:
+            info = await database[query.collection].index_information()
+            index_keys[query.collection] = {name: spec["key"] for name, spec in info.items()}
+        explain = await database.command(
+            {"explain": query.command, "verbosity": "executionStats"}
+        )
+        stats = analyze_explain(explain)
+        flags = stats.flags(max_ratio, min_examined)
+        entry = {
+            "labels": query.labels,
+            "collection": query.collection,
+            "command": query.command_name,
+            "shape": query.shape,
+            "stages": stats.stages,
+            "indexes": stats.indexes,
+            "keys_examined": stats.keys_examined,
+            "docs_examined": stats.docs_examined,
+            "returned": stats.returned,
+            "flags": flags,
+        }
+        suggestion = suggest_index(query.command_name, query.command) if flags else None
+        if suggestion:
+            existing = covering_index(suggestion, list(index_keys[query.collection].values()))
+            if existing:
+                name = next(n for n, k in index_keys[query.collection].items() if k is existing)
+                entry["existing_index"] = name
+            else:
+                entry["suggested_index"] = suggestion
+        results[key] = entry
+    return results
+
+
+def print_report(results: dict) -> None:
+    print(f"{'query':<58} {'keys':>8} {'docs':>8} {'rows':>7}  plan")
+    for entry in sorted(results.values(), key=lambda e: (not e["flags"], e["labels"][0])):
+        label = entry["labels"][0] + (f" (+{len(entry['labels']) - 1})" if len(entry["labels"]) > 1 else "")
+        plan = " > ".join(entry["stages"]) or "?"
+        print(
+            f"{label:<58} {entry['keys_examined']:>8} {entry['docs_examined']:>8} "
+            f"{entry['returned']:>7}  {plan}"
+        )
+        if entry["flags"]:
+            print(f"    !! {', '.join(entry['flags'])} on {entry['collection']} {entry['shape']}")
+        if "suggested_index" in entry:
+            print(f"    -> add index {entry['suggested_index']}")
+        if "existing_index" in entry:
+            print(f"    -> index {entry['existing_index']} fits but was not chosen")
+
+
+def compare(current: dict, baseline: dict) -> List[str]:
+    """Shapes that gained a flag since ``baseline`` (new shapes count in
+    full)."""
+    regressions = []
+    before = baseline["queries"]
+    for key, entry in current["queries"].items():
+        new = set(entry["flags"]) - set(before.get(key, {}).get("flags", []))
+        if new:
+            regressions.append(f"{entry['labels'][0]}: {', '.join(sorted(new))}")
+    return regressions
+
+
+async def main(args) -> int:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        results = await explain_all(args.max_ratio, args.min_examined)
+    finally:
+        await close_core()
+
+    print_report(results)
+    commit, dirty = git_commit()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {"max_ratio": args.max_ratio, "min_examined": args.min_examined},
+        "queries": results,
+    }
+    path = args.save or os.path.join(
+        BASELINE_DIR, f"explain-{commit}{'-dirty' if dirty else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    flagged = sum(1 for entry in results.values() if entry["flags"])
+    print(f"\n{len(results)} query shapes, {flagged} flagged; saved {path}")
+
+    failed = args.strict and flagged > 0
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        failed |= bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explain every repository query shape")
+    parser.add_argument("--max-ratio", type=float, default=10.0,
+                        help="Keys or docs examined per row returned before flagging")
+    parser.add_argument("--min-examined", type=int, default=100,
+                        help="Ignore selectivity below this many keys/docs examined")
+    parser.add_argument("--save", help="Report path (default: baselines/explain-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier report; exit 1 on newly flagged shapes")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 on any flagged shape")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+API load test with JSON baselines
+
+Drives concurrent requests at the API and reports per-scenario throughput
+and p50/p90/p99 latency. Seed the bench databases first
+(``benchmarks/synthetic_data.py``); the population (users, their hives) is
+read back from them, and requests authenticate with tokens minted for the
+seeded users.
+
+By default the app runs in-process over ``httpx.ASGITransport`` (no server,
+no network hop: app + Mongo only). ``--url`` targets a running server
+instead, which must use the same bench databases.
+
+Scenarios:
+  feed               GET /api/feed (per-source queries over followed users)
+  inspection_create  POST /api/inspections (summary upkeep + follower fan-out)
+  calendar           GET /api/events/calendar, random 30-day windows
+  task_list          GET /api/tasks, first page and filtered pages
+
+Each run is written to ``benchmarks/baselines/<commit>.json``, or to
+``--save``. ``--compare`` diffs it against an earlier baseline and exits 1
+when any scenario's p99 or throughput is worse than ``--tolerance``.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/synthetic_data.py --reset
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/load_test.py --compare benchmarks/baselines/abc1234.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGODB_DB", "beekeeper_bench")
+os.environ.setdefault("IDENTITY_DB", "assistive_identity_bench")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+
+from assistive_core import User, auth_service, close_core, init_core  # noqa: E402
+
+from app.feed_sources import FEED_SOURCES  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import DOMAIN_DOCUMENTS, Inspection  # noqa: E402
+
+from synthetic_data import EMAIL_DOMAIN  # noqa: E402
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+LOAD_TEST_NOTE = "load-test"
+
+
+class Population:
+    """Seeded users with a token each, and the hives they inspect."""
+
+    def __init__(self, users, hives_by_user):
+        self.users = users
+        self.hives_by_user = hives_by_user
+        self.tokens = {
+            u.id: auth_service.create_access_token({"sub": u.email}, timedelta(hours=12))
+            for u in users
+        }
+
+    @classmethod
+    async def load(cls) -> "Population":
+        users = await User.find({"email": {"$regex": f"@{EMAIL_DOMAIN}$"}}).to_list()
+        pipeline = [
+            {"$group": {"_id": "$user_id", "hives": {"$addToSet": "$hive_id"}}},
+        ]
+        grouped = await Inspection.get_motor_collection().aggregate(pipeline).to_list(length=None)
+        hives_by_user = {doc["_id"]: sorted(doc["hives"]) for doc in grouped}
+        users = [u for u in users if u.id in hives_by_user]
+        if not users:
+            raise SystemExit("No seeded users found; run benchmarks/synthetic_data.py first")
+        return cls(sorted(users, key=lambda u: u.email), hives_by_user)
+
+    def pick(self, rng: random.Random):
+        user = rng.choice(self.users)
+        return user, {"Authorization": f"Bearer {self.tokens[user.id]}"}
+
+
+# A scenario builds one request: (method, path, params, json body, headers).
+def feed(pop, rng, now):
+    _, headers = pop.pick(rng)
+    return "GET", "/api/feed", {"limit": 20}, None, headers
+
+
+def inspection_create(pop, rng, now):
+    user, headers = pop.pick(rng)
+    body = {
+        "hiveId": rng.choice(pop.hives_by_user[user.id]),
+        "inspectionDate": now.isoformat(),
+        "queenSeen": rng.random() < 0.5,
+        "notes": LOAD_TEST_NOTE,
+    }
+    return "POST", "/api/inspections", None, body, headers
+
+
+def calendar(pop, rng, now):
+    _, headers = pop.pick(rng)
+    start = now - timedelta(days=rng.randint(0, 365 * 2))
+    params = {"start": start.isoformat(), "end": (start + timedelta(days=30)).isoformat()}
+    return "GET", "/api/events/calendar", params, None, headers
+
+
+def task_list(pop, rng, now):
+    _, headers = pop.pick(rng)
+    params = rng.choice([
+        {"limit": 50},
+        {"limit": 50, "task_status": "PENDING"},
+        {"upcoming_days": 14},
+    ])
+    return "GET", "/api/tasks", params, None, headers
+
+
+SCENARIOS = {
+    "feed": feed,
+    "inspection_create": inspection_create,
+    "calendar": calendar,
+    "task_list": task_list,
+}
+
+
+async def run_scenario(client, build, pop, requests, concurrency, seed):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    planned = [build(pop, rng, now) for _ in range(requests)]
+    latencies, errors, created = [], 0, []
+    queue = iter(planned)
+
+    async def worker():
+        nonlocal errors
+        for method, path, params, body, headers in queue:
+            started = time.perf_counter()
+            response = await client.request(method, path, params=params, json=body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            elif method == "POST":
+                created.append((response.json()["id"], headers))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    if not latencies:
+        return {}, created
+    ms = np.array(latencies) * 1000
+    result = {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p90_ms": round(float(np.percentile(ms, 90)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+    return result, created
+
+
+async def cleanup(client, created):
+    """Delete what the write scenarios created, through the API so the hive
+    summaries stay consistent."""
+    for inspection_id, headers in created:
+        await client.delete(f"/api/inspections/{inspection_id}", headers=headers)
+
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+
+    return git("rev-parse", "--short", "HEAD") or "unknown", bool(git("status", "--porcelain"))
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the diff against ``baseline``. Returns True on a regression."""
+    print(f"\nvs {baseline['commit']} ({baseline['created_at']})")
+    print(f"{'scenario':<20} {'p50':>9} {'p99':>9} {'rps':>9}")
+    regressed = False
+    for name, now in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+
+        def delta(key):
+            return (now[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+
+        worse = delta("p99_ms") > tolerance * 100 or delta("throughput_rps") < -tolerance * 100
+        regressed |= worse
+        print(
+            f"{name:<20} {delta('p50_ms'):>+8.1f}% {delta('p99_ms'):>+8.1f}% "
+            f"{delta('throughput_rps'):>+8.1f}%{'  REGRESSION' if worse else ''}"
+        )
+    return regressed
+
+
+async def main(args) -> int:
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    try:
+        pop = await Population.load()
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        else:
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60
+            )
+        commit, dirty = git_commit()
+        report = {
+            "commit": commit,
+            "dirty": dirty,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": args.url or "in-process",
+            "config": {
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "seed": args.seed,
+                "users": len(pop.users),
+            },
+            "scenarios": {},
+        }
+        print(f"{len(pop.users)} users, {args.concurrency} concurrent, {args.requests} requests/scenario\n")
+        print(f"{'scenario':<20} {'rps':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'err':>5}")
+        async with client:
+            for index, name in enumerate(args.scenarios):
+                build = SCENARIOS[name]
+                # Warm-up: connection pools, caches and code paths.
+                _, created = await run_scenario(
+                    client, build, pop, args.warmup, args.concurrency, args.seed - index - 1
+                )
+                result, more = await run_scenario(
+                    client, build, pop, args.requests, args.concurrency, args.seed + index
+                )
+                await cleanup(client, created + more)
+                report["scenarios"][name] = result
+                print(
+                    f"{name:<20} {result['throughput_rps']:>8.1f} {result['p50_ms']:>7.1f}ms "
+                    f"{result['p90_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms {result['errors']:>5}"
+                )
+    finally:
+        await close_core()
+
+    path = args.save or os.path.join(BASELINE_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nsaved {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(report, json.load(f), args.tolerance):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the API against the bench databases")
+    parser.add_argument("--url", help="Running server to target (default: in-process)")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", help="Baseline path (default: baselines/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier baseline to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed p99/throughput change before failing (fraction)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset for benchmarks and load tests
+
+Seeds the bench databases with a deterministic (``--seed``) social graph and
+years of beekeeping history:
+
+  - users (one shared password hash, so seeding does not pay bcrypt per user)
+  - follows with a power-law degree: out-degree is Pareto-distributed and
+    targets are picked by preferential attachment, so a few users have many
+    followers, like the real graph
+  - 1-3 apiaries per user with coordinates, 2-6 hives per apiary
+  - inspections every ~10 days through each season for ``--years``, then the
+    per-hive summaries rebuilt from them
+  - tasks across the same period (past ones mostly completed) and a few
+    calendar events per user per month
+
+Re-running with ``--reset`` drops the bench databases first; it refuses to
+touch a database whose name does not end in ``_bench``.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/synthetic_data.py --users 200 --years 3 --reset
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGODB_DB", "beekeeper_bench")
+os.environ.setdefault("IDENTITY_DB", "assistive_identity_bench")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from assistive_core import (  # noqa: E402
+    Event,
+    Follow,
+    User,
+    auth_service,
+    close_core,
+    get_client,
+    init_core,
+    settings,
+)
+
+from app.feed_sources import FEED_SOURCES  # noqa: E402
+from app.models import (  # noqa: E402
+    DOMAIN_DOCUMENTS,
+    Apiary,
+    BroodPattern,
+    HealthStatus,
+    Hive,
+    Inspection,
+    ResourceLevel,
+    Task,
+    TaskPriority,
+    TaskStatus,
+    TaskType,
+)
+from app.services import InspectionSummaryService  # noqa: E402
+
+PASSWORD = "bench-password"
+EMAIL_DOMAIN = "bench.example.com"
+INSERT_BATCH = 5000
+
+
+def bench_email(index: int) -> str:
+    return f"user{index}@{EMAIL_DOMAIN}"
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def follow_edges(rng: random.Random, users: int, mean_degree: float, alpha: float = 2.1):
+    """``(follower, followed)`` index pairs. Out-degree ~ Pareto(alpha - 1)
+    scaled to ``mean_degree``; targets by preferential attachment (weight
+    1 / rank)."""
+    shape = alpha - 1
+    scale = mean_degree * (shape - 1) / shape if shape > 1 else 1.0
+    ranks = list(range(users))
+    rng.shuffle(ranks)
+    population = range(users)
+    cum_weights, total = [], 0.0
+    for rank in ranks:
+        total += 1.0 / (rank + 1)
+        cum_weights.append(total)
+    edges = set()
+    for follower in range(users):
+        degree = min(users - 1, int(scale * rng.paretovariate(shape)))
+        targets = set()
+        # Bounded retries: popular targets repeat often for large degrees.
+        for _ in range(degree * 4):
+            if len(targets) >= degree:
+                break
+            followed = rng.choices(population, cum_weights=cum_weights)[0]
+            if followed != follower:
+                targets.add(followed)
+        edges.update((follower, followed) for followed in targets)
+    return sorted(edges)
+
+
+async def _insert(document, items):
+    for start in range(0, len(items), INSERT_BATCH):
+        await document.insert_many(items[start:start + INSERT_BATCH])
+
+
+async def seed(users: int, years: int, mean_follows: float, seed_value: int) -> dict:
+    rng = random.Random(seed_value)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = now - timedelta(days=365 * years)
+    hashed = auth_service.get_password_hash(PASSWORD)
+
+    user_docs = [
+        User(id=_uuid(rng), email=bench_email(i), hashed_password=hashed, full_name=f"Bench {i}")
+        for i in range(users)
+    ]
+    follows = [
+        Follow(id=_uuid(rng), follower_id=user_docs[a].id, followed_id=user_docs[b].id)
+        for a, b in follow_edges(rng, users, mean_follows)
+    ]
+
+    apiaries, hives, inspections, tasks, events = [], [], [], [], []
+    for user in user_docs:
+        home = (rng.uniform(50.0, 54.0), rng.uniform(-3.0, 1.0))
+        for a in range(rng.randint(1, 3)):
+            apiary = Apiary(
+                id=_uuid(rng),
+                name=f"{user.full_name} yard {a}",
+                location="bench",
+                latitude=home[0] + rng.uniform(-0.2, 0.2),
+                longitude=home[1] + rng.uniform(-0.2, 0.2),
+            )
+            apiaries.append(apiary)
+            for h in range(rng.randint(2, 6)):
+                hive = Hive(id=_uuid(rng), name=f"Hive {h}", apiary_id=apiary.id, last_inspected=start)
+                hives.append(hive)
+                day = start
+                while day < now:
+                    # Inspect April-September, roughly every 10 days.
+                    if 4 <= day.month <= 9:
+                        day += timedelta(days=rng.randint(7, 14))
+                        if day >= now:
+                            break
+                        inspections.append(Inspection(
+                            id=_uuid(rng),
+                            user_id=user.id,
+                            hive_id=hive.id,
+                            inspection_date=day + timedelta(hours=rng.randint(9, 16)),
+                            duration_minutes=rng.randint(10, 45),
+                            queen_seen=rng.random() < 0.6,
+                            eggs_seen=rng.random() < 0.7,
+                            brood_pattern=rng.choice(list(BroodPattern)),
+                            health_status=rng.choice(
+                                [HealthStatus.HEALTHY] * 6 + [HealthStatus.CONCERNING]
+                            ),
+                            varroa_mites_detected=rng.random() < 0.15,
+                            honey_stores=rng.choice(list(ResourceLevel)),
+                            notes="bench",
+                        ))
+                        hive.last_inspected = inspections[-1].inspection_date
+                    else:
+                        day += timedelta(days=30)
+                # Tasks due from the start of history to two months ahead.
+                span_hours = years * 365 * 24 + 60 * 24
+                for _ in range(years * 6):
+                    due = start + timedelta(hours=rng.randint(0, span_hours))
+                    past = due < now
+                    tasks.append(Task(
+                        id=_uuid(rng),
+                        user_id=user.id,
+                        hive_id=hive.id,
+                        apiary_id=apiary.id,
+                        title="Bench task",
+                        task_type=rng.choice(list(TaskType)),
+                        priority=rng.choice(list(TaskPriority)),
+                        status=TaskStatus.COMPLETED if past and rng.random() < 0.9 else TaskStatus.PENDING,
+                        due_date=due,
+                        estimated_duration_minutes=rng.choice([15, 30, 45, 60]),
+                    ))
+        for month in range(years * 12):
+            for _ in range(rng.randint(0, 3)):
+                when = start + timedelta(days=30 * month + rng.randint(0, 29), hours=rng.randint(8, 18))
+                events.append(Event(id=_uuid(rng), user_id=user.id, title="Bench event", event_date=when))
+
+    counts = {}
+    for document, items in (
+        (User, user_docs), (Follow, follows), (Apiary, apiaries), (Hive, hives),
+        (Inspection, inspections), (Task, tasks), (Event, events),
+    ):
+        started = time.perf_counter()
+        await _insert(document, items)
+        counts[document.get_settings().name] = len(items)
+        print(f"  {document.__name__:<12} {len(items):>9}  {time.perf_counter() - started:6.1f}s")
+    started = time.perf_counter()
+    summaries = await InspectionSummaryService().rebuild_all()
+    counts["hive_inspection_summaries"] = summaries
+    print(f"  {'summaries':<12} {summaries:>9}  {time.perf_counter() - started:6.1f}s")
+    return counts
+
+
+async def reset() -> None:
+    for name in (settings.MONGODB_DB, settings.IDENTITY_DB):
+        if not name.endswith("_bench"):
+            raise SystemExit(f"refusing to drop {name!r}: not a *_bench database")
+        await get_client().drop_database(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the bench databases")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--mean-follows", type=float, default=15)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop the bench databases first")
+    args = parser.parse_args()
+
+    async def run():
+        if args.reset:
+            await reset()
+        await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+        try:
+            print(f"Seeding {settings.MONGODB_DB} ({args.users} users, {args.years} years)")
+            await seed(args.users, args.years, args.mean_follows, args.seed)
+        finally:
+            await close_core()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Task filter planner benchmark
+
+Seeds a throwaway database with synthetic tasks, then runs every GET /tasks
+filter combination through ``build_task_filter`` and reports the index the
+planner picked, keys/docs examined and execution time from
+explain("executionStats"). A healthy plan has no SORT stage and examines
+roughly as many keys as it returns.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/task_filter_plans.py
+"""
+
+import asyncio
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGODB_DB", "beekeeper_bench")
+os.environ.setdefault("IDENTITY_DB", "assistive_identity_bench")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from assistive_core import init_core, close_core  # noqa: E402
+
+from app.feed_sources import FEED_SOURCES  # noqa: E402
+from app.models import (  # noqa: E402
+    DOMAIN_DOCUMENTS,
+    Task,
+    TaskPriority,
+    TaskStatus,
+    TaskType,
+)
+from app.repositories.task_repository import (  # noqa: E402
+    TaskQuery,
+    TaskRepository,
+    build_task_filter,
+)
+
+
+USERS = int(os.getenv("BENCH_USERS", "50"))
+TASKS_PER_USER = int(os.getenv("BENCH_TASKS_PER_USER", "400"))
+PAGE_SIZE = 50
+
+
+def _synthetic_tasks(user_ids, now):
+    rng = random.Random(42)
+    for user_id in user_ids:
+        hives = [str(uuid.uuid4()) for _ in range(8)]
+        apiaries = [str(uuid.uuid4()) for _ in range(2)]
+        for _ in range(TASKS_PER_USER):
+            yield Task(
+                id=str(uuid.uuid4()),
+                title="bench",
+                user_id=user_id,
+                hive_id=rng.choice(hives),
+                apiary_id=rng.choice(apiaries),
+                status=rng.choice(list(TaskStatus)),
+                priority=rng.choice(list(TaskPriority)),
+                task_type=rng.choice(list(TaskType)),
+                due_date=now + timedelta(hours=rng.randint(-24 * 60, 24 * 120)),
+            )
+
+
+def _plan_stages(plan):
+    stages = [plan]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+
+async def _explain(query, now):
+    direction = -1 if query.descending else 1
+    cursor = (
+        Task.get_motor_collection()
+        .find(build_task_filter(query, now))
+        .sort([("due_date", direction), ("_id", direction)])
+    )
+    if query.limit:
+        cursor = cursor.limit(query.limit)
+    return await cursor.explain()
+
+
+def _summary(explain):
+    stats = explain["executionStats"]
+    stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+    index = next(
+        (s.get("indexName") for s in stages if s.get("stage") == "IXSCAN"),
+        "COLLSCAN",
+    )
+    sort = any(s.get("stage") == "SORT" for s in stages)
+    return (
+        index,
+        stats["nReturned"],
+        stats["totalKeysExamined"],
+        stats["totalDocsExamined"],
+        stats["executionTimeMillis"],
+        sort,
+    )
+
+
+async def main():
+    await init_core(vertical_documents=DOMAIN_DOCUMENTS, feed_sources=FEED_SOURCES)
+    now = datetime.now(timezone.utc)
+    user_ids = [str(uuid.uuid4()) for _ in range(USERS)]
+    await Task.insert_many(list(_synthetic_tasks(user_ids, now)))
+
+    user_id = user_ids[0]
+    sample = await Task.find_one(Task.user_id == user_id)
+    _, cursor = await TaskRepository().query(
+        TaskQuery(user_id=user_id, limit=PAGE_SIZE), now=now
+    )
+    combos = {
+        "user": TaskQuery(user_id=user_id),
+        "user page 2": TaskQuery(user_id=user_id, limit=PAGE_SIZE, cursor=cursor),
+        "status": TaskQuery(user_id=user_id, statuses=[TaskStatus.IN_PROGRESS]),
+        "derived overdue": TaskQuery(user_id=user_id, statuses=[TaskStatus.OVERDUE]),
+        "hive": TaskQuery(user_id=user_id, hive_id=sample.hive_id),
+        "apiary": TaskQuery(user_id=user_id, apiary_id=sample.apiary_id),
+        "priority": TaskQuery(user_id=user_id, priorities=[TaskPriority.URGENT]),
+        "upcoming 7d": TaskQuery(
+            user_id=user_id,
+            statuses=[TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.OVERDUE],
+            due_before=now + timedelta(days=7),
+        ),
+        "hive + status + window": TaskQuery(
+            user_id=user_id,
+            hive_id=sample.hive_id,
+            statuses=[TaskStatus.PENDING],
+            due_before=now + timedelta(days=30),
+        ),
+        "descending page": TaskQuery(user_id=user_id, descending=True, limit=PAGE_SIZE),
+    }
+
+    print(f"{USERS * TASKS_PER_USER} tasks across {USERS} users\n")
+    print(f"{'combination':<24} {'index':<42} {'ret':>5} {'keys':>6} {'docs':>6} {'ms':>4}  sort")
+    try:
+        for name, query in combos.items():
+            index, returned, keys, docs, ms, sort = _summary(await _explain(query, now))
+            print(
+                f"{name:<24} {index:<42} {returned:>5} {keys:>6} {docs:>6} {ms:>4}  "
+                f"{'SORT' if sort else '-'}"
+            )
+    finally:
+        await Task.get_motor_collection().delete_many({"user_id": {"$in": user_ids}})
+        await close_core()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
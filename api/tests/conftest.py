@@ -44,6 +44,9 @@ os.environ.setdefault("IDENTITY_DB", "assistive_identity_test")
 os.environ.setdefault("ASSISTIVE_ENV", "test")
 os.environ.setdefault("ENV", "test")
 MONGODB_URI = os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+# The route tests read the demo data the lifespan seeds; startup only seeds
+# when asked to.
+os.environ.setdefault("SEED_ON_STARTUP", "true")
 
 import uuid
 from datetime import datetime, timezone
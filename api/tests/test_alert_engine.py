@@ -0,0 +1,202 @@
+"""Tests for the batch alert engine (``app/services/alert_engine.py``).
+
+The rules are pure functions of a hive and its inspection summary and run
+without Mongo. The engine tests run against the conftest ``init_core`` fixture
+(live test Mongo, skipped when none is reachable) and cover fingerprint dedupe,
+dismissal, auto-resolution and the incremental change cursor.
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.models import (
+    Alert,
+    AlertType,
+    Apiary,
+    Hive,
+    HiveInspectionSummary,
+    InspectionSnapshot,
+    QueenCellStatus,
+)
+from app.models.base import utcnow
+from app.schemas import InspectionCreate
+from app.services.alert_engine import (
+    AlertEngine,
+    HiveContext,
+    inspection_due_rule,
+    swarm_cells_rule,
+    varroa_streak_rule,
+    weather_findings,
+)
+from app.services.inspection_service import InspectionService
+
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _hive(last_inspected: datetime = NOW) -> Hive:
+    # model_construct: a Beanie Document can't be instantiated before init.
+    return Hive.model_construct(id="h1", name="Hive 1", apiary_id="ap1",
+                                last_inspected=last_inspected)
+
+
+def _summary(**fields) -> HiveInspectionSummary:
+    fields.setdefault("varroa_current_streak", 0)
+    return HiveInspectionSummary.model_construct(
+        id="u1:h1", hive_id="h1", user_id="u1", **fields)
+
+
+# --------------------------------------------------------------------------- #
+# Rules (pure)
+# --------------------------------------------------------------------------- #
+def test_swarm_cells_fingerprint_is_per_inspection():
+    snapshot = InspectionSnapshot(inspection_id="i7", inspection_date=NOW,
+                                  queen_cells=QueenCellStatus.SWARM_CELLS)
+    finding = swarm_cells_rule(HiveContext(_hive(), _summary(last_inspection=snapshot), NOW))
+    assert finding.fingerprint == "swarm_cells:h1:u1:i7"
+    assert finding.hive_ids == ["h1"]
+
+    snapshot.queen_cells = QueenCellStatus.NONE
+    assert swarm_cells_rule(HiveContext(_hive(), _summary(last_inspection=snapshot), NOW)) is None
+    assert swarm_cells_rule(HiveContext(_hive(), None, NOW)) is None
+
+
+def test_varroa_streak_threshold_and_episode():
+    started = NOW - timedelta(days=14)
+    ctx = HiveContext(_hive(), _summary(varroa_current_streak=2,
+                                        varroa_streak_started=started), NOW)
+    assert varroa_streak_rule(ctx).fingerprint == "varroa_streak:h1:u1:2026-05-18"
+    ctx.summary.varroa_current_streak = 1
+    assert varroa_streak_rule(ctx) is None
+
+
+def test_inspection_due_uses_latest_of_hive_and_summary():
+    stale_hive = _hive(last_inspected=NOW - timedelta(days=30))
+    assert inspection_due_rule(HiveContext(stale_hive, None, NOW)) is not None
+
+    recent = InspectionSnapshot(inspection_id="i1", inspection_date=NOW - timedelta(days=3))
+    assert inspection_due_rule(
+        HiveContext(stale_hive, _summary(last_inspection=recent), NOW)) is None
+
+
+def test_weather_findings_thresholds():
+    apiary = Apiary.model_construct(id="ap1", name="Home")
+    forecast = {"hours": [{"temperature_c": 1.0, "wind_speed_ms": 4},
+                          {"temperature_c": 9.0}, {}]}
+    findings = weather_findings(apiary, ["h1", "h2"], forecast, NOW)
+    assert [f.fingerprint for f in findings] == ["weather:ap1:frost:2026-06-01"]
+    assert findings[0].hive_ids == ["h1", "h2"]
+    assert weather_findings(apiary, [], {"hours": None}, NOW) == []
+
+
+# --------------------------------------------------------------------------- #
+# Engine
+# --------------------------------------------------------------------------- #
+async def _engine_alerts(**query) -> list[Alert]:
+    return await Alert.find({"rule": {"$ne": None}, **query}).to_list()
+
+
+async def _swarm_inspection(hive_id: str, id: str, cells: QueenCellStatus) -> None:
+    await InspectionService().create_inspection(
+        InspectionCreate(hive_id=hive_id, inspection_date=utcnow(), queen_cells=cells),
+        id, "u1")
+
+
+async def test_engine_dedupes_and_respects_dismissal(init_core):
+    await Hive(id="h1", name="Hive 1", apiary_id="ap1", last_inspected=utcnow()).insert()
+    await _swarm_inspection("h1", "i1", QueenCellStatus.SWARM_CELLS)
+    engine = AlertEngine(weather=None)
+
+    assert await engine.run() == 1
+    assert await engine.run() == 0
+    [alert] = await _engine_alerts()
+    assert (alert.type, alert.rule) == (AlertType.SWARM_WARNING, "swarm_cells")
+
+    # A dismissed alert is not re-raised for the same inspection...
+    alert.dismissed = True
+    await alert.save()
+    await HiveInspectionSummary.get_motor_collection().update_many(
+        {}, {"$set": {"updated_at": utcnow()}})
+    assert await engine.run() == 0
+
+    # ...but a new inspection with swarm cells is a new episode.
+    await _swarm_inspection("h1", "i2", QueenCellStatus.SWARM_CELLS)
+    await engine.run()
+    assert len(await _engine_alerts(dismissed=False)) == 1
+
+
+async def test_engine_resolves_cleared_conditions(init_core):
+    await Hive(id="h1", name="Hive 1", apiary_id="ap1", last_inspected=utcnow()).insert()
+    await _swarm_inspection("h1", "i1", QueenCellStatus.SWARM_CELLS)
+    engine = AlertEngine(weather=None)
+    await engine.run()
+
+    await _swarm_inspection("h1", "i2", QueenCellStatus.NONE)
+    assert await engine.run() == 1
+    [alert] = await _engine_alerts()
+    assert alert.dismissed and alert.resolved_at is not None
+
+
+async def test_engine_only_reevaluates_changed_hives(init_core):
+    await Hive(id="h1", name="Hive 1", apiary_id="ap1", last_inspected=utcnow()).insert()
+    engine = AlertEngine(weather=None)
+    await engine.run()
+
+    start = utcnow()
+    assert await engine.changed_hive_ids(start + timedelta(minutes=5), start) == []
+    await _swarm_inspection("h1", "i1", QueenCellStatus.SWARM_CELLS)
+    state = await engine.state.get("alert_engine")
+    cursor = state.cursor.replace(tzinfo=timezone.utc)
+    assert await engine.changed_hive_ids(cursor, utcnow()) == ["h1"]
+
+
+async def test_engine_picks_up_hives_crossing_the_due_window(init_core):
+    real_now = utcnow()
+    await Hive(id="h1", name="Hive 1", apiary_id="ap1",
+               last_inspected=real_now - timedelta(days=13, hours=23),
+               updated_at=real_now - timedelta(days=1)).insert()
+    engine = AlertEngine(weather=None)
+    assert await engine.run(now=real_now) == 0
+
+    # Nothing was written, but the hive became due since the last run.
+    assert await engine.run(now=real_now + timedelta(hours=2)) == 1
+    [alert] = await _engine_alerts()
+    assert alert.rule == "inspection_due"
+
+
+async def test_engine_weather_alerts_are_throttled(init_core):
+    class FakeWeather:
+        calls = 0
+
+        async def get_forecast_batch(self, coordinates, hours=24):
+            FakeWeather.calls += 1
+            return [{"hours": [{"temperature_c": 38.0, "wind_speed_ms": 2.0}]}
+                    for _ in coordinates]
+
+    await Apiary(id="ap1", name="Home", location="Garden", latitude=51.5, longitude=-0.1).insert()
+    await Apiary(id="ap2", name="Away", location="Field").insert()
+    await Hive(id="h1", name="Hive 1", apiary_id="ap1", last_inspected=utcnow()).insert()
+    engine = AlertEngine(weather=FakeWeather())
+
+    await engine.run()
+    await engine.run()
+    assert FakeWeather.calls == 1
+    [alert] = await _engine_alerts(rule="weather")
+    assert alert.hive_ids == ["h1"]
+    assert alert.fingerprint.startswith("weather:ap1:heat:")
+
+
+async def test_engine_weather_resolution_is_scoped_per_apiary(init_core):
+    class FakeWeather:
+        async def get_forecast_batch(self, coordinates, hours=24):
+            return [{"hours": [{"temperature_c": 38.0, "wind_speed_ms": 2.0}]}
+                    for _ in coordinates]
+
+    for apiary_id in ("ap1", "ap2"):
+        await Apiary(id=apiary_id, name=apiary_id, location="Field",
+                     latitude=51.5, longitude=-0.1).insert()
+        await Hive(id=f"h-{apiary_id}", name="Hive", apiary_id=apiary_id,
+                   last_inspected=utcnow()).insert()
+
+    await AlertEngine(weather=FakeWeather()).run()
+    # One apiary's resolve must not dismiss the other's firing alert.
+    alerts = await _engine_alerts(rule="weather", dismissed=False)
+    assert sorted(a.fingerprint.split(":")[1] for a in alerts) == ["ap1", "ap2"]
@@ -39,6 +39,7 @@ but these cases assert on enums/booleans/list fields rather than datetime values
 so no tz handling is needed here.
 """
 import uuid
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
@@ -47,7 +48,7 @@ from app.models import (
     RecommendationType,
     Priority,
 )
-from app.repositories.alert_repository import AlertRepository
+from app.repositories.alert_repository import AlertQuery, AlertRepository
 from app.repositories.recommendation_repository import (
     RecommendationRepository,
 )
@@ -174,6 +175,60 @@ async def test_alert_hive_ids_persisted_via_repo(init_core, alert_repo, alert_fa
     assert empty_fetched.hive_ids == []
 
 
+@pytest.mark.asyncio
+async def test_alert_query_scopes_to_owner_and_shared(init_core, alert_repo, alert_factory):
+    """``query`` returns the user's alerts plus shared (ownerless) ones, newest
+    first; other users' alerts never match."""
+    now = datetime.now(timezone.utc)
+    mine = await alert_repo.create(alert_factory(user_id="u1", timestamp=now))
+    shared = await alert_repo.create(
+        alert_factory(timestamp=now - timedelta(hours=1), hive_ids=["h1"]))
+    await alert_repo.create(alert_factory(user_id="u2", hive_ids=["h1"]))
+
+    alerts, cursor = await alert_repo.query(AlertQuery(user_id="u1"))
+    assert [a.id for a in alerts] == [mine.id, shared.id]
+    assert cursor is None
+
+    by_hive, _ = await alert_repo.query(AlertQuery(user_id="u1", hive_ids=["h1"]))
+    assert [a.id for a in by_hive] == [shared.id]
+
+
+@pytest.mark.asyncio
+async def test_alert_query_keyset_pages(init_core, alert_repo, alert_factory):
+    """Pages of ``limit`` resume after the cursor, including across equal
+    timestamps (tie broken on ``_id``)."""
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    created = [
+        await alert_repo.create(alert_factory(user_id="u1", timestamp=now - timedelta(minutes=i // 2)))
+        for i in range(5)
+    ]
+    seen, cursor = [], None
+    while True:
+        page, cursor = await alert_repo.query(
+            AlertQuery(user_id="u1", dismissed=False, limit=2, cursor=cursor))
+        seen += [a.id for a in page]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(a.id for a in created)
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.asyncio
+async def test_alert_dismiss_many(init_core, alert_repo, alert_factory):
+    """One ``update_many`` dismisses the user's visible alerts for a hive and
+    leaves other users' alerts alone."""
+    mine = await alert_repo.create(alert_factory(user_id="u1", hive_ids=["h1", "h2"]))
+    other_hive = await alert_repo.create(alert_factory(user_id="u1", hive_ids=["h3"]))
+    theirs = await alert_repo.create(alert_factory(user_id="u2", hive_ids=["h1"]))
+
+    assert await alert_repo.dismiss_many("u1", hive_ids=["h1"]) == 1
+    assert (await alert_repo.get_by_id(mine.id)).dismissed is True
+    assert (await alert_repo.get_by_id(other_hive.id)).dismissed is False
+    assert (await alert_repo.get_by_id(theirs.id)).dismissed is False
+
+    assert await alert_repo.dismiss_many("u1", alert_ids=[other_hive.id, theirs.id]) == 1
+
+
 # --- RecommendationRepository tests --------------------------------------------
 
 
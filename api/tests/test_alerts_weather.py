@@ -1,6 +1,9 @@
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from assistive_core import get_current_user
 
 from .conftest import requires_mongo
 
@@ -15,9 +18,20 @@ def _app_lifespan():
     handlers hit a live, freshly-bound Beanie client on the TestClient's own loop.
     Without it the module-level TestClient never triggers startup, so these tests
     inherit Beanie bound to a closed client from a prior async (init_core-fixture)
-    test -> 'Event loop is closed'."""
-    with client:
-        yield
+    test -> 'Event loop is closed'.
+
+    The alert routes are owner-scoped, so auth is overridden with a stub user
+    (seeded alerts are shared and still visible to it)."""
+    app.dependency_overrides[get_current_user] = lambda: _StubUser()
+    try:
+        with client:
+            yield
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+class _StubUser:
+    id = str(uuid.uuid4())
 
 
 def test_get_all_alerts():
@@ -56,6 +70,44 @@ def test_dismiss_alert():
         assert data["dismissed"] == True
 
 
+def test_list_alerts_by_hive_pages_and_bulk_dismisses():
+    """Alerts filter by hive, page via ``X-Next-Cursor``, and a bulk dismiss
+    clears them in one call."""
+    hive_id = str(uuid.uuid4())
+    for i in range(3):
+        response = client.post("/api/alerts", json={
+            "type": "GENERAL", "title": f"Alert {i}", "message": "m",
+            "severity": "INFO", "timestamp": f"2026-05-0{i + 1}T00:00:00Z",
+            "hiveIds": [hive_id],
+        })
+        assert response.status_code == 201
+
+    first = client.get("/api/alerts", params={"hive_id": hive_id, "limit": 2})
+    assert [a["title"] for a in first.json()] == ["Alert 2", "Alert 1"]
+    second = client.get("/api/alerts", params={
+        "hive_id": hive_id, "limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [a["title"] for a in second.json()] == ["Alert 0"]
+    assert "X-Next-Cursor" not in second.headers
+
+    response = client.post("/api/alerts/dismiss", json={"hiveId": hive_id})
+    assert response.json() == {"dismissed": 3}
+    active = client.get("/api/alerts", params={"hive_id": hive_id, "dismissed": False})
+    assert active.json() == []
+    assert client.post("/api/alerts/dismiss", json={}).status_code == 400
+
+
+def test_broadcast_alert_reaches_apiaries_in_radius():
+    """A swarm warning near the seeded Sunnyvale apiary lands on its hives."""
+    response = client.post("/api/alerts/broadcast", json={
+        "type": "SWARM_WARNING", "title": "Swarm nearby", "message": "Check your hives",
+        "severity": "WARNING", "latitude": 37.37, "longitude": -122.04, "radiusKm": 10,
+    })
+    assert response.status_code == 201
+    assert response.json() == {"apiaryIds": ["1"], "alerts": 1}
+    alerts = client.get("/api/alerts", params={"hive_id": "h1"}).json()
+    assert "Swarm nearby" in [a["title"] for a in alerts]
+
+
 def test_get_weather():
     """Test getting weather data"""
     response = client.get("/api/weather")
@@ -66,3 +118,12 @@ def test_get_weather():
     assert "windSpeed" in data
     assert "condition" in data
     assert "description" in data
+
+
+def test_get_weather_for_apiary_errors():
+    """Live weather needs a known apiary with coordinates."""
+    assert client.get("/api/weather", params={"apiary_id": "missing"}).status_code == 404
+    apiary = client.post("/api/apiaries", json={"name": "No GPS", "location": "Somewhere"})
+    assert apiary.status_code == 201
+    response = client.get("/api/weather", params={"apiary_id": apiary.json()["id"]})
+    assert response.status_code == 400
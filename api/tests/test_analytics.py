@@ -0,0 +1,165 @@
+"""Tests for the columnar analytics engine (``app/analytics``) and
+``AnalyticsService``.
+
+The column loading and metric arithmetic are pure NumPy and run without Mongo.
+The service tests (scope resolution, last-modified cache validation) depend on
+the conftest ``init_core`` fixture (live test Mongo, skipped when none is
+reachable).
+"""
+import os
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.analytics import InspectionColumns, compute_metrics
+from app.analytics.columns import to_day
+from app.models import Apiary, Hive, Inspection
+from app.schemas import InspectionUpdate
+from app.services.analytics_service import AnalyticsService, ColumnCache
+from app.services.inspection_service import InspectionService
+
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _row(hive_id: str, days_ago: float, **fields) -> dict:
+    # Raw documents come back from Motor with naive-UTC datetimes.
+    date = (NOW - timedelta(days=days_ago)).replace(tzinfo=None)
+    return {"hive_id": hive_id, "inspection_date": date, **fields}
+
+
+# --------------------------------------------------------------------------- #
+# Columns + metrics (pure)
+# --------------------------------------------------------------------------- #
+def test_columns_sort_by_hive_then_date_and_code_enums():
+    cols = InspectionColumns.from_documents([
+        _row("b", 1, population="STRONG"),
+        _row("a", 5, population="WEAK"),
+        _row("a", 10),
+    ])
+    assert list(cols.hive_ids[cols.hive]) == ["a", "a", "b"]
+    assert list(cols.population) == [3, 2, 4]  # missing field -> model default
+    assert cols.day[0] < cols.day[1]
+
+
+def test_metrics_per_hive():
+    cols = InspectionColumns.from_documents([
+        _row("a", 28, queen_seen=True, population="WEAK", honey_stores="LOW"),
+        _row("a", 14, varroa_mites_detected=True, population="MEDIUM"),
+        _row("a", 0, population="STRONG", honey_stores="GOOD"),
+        _row("b", 3, varroa_mites_detected=True),
+    ])
+    result = compute_metrics(cols, to_day(NOW), window_days=30, windows=1)
+    a, b = result["hives"]
+
+    assert result["inspection_count"] == 4
+    assert result["cadence"] == {"mean_interval_days": 14.0, "median_interval_days": 14.0}
+    assert a["days_since_queen_seen"] == 28.0
+    assert a["mean_interval_days"] == 14.0
+    assert a["varroa_prevalence"] == pytest.approx(1 / 3, abs=1e-3)
+    assert a["population_trend"] == pytest.approx(30 / 14, abs=1e-3)
+    assert a["honey_stores_trend"] > 0
+    assert a["population_latest"] == 4
+    assert b["days_since_queen_seen"] is None
+    assert b["mean_interval_days"] is None
+    assert b["population_trend"] is None
+
+
+def test_rolling_windows_oldest_first():
+    cols = InspectionColumns.from_documents([
+        _row("a", 40, varroa_mites_detected=True),
+        _row("a", 35),
+        _row("a", 10, varroa_mites_detected=True),
+    ])
+    windows = compute_metrics(cols, to_day(NOW), window_days=30, windows=3, step_days=15)["windows"]
+
+    assert [w["end"] for w in windows] == [NOW - timedelta(days=30), NOW - timedelta(days=15), NOW]
+    assert [w["inspections"] for w in windows] == [2, 2, 1]
+    assert [w["varroa_prevalence"] for w in windows] == [0.5, 0.5, 1.0]
+
+
+def test_metrics_on_empty_scope():
+    result = compute_metrics(InspectionColumns.empty(), to_day(NOW), windows=2)
+    assert result["hives"] == []
+    assert [w["inspections"] for w in result["windows"]] == [0, 0]
+    assert result["windows"][0]["varroa_prevalence"] is None
+
+
+def test_column_cache_validates_version_and_evicts():
+    cache = ColumnCache(max_entries=1)
+    cols = InspectionColumns.empty()
+    cache.put("k1", 1, cols)
+    assert cache.get("k1", 1) is cols
+    assert cache.get("k1", 2) is None
+    cache.put("k2", 1, cols)
+    assert cache.get("k1", 1) is None
+
+
+def test_app_import_does_not_load_numpy():
+    # The analytics and route-planning stacks load on first use only.
+    code = "import sys, app.main; print(sorted({'numpy', 'app.scheduling.route'} & set(sys.modules)))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+# --------------------------------------------------------------------------- #
+# Service
+# --------------------------------------------------------------------------- #
+async def _inspect(hive_id: str, user_id: str, days_ago: int, **fields) -> Inspection:
+    inspection = Inspection(
+        id=str(uuid.uuid4()),
+        hive_id=hive_id,
+        user_id=user_id,
+        inspection_date=datetime.now(timezone.utc) - timedelta(days=days_ago),
+        **fields,
+    )
+    return await inspection.insert()
+
+
+async def test_scopes_are_owner_filtered(init_core):
+    await Apiary(id="ap1", name="Home", location="Garden").insert()
+    for hive_id in ("h1", "h2"):
+        await Hive(id=hive_id, name=hive_id, apiary_id="ap1",
+                   last_inspected=datetime.now(timezone.utc)).insert()
+    await _inspect("h1", "u1", 3)
+    await _inspect("h2", "u1", 2)
+    await _inspect("h3", "u1", 1)
+    await _inspect("h1", "u2", 1)
+
+    service = AnalyticsService(cache=ColumnCache())
+    assert (await service.for_user("u1")).inspection_count == 3
+    apiary = await service.for_apiary("ap1", "u1")
+    assert sorted(h.hive_id for h in apiary.hives) == ["h1", "h2"]
+    hive = await service.for_hive("h1", "u1")
+    assert hive.inspection_count == 1
+
+    with pytest.raises(HTTPException) as exc:
+        await service.for_apiary("missing", "u1")
+    assert exc.value.status_code == 404
+
+
+async def test_cache_reloads_only_when_scope_changes(init_core):
+    cache = ColumnCache()
+    service = AnalyticsService(cache=cache)
+    first = await _inspect("h1", "u1", 5)
+
+    key = ("hive", "h1", "u1")
+    await service.for_hive("h1", "u1")
+    cached = cache._entries[key][1]
+    await service.for_hive("h1", "u1")
+    assert cache._entries[key][1] is cached
+
+    # An edit bumps updated_at, a delete drops the count: both invalidate.
+    await InspectionService().update_inspection(
+        first.id, InspectionUpdate(varroa_mites_detected=True), "u1")
+    edited = await service.for_hive("h1", "u1")
+    assert edited.hives[0].varroa_prevalence == 1.0
+    assert cache._entries[key][1] is not cached
+
+    await InspectionService().delete_inspection(first.id, "u1")
+    assert (await service.for_hive("h1", "u1")).inspection_count == 0
@@ -53,6 +53,27 @@ def test_get_nonexistent_apiary():
     assert response.status_code == 404
 
 
+def test_nearby_apiaries_by_radius_and_box():
+    """Seeded "Backyard Garden" (Sunnyvale) is found by radius, nearest
+    first with its distance, and by bounding box."""
+    response = client.get(
+        "/api/apiaries/nearby", params={"lat": 37.37, "lon": -122.04, "radius_km": 5}
+    )
+    assert response.status_code == 200
+    first = response.json()[0]
+    assert first["id"] == "1" and first["distanceKm"] < 1
+    assert first["hiveCount"] == 4
+
+    response = client.get("/api/apiaries/nearby", params={
+        "min_lat": 37, "min_lon": -123, "max_lat": 38, "max_lon": -121})
+    assert "1" in [a["id"] for a in response.json()]
+
+    assert client.get("/api/apiaries/nearby", params={"lat": 37.37}).status_code == 400
+    response = client.get("/api/apiaries/nearby", params={
+        "min_lat": 38, "min_lon": -123, "max_lat": 37, "max_lon": -121})
+    assert response.status_code == 400
+
+
 def test_create_apiary():
     """Test creating a new apiary"""
     new_apiary = {
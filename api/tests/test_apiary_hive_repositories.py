@@ -224,3 +224,39 @@ async def test_hive_get_all(apiary_repo, hive_repo):
     assert {h1.id, h2.id, h3.id}.issubset(all_ids)
     # clean_collections guarantees isolation, so exactly these three exist.
     assert len(all_hives) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("init_core")
+async def test_apiary_geo_queries(apiary_repo):
+    """``geo`` follows latitude/longitude; radius, nearest-first and box
+    lookups run on the 2dsphere index; ``backfill_geo`` fixes legacy rows."""
+    # Roughly 0, 1.1 and 11 km north of the origin, plus one unmapped yard.
+    here = await apiary_repo.create(make_apiary(latitude=40.0, longitude=-74.0))
+    close = await apiary_repo.create(make_apiary(latitude=40.01, longitude=-74.0))
+    far = await apiary_repo.create(make_apiary(latitude=40.1, longitude=-74.0))
+    await apiary_repo.create(make_apiary(latitude=None, longitude=None))
+    assert here.geo.coordinates == [-74.0, 40.0]
+
+    near = await apiary_repo.get_near(40.0, -74.0, max_km=5)
+    assert [a.id for a, _ in near] == [here.id, close.id]
+    assert near[0][1] < 0.01 and 1.0 < near[1][1] < 1.2
+
+    ids = await apiary_repo.get_ids_within_radius(40.0, -74.0, radius_km=20)
+    assert set(ids) == {here.id, close.id, far.id}
+    boxed = await apiary_repo.get_within_box(40.05, -74.1, 40.2, -73.9)
+    assert [a.id for a in boxed] == [far.id]
+
+    # Moving an apiary moves its point.
+    far.latitude = 40.0
+    await apiary_repo.update(far)
+    assert len(await apiary_repo.get_near(40.0, -74.0, max_km=0.5)) == 2
+
+    # A document written before ``geo`` existed is found after the backfill.
+    legacy = str(uuid.uuid4())
+    await Apiary.get_motor_collection().insert_one(
+        {"_id": legacy, "name": "Old", "location": "x", "latitude": 40.0,
+         "longitude": -74.0, "status": "HEALTHY"})
+    assert legacy not in await apiary_repo.get_ids_within_radius(40.0, -74.0, 1)
+    assert await apiary_repo.backfill_geo() == 1
+    assert legacy in await apiary_repo.get_ids_within_radius(40.0, -74.0, 1)
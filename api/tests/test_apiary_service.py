@@ -33,7 +33,7 @@ cleanup is no longer needed). The skip-when-no-Mongo behaviour is carried by
     (after ``init_core`` has run).
 """
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
@@ -162,6 +162,26 @@ async def test_create_apiary_starts_with_zero_hives(init_core, service):
     assert refetched.hive_count == 0
 
 
+@pytest.mark.asyncio
+async def test_update_apiary_sets_sent_fields_and_recomputes_geo(init_core, service, apiary_repo):
+    apiary = make_apiary(name="Before")
+    # Backdated: Mongo keeps milliseconds, so "moves" must not hinge on the clock.
+    apiary.updated_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    apiary = await apiary_repo.create(apiary)
+
+    updated = await service.update_apiary(apiary.id, ApiaryUpdate(latitude=51.5))
+    assert updated.name == "Before"
+    assert (updated.latitude, updated.longitude) == (51.5, -74.0060)
+    # Raw documents: loading an Apiary re-derives geo, hiding what is stored.
+    collection = Apiary.get_motor_collection()
+    stored = await collection.find_one({"_id": apiary.id})
+    assert stored["geo"] == {"type": "Point", "coordinates": [-74.0060, 51.5]}
+    assert stored["updated_at"] > apiary.updated_at.replace(tzinfo=None)
+
+    await service.update_apiary(apiary.id, ApiaryUpdate(longitude=None))
+    assert (await collection.find_one({"_id": apiary.id}))["geo"] is None
+
+
 # --- 404 paths -----------------------------------------------------------------
 
 
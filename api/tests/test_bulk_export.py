@@ -0,0 +1,113 @@
+"""Tests for streaming export (``app/services/bulk_export.py``).
+
+Cell formatting is pure. The exporter tests run against the conftest
+``init_core`` fixture (live test Mongo, skipped when none is reachable).
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Inspection, Task, TaskStatus
+from app.schemas import InspectionResponse
+from app.services.bulk_export import BulkExporter, csv_cell, csv_columns
+from app.services.bulk_import import BulkImporter
+
+
+async def _body(chunks) -> str:
+    return b"".join([chunk async for chunk in chunks]).decode()
+
+
+def test_csv_cells_and_columns():
+    assert [csv_cell(v) for v in (None, True, False, 3, ["a"], "x")] == [
+        "", "true", "false", "3", '["a"]', "x",
+    ]
+    columns = csv_columns(InspectionResponse)
+    assert columns[0] == "hiveId" and columns[-1] == "cursor"
+    assert "inspectionDate" in columns and "userId" in columns
+
+
+def test_invalid_cursor_rejected_before_streaming():
+    with pytest.raises(HTTPException) as exc:
+        BulkExporter().stream("tasks", "u1", cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+# --------------------------------------------------------------------------- #
+# Exporter
+# --------------------------------------------------------------------------- #
+async def _seed_inspections():
+    start = datetime(2024, 1, 1)
+    for i in range(7):
+        await Inspection(
+            id=f"i{i}", user_id="u1", hive_id="h1" if i % 2 else "h2",
+            inspection_date=start + timedelta(days=i), notes=f"n{i}",
+            photos=["p6"] if i == 6 else [],
+        ).insert()
+    await Inspection(id="other", user_id="u2", hive_id="h1", inspection_date=start).insert()
+
+
+async def test_export_streams_in_order_and_resumes_from_cursor(init_core):
+    await _seed_inspections()
+    exporter = BulkExporter(batch_size=2)
+
+    rows = [json.loads(line) for line in (await _body(exporter.stream("inspections", "u1"))).splitlines()]
+    assert [r["id"] for r in rows] == [f"i{i}" for i in range(7)]
+    assert rows[0]["hiveId"] == "h2" and rows[0]["notes"] == "n0"
+
+    resumed = await _body(exporter.stream("inspections", "u1", cursor=rows[3]["cursor"]))
+    assert [json.loads(line)["id"] for line in resumed.splitlines()] == ["i4", "i5", "i6"]
+
+    filtered = await _body(exporter.stream(
+        "inspections", "u1", hive_id="h1",
+        since=datetime(2024, 1, 2), until=datetime(2024, 1, 4),
+    ))
+    assert [json.loads(line)["id"] for line in filtered.splitlines()] == ["i1", "i3"]
+
+
+async def test_csv_export_round_trips_through_import(init_core):
+    await _seed_inspections()
+    body = await _body(BulkExporter(batch_size=3).stream("inspections", "u1", fmt="csv"))
+    records = list(csv.DictReader(io.StringIO(body)))
+    assert [r["id"] for r in records] == [f"i{i}" for i in range(7)]
+    assert records[0]["queenSeen"] == "false" and records[0]["photos"] == "[]"
+
+    # The unmodified export imports back; clear the originals first so the
+    # source ids do not collide.
+    await Inspection.find_all().delete()
+
+    async def stream():
+        yield body.encode()
+
+    report = await BulkImporter().run("inspections", "u3", stream(), fmt="csv")
+    assert (report.inserted, report.failed) == (7, 0)
+    copy = await Inspection.get("i6")
+    assert copy.user_id == "u3" and copy.notes == "n6" and copy.photos == ["p6"]
+
+
+async def test_task_export_orders_by_due_date(init_core):
+    base = datetime(2024, 3, 1)
+    for task_id, days in (("late", 5), ("early", 1), ("mid", 3)):
+        await Task(id=task_id, user_id="u1", title=task_id, due_date=base + timedelta(days=days)).insert()
+    body = await _body(BulkExporter().stream("tasks", "u1"))
+    assert [json.loads(line)["id"] for line in body.splitlines()] == ["early", "mid", "late"]
+
+
+async def test_task_export_reports_past_due_pending_as_overdue(init_core):
+    now = datetime.now(timezone.utc)
+    for task_id, days, task_status in (
+        ("missed", -2, TaskStatus.PENDING),
+        ("done", -1, TaskStatus.COMPLETED),
+        ("next", 2, TaskStatus.PENDING),
+    ):
+        await Task(
+            id=task_id, user_id="u1", title=task_id, status=task_status, due_date=now + timedelta(days=days)
+        ).insert()
+    body = await _body(BulkExporter().stream("tasks", "u1", fmt="csv"))
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [(r["id"], r["status"]) for r in rows] == [
+        ("missed", "OVERDUE"), ("done", "COMPLETED"), ("next", "PENDING"),
+    ]
@@ -0,0 +1,156 @@
+"""Tests for the bulk import pipeline (``app/services/bulk_import.py``).
+
+Parsing and error mapping are pure. The importer tests run against the
+conftest ``init_core`` fixture (live test Mongo, skipped when none is
+reachable).
+"""
+import json
+from datetime import timedelta
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+from typing import List
+
+from app.models import HiveInspectionSummary, Inspection, Media, Task, TaskStatus
+from app.models.base import utcnow
+from app.schemas import TaskImportRow
+from app.services.bulk_import import (
+    BulkImporter,
+    _row_errors,
+    parse_csv,
+    parse_ndjson,
+)
+from app.services.media_service import MediaService
+
+
+async def _stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(rows):
+    return [item async for item in rows]
+
+
+# --------------------------------------------------------------------------- #
+# Parsing (pure)
+# --------------------------------------------------------------------------- #
+async def test_ndjson_rows_split_across_chunks_and_bad_lines_reported():
+    rows = await _collect(parse_ndjson(_stream(
+        b'\xef\xbb\xbf{"a": 1}\n{"a"',
+        b': 2}\r\n\n[1]\nnot json\n{"a": 3}',
+    )))
+    assert rows[0] == (1, {"a": 1})
+    assert rows[1] == (2, {"a": 2})
+    assert rows[2] == (4, "expected a JSON object")
+    assert rows[3][0] == 5 and rows[3][1].startswith("invalid JSON")
+    assert rows[4] == (6, {"a": 3})
+
+
+async def test_csv_quoted_multiline_cells_and_empty_cells():
+    body = (
+        b'hiveId,notes,queenSeen\n'
+        b'h1,"first line\nsecond, line",true\n'
+        b'h2,,\n'
+        b'h3,x,true,extra\n'
+        b'h4,"never closed\n'
+    )
+    rows = await _collect(parse_csv(_stream(body[:20], body[20:])))
+    assert rows[0] == (2, {"hiveId": "h1", "notes": "first line\nsecond, line", "queenSeen": "true"})
+    assert rows[1] == (4, {"hiveId": "h2"})
+    assert rows[2] == (5, "expected 3 columns, got 4")
+    assert rows[3] == (6, "unterminated quoted cell")
+
+
+def test_row_errors_keyed_by_chunk_index():
+    adapter = TypeAdapter(List[TaskImportRow])
+    rows = [
+        {"title": "ok", "dueDate": "2024-05-01T00:00:00Z"},
+        {"title": "no date"},
+        {"title": "weekly", "dueDate": "2024-05-01T00:00:00Z", "recurrenceFrequency": "WEEKLY"},
+    ]
+    with pytest.raises(ValidationError) as exc:
+        adapter.validate_python(rows)
+    errors = _row_errors(exc.value)
+    assert set(errors) == {1, 2}
+    assert errors[1] == ["dueDate: Field required"]
+    assert errors[2][0].startswith("recurring tasks are not supported")
+
+
+# --------------------------------------------------------------------------- #
+# Importer
+# --------------------------------------------------------------------------- #
+async def test_import_inspections_reports_bad_rows_and_rebuilds_summaries(init_core):
+    lines = [
+        {"id": "i1", "hiveId": "h1", "inspectionDate": "2024-04-01T10:00:00Z"},
+        {"id": "i2", "hiveId": "h1", "inspectionDate": "2024-05-01T10:00:00Z",
+         "varroaMitesDetected": True},
+        {"hiveId": "h2"},
+        {"hiveId": "h2", "inspectionDate": "2024-05-02T10:00:00Z"},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines).encode()
+    report = await BulkImporter().run("inspections", "u1", _stream(body))
+
+    assert (report.received, report.inserted, report.failed) == (4, 3, 1)
+    assert [(e.line, e.errors) for e in report.errors] == [(3, ["inspectionDate: Field required"])]
+    assert report.summaries_rebuilt == 2
+    stored = await Inspection.get("i2")
+    assert stored.user_id == "u1" and stored.varroa_mites_detected and stored.photos == []
+    summary = await HiveInspectionSummary.get(HiveInspectionSummary.summary_id("h1", "u1"))
+    assert summary.inspection_count == 2 and summary.varroa_detections == 1
+
+    # Re-running with source ids skips what is already there.
+    again = await BulkImporter().run("inspections", "u1", _stream(body))
+    assert again.inserted == 1
+    assert [(e.line, e.errors) for e in again.errors][:2] == [
+        (1, ["duplicate id"]),
+        (2, ["duplicate id"]),
+    ]
+
+
+async def test_import_tasks_from_csv(init_core):
+    body = (
+        b"title,dueDate,status,completedDate,hiveId\n"
+        b"Feed,2023-09-01T00:00:00Z,COMPLETED,2023-09-02T00:00:00Z,h1\n"
+        b"Treat,2023-10-01T00:00:00Z,,,\n"
+    )
+    report = await BulkImporter().run("tasks", "u1", _stream(body), fmt="csv")
+    assert (report.inserted, report.failed, report.summaries_rebuilt) == (2, 0, 0)
+    tasks = {t.title: t for t in await Task.find(Task.user_id == "u1").to_list()}
+    assert tasks["Feed"].status == TaskStatus.COMPLETED
+    assert tasks["Feed"].completed_date is not None
+    assert tasks["Treat"].status == TaskStatus.PENDING and tasks["Treat"].hive_id is None
+
+
+async def test_imported_inspection_photos_are_referenced_and_survive_gc(init_core):
+    url = "https://cdn.test/inspections/frame.jpg"
+    await Media(
+        id="inspections/frame.jpg", url=url, owner_id="u1",
+        variants={"thumb": "https://cdn.test/inspections/frame_thumb.webp"},
+        unreferenced_since=utcnow() - timedelta(days=2),
+    ).insert()
+    body = json.dumps(
+        {"id": "i1", "hiveId": "h1", "inspectionDate": "2024-04-01T10:00:00Z", "photos": [url]}
+    ).encode()
+    assert (await BulkImporter().run("inspections", "u1", _stream(body))).inserted == 1
+
+    stored = await Inspection.get("i1")
+    assert [v.url for v in stored.photo_variants] == [url]
+    assert (await Media.get("inspections/frame.jpg")).refs == ["inspection:i1"]
+
+    class Storage:
+        configured = True
+        deleted = []
+
+        def path_for_url(self, url):
+            return url.removeprefix("https://cdn.test/")
+
+        async def delete_photos(self, paths):
+            self.deleted.extend(paths)
+            return {path: True for path in paths}
+
+    media = MediaService()
+    media.storage = Storage()
+    assert await media.collect_garbage(grace_hours=24) == 0
+    assert media.storage.deleted == []
+    assert await Media.get("inspections/frame.jpg") is not None
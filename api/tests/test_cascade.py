@@ -0,0 +1,194 @@
+"""Tests for tombstoned deletes and the cascade job
+(``app/services/cascade_service.py``). They use the conftest ``init_core``
+fixture (live test Mongo, skipped when none is reachable)."""
+import pytest
+
+from app.models import (
+    Alert,
+    Hive,
+    HiveInspectionSummary,
+    Inspection,
+    Media,
+    Recommendation,
+    RecommendationState,
+    Task,
+    Tombstone,
+    TombstoneKind,
+)
+from app.models.base import utcnow
+from app.repositories import CascadeRepository, StaleTombstone
+from app.services.apiary_service import ApiaryService
+from app.services.cascade_service import CascadeService
+from app.services.hive_service import HiveService
+from app.services.media_service import HIVE, INSPECTION
+
+from .conftest import (
+    make_alert,
+    make_apiary,
+    make_hive,
+    make_inspection,
+    make_recommendation,
+    make_task,
+)
+
+CDN = "https://cdn.test"
+
+
+async def _catalogue(url: str, ref: str) -> None:
+    await Media(id=url[len(CDN) + 1:], url=url, owner_id="u", refs=[ref]).insert()
+
+
+async def _seed_hive(apiary_id=None) -> Hive:
+    hive = make_hive(apiary_id)
+    hive.image_url = f"{CDN}/hives/{hive.id}.jpg"
+    await hive.insert()
+    await _catalogue(hive.image_url, Media.ref(HIVE, hive.id))
+    for n in range(3):
+        inspection = await make_inspection(hive.id, photos=[f"{CDN}/inspections/{hive.id}/{n}.jpg"]).insert()
+        await _catalogue(inspection.photos[0], Media.ref(INSPECTION, inspection.id))
+    await make_task(hive_id=hive.id).insert()
+    await make_recommendation(hive.id).insert()
+    await RecommendationState(id=hive.id, input_hash="x", generated_at=utcnow()).insert()
+    await HiveInspectionSummary(id=f"u:{hive.id}", hive_id=hive.id, user_id="u").insert()
+    return hive
+
+
+async def _dependents(hive_id: str) -> int:
+    return sum(
+        [
+            await Inspection.find(Inspection.hive_id == hive_id).count(),
+            await Task.find(Task.hive_id == hive_id).count(),
+            await Recommendation.find(Recommendation.hive_id == hive_id).count(),
+            await RecommendationState.find({"_id": hive_id}).count(),
+            await HiveInspectionSummary.find(HiveInspectionSummary.hive_id == hive_id).count(),
+        ]
+    )
+
+
+async def test_hive_delete_returns_before_dependents_go(init_core):
+    hive = await _seed_hive()
+    await HiveService().delete_hive(hive.id)
+
+    assert await Hive.get(hive.id) is None
+    assert await _dependents(hive.id) == 7
+    tombstone = await Tombstone.get(Tombstone.tombstone_id(TombstoneKind.HIVE, hive.id))
+    assert tombstone.step == 0
+    # References outlive the hive until the cascade reaches them.
+    assert await Media.find(Media.refs == []).count() == 0
+
+
+async def test_cascade_removes_hive_dependents_media_refs_and_alert_links(init_core):
+    hive = await _seed_hive()
+    other = make_hive().id
+    alert = await make_alert(hive_ids=[hive.id, other]).insert()
+    engine_alert = await make_alert(
+        hive_ids=[hive.id], rule="swarm_cells", fingerprint=f"swarm_cells:{hive.id}:1", user_id=None
+    ).insert()
+    await HiveService().delete_hive(hive.id)
+
+    touched = await CascadeService(batch_size=2).run()
+
+    assert await _dependents(hive.id) == 0
+    assert (await Alert.get(alert.id)).hive_ids == [other]
+    # The engine no longer loads the hive, so its own alerts are resolved here.
+    resolved = await Alert.get(engine_alert.id)
+    assert resolved.dismissed and resolved.resolved_at is not None and resolved.hive_ids == []
+    assert not (await Alert.get(alert.id)).dismissed
+    # Released, not deleted: the media GC job reclaims them after the grace period.
+    media = await Media.find_all().to_list()
+    assert len(media) == 4
+    assert all(not m.refs and m.unreferenced_since for m in media)
+    # Dependents, the engine alert (resolved, then unlinked), the other
+    # alert's link, the hive image reference.
+    assert touched == 7 + 2 + 1 + 1
+    assert await Tombstone.count() == 0
+
+
+async def test_cascade_resumes_from_saved_progress(init_core):
+    hive = await _seed_hive()
+    await HiveService().delete_hive(hive.id)
+    tombstone_id = Tombstone.tombstone_id(TombstoneKind.HIVE, hive.id)
+
+    # Two one-document batches: the (already deleted) hive, one inspection.
+    await CascadeService(batch_size=1, max_batches=2).run()
+    tombstone = await Tombstone.get(tombstone_id)
+    assert tombstone.step == 1
+    assert tombstone.progress["inspections"] == 1
+    # The deleted inspection's photo was released with it.
+    assert tombstone.progress["media"] == 1
+    assert await Inspection.find(Inspection.hive_id == hive.id).count() == 2
+
+    await CascadeService(batch_size=1).run()
+    assert await Tombstone.get(tombstone_id) is None
+    assert await _dependents(hive.id) == 0
+
+
+async def test_apiary_cascade_tombstones_its_hives(init_core):
+    apiary = await make_apiary().insert()
+    hives = [await _seed_hive(apiary.id) for _ in range(2)]
+    await make_task(apiary_id=apiary.id).insert()
+    ours = await make_alert(rule="weather", fingerprint=f"weather:{apiary.id}:frost:2026-06-01").insert()
+    other = await make_alert(rule="weather", fingerprint="weather:elsewhere:frost:2026-06-01").insert()
+    await ApiaryService().delete_apiary(apiary.id)
+
+    cascade = CascadeService()
+    await cascade.run()
+    assert await Hive.find(Hive.apiary_id == apiary.id).count() == 0
+    assert await Task.find(Task.apiary_id == apiary.id).count() == 0
+    # The engine no longer sees the apiary, so its weather alerts are resolved here.
+    assert (await Alert.get(ours.id)).dismissed
+    assert (await Alert.get(ours.id)).resolved_at is not None
+    assert not (await Alert.get(other.id)).dismissed
+    # The hive tombstones were created during that pass; the next one drains them.
+    assert await Tombstone.count() == 2
+
+    await cascade.run()
+    assert await Tombstone.count() == 0
+    for hive in hives:
+        assert await _dependents(hive.id) == 0
+    assert await Media.find(Media.refs == []).count() == 8
+
+
+async def test_failing_cascade_is_given_up_after_max_attempts(init_core, monkeypatch):
+    hive = await _seed_hive()
+    await HiveService().delete_hive(hive.id)
+
+    cascade = CascadeService(max_attempts=2)
+
+    async def boom(kind, ids):
+        raise RuntimeError("media down")
+
+    monkeypatch.setattr(cascade.media, "release", boom)
+    await cascade.run()
+    tombstone = await Tombstone.get(Tombstone.tombstone_id(TombstoneKind.HIVE, hive.id))
+    assert tombstone.attempts == 1
+    assert tombstone.last_error == "media down"
+
+    await cascade.run()
+    # Given up on: left for an operator, skipped by later runs.
+    assert await CascadeService(max_attempts=2).run() == 0
+    assert await Tombstone.count() == 1
+
+
+async def test_concurrent_workers_advance_a_step_once(init_core):
+    hive = await _seed_hive()
+    await HiveService().delete_hive(hive.id)
+    tombstone_id = Tombstone.tombstone_id(TombstoneKind.HIVE, hive.id)
+    repository = CascadeRepository()
+    mine, theirs = await repository.get(tombstone_id), await repository.get(tombstone_id)
+
+    await repository.record(mine, "hives", 0, finished=True)
+    with pytest.raises(StaleTombstone):
+        await repository.record(theirs, "hives", 0, finished=True)
+    assert (await Tombstone.get(tombstone_id)).step == 1
+
+    # A worker holding the stale copy backs off instead of counting a failure.
+    cascade = CascadeService()
+
+    async def pending(limit, max_attempts):
+        return [theirs]
+
+    cascade.repository.pending = pending
+    await cascade.run()
+    stored = await Tombstone.get(tombstone_id)
+    assert (stored.step, stored.attempts) == (1, 0)
@@ -12,21 +12,49 @@ index **key spec** (the ``("field", direction)`` tuples) rather than the
 auto-generated index name, so a rename of the index never breaks the assertion.
 
 Declared indexes (source of truth — ``app/models/*.py`` ``class Settings``):
-  - Hive (``hives``):            ["apiary_id"]
-  - Alert (``alerts``):          [[("dismissed", 1), ("timestamp", -1)]]
+  - Hive (``hives``):            ["apiary_id", "updated_at", "last_inspected"]
+  - Alert (``alerts``):          [[("user_id", 1), ("dismissed", 1),
+                                   ("timestamp", -1), ("_id", -1)],
+                                  [("hive_ids", 1), ("dismissed", 1),
+                                   ("timestamp", -1), ("_id", -1)],
+                                  unique partial [("fingerprint", 1)],
+                                  [("rule", 1), ("hive_ids", 1), ("dismissed", 1)]]
   - Recommendation (``recommendations``): ["hive_id"]
   - Task (``tasks``):            ["hive_id", "apiary_id",
-                                  [("user_id", 1), ("due_date", 1)],
-                                  [("user_id", 1), ("status", 1)]]
+                                  [("user_id", 1), ("due_date", 1), ("_id", 1)],
+                                  [("user_id", 1), ("status", 1),
+                                   ("due_date", 1), ("_id", 1)],
+                                  [("user_id", 1), ("hive_id", 1),
+                                   ("due_date", 1), ("_id", 1)],
+                                  [("user_id", 1), ("apiary_id", 1),
+                                   ("due_date", 1), ("_id", 1)],
+                                  [("user_id", 1), ("priority", 1),
+                                   ("due_date", 1), ("_id", 1)],
+                                  [("status", 1), ("due_date", 1)],
+                                  [("occurrence_index", 1),
+                                   ("recurrence_materialized_until", 1)],
+                                  unique partial [("occurrence_key", 1)]]
   - Inspection (``inspections``):["hive_id", "user_id",
                                   [("hive_id", 1), ("inspection_date", -1)],
-                                  [("user_id", 1), ("inspection_date", -1)],
+                                  [("user_id", 1), ("inspection_date", -1),
+                                   ("_id", -1)],
+                                  [("user_id", 1), ("hive_id", 1),
+                                   ("inspection_date", -1), ("_id", -1)],
                                   [("user_id", 1), ("is_public", 1),
-                                   ("inspection_date", -1)]]
-  - Apiary (``apiaries``):       no custom indexes (only the default ``_id``).
-
-No model declares ``unique=True``, so there is no uniqueness to assert beyond the
-default ``_id`` index (per TEST_PLAN §4.8 note).
+                                   ("inspection_date", -1)],
+                                  [("user_id", 1), ("updated_at", -1)]]
+  - HiveInspectionSummary (``hive_inspection_summaries``): ["hive_id",
+                                  "user_id", "updated_at",
+                                  "last_inspection.inspection_date"]
+  - JobState (``job_state``):    no custom indexes (read by job name ``_id``).
+  - RecommendationState (``recommendation_state``): no custom indexes (read
+                                  by hive ``_id``).
+  - Apiary (``apiaries``):       [("geo", "2dsphere")]
+
+The declared uniqueness is the Task ``occurrence_key`` index and the Alert
+``fingerprint`` index (both partial on string keys, so ordinary documents with a
+null key never collide); they are asserted by ``test_task_occurrence_key_unique``
+and ``test_alert_fingerprint_unique``.
 
 Infra note (TEST_PLAN §3): there is no reliance on shared conftest infra here;
 like the sibling migration test files this module is self-contained so it
@@ -51,6 +79,9 @@ os.environ.setdefault("ASSISTIVE_ENV", "test")
 os.environ.setdefault("ENV", "test")
 MONGODB_URI = os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
 
+import uuid
+from datetime import datetime, timedelta, timezone
+
 import pytest
 import pytest_asyncio
 
@@ -65,8 +96,17 @@ from app.models import (  # noqa: E402
     Alert,
     Recommendation,
     Task,
+    HiveInspectionSummary,
+    TaskPriority,
+    TaskStatus,
     Inspection,
 )
+from app.repositories.alert_repository import AlertQuery, build_alert_filter  # noqa: E402
+from app.repositories.task_repository import (  # noqa: E402
+    TaskQuery,
+    TaskRepository,
+    build_task_filter,
+)
 
 
 # --- Mongo reachability guard: skip the whole module if no live Mongo. ---------
@@ -148,6 +188,33 @@ def _has_index(specs: list[list[tuple]], expected: list[tuple]) -> bool:
     return expected in specs
 
 
+def _plan_stages(plan: dict) -> list[dict]:
+    """Flatten a (winning) plan tree into its stages, root first."""
+    stages = [plan]
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            stages.extend(_plan_stages(plan[child_key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def _winning_stages(model, query: dict, sort: list[tuple]) -> list[dict]:
+    """Stages of the planner's winning plan for ``find(query).sort(sort)``."""
+    cursor = model.get_motor_collection().find(query).sort(sort)
+    explain = await cursor.explain()
+    return _plan_stages(explain["queryPlanner"]["winningPlan"])
+
+
+def _assert_index_scan(stages: list[dict], key_pattern: dict) -> None:
+    """The plan scans ``key_pattern`` and needs no in-memory SORT."""
+    scans = [s.get("keyPattern") for s in stages if s.get("stage") == "IXSCAN"]
+    assert key_pattern in scans, f"expected IXSCAN on {key_pattern}; plan {stages}"
+    assert not any(s.get("stage") == "SORT" for s in stages), (
+        f"expected the index to provide the sort; plan {stages}"
+    )
+
+
 # --- Hive ----------------------------------------------------------------------
 async def test_hive_index_on_apiary_id():
     """``hives`` has a single-field index keyed on ``apiary_id`` (ascending)."""
@@ -157,16 +224,58 @@ async def test_hive_index_on_apiary_id():
     )
 
 
+async def test_hive_alert_engine_indexes():
+    """``updated_at`` / ``last_inspected`` back the alert engine's change
+    cursor and inspection-due window."""
+    specs = await _index_key_specs(Hive)
+    for expected in ([("updated_at", 1)], [("last_inspected", 1)]):
+        assert _has_index(specs, expected), f"hives missing {expected}; got {specs}"
+
+
 # --- Alert ---------------------------------------------------------------------
-async def test_alert_compound_index():
-    """``alerts`` has the compound ``(dismissed:1, timestamp:-1)`` index.
+async def test_alert_scoped_list_indexes():
+    """``alerts`` has the owner-scoped and per-hive (multikey) list compounds,
+    each ``(..., dismissed:1, timestamp:-1, _id:-1)`` for keyset pages.
 
-    Backs ``AlertRepository.get_active`` (``dismissed == False`` newest-first).
+    Backs ``AlertRepository.query``; ``(rule, hive_ids, dismissed)`` backs the
+    engine's auto-resolution.
     """
     specs = await _index_key_specs(Alert)
-    assert _has_index(specs, [("dismissed", 1), ("timestamp", -1)]), (
-        f"expected compound (dismissed:1, timestamp:-1) index on alerts; got {specs}"
+    for expected in (
+        [("user_id", 1), ("dismissed", 1), ("timestamp", -1), ("_id", -1)],
+        [("hive_ids", 1), ("dismissed", 1), ("timestamp", -1), ("_id", -1)],
+        [("rule", 1), ("hive_ids", 1), ("dismissed", 1)],
+    ):
+        assert _has_index(specs, expected), f"alerts missing {expected}; got {specs}"
+
+
+async def test_alert_queries_use_index():
+    """Owner and hive-scoped alert pages are index scans with no blocking
+    SORT (the owner ``$in [user, None]`` is answered by a SORT_MERGE)."""
+    sort = [("timestamp", -1), ("_id", -1)]
+    patterns = (
+        {"user_id": 1, "dismissed": 1, "timestamp": -1, "_id": -1},
+        {"hive_ids": 1, "dismissed": 1, "timestamp": -1, "_id": -1},
     )
+    for q in (
+        AlertQuery(user_id="u1", dismissed=False),
+        AlertQuery(user_id="u1", hive_ids=["h1"], dismissed=False),
+    ):
+        stages = await _winning_stages(Alert, build_alert_filter(q), sort)
+        scans = [s.get("keyPattern") for s in stages if s.get("stage") == "IXSCAN"]
+        assert scans and all(p in patterns for p in scans), stages
+        assert not any(s.get("stage") == "SORT" for s in stages), stages
+
+
+async def test_alert_fingerprint_unique():
+    """Engine fingerprints are unique; manual alerts (no fingerprint) are not
+    constrained."""
+    info = await Alert.get_motor_collection().index_information()
+    fingerprint = [m for m in info.values() if m["key"] == [("fingerprint", 1)]]
+    assert fingerprint and fingerprint[0].get("unique"), info
+    assert fingerprint[0].get("partialFilterExpression") == {
+        "fingerprint": {"$type": "string"}
+    }
 
 
 # --- Recommendation ------------------------------------------------------------
@@ -180,46 +289,164 @@ async def test_recommendation_index_on_hive_id():
 
 # --- Task ----------------------------------------------------------------------
 async def test_task_indexes():
-    """``tasks`` has hive_id, apiary_id, and the two user-scoped compounds."""
+    """``tasks`` has hive_id, apiary_id, the user-scoped ``(..., due_date, _id)``
+    keyset compounds, and the global ``(status, due_date)`` compound behind the
+    overdue sweep."""
     specs = await _index_key_specs(Task)
     expected = [
         [("hive_id", 1)],
         [("apiary_id", 1)],
-        [("user_id", 1), ("due_date", 1)],
-        [("user_id", 1), ("status", 1)],
+        [("user_id", 1), ("due_date", 1), ("_id", 1)],
+        [("user_id", 1), ("status", 1), ("due_date", 1), ("_id", 1)],
+        [("user_id", 1), ("hive_id", 1), ("due_date", 1), ("_id", 1)],
+        [("user_id", 1), ("apiary_id", 1), ("due_date", 1), ("_id", 1)],
+        [("user_id", 1), ("priority", 1), ("due_date", 1), ("_id", 1)],
+        [("status", 1), ("due_date", 1)],
+        [("occurrence_index", 1), ("recurrence_materialized_until", 1)],
+        [("occurrence_key", 1)],
     ]
     missing = [e for e in expected if not _has_index(specs, e)]
     assert not missing, f"tasks missing declared indexes {missing}; got {specs}"
 
 
+async def test_task_occurrence_key_unique():
+    """``occurrence_key`` is unique, but only over string keys (partial), so a
+    re-materialised recurrence window can never double-insert."""
+    info = await Task.get_motor_collection().index_information()
+    meta = next(m for m in info.values() if m["key"] == [("occurrence_key", 1)])
+    assert meta.get("unique") is True
+    assert meta.get("partialFilterExpression") == {"occurrence_key": {"$type": "string"}}
+
+
+async def test_task_owner_scoped_hive_and_apiary_queries_use_index():
+    """``get_by_hive_for_user`` / ``get_by_apiary_for_user`` are answered by the
+    owner-scoped compounds, sorted by the index rather than in memory, so a
+    shared hive's other-owner tasks are never read."""
+    owner, other = str(uuid.uuid4()), str(uuid.uuid4())
+    hive_id, apiary_id = str(uuid.uuid4()), str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    tasks = [
+        Task(
+            id=str(uuid.uuid4()),
+            title=f"t{i}",
+            user_id=owner if i % 2 else other,
+            hive_id=hive_id,
+            apiary_id=apiary_id,
+            due_date=now + timedelta(days=i),
+        )
+        for i in range(20)
+    ]
+    await Task.insert_many(tasks)
+    try:
+        hive_stages = await _winning_stages(
+            Task, {"user_id": owner, "hive_id": hive_id}, [("due_date", 1)]
+        )
+        _assert_index_scan(
+            hive_stages, {"user_id": 1, "hive_id": 1, "due_date": 1, "_id": 1}
+        )
+
+        apiary_stages = await _winning_stages(
+            Task, {"user_id": owner, "apiary_id": apiary_id}, [("due_date", 1)]
+        )
+        _assert_index_scan(
+            apiary_stages,
+            {"user_id": 1, "apiary_id": 1, "due_date": 1, "_id": 1},
+        )
+    finally:
+        await Task.find({"_id": {"$in": [t.id for t in tasks]}}).delete()
+
+
+@pytest.mark.parametrize(
+    "filters, key_pattern",
+    [
+        ({}, {"user_id": 1, "due_date": 1, "_id": 1}),
+        ({"statuses": [TaskStatus.IN_PROGRESS]},
+         {"user_id": 1, "status": 1, "due_date": 1, "_id": 1}),
+        ({"hive_id": "hive-q"}, {"user_id": 1, "hive_id": 1, "due_date": 1, "_id": 1}),
+        ({"apiary_id": "apiary-q"},
+         {"user_id": 1, "apiary_id": 1, "due_date": 1, "_id": 1}),
+        ({"priorities": [TaskPriority.HIGH]},
+         {"user_id": 1, "priority": 1, "due_date": 1, "_id": 1}),
+    ],
+)
+async def test_task_query_combinations_use_keyset_index(filters, key_pattern):
+    """Each ``TaskQuery`` filter combination behind ``GET /tasks`` is served by
+    a ``(user_id, <filter>, due_date, _id)`` compound with no in-memory SORT,
+    including the keyset continuation of a later page."""
+    owner = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    tasks = [
+        Task(
+            id=str(uuid.uuid4()),
+            title=f"t{i}",
+            user_id=owner,
+            hive_id="hive-q" if i % 3 == 0 else None,
+            apiary_id="apiary-q" if i % 4 == 0 else None,
+            priority=TaskPriority.HIGH if i % 5 == 0 else TaskPriority.MEDIUM,
+            status=TaskStatus.IN_PROGRESS if i % 2 else TaskStatus.COMPLETED,
+            due_date=now + timedelta(days=i),
+        )
+        for i in range(30)
+    ]
+    await Task.insert_many(tasks)
+    try:
+        first = TaskQuery(user_id=owner, limit=5, **filters)
+        sort = [("due_date", 1), ("_id", 1)]
+        stages = await _winning_stages(Task, build_task_filter(first, now), sort)
+        _assert_index_scan(stages, key_pattern)
+
+        _, cursor = await TaskRepository().query(first, now=now)
+        if cursor is not None:
+            later = TaskQuery(user_id=owner, limit=5, cursor=cursor, **filters)
+            stages = await _winning_stages(Task, build_task_filter(later, now), sort)
+            _assert_index_scan(stages, key_pattern)
+    finally:
+        await Task.find({"_id": {"$in": [t.id for t in tasks]}}).delete()
+
+
 # --- Inspection ----------------------------------------------------------------
 async def test_inspection_indexes():
-    """``inspections`` has both single-field and the three feed/sort compounds."""
+    """``inspections`` has both single-field and the feed/sort compounds (the
+    owner-scoped ones end in ``_id`` for keyset export), plus ``(user_id,
+    updated_at)`` behind the analytics last-modified check."""
     specs = await _index_key_specs(Inspection)
     expected = [
         [("hive_id", 1)],
         [("user_id", 1)],
         [("hive_id", 1), ("inspection_date", -1)],
-        [("user_id", 1), ("inspection_date", -1)],
+        [("user_id", 1), ("inspection_date", -1), ("_id", -1)],
+        [("user_id", 1), ("hive_id", 1), ("inspection_date", -1), ("_id", -1)],
         [("user_id", 1), ("is_public", 1), ("inspection_date", -1)],
+        [("user_id", 1), ("updated_at", -1)],
     ]
     missing = [e for e in expected if not _has_index(specs, e)]
     assert not missing, f"inspections missing declared indexes {missing}; got {specs}"
 
 
-# --- Apiary --------------------------------------------------------------------
-async def test_apiary_has_only_default_index():
-    """``apiaries`` declares no custom indexes — only the default ``_id`` index.
+async def test_hive_inspection_summary_index_on_hive_id():
+    """``hive_inspection_summaries`` is read by ``_id``; ``hive_id`` serves
+    per-hive maintenance."""
+    specs = await _index_key_specs(HiveInspectionSummary)
+    assert _has_index(specs, [("hive_id", 1)]), (
+        f"hive_inspection_summaries missing hive_id index; got {specs}"
+    )
+    for expected in (
+        [("user_id", 1)],
+        [("updated_at", 1)],
+        [("last_inspection.inspection_date", 1)],
+    ):
+        assert _has_index(specs, expected), (
+            f"hive_inspection_summaries missing {expected}; got {specs}"
+        )
 
-    Guards against a scaffolder inventing indexes the model never declares: the
-    collection's index catalogue should contain exactly the implicit ``_id``
-    index and nothing else.
-    """
-    info = await Apiary.get_motor_collection().index_information()
-    # The only index is the default _id_ (key spec [("_id", 1)]).
-    names = set(info)
-    assert names == {"_id_"}, (
-        f"apiaries should have only the default _id_ index; got {sorted(names)}"
+
+# --- Apiary --------------------------------------------------------------------
+async def test_apiary_geo_index():
+    """``apiaries`` carries exactly the default ``_id`` index and the
+    ``geo`` 2dsphere index behind nearby queries and regional broadcast."""
+    specs = await _index_key_specs(Apiary)
+    assert sorted(specs) == [[("_id", 1)], [("geo", "2dsphere")]], (
+        f"apiaries should have only _id and geo 2dsphere indexes; got {specs}"
     )
 
 
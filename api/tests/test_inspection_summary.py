@@ -0,0 +1,170 @@
+"""Tests for the per-hive inspection rollup
+(``app/services/inspection_summary_service.py``).
+
+The rollup arithmetic (``contribution`` / ``varroa_streaks``) is pure and runs
+without Mongo; ``summarize`` builds a Beanie document, so it needs the
+initialised ODM like the rest. The maintenance tests drive ``InspectionService``
+against the conftest ``init_core`` fixture (live test Mongo, skipped when none is
+reachable) and check the incrementally maintained summary always equals a full
+rebuild from history.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import (
+    BroodPattern,
+    ColonyPopulation,
+    HiveInspectionSummary,
+    Inspection,
+)
+from app.schemas import InspectionCreate, InspectionUpdate
+from app.services.inspection_service import InspectionService
+from app.services.inspection_summary_service import (
+    InspectionSummaryService,
+    merge,
+    contribution,
+    summarize,
+    varroa_streaks,
+)
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _inspection(id: str, date: datetime, **overrides) -> Inspection:
+    # model_construct: a Beanie Document can't be instantiated before init.
+    return Inspection.model_construct(
+        id=id, hive_id="h1", user_id="u1", inspection_date=date, **overrides
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Pure rollup arithmetic
+# --------------------------------------------------------------------------- #
+def test_varroa_streaks():
+    assert varroa_streaks([]) == (0, 0)
+    assert varroa_streaks([True, True, False, True]) == (1, 2)
+    assert varroa_streaks([False, True, True, True]) == (3, 3)
+
+
+def test_contribution_cancels_out():
+    insp = _inspection("a", _utc(2026, 5, 3), varroa_mites_detected=True,
+                       estimated_frames_covered=6)
+    assert merge(contribution(insp), contribution(insp, -1)) == {}
+
+
+def test_summarize_counts_streaks_and_months(init_core):
+    history = [
+        _inspection("a", _utc(2026, 4, 20), population=ColonyPopulation.WEAK,
+                    varroa_mites_detected=True),
+        _inspection("b", _utc(2026, 5, 2), population=ColonyPopulation.STRONG,
+                    varroa_mites_detected=True, estimated_frames_covered=8),
+        _inspection("c", _utc(2026, 5, 16), population=ColonyPopulation.STRONG,
+                    brood_pattern=BroodPattern.SPOTTY, estimated_frames_covered=10),
+    ]
+    summary = summarize("h1", "u1", history)
+
+    assert summary.inspection_count == 3
+    assert summary.last_inspection.inspection_id == "c"
+    assert summary.counts["population"] == {"WEAK": 1, "STRONG": 2}
+    assert summary.counts["brood_pattern"] == {"GOOD": 2, "SPOTTY": 1}
+    assert (summary.varroa_current_streak, summary.varroa_longest_streak) == (0, 2)
+    assert summary.varroa_last_detected == _utc(2026, 5, 2)
+    may = summary.monthly["2026-05"]
+    assert (may.inspections, may.varroa_detections, may.population_score) == (2, 1, 8)
+    assert (may.frames_covered, may.frames_covered_samples) == (18, 2)
+    assert summary.monthly["2026-04"].frames_covered_samples == 0
+
+
+# --------------------------------------------------------------------------- #
+# Maintenance on write
+# --------------------------------------------------------------------------- #
+def _payload(date: datetime, **fields) -> InspectionCreate:
+    return InspectionCreate(hive_id="h1", inspection_date=date, **fields)
+
+
+async def _assert_matches_rebuild(user_id: str = "u1") -> HiveInspectionSummary:
+    stored = await HiveInspectionSummary.get(HiveInspectionSummary.summary_id("h1", user_id))
+    history = await InspectionService().repository.get_history_for_summary("h1", user_id)
+    expected = summarize("h1", user_id, history)
+    exclude = {"created_at", "updated_at", "revision_id"}
+    got = stored.model_dump(exclude=exclude)
+    want = expected.model_dump(exclude=exclude)
+    # Decrements leave zeroed paths behind; they carry no information.
+    got["counts"] = {f: {v: n for v, n in c.items() if n} for f, c in got["counts"].items()}
+    got["counts"] = {f: c for f, c in got["counts"].items() if c}
+    got["monthly"] = {m: s for m, s in got["monthly"].items() if s["inspections"]}
+    assert got == want
+    return stored
+
+
+async def test_create_update_delete_keep_summary_in_step(init_core):
+    service = InspectionService()
+    first = await service.create_inspection(
+        _payload(_utc(2026, 5, 1), varroa_mites_detected=True), "i1", "u1")
+    await service.create_inspection(
+        _payload(_utc(2026, 5, 8), varroa_mites_detected=True), "i2", "u1")
+    summary = await _assert_matches_rebuild()
+    assert summary.varroa_current_streak == 2
+    assert summary.varroa_streak_started.replace(tzinfo=timezone.utc) == _utc(2026, 5, 1)
+
+    # Back-dated entry lands in the middle of the timeline and breaks the streak.
+    await service.create_inspection(_payload(_utc(2026, 5, 4)), "i3", "u1")
+    summary = await _assert_matches_rebuild()
+    assert (summary.varroa_current_streak, summary.varroa_longest_streak) == (1, 1)
+
+    # Editing a date moves the record between months.
+    await service.update_inspection(
+        first.id, InspectionUpdate(inspection_date=_utc(2026, 4, 28)), "u1")
+    await _assert_matches_rebuild()
+
+    await service.update_inspection(
+        "i3", InspectionUpdate(population=ColonyPopulation.VERY_STRONG), "u1")
+    await _assert_matches_rebuild()
+
+    await service.delete_inspection("i2", "u1")
+    summary = await _assert_matches_rebuild()
+    assert summary.last_inspection.inspection_id == "i3"
+    assert summary.varroa_current_streak == 0
+
+
+async def test_deleting_last_inspection_removes_summary(init_core):
+    service = InspectionService()
+    await service.create_inspection(_payload(_utc(2026, 5, 1)), "only", "u1")
+    await service.delete_inspection("only", "u1")
+    assert await HiveInspectionSummary.get(HiveInspectionSummary.summary_id("h1", "u1")) is None
+
+
+async def test_get_summary_rebuilds_missing_rollup(init_core):
+    """Hives with history from before rollups existed build on first read."""
+    await Inspection(id="legacy", hive_id="h1", user_id="u1",
+                     inspection_date=_utc(2026, 3, 1)).insert()
+
+    response = await InspectionSummaryService().get_summary("h1", "u1")
+    assert response.inspection_count == 1
+    assert response.monthly[0].month == "2026-03"
+    assert response.monthly[0].avg_population == 3
+
+
+async def test_get_summary_404_without_inspections(init_core):
+    with pytest.raises(HTTPException) as exc:
+        await InspectionSummaryService().get_summary("h1", "u1")
+    assert exc.value.status_code == 404
+
+
+async def test_rebuild_all_repairs_and_drops_orphans(init_core):
+    service = InspectionService()
+    await service.create_inspection(_payload(_utc(2026, 5, 1)), "i1", "u1")
+    await HiveInspectionSummary.get_motor_collection().update_one(
+        {"_id": HiveInspectionSummary.summary_id("h1", "u1")},
+        {"$set": {"inspection_count": 99}},
+    )
+    orphan = HiveInspectionSummary(id="u9:gone", hive_id="gone", user_id="u9")
+    await orphan.insert()
+
+    assert await InspectionSummaryService().rebuild_all() == 1
+    await _assert_matches_rebuild()
+    assert await HiveInspectionSummary.get("u9:gone") is None
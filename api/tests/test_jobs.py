@@ -0,0 +1,88 @@
+"""Tests for the in-process periodic job runner (``app/jobs/scheduler.py``).
+
+These exercise ``PeriodicJob`` / ``Scheduler`` with plain async callables, so
+they need no Mongo and run in DB-less CI. The DB-backed job bodies (e.g. the
+global overdue sweep) are covered by their repository tests.
+"""
+import asyncio
+
+from app.jobs import PeriodicJob, Scheduler
+
+
+async def test_run_once_records_touched_rows():
+    async def body() -> int:
+        return 3
+
+    job = PeriodicJob("demo", body, interval_seconds=60)
+    assert await job.run_once() == 3
+    assert await job.run_once() == 3
+
+    stats = job.stats.as_dict()
+    assert stats["runs"] == 2
+    assert stats["failures"] == 0
+    assert stats["last_touched"] == 3
+    assert stats["total_touched"] == 6
+    assert stats["recent_touched"] == [3, 3]
+    assert stats["last_run_at"] is not None
+
+
+async def test_run_once_swallows_failures():
+    async def boom() -> int:
+        raise RuntimeError("db down")
+
+    job = PeriodicJob("boom", boom, interval_seconds=60)
+    assert await job.run_once() == 0
+    assert job.stats.failures == 1
+    assert job.stats.runs == 1
+
+
+async def test_disabled_job_never_starts():
+    calls = []
+
+    async def body() -> int:
+        calls.append(1)
+        return 0
+
+    job = PeriodicJob("off", body, interval_seconds=0)
+    scheduler = Scheduler()
+    scheduler.add(job)
+    scheduler.start()
+    await asyncio.sleep(0)
+    await scheduler.stop()
+    assert not job.enabled
+    assert calls == []
+
+
+async def test_scheduler_start_runs_and_stop_cancels():
+    ran = asyncio.Event()
+
+    async def body() -> int:
+        ran.set()
+        return 1
+
+    scheduler = Scheduler()
+    scheduler.add(PeriodicJob("tick", body, interval_seconds=3600))
+    scheduler.start()
+    await asyncio.wait_for(ran.wait(), timeout=1)
+    await scheduler.stop()
+
+    assert scheduler.stats()["tick"]["runs"] == 1
+    assert scheduler.get("tick")._task is None
+
+
+def test_overdue_sweep_is_registered():
+    from app.jobs import scheduler
+
+    assert scheduler.get("overdue_tasks") is not None
+
+
+def test_cascade_job_is_registered():
+    from app.jobs import scheduler
+
+    assert scheduler.get("cascade") is not None
+
+
+def test_media_gc_job_is_registered():
+    from app.jobs import scheduler
+
+    assert scheduler.get("media_gc") is not None
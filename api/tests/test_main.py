@@ -24,6 +24,9 @@ os.environ.setdefault("IDENTITY_DB", "assistive_identity_test")
 os.environ.setdefault("ASSISTIVE_ENV", "test")
 os.environ.setdefault("ENV", "test")
 MONGODB_URI = os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+# The route tests read the demo data the lifespan seeds; startup only seeds
+# when asked to.
+os.environ.setdefault("SEED_ON_STARTUP", "true")
 
 import pytest
 from fastapi.testclient import TestClient
@@ -78,6 +81,22 @@ def test_health_endpoint():
     assert response.json() == {"status": "healthy"}
 
 
+def test_requests_are_timed_and_exposed_as_metrics():
+    """Every response carries ``Server-Timing``; ``/metrics`` reports the
+    latency histogram under the route template."""
+    response = client.get("/health")
+    assert response.headers["server-timing"].startswith("app;dur=")
+    assert 'db;dur=0.0;desc="0 commands"' in response.headers["server-timing"]
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        in metrics.text
+    )
+
+
 def test_app_boots_with_lifespan():
     """App boots cleanly under the real lifespan (init_core + seed_database).
 
@@ -0,0 +1,193 @@
+"""Tests for the media catalog, reference tracking and photo GC
+(``app/services/media_service.py``). They use the conftest ``init_core``
+fixture (live test Mongo, skipped when none is reachable) and a fake photo
+store in place of Bunny."""
+import io
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Media, PhotoVariants
+from app.models.base import utcnow
+from app.schemas import InspectionCreate, InspectionUpdate
+from app.services.image_processing import ProcessedImage, Variant
+from app.services.inspection_service import InspectionService
+from app.services.media_service import HIVE, INSPECTION, MediaService
+
+CDN = "https://cdn.test"
+
+
+class FakeStorage:
+    configured = True
+
+    def __init__(self, fail: bool = False):
+        self.uploaded = []
+        self.deleted = []
+        self.fail = fail
+
+    async def upload_photo(self, file_content, filename, folder="inspections"):
+        path = f"{folder}/{len(self.uploaded)}_{filename}"
+        self.uploaded.append(path)
+        return f"{CDN}/{path}"
+
+    def path_for_url(self, url):
+        return url[len(CDN) + 1:] if url.startswith(CDN + "/") else None
+
+    async def delete_photo(self, path):
+        if self.fail:
+            return False
+        self.deleted.append(path)
+        return True
+
+    async def delete_photos(self, paths):
+        return {path: await self.delete_photo(path) for path in paths}
+
+
+async def _render(content: bytes) -> ProcessedImage:
+    return ProcessedImage(variants=[Variant("thumb", 160, 120, b"t" + content, "image/webp", "webp")])
+
+
+def _media(storage: FakeStorage) -> MediaService:
+    service = MediaService()
+    service.storage = storage
+    service.render = _render
+    return service
+
+
+async def _age(media: Media, hours: float) -> None:
+    await Media.get_motor_collection().update_one(
+        {"_id": media.id}, {"$set": {"unreferenced_since": utcnow() - timedelta(hours=hours)}}
+    )
+
+
+async def test_upload_dedupes_identical_bytes_per_owner(init_core):
+    storage = FakeStorage()
+    service = _media(storage)
+
+    first = await service.upload(b"frame", "a.jpg", "inspections", "u1", "image/jpeg")
+    again = await service.upload(b"frame", "b.jpg", "inspections", "u1", "image/jpeg")
+    other = await service.upload(b"frame", "a.jpg", "inspections", "u2", "image/jpeg")
+
+    assert again.id == first.id
+    assert other.id != first.id
+    # Original plus thumbnail, once per owner.
+    assert len(storage.uploaded) == 4
+    assert first.variants == {"thumb": f"{CDN}/inspections/1_a_thumb.webp"}
+    assert first.size == 5 and first.owner_id == "u1"
+    assert first.unreferenced_since is not None
+
+
+async def test_references_follow_inspection_changes(init_core):
+    service = InspectionService()
+    service.media = _media(FakeStorage())
+    a = await service.media.upload(b"a", "a.jpg", "inspections", "u1")
+    b = await service.media.upload(b"b", "b.jpg", "inspections", "u1")
+
+    created = await service.create_inspection(
+        InspectionCreate(hive_id="h1", inspection_date=utcnow(), photos=[a.url, b.url]), "i1", "u1"
+    )
+    assert (await Media.get(a.id)).refs == [Media.ref(INSPECTION, created.id)]
+    assert (await Media.get(b.id)).unreferenced_since is None
+    assert [v.variants for v in created.photo_variants] == [a.variants, b.variants]
+
+    returned = await service.update_inspection("i1", InspectionUpdate(photos=[a.url]), "u1")
+    assert [v.url for v in returned.photo_variants] == [a.url]
+    # The post-image the repository returns (and caches) holds models, not dicts.
+    _, after = await service.repository.update_fields(
+        "i1", "u1", {"photo_variants": [{"url": a.url, "variants": a.variants}]}
+    )
+    assert isinstance(after.photo_variants[0], PhotoVariants)
+    assert [v.url for v in (await service.get_inspection("i1", "u1")).photo_variants] == [a.url]
+    assert (await Media.get(a.id)).ref_count == 1
+    dropped = await Media.get(b.id)
+    assert dropped.refs == [] and dropped.unreferenced_since is not None
+
+    # Shared with a hive: the inspection letting go does not orphan it.
+    await service.media.attach(HIVE, "h1", [a.url])
+    await service.delete_inspection("i1", "u1")
+    assert (await Media.get(a.id)).refs == [Media.ref(HIVE, "h1")]
+
+
+async def test_gc_deletes_only_long_unreferenced_objects(init_core):
+    storage = FakeStorage()
+    service = _media(storage)
+    old = await service.upload(b"old", "old.jpg", "inspections", "u1")
+    fresh = await service.upload(b"fresh", "fresh.jpg", "inspections", "u1")
+    used = await service.upload(b"used", "used.jpg", "inspections", "u1")
+    await service.attach(INSPECTION, "i1", [used.url])
+    await _age(old, 48)
+    await _age(used, 48)
+
+    assert await service.collect_garbage(grace_hours=24) == 1
+    assert storage.deleted == [old.id, storage.path_for_url(old.variants["thumb"])]
+    assert await Media.get(old.id) is None
+    assert await Media.get(fresh.id) is not None
+    assert await Media.get(used.id) is not None
+
+
+async def test_gc_restores_entries_whose_delete_failed(init_core):
+    service = _media(FakeStorage(fail=True))
+    media = await service.upload(b"x", "x.jpg", "inspections", "u1")
+    await _age(media, 48)
+
+    assert await service.collect_garbage(grace_hours=24) == 0
+    assert await Media.get(media.id) is not None
+
+    service.storage = FakeStorage()
+    assert await service.collect_garbage(grace_hours=24) == 1
+
+
+async def test_delete_checks_owner_and_references(init_core):
+    storage = FakeStorage()
+    service = _media(storage)
+    media = await service.upload(b"x", "x.jpg", "inspections", "u1")
+
+    with pytest.raises(HTTPException) as missing:
+        await service.delete("inspections/elsewhere.jpg", "u1")
+    assert missing.value.status_code == 404
+    with pytest.raises(HTTPException) as foreign:
+        await service.delete(media.id, "u2")
+    assert foreign.value.status_code == 403
+
+    await service.attach(INSPECTION, "i1", [media.url])
+    with pytest.raises(HTTPException) as referenced:
+        await service.delete(media.id, "u1")
+    assert referenced.value.status_code == 409
+
+    await service.release(INSPECTION, ["i1"])
+    await service.delete(media.id, "u1")
+    assert storage.deleted == [media.id, storage.path_for_url(media.variants["thumb"])]
+    assert await Media.get(media.id) is None
+
+
+async def test_failed_original_upload_discards_its_variants(init_core):
+    storage = FakeStorage()
+
+    async def upload_photo(file_content, filename, folder="inspections"):
+        return None if filename == "a.jpg" else f"{CDN}/{folder}/{filename}"
+
+    storage.upload_photo = upload_photo
+    assert await _media(storage).upload(b"a", "a.jpg", "inspections", "u1") is None
+    assert storage.deleted == ["inspections/a_thumb.webp"]
+    assert await Media.count() == 0
+
+
+def test_process_image_bounds_variants_and_strips_exif():
+    Image = pytest.importorskip("PIL.Image")
+    from app.services.image_processing import VARIANT_SIZES, process_image
+
+    exif = Image.Exif()
+    exif[0x0112] = 6  # orientation: rotated 90 degrees
+    exif[0x010F] = "camera"
+    buffer = io.BytesIO()
+    Image.new("RGB", (2000, 1000), "yellow").save(buffer, format="JPEG", exif=exif)
+
+    processed = process_image(buffer.getvalue())
+
+    assert [v.name for v in processed.variants] == list(VARIANT_SIZES)
+    for variant in processed.variants:
+        # Orientation applied: portrait, longest edge at the bound.
+        assert (variant.width, variant.height) == (VARIANT_SIZES[variant.name] // 2, VARIANT_SIZES[variant.name])
+        assert not Image.open(io.BytesIO(variant.content)).getexif()
+    assert not Image.open(io.BytesIO(processed.original)).getexif()
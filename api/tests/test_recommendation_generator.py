@@ -0,0 +1,162 @@
+"""Tests for server-side recommendation generation
+(``app/services/recommendation_generator.py``).
+
+Fact reduction, hashing and the rules are pure and run without Mongo. The
+generator tests run against the conftest ``init_core`` fixture (live test
+Mongo, skipped when none is reachable) and cover memoization, the in-place
+swap and the bulk apiary path.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import (
+    Apiary,
+    BroodPattern,
+    ColonyPopulation,
+    Hive,
+    Inspection,
+    QueenCellStatus,
+    Recommendation,
+    RecommendationType,
+    ResourceLevel,
+    Task,
+    TaskStatus,
+)
+from app.models.base import utcnow
+from app.services.recommendation_generator import (
+    RecommendationGenerator,
+    derive_recommendations,
+    hive_facts,
+    input_hash,
+)
+
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _inspection(days_ago: float = 2, **fields) -> Inspection:
+    # model_construct: a Beanie Document can't be instantiated before init.
+    fields.setdefault("queen_seen", True)
+    return Inspection.model_construct(
+        id="i1", hive_id="h1", user_id="u1",
+        inspection_date=NOW - timedelta(days=days_ago), **fields)
+
+
+def _task(title: str, due_in_days: float, status: TaskStatus = TaskStatus.PENDING) -> Task:
+    return Task.model_construct(id=title, title=title, status=status,
+                                due_date=NOW + timedelta(days=due_in_days))
+
+
+def _rules(facts: dict) -> dict:
+    return {d.rule: d for d in derive_recommendations(facts)}
+
+
+# --------------------------------------------------------------------------- #
+# Facts + rules (pure)
+# --------------------------------------------------------------------------- #
+def test_facts_hash_ignores_irrelevant_changes():
+    base = hive_facts(_inspection(), [_task("Feed", 3)], {}, NOW)
+    # A day later nothing the rules read has changed.
+    later = hive_facts(_inspection(), [_task("Feed", 3)], {}, NOW + timedelta(hours=6))
+    assert input_hash(base) == input_hash(later)
+
+    with_task = hive_facts(_inspection(), [_task("Feed", 3), _task("Treat", 5)], {}, NOW)
+    assert input_hash(with_task) != input_hash(base)
+    unknown_weather = hive_facts(_inspection(), [_task("Feed", 3)], None, NOW)
+    assert input_hash(unknown_weather) != input_hash(base)
+
+
+def test_rules_from_latest_inspection():
+    rules = _rules(hive_facts(
+        _inspection(queen_cells=QueenCellStatus.SWARM_CELLS, varroa_mites_detected=True,
+                    honey_stores=ResourceLevel.LOW),
+        [], {"frost": 0.5}, NOW))
+    assert rules["swarm"].type == RecommendationType.ACTION_REQUIRED
+    assert rules["varroa"].title == "Treat for varroa"
+    assert "stores" in rules and "weather" in rules
+    assert "thriving" not in rules
+
+    assert _rules(hive_facts(None, [], None, NOW))["inspect"].type == RecommendationType.INFO
+    assert _rules(hive_facts(_inspection(days_ago=20), [], None, NOW))["inspect"].type == (
+        RecommendationType.ACTION_REQUIRED)
+
+
+def test_thriving_only_without_concerns():
+    strong = dict(population=ColonyPopulation.STRONG, brood_pattern=BroodPattern.EXCELLENT)
+    assert "thriving" in _rules(hive_facts(_inspection(**strong), [], {}, NOW))
+    overdue = [_task("Requeen", -1)]
+    rules = _rules(hive_facts(_inspection(**strong), overdue, {}, NOW))
+    assert "thriving" not in rules
+    assert rules["tasks"].description == "Overdue: Requeen."
+
+
+# --------------------------------------------------------------------------- #
+# Generator
+# --------------------------------------------------------------------------- #
+async def _hive(hive_id: str = "h1", apiary_id: str = "ap1") -> Hive:
+    return await Hive(id=hive_id, name=hive_id, apiary_id=apiary_id,
+                      last_inspected=utcnow()).insert()
+
+
+async def _inspect(hive_id: str = "h1", **fields) -> Inspection:
+    return await Inspection(id=str(uuid.uuid4()), hive_id=hive_id, user_id="u1",
+                            inspection_date=utcnow(), queen_seen=True, **fields).insert()
+
+
+async def test_generator_memoizes_and_swaps_in_place(init_core):
+    hive = await _hive()
+    manual = await Recommendation(id="manual", hive_id="h1", type=RecommendationType.INFO,
+                                  title="Posted", description="by a client").insert()
+    await _inspect(varroa_mites_detected=True)
+    generator = RecommendationGenerator(weather=None)
+
+    assert await generator.regenerate([hive]) == (1, 0)
+    assert await generator.regenerate([hive]) == (0, 1)
+    recs = {r.id: r for r in await Recommendation.find(Recommendation.hive_id == "h1").to_list()}
+    assert set(recs) == {"manual", "h1:varroa"}
+
+    # A new inspection changes the inputs: varroa clears, the colony is thriving.
+    await _inspect(population="STRONG")
+    assert await generator.regenerate([hive]) == (1, 0)
+    recs = {r.id for r in await Recommendation.find(Recommendation.hive_id == "h1").to_list()}
+    assert recs == {manual.id, "h1:thriving"}
+
+
+async def test_generator_task_changes_trigger_regeneration(init_core):
+    hive = await _hive()
+    await _inspect()
+    generator = RecommendationGenerator(weather=None)
+    await generator.regenerate([hive])
+
+    await Task(id="t1", user_id="u1", hive_id="h1", title="Add super",
+               due_date=utcnow() + timedelta(days=2)).insert()
+    assert await generator.regenerate([hive]) == (1, 0)
+    assert await Recommendation.get("h1:tasks") is not None
+
+    await Task.find(Task.id == "t1").update({"$set": {"status": TaskStatus.COMPLETED}})
+    assert await generator.regenerate([hive]) == (1, 0)
+    assert await Recommendation.get("h1:tasks") is None
+
+
+async def test_regenerate_apiary_in_bulk(init_core):
+    class FakeWeather:
+        async def get_forecast_batch(self, coordinates, hours=24):
+            return [{"hours": [{"temperature_c": -3.0}]} for _ in coordinates]
+
+    await Apiary(id="ap1", name="Home", location="Garden", latitude=51.5, longitude=-0.1).insert()
+    for hive_id in ("h1", "h2", "h3"):
+        await _hive(hive_id)
+        await _inspect(hive_id)
+    generator = RecommendationGenerator(weather=FakeWeather(), workers=2)
+
+    result = await generator.regenerate_apiary("ap1")
+    assert (result.regenerated, result.unchanged) == (3, 0)
+    assert await Recommendation.get("h2:weather") is not None
+    assert (await generator.regenerate_apiary("ap1")).unchanged == 3
+
+    with pytest.raises(HTTPException) as exc:
+        await generator.regenerate_apiary("missing")
+    assert exc.value.status_code == 404
@@ -35,3 +35,19 @@ def test_get_recommendations_for_hive():
         # All recommendations should be for this hive
         for rec in data:
             assert rec["hiveId"] == hive_id
+
+
+def test_generate_recommendations_for_hive():
+    """The generator endpoint derives recommendations for a hive; a second
+    call with unchanged inputs is a no-op."""
+    hives = client.get("/api/hives").json()
+    if hives:
+        hive_id = hives[0]["id"]
+        client.post(f"/api/recommendations/generate?hive_id={hive_id}")
+        response = client.post(f"/api/recommendations/generate?hive_id={hive_id}")
+        assert response.status_code == 200
+        assert response.json() == {"regenerated": 0, "unchanged": 1}
+        recs = client.get(f"/api/recommendations?hive_id={hive_id}").json()
+        assert any(rec["rule"] for rec in recs)
+    assert client.post("/api/recommendations/generate").status_code == 400
+    assert client.post("/api/recommendations/generate?hive_id=missing").status_code == 404
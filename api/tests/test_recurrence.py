@@ -0,0 +1,198 @@
+"""Tests for recurring-task expansion (``app/services/recurrence_service.py``).
+
+The date arithmetic (``occurrence_date`` / ``iter_occurrences``) is pure and
+runs without Mongo. The materialisation tests depend on the conftest
+``init_core`` fixture (live test Mongo, skipped when none is reachable).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import RecurrenceFrequency, Task, TaskStatus
+from app.schemas import TaskCreate
+from app.services.recurrence_service import (
+    RecurrenceService,
+    iter_occurrences,
+    occurrence_date,
+)
+from app.services.task_service import TaskService
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+# --------------------------------------------------------------------------- #
+# Pure date arithmetic
+# --------------------------------------------------------------------------- #
+def test_weekly_interval_steps_in_days():
+    start = _utc(2026, 3, 2, 9)
+    assert occurrence_date(start, RecurrenceFrequency.WEEKLY, 2, 3) == start + timedelta(weeks=6)
+
+
+def test_monthly_clamps_without_drift():
+    """Dates are computed from the series start, so Jan 31 never decays to 28."""
+    start = _utc(2026, 1, 31)
+    dates = [occurrence_date(start, RecurrenceFrequency.MONTHLY, 1, i) for i in range(4)]
+    assert [d.day for d in dates] == [31, 28, 31, 30]
+
+
+def test_quarterly_and_yearly():
+    start = _utc(2024, 2, 29)
+    assert occurrence_date(start, RecurrenceFrequency.QUARTERLY, 1, 1) == _utc(2024, 5, 29)
+    assert occurrence_date(start, RecurrenceFrequency.YEARLY, 1, 1) == _utc(2025, 2, 28)
+
+
+def _series(**overrides) -> Task:
+    data = dict(
+        id="root",
+        title="Feed",
+        user_id="u1",
+        due_date=_utc(2026, 1, 1),
+        recurrence_frequency=RecurrenceFrequency.DAILY,
+    )
+    data.update(overrides)
+    return Task.model_construct(**data)
+
+
+def test_iter_occurrences_respects_count_and_end_date():
+    counted = _series(recurrence_count=3)
+    assert [i for i, _ in iter_occurrences(counted, 1, _utc(2027, 1, 1))] == [1, 2]
+
+    ended = _series(recurrence_end_date=_utc(2026, 1, 4))
+    assert [i for i, _ in iter_occurrences(ended, 1, _utc(2027, 1, 1))] == [1, 2, 3]
+
+
+def test_iter_occurrences_stops_at_until():
+    series = _series()
+    got = list(iter_occurrences(series, 5, _utc(2026, 1, 8)))
+    assert [i for i, _ in got] == [5, 6, 7]
+    assert got[0][1] == _utc(2026, 1, 6)
+
+
+# --------------------------------------------------------------------------- #
+# Materialisation (live Mongo)
+# --------------------------------------------------------------------------- #
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _user_tasks(user_id: str):
+    return await Task.find(Task.user_id == user_id).sort(Task.due_date).to_list()
+
+
+async def test_create_materialises_within_horizon(init_core):
+    service = TaskService()
+    await service.create_task(
+        TaskCreate(title="Weekly", due_date=_now(), recurrence_frequency=RecurrenceFrequency.WEEKLY),
+        "root-1",
+        "u1",
+    )
+    tasks = await _user_tasks("u1")
+    horizon = service.recurrence.horizon_days
+    assert [t.occurrence_index for t in tasks] == list(range(horizon // 7 + 1))
+    assert all(t.series_id == "root-1" for t in tasks)
+    assert len({t.occurrence_key for t in tasks}) == len(tasks)
+
+
+async def test_materialise_is_idempotent_and_incremental(init_core):
+    service = TaskService()
+    await service.create_task(
+        TaskCreate(title="Daily", due_date=_now(), recurrence_frequency=RecurrenceFrequency.DAILY),
+        "root-2",
+        "u1",
+    )
+    before = len(await _user_tasks("u1"))
+
+    # Same horizon again: nothing new is written.
+    assert await service.recurrence.materialize_due() == 0
+    assert len(await _user_tasks("u1")) == before
+
+    # Rolling the clock forward only inserts the new tail.
+    later = _now() + timedelta(days=5)
+    assert await service.recurrence.materialize_due(now=later) == 5
+    assert len(await _user_tasks("u1")) == before + 5
+
+
+async def test_complete_spawns_next_occurrence(init_core):
+    service = TaskService()
+    # A short horizon so the successor is not materialised yet.
+    service.recurrence = RecurrenceService(horizon_days=0)
+    await service.create_task(
+        TaskCreate(title="Monthly", due_date=_now(), recurrence_frequency=RecurrenceFrequency.MONTHLY),
+        "root-3",
+        "u1",
+    )
+    assert len(await _user_tasks("u1")) == 1
+
+    await service.complete_task("root-3", "u1")
+    tasks = await _user_tasks("u1")
+    assert [t.occurrence_index for t in tasks] == [0, 1]
+    assert tasks[0].status == TaskStatus.COMPLETED
+    assert tasks[1].status == TaskStatus.PENDING
+
+    # Completing again does not duplicate the successor.
+    await service.recurrence.spawn_next(tasks[0])
+    assert len(await _user_tasks("u1")) == 2
+
+    # The spawned successor lies past the horizon; the root moved on, so it
+    # is not also projected virtually.
+    assert (await Task.get("root-3")).recurrence_next_index == 2
+    upcoming = await service.get_upcoming_tasks("u1", days=91)
+    keys = [t.id if t.is_virtual else f"root-3:{t.occurrence_index}" for t in upcoming]
+    assert len(keys) == len(set(keys))
+
+
+async def test_job_skips_exhausted_and_caught_up_series(init_core):
+    service = TaskService()
+    for root_id, count in (("root-live", None), ("root-done", 3)):
+        await service.create_task(
+            TaskCreate(title=root_id, due_date=_now(), recurrence_frequency=RecurrenceFrequency.DAILY,
+                       recurrence_count=count),
+            root_id,
+            "u1",
+        )
+    done = await Task.get("root-done")
+    assert done.recurrence_exhausted and done.recurrence_next_index == 3
+    live = await Task.get("root-live")
+    assert not live.recurrence_exhausted
+    # The stored date is the next occurrence to materialise, past the horizon.
+    assert live.recurrence_materialized_until.replace(tzinfo=timezone.utc) > service.recurrence.horizon()
+
+    behind = service.repository.get_series_roots_behind
+    assert await behind(service.recurrence.horizon()) == []
+    # Two days on, only the live series is behind; an hour's lag is tolerated.
+    later = service.recurrence.horizon(_now() + timedelta(days=2))
+    assert [t.id for t in await behind(later)] == ["root-live"]
+    assert await behind(service.recurrence.horizon(_now() + timedelta(minutes=30))
+                        - timedelta(hours=1)) == []
+
+
+async def test_upcoming_expands_virtually_past_horizon(init_core):
+    service = TaskService()
+    await service.create_task(
+        TaskCreate(title="Weekly", due_date=_now(), recurrence_frequency=RecurrenceFrequency.WEEKLY),
+        "root-4",
+        "u1",
+    )
+    stored = len(await _user_tasks("u1"))
+
+    upcoming = await service.get_upcoming_tasks("u1", days=91)
+    virtual = [t for t in upcoming if t.is_virtual]
+    assert virtual, "expected query-time occurrences beyond the horizon"
+    assert len(upcoming) == 14
+    assert all(t.id.startswith("root-4:") for t in virtual)
+    # Nothing was written for the virtual range.
+    assert len(await _user_tasks("u1")) == stored
+
+
+@pytest.mark.parametrize("days", [7, 30])
+async def test_upcoming_within_horizon_is_db_only(init_core, days):
+    service = TaskService()
+    await service.create_task(
+        TaskCreate(title="Weekly", due_date=_now(), recurrence_frequency=RecurrenceFrequency.WEEKLY),
+        "root-5",
+        "u1",
+    )
+    upcoming = await service.get_upcoming_tasks("u1", days=days)
+    assert not any(t.is_virtual for t in upcoming)
@@ -0,0 +1,115 @@
+"""Tests for assistive-core's request-scoped identity map and query cache.
+The last test needs the conftest ``init_core`` fixture (live test Mongo,
+skipped when none is reachable)."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from assistive_core import request_cache, request_cache_metrics, request_scope
+
+from app.models import Hive
+
+
+class _Loader:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def __call__(self, *args):
+        self.calls.append(args)
+        return self.result(*args) if callable(self.result) else self.result
+
+
+class _Hive(SimpleNamespace):
+    """Stands in for a Beanie document (only the collection name is used)."""
+
+    @staticmethod
+    def get_settings():
+        return SimpleNamespace(name="hives")
+
+
+def _write(command_name: str, collection: str):
+    return SimpleNamespace(command_name=command_name, command={command_name: collection})
+
+
+async def test_lookups_outside_a_scope_always_load():
+    load = _Loader("hive")
+    assert await request_cache.get_document(_Hive, "h1", load) == "hive"
+    assert await request_cache.get_document(_Hive, "h1", load) == "hive"
+    assert len(load.calls) == 2
+    assert request_cache.current() is None
+
+
+async def test_identity_map_and_query_cache_within_a_scope():
+    before = request_cache_metrics()
+    hive = _Hive(id="h1")
+    load = _Loader(hive)
+    count = _Loader(3)
+    with request_scope() as cache:
+        assert await request_cache.get_document(_Hive, "h1", load) is hive
+        assert await request_cache.get_document(_Hive, "h1", load) is hive
+        assert await request_cache.cached_query("hives", ("count", "a1"), count) == 3
+        assert await request_cache.cached_query("hives", ("count", "a1"), count) == 3
+        missing = _Loader(None)
+        assert await request_cache.get_document(_Hive, "nope", missing) is None
+        assert await request_cache.get_document(_Hive, "nope", missing) is None
+    assert len(load.calls) == 1 and len(count.calls) == 1 and len(missing.calls) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+    after = request_cache_metrics()
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] - before["misses"] == 4
+    assert request_cache.current() is None
+
+
+async def test_get_documents_loads_only_the_missing_ids():
+    load = _Loader(lambda ids: [_Hive(id=i) for i in ids if i != "gone"])
+    with request_scope() as cache:
+        await request_cache.get_document(_Hive, "h1", _Loader(_Hive(id="h1")))
+        found = await request_cache.get_documents(_Hive, ["h2", "h1", "gone", "h2"], load)
+        assert [h.id for h in found] == ["h2", "h1"]
+        assert load.calls == [(["h2", "gone"],)]
+        again = await request_cache.get_documents(_Hive, ["h1", "h2"], load)
+    assert [h.id for h in again] == ["h1", "h2"]
+    assert len(load.calls) == 1
+    assert cache.hits == 1
+
+
+async def test_writes_invalidate_their_collection_only():
+    hive = _Hive(id="h1")
+    load = _Loader(hive)
+    with request_scope() as cache:
+        await request_cache.get_document(_Hive, "h1", load)
+        await request_cache.cached_query("apiaries", "all", _Loader([]))
+
+        request_cache.invalidator.started(_write("find", "hives"))
+        request_cache.invalidator.started(_write("update", "hives"))
+        await request_cache.get_document(_Hive, "h1", load)
+        assert len(load.calls) == 2
+        assert ("apiaries", "all") in cache.queries
+
+        request_cache.invalidator.started(_write("findAndModify", "apiaries"))
+        assert cache.queries == {}
+        # A save re-seeds the identity map.
+        request_cache.remember(_Hive(id="h2"))
+        assert ("hives", "h2") in cache.documents
+    assert cache.invalidations == 2
+
+
+async def test_repository_reads_are_served_from_the_scope(init_core):
+    from app.repositories.hive_repository import HiveRepository
+
+    hives = HiveRepository()
+    hive = await Hive(
+        id=str(uuid4()), apiary_id="a1", name="Cached", last_inspected=datetime.now(timezone.utc)
+    ).insert()
+    with request_scope() as cache:
+        first = await hives.get_by_id(hive.id)
+        assert await hives.get_by_id(hive.id) is first
+        assert await hives.count_by_apiary_id("a1") == 1
+        assert await hives.count_by_apiary_id("a1") == 1
+        assert cache.hits == 2
+
+        first.name = "Renamed"
+        await hives.update(first)
+        assert await hives.count_by_apiary_id("a1") == 1
+        assert (await hives.get_by_id(hive.id)).name == "Renamed"
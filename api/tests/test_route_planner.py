@@ -0,0 +1,118 @@
+"""Tests for day route planning (``app/scheduling/route.py`` and
+``app/services/route_planner.py``).
+
+Distances and the ordering heuristics are pure. The planner tests run against
+the conftest ``init_core`` fixture (live test Mongo, skipped when none is
+reachable).
+"""
+import random
+from datetime import timedelta
+
+import numpy as np
+
+from app.models import Apiary, Hive, HiveInspectionSummary, Task
+from app.models.base import utcnow
+from app.models.hive_inspection_summary import InspectionSnapshot
+from app.scheduling.route import (
+    distance_matrix,
+    nearest_neighbour,
+    path_length,
+    solve_route,
+    two_opt,
+)
+from app.services.route_planner import DistanceMatrixCache, RoutePlanner
+
+
+# --------------------------------------------------------------------------- #
+# Distances + ordering (pure)
+# --------------------------------------------------------------------------- #
+def test_haversine_matrix():
+    london, paris = (51.5074, -0.1278), (48.8566, 2.3522)
+    matrix = distance_matrix([london, paris, london])
+    assert abs(matrix[0, 1] - 343.5) < 1.0
+    assert matrix[0, 2] == 0.0
+    assert np.allclose(matrix, matrix.T)
+
+
+def test_two_opt_untangles_crossing_path():
+    # Points on a line; the crossing order 0, 2, 1, 3 doubles back.
+    points = [(0.0, 0.0), (0.0, 0.1), (0.0, 0.2), (0.0, 0.3)]
+    matrix = distance_matrix(points)
+    assert two_opt([0, 2, 1, 3], matrix) == [0, 1, 2, 3]
+
+
+def test_solve_route_finds_line_order_from_any_start():
+    rng = random.Random(3)
+    points = [(0.0, 0.01 * i) for i in range(12)]
+    rng.shuffle(points)
+    matrix = distance_matrix(points)
+    order = solve_route(matrix)
+    lons = [points[i][1] for i in order]
+    assert lons in (sorted(lons), sorted(lons, reverse=True))
+
+    fixed = solve_route(matrix, start=order[5])
+    assert fixed[0] == order[5] and sorted(fixed) == list(range(12))
+    assert path_length(fixed, matrix) <= path_length(nearest_neighbour(matrix, order[5]), matrix)
+
+
+def test_matrix_cache_rebuilds_only_when_apiaries_change():
+    cache = DistanceMatrixCache(max_users=1)
+    a = Apiary.model_construct(id="a", latitude=51.0, longitude=0.0)
+    b = Apiary.model_construct(id="b", latitude=51.1, longitude=0.0)
+    index, _ = cache.get("u1", [b, a])
+    assert index == {"a": 0, "b": 1}
+    cache.get("u1", [a, b])
+    assert cache.stats == {"hits": 1, "builds": 1}
+    moved = Apiary.model_construct(id="b", latitude=52.0, longitude=0.0)
+    _, matrix = cache.get("u1", [a, moved])
+    assert cache.stats["builds"] == 2 and matrix[0, 1] > 100
+    cache.get("u2", [a])  # evicts u1
+    cache.get("u1", [a, moved])
+    assert cache.stats["builds"] == 4
+
+
+# --------------------------------------------------------------------------- #
+# Planner
+# --------------------------------------------------------------------------- #
+async def test_planner_groups_due_work_and_orders_stops(init_core):
+    now = utcnow()
+    # Three yards along a line east of the start, listed out of order.
+    for apiary_id, lon in (("far", 0.2), ("near", 0.05), ("mid", 0.1)):
+        await Apiary(id=apiary_id, name=apiary_id, location="x",
+                     latitude=51.0, longitude=lon).insert()
+    await Apiary(id="nomap", name="nomap", location="x").insert()
+    for hive_id, apiary_id in (("h-far", "far"), ("h-near", "near"), ("h-nomap", "nomap")):
+        await Hive(id=hive_id, name=hive_id, apiary_id=apiary_id, last_inspected=now).insert()
+
+    await Task(id="t1", user_id="u1", hive_id="h-far", title="Feed", due_date=now,
+               estimated_duration_minutes=45).insert()
+    await Task(id="t2", user_id="u1", apiary_id="mid", title="Mow", due_date=now).insert()
+    await Task(id="t3", user_id="u1", hive_id="h-nomap", title="Treat", due_date=now).insert()
+    # Not due today / not this user's.
+    await Task(id="t4", user_id="u1", apiary_id="near", title="Later",
+               due_date=now + timedelta(days=3)).insert()
+    await Task(id="t5", user_id="u2", apiary_id="near", title="Other", due_date=now).insert()
+    for hive_id, days in (("h-near", 30), ("h-far", 2)):
+        await HiveInspectionSummary(
+            id=HiveInspectionSummary.summary_id(hive_id, "u1"), hive_id=hive_id, user_id="u1",
+            last_inspection=InspectionSnapshot(inspection_id="i",
+                                               inspection_date=now - timedelta(days=days)),
+        ).insert()
+
+    cache = DistanceMatrixCache(max_users=8)
+    planner = RoutePlanner(cache=cache)
+    plan = await planner.plan("u1", now.date(), start=(51.0, 0.0))
+    assert [s.apiary_id for s in plan.stops] == ["near", "mid", "far"]
+    near, mid, far = plan.stops
+    assert near.inspection_hive_ids == ["h-near"] and near.task_ids == []
+    assert mid.task_ids == ["t2"] and far.task_ids == ["t1"]
+    assert (near.service_minutes, far.service_minutes) == (30, 45)
+    assert 3.0 < near.distance_km < 4.0
+    assert mid.arrival_minutes > near.arrival_minutes + near.service_minutes
+    assert plan.total_service_minutes == 30 + 30 + 45
+    (unrouted,) = plan.unrouted
+    assert (unrouted.apiary_id, unrouted.task_ids) == ("nomap", ["t3"])
+    assert unrouted.reason == "Apiary has no coordinates"
+
+    await planner.plan("u1", now.date())
+    assert cache.stats == {"hits": 1, "builds": 1}
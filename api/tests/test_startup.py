@@ -0,0 +1,69 @@
+"""Tests for fast startup: assistive-core's schema-hash index-sync skip and
+the startup profile. The ``init_database`` test needs the conftest
+``init_core`` fixture (live test Mongo, skipped when none is reachable)."""
+import pytest
+from pymongo import IndexModel
+
+from assistive_core import schema_version
+from assistive_core.settings import settings
+
+from app.models import DOMAIN_DOCUMENTS, Hive
+from app.telemetry import StartupProfile
+
+
+def test_schema_hash_is_stable_and_tracks_index_changes(monkeypatch):
+    digest = schema_version.schema_hash(DOMAIN_DOCUMENTS)
+    assert digest == schema_version.schema_hash(list(reversed(DOMAIN_DOCUMENTS)))
+
+    monkeypatch.setattr(Hive.Settings, "indexes", [*Hive.Settings.indexes, "name"])
+    changed = schema_version.schema_hash(DOMAIN_DOCUMENTS)
+    assert changed != digest
+
+    options = [*Hive.Settings.indexes[:-1], IndexModel([("name", 1)], unique=True)]
+    monkeypatch.setattr(Hive.Settings, "indexes", options)
+    assert schema_version.schema_hash(DOMAIN_DOCUMENTS) not in (digest, changed)
+
+
+async def _has_apiary_index() -> bool:
+    info = await Hive.get_motor_collection().index_information()
+    return any(spec["key"] == [("apiary_id", 1)] for spec in info.values())
+
+
+async def test_init_database_skips_indexes_while_the_hash_matches(init_core):
+    from assistive_core import get_client
+
+    database = get_client()[settings.MONGODB_DB]
+    # init_core (mode "always") synced and stored the hash.
+    assert await schema_version.stored_hash(database) is not None
+
+    await Hive.get_motor_collection().drop_indexes()
+    assert await schema_version.init_database(database, [Hive], "on_change") is True
+    assert await _has_apiary_index()
+
+    await Hive.get_motor_collection().drop_indexes()
+    assert await schema_version.init_database(database, [Hive], "on_change") is False
+    assert not await _has_apiary_index()
+    assert await schema_version.init_database(database, [Hive], "always") is True
+    assert await _has_apiary_index()
+
+    with pytest.raises(ValueError):
+        await schema_version.init_database(database, [Hive], "never")
+
+
+def test_startup_profile_reports_and_renders_phases():
+    profile = StartupProfile(started=0.0)
+    profile.record("imports", 0.12)
+    with profile.phase("init_core"):
+        pass
+    profile.record("imports", 0.1)
+    profile.notes["indexes"] = "unchanged, skipped"
+    assert "app_startup_seconds " not in profile.render()
+
+    profile.ready()
+    report = profile.report()
+    assert report.startswith("Ready in ")
+    assert "imports 100ms, init_core 0ms, indexes: unchanged, skipped" in report
+    text = profile.render()
+    assert 'app_startup_phase_seconds{phase="imports"} 0.100000' in text
+    assert text.count("app_startup_phase_seconds{") == 2
+    assert "app_startup_seconds " in text
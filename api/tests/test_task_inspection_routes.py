@@ -20,7 +20,7 @@ pytest before this module, so ``app`` picks up the test DBs on import.
 """
 import os
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from fastapi.testclient import TestClient
@@ -92,7 +92,8 @@ def _iso(dt: datetime | None = None) -> str:
 
 def _task_payload(**overrides) -> dict:
     # camelCase keys: the schemas use alias_generator=to_camel.
-    data = {"title": "Inspect hive", "dueDate": _iso()}
+    # Due tomorrow: a past-due PENDING task is reported as OVERDUE.
+    data = {"title": "Inspect hive", "dueDate": _iso(datetime.now(timezone.utc) + timedelta(days=1))}
     data.update(overrides)
     return data
 
@@ -128,6 +129,60 @@ def test_list_tasks_includes_created(client):
     assert created["id"] in [t["id"] for t in resp.json()]
 
 
+def test_list_tasks_combines_filters_and_pages(client):
+    hive_id = str(uuid.uuid4())
+    ids = [
+        client.post("/api/tasks", json=_task_payload(
+            title=f"Page {i}", hiveId=hive_id, priority="HIGH",
+        )).json()["id"]
+        for i in range(3)
+    ]
+    client.post("/api/tasks", json=_task_payload(hiveId=hive_id, priority="LOW"))
+
+    params = {"hive_id": hive_id, "priority": "HIGH", "limit": 2}
+    first = client.get("/api/tasks", params=params)
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/tasks", params={**params, "cursor": cursor})
+    assert "X-Next-Cursor" not in second.headers
+    seen = [t["id"] for t in first.json() + second.json()]
+    assert sorted(seen) == sorted(ids)
+
+
+def test_list_tasks_rejects_bad_cursor(client):
+    resp = client.get("/api/tasks", params={"limit": 2, "cursor": "garbage"})
+    assert resp.status_code == 400
+
+
+def test_update_task_sets_only_the_sent_fields(client):
+    created = client.post(
+        "/api/tasks", json=_task_payload(title="Before", notes="Keep me")
+    ).json()
+    resp = client.put(f"/api/tasks/{created['id']}", json={"title": "After"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["title"] == "After"
+    assert body["notes"] == "Keep me"
+    assert body["status"] == "PENDING"
+
+
+def test_past_due_task_reports_overdue_on_every_path(client):
+    past = _iso(datetime.now(timezone.utc) - timedelta(days=1))
+    created = client.post("/api/tasks", json=_task_payload(title="Late", dueDate=past))
+    assert created.json()["status"] == "OVERDUE"
+    task_id = created.json()["id"]
+    updated = client.put(f"/api/tasks/{task_id}", json={"title": "Still late"})
+    assert updated.json()["status"] == "OVERDUE"
+    assert client.get(f"/api/tasks/{task_id}").json()["status"] == "OVERDUE"
+
+
+def test_update_unknown_task_returns_404(client):
+    resp = client.put(f"/api/tasks/{uuid.uuid4()}", json={"title": "Nope"})
+    assert resp.status_code == 404
+
+
 def test_complete_task_sets_status_completed(client):
     created = client.post("/api/tasks", json=_task_payload(title="Finish me")).json()
     resp = client.post(f"/api/tasks/{created['id']}/complete")
@@ -168,6 +223,41 @@ def test_list_inspections_includes_created(client):
     assert created["id"] in [i["id"] for i in resp.json()]
 
 
+def test_hive_summary_tracks_inspections(client):
+    hive_id = str(uuid.uuid4())
+    client.post("/api/inspections", json=_inspection_payload(
+        hiveId=hive_id, varroaMitesDetected=True))
+    latest = client.post("/api/inspections", json=_inspection_payload(
+        hiveId=hive_id, varroaMitesDetected=True)).json()
+
+    resp = client.get(f"/api/inspections/hive/{hive_id}/summary")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["inspectionCount"] == 2
+    assert body["varroaCurrentStreak"] == 2
+    assert body["lastInspection"]["inspectionId"] == latest["id"]
+    assert body["monthly"][0]["inspections"] == 2
+
+
+def test_update_inspection_moves_the_summary_streak(client):
+    hive_id = str(uuid.uuid4())
+    created = client.post("/api/inspections", json=_inspection_payload(
+        hiveId=hive_id, varroaMitesDetected=True)).json()
+
+    resp = client.put(
+        f"/api/inspections/{created['id']}", json={"varroaMitesDetected": False}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["varroaMitesDetected"] is False
+    summary = client.get(f"/api/inspections/hive/{hive_id}/summary").json()
+    assert summary["varroaCurrentStreak"] == 0
+
+
+def test_hive_summary_404_without_inspections(client):
+    resp = client.get(f"/api/inspections/hive/{uuid.uuid4()}/summary")
+    assert resp.status_code == 404
+
+
 def test_delete_inspection_then_404(client):
     created = client.post("/api/inspections", json=_inspection_payload()).json()
     assert client.delete(f"/api/inspections/{created['id']}").status_code == 204
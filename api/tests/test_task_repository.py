@@ -15,6 +15,7 @@ What this file covers (the migration-affected query/mutation logic):
     ``limit`` + ``before`` cursor, newest-first)
   - ``mark_as_completed`` (stamps ``completed_date`` + flips status)
   - the bulk ``mark_overdue_tasks`` mutation and its ``modified_count`` return
+  - the combined ``query`` (``TaskQuery`` filters + keyset pagination)
 
 Infra notes
 -----------
@@ -33,8 +34,8 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from app.models import Task, TaskStatus
-from app.repositories.task_repository import TaskRepository
+from app.models import Task, TaskPriority, TaskStatus
+from app.repositories.task_repository import TaskQuery, TaskRepository
 
 
 def _utcnow() -> datetime:
@@ -121,6 +122,26 @@ async def test_create_get_update_delete(init_core, repo):
     assert await repo.get_by_id(str(uuid.uuid4())) is None
 
 
+@pytest.mark.asyncio
+async def test_update_fields_is_owner_scoped_and_stamps_updated_at(init_core, repo):
+    """One ``find_one_and_update``: only the given fields change, ``updated_at``
+    moves, and another user's filter matches nothing."""
+    # Backdated: Mongo keeps milliseconds, so "moves" must not hinge on the clock.
+    stale = datetime.now(timezone.utc) - timedelta(minutes=5)
+    task = make_task(user_id="owner", title="Original", hive_id="hive-1")
+    task.updated_at = stale
+    task = await repo.create(task)
+
+    assert await repo.update_fields(task.id, "intruder", {"title": "Hijacked"}) is None
+    updated = await repo.update_fields(task.id, "owner", {"title": "Renamed"})
+    assert updated is not None
+    assert updated.title == "Renamed"
+    assert updated.hive_id == "hive-1"
+    assert _as_utc(updated.updated_at) > _as_utc(task.updated_at)
+    assert (await repo.get_by_id(task.id)).title == "Renamed"
+    assert await repo.update_fields(str(uuid.uuid4()), "owner", {"title": "x"}) is None
+
+
 # --------------------------------------------------------------------------- #
 # Equality filters
 # --------------------------------------------------------------------------- #
@@ -459,3 +480,209 @@ async def test_mark_overdue_tasks_scoped_to_user(init_core, repo):
 
     assert (await repo.get_by_id(mine.id)).status == TaskStatus.OVERDUE
     assert (await repo.get_by_id(theirs.id)).status == TaskStatus.PENDING
+
+
+# --------------------------------------------------------------------------- #
+# mark_all_overdue: global sweep across users
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_mark_all_overdue_spans_users(init_core, repo):
+    """One sweep flips past-due PENDING tasks for every user, nothing else."""
+    now = _utcnow()
+    mine = await repo.create(
+        make_task(user_id="u1", status=TaskStatus.PENDING,
+                  due_date=now - timedelta(days=1), title="mine")
+    )
+    theirs = await repo.create(
+        make_task(user_id="u2", status=TaskStatus.PENDING,
+                  due_date=now - timedelta(hours=1), title="theirs")
+    )
+    future = await repo.create(
+        make_task(user_id="u2", status=TaskStatus.PENDING,
+                  due_date=now + timedelta(days=1), title="future")
+    )
+    done = await repo.create(
+        make_task(user_id="u1", status=TaskStatus.COMPLETED,
+                  due_date=now - timedelta(days=1), title="done")
+    )
+
+    modified = await repo.mark_all_overdue()
+    assert modified == 2
+
+    assert (await repo.get_by_id(mine.id)).status == TaskStatus.OVERDUE
+    assert (await repo.get_by_id(theirs.id)).status == TaskStatus.OVERDUE
+    assert (await repo.get_by_id(future.id)).status == TaskStatus.PENDING
+    assert (await repo.get_by_id(done.id)).status == TaskStatus.COMPLETED
+
+    # Idempotent: a second sweep has nothing left to flip.
+    assert await repo.mark_all_overdue() == 0
+
+
+@pytest.mark.asyncio
+async def test_get_overdue_includes_swept_tasks(init_core, repo):
+    """Tasks already flipped to OVERDUE still show in get_overdue."""
+    now = _utcnow()
+    await repo.create(
+        make_task(user_id="u1", status=TaskStatus.OVERDUE,
+                  due_date=now - timedelta(days=2), title="swept")
+    )
+    await repo.create(
+        make_task(user_id="u1", status=TaskStatus.PENDING,
+                  due_date=now - timedelta(days=1), title="unswept")
+    )
+
+    titles = [t.title for t in await repo.get_overdue("u1")]
+    assert titles == ["swept", "unswept"]
+
+
+@pytest.mark.asyncio
+async def test_get_by_effective_status_derives_overdue(init_core, repo):
+    """OVERDUE matches past-due PENDING without a write; PENDING excludes it."""
+    now = _utcnow()
+    await repo.create(
+        make_task(user_id="u1", status=TaskStatus.PENDING,
+                  due_date=now - timedelta(days=1), title="past_pending")
+    )
+    await repo.create(
+        make_task(user_id="u1", status=TaskStatus.PENDING,
+                  due_date=now + timedelta(days=1), title="future_pending")
+    )
+    await repo.create(
+        make_task(user_id="u1", status=TaskStatus.OVERDUE,
+                  due_date=now - timedelta(days=3), title="swept")
+    )
+
+    overdue = await repo.get_by_effective_status("u1", TaskStatus.OVERDUE, now=now)
+    assert [t.title for t in overdue] == ["swept", "past_pending"]
+
+    pending = await repo.get_by_effective_status("u1", TaskStatus.PENDING, now=now)
+    assert [t.title for t in pending] == ["future_pending"]
+
+
+# --------------------------------------------------------------------------- #
+# Owner-scoped hive / apiary lookups
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_get_by_hive_for_user_scopes_and_sorts(init_core, repo):
+    """Only the owner's tasks on a shared hive, soonest due first."""
+    now = _utcnow()
+    await repo.create(make_task(user_id="u1", hive_id="h1", title="later",
+                                due_date=now + timedelta(days=3)))
+    await repo.create(make_task(user_id="u1", hive_id="h1", title="sooner",
+                                due_date=now + timedelta(days=1)))
+    await repo.create(make_task(user_id="u2", hive_id="h1", title="theirs"))
+    await repo.create(make_task(user_id="u1", hive_id="h2", title="other_hive"))
+
+    results = await repo.get_by_hive_for_user("h1", "u1")
+    assert [t.title for t in results] == ["sooner", "later"]
+
+
+@pytest.mark.asyncio
+async def test_get_by_apiary_for_user_scopes_and_sorts(init_core, repo):
+    now = _utcnow()
+    await repo.create(make_task(user_id="u1", apiary_id="a1", title="later",
+                                due_date=now + timedelta(days=2)))
+    await repo.create(make_task(user_id="u1", apiary_id="a1", title="sooner",
+                                due_date=now - timedelta(days=2)))
+    await repo.create(make_task(user_id="u2", apiary_id="a1", title="theirs"))
+
+    results = await repo.get_by_apiary_for_user("a1", "u1")
+    assert [t.title for t in results] == ["sooner", "later"]
+
+
+# --------------------------------------------------------------------------- #
+# Combined query + keyset pagination
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_query_combines_filters(init_core, repo):
+    """Hive, priority and due window all apply together (AND)."""
+    now = _utcnow()
+    match = make_task(user_id="u1", hive_id="h1", title="match",
+                      due_date=now + timedelta(days=2))
+    match.priority = TaskPriority.HIGH
+    await repo.create(match)
+    low = make_task(user_id="u1", hive_id="h1", title="low",
+                    due_date=now + timedelta(days=2))
+    await repo.create(low)
+    far = make_task(user_id="u1", hive_id="h1", title="far",
+                    due_date=now + timedelta(days=20))
+    far.priority = TaskPriority.HIGH
+    await repo.create(far)
+    other = make_task(user_id="u1", hive_id="h2", title="other_hive",
+                      due_date=now + timedelta(days=2))
+    other.priority = TaskPriority.HIGH
+    await repo.create(other)
+
+    tasks, cursor = await repo.query(TaskQuery(
+        user_id="u1", hive_id="h1", priorities=[TaskPriority.HIGH],
+        due_before=now + timedelta(days=7),
+    ))
+    assert [t.title for t in tasks] == ["match"]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_query_derives_overdue_status(init_core, repo):
+    """OVERDUE picks up past-due PENDING rows the sweep hasn't reached yet;
+    PENDING excludes them."""
+    now = _utcnow()
+    await repo.create(make_task(user_id="u1", title="late",
+                                due_date=now - timedelta(days=1)))
+    await repo.create(make_task(user_id="u1", title="swept",
+                                status=TaskStatus.OVERDUE,
+                                due_date=now - timedelta(days=2)))
+    await repo.create(make_task(user_id="u1", title="future",
+                                due_date=now + timedelta(days=1)))
+
+    overdue, _ = await repo.query(
+        TaskQuery(user_id="u1", statuses=[TaskStatus.OVERDUE]), now=now)
+    assert [t.title for t in overdue] == ["swept", "late"]
+
+    pending, _ = await repo.query(
+        TaskQuery(user_id="u1", statuses=[TaskStatus.PENDING]), now=now)
+    assert [t.title for t in pending] == ["future"]
+
+
+@pytest.mark.asyncio
+async def test_query_keyset_pages_cover_all_rows_once(init_core, repo):
+    """Paging by cursor visits every row exactly once, in (due_date, _id)
+    order, even when due dates tie across a page boundary."""
+    due = _utcnow().replace(microsecond=0) + timedelta(days=1)
+    for i in range(7):
+        await repo.create(make_task(user_id="u1", title=f"t{i}",
+                                    due_date=due + timedelta(hours=i // 3)))
+    await repo.create(make_task(user_id="u2", due_date=due))
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = await repo.query(
+            TaskQuery(user_id="u1", limit=3, cursor=cursor))
+        seen.extend(page)
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert len({t.id for t in seen}) == 7
+    keys = [(_as_utc(t.due_date), t.id) for t in seen]
+    assert keys == sorted(keys)
+
+
+@pytest.mark.asyncio
+async def test_query_descending_pages(init_core, repo):
+    now = _utcnow()
+    for i in range(4):
+        await repo.create(make_task(user_id="u1", title=f"t{i}",
+                                    due_date=now + timedelta(days=i)))
+
+    first, cursor = await repo.query(
+        TaskQuery(user_id="u1", descending=True, limit=2))
+    second, last = await repo.query(
+        TaskQuery(user_id="u1", descending=True, limit=2, cursor=cursor))
+    assert [t.title for t in first + second] == ["t3", "t2", "t1", "t0"]
+    assert last is None
+
+
+@pytest.mark.asyncio
+async def test_query_rejects_malformed_cursor(init_core, repo):
+    with pytest.raises(ValueError):
+        await repo.query(TaskQuery(user_id="u1", limit=2, cursor="not-a-cursor"))
@@ -0,0 +1,154 @@
+"""Tests for the weather-aware task scheduler (``app/scheduling`` and
+``app/services/task_schedule_service.py``).
+
+The solver is pure and runs without Mongo. The service test runs against the
+conftest ``init_core`` fixture (live test Mongo, skipped when none is
+reachable) with a fake forecast client.
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models import Apiary, Hive, Task, TaskPriority, TaskStatus
+from app.scheduling import HourForecast, PlanTask, solve
+from app.services.task_schedule_service import TaskScheduleService, forecast_hours
+
+
+ORIGIN = datetime(2026, 6, 1, 0, tzinfo=timezone.utc)
+
+
+def _hours(temps, wet=()):
+    return [
+        HourForecast(start=ORIGIN + timedelta(hours=i), temperature_c=t, wind_speed_ms=2.0,
+                     wet=i in wet)
+        for i, t in enumerate(temps)
+    ]
+
+
+def _task(task_id, weight=2.0, due_hours=48, duration=1, min_temp=None, location="a1"):
+    return PlanTask(id=task_id, location=location, weight=weight,
+                    due=ORIGIN + timedelta(hours=due_hours), duration_hours=duration,
+                    minimum_temperature=min_temp)
+
+
+# --------------------------------------------------------------------------- #
+# Solver (pure)
+# --------------------------------------------------------------------------- #
+def test_slots_respect_temperature_duration_and_working_day():
+    # Warm only from 12:00 to 15:00; 13:00 is wet.
+    temps = [10.0] * 24
+    for h in (12, 13, 14, 15):
+        temps[h] = 20.0
+    plan = solve([_task("t1", duration=2, min_temp=16)], {"a1": _hours(temps, wet={13})},
+                 ORIGIN, 24)
+    (slot,) = plan.assignments
+    assert (slot.start.hour, slot.end.hour) == (14, 16)
+    assert slot.temperature_c == 20.0
+
+    plan = solve([_task("t1", min_temp=25)], {"a1": _hours(temps)}, ORIGIN, 24)
+    assert plan.unplanned == {"t1": "No suitable weather window in the horizon"}
+    plan = solve([_task("t1", location="elsewhere")], {"a1": _hours(temps)}, ORIGIN, 24)
+    assert "t1" in plan.unplanned
+
+
+def test_no_overlap_and_priority_gets_the_earliest_slot():
+    temps = [20.0] * 24
+    tasks = [_task("low", weight=1.0), _task("urgent", weight=8.0), _task("high", weight=4.0)]
+    plan = solve(tasks, {"a1": _hours(temps), "a2": _hours(temps)}, ORIGIN, 24)
+    order = [a.task_id for a in plan.assignments]
+    assert order == ["urgent", "high", "low"]
+    assert [a.start.hour for a in plan.assignments] == [9, 10, 11]
+
+
+def test_local_search_repairs_greedy_plan():
+    # "flex" is heavier and fits anywhere warm; "only" fits only at 09:00.
+    # Greedy gives 09:00 to "flex" and strands "only"; one ejection fixes it.
+    temps = [20.0] * 24
+    tasks = [_task("flex", weight=4.0), _task("only", weight=2.0, min_temp=10, location="a2")]
+    cold = [5.0] * 24
+    cold[9] = 15.0
+    plan = solve(tasks, {"a1": _hours(temps), "a2": _hours(cold)}, ORIGIN, 24)
+    assert not plan.unplanned
+    assert {a.task_id: a.start.hour for a in plan.assignments} == {"only": 9, "flex": 10}
+
+
+def test_few_hundred_tasks_solve_within_a_second():
+    rng = random.Random(7)
+    forecasts = {
+        f"a{i}": _hours([rng.uniform(5, 28) for _ in range(168)], wet={rng.randrange(168)})
+        for i in range(20)
+    }
+    tasks = [
+        _task(f"t{i}", weight=rng.choice([1.0, 2.0, 4.0, 8.0]), due_hours=rng.randrange(168),
+              duration=rng.choice([1, 1, 2, 3]), min_temp=rng.choice([None, 12, 16, 20]),
+              location=f"a{rng.randrange(20)}")
+        for i in range(300)
+    ]
+    started = time.perf_counter()
+    plan = solve(tasks, forecasts, ORIGIN, 168, time_budget=0.5)
+    assert time.perf_counter() - started < 1.0
+    assert len(plan.assignments) + len(plan.unplanned) == 300
+    taken = [h for a in plan.assignments
+             for h in range(int((a.start - ORIGIN).total_seconds() // 3600),
+                            int((a.end - ORIGIN).total_seconds() // 3600))]
+    assert len(taken) == len(set(taken))
+
+
+def test_forecast_hours_reads_upstream_entries():
+    hours = forecast_hours(
+        {"hours": [
+            {"time": "2026-06-01T09:00:00Z", "temperature_c": 18, "weather_code": 61},
+            {"temperature_c": 19},
+        ]},
+        ORIGIN,
+    )
+    assert hours[0].start == ORIGIN.replace(hour=9) and hours[0].wet
+    assert hours[1].start == ORIGIN + timedelta(hours=1) and not hours[1].wet
+    assert forecast_hours(None, ORIGIN) == []
+
+
+# --------------------------------------------------------------------------- #
+# Service
+# --------------------------------------------------------------------------- #
+class _FakeWeather:
+    def __init__(self, now: datetime):
+        start = now.replace(minute=0, second=0, microsecond=0)
+        self.hours = [
+            {"time": (start + timedelta(hours=i)).isoformat(), "temperature_c": 20.0,
+             "wind_speed_ms": 2.0, "weather_code": 0}
+            for i in range(200)
+        ]
+
+    async def get_forecast_batch(self, coordinates, hours=24):
+        return [{"hours": self.hours[:hours]} for _ in coordinates]
+
+
+async def test_service_proposes_and_applies_due_dates(init_core):
+    now = datetime.now(timezone.utc)
+    await Apiary(id="ap1", name="Home", location="Garden", latitude=51.5, longitude=-0.1).insert()
+    await Hive(id="h1", name="H1", apiary_id="ap1", last_inspected=now).insert()
+    due = now + timedelta(days=2)
+    await Task(id="t1", user_id="u1", hive_id="h1", title="Split", due_date=due,
+               weather_dependent=True, minimum_temperature=15,
+               priority=TaskPriority.HIGH, estimated_duration_minutes=90).insert()
+    await Task(id="t2", user_id="u1", apiary_id="nowhere", title="Move", due_date=due,
+               weather_dependent=True).insert()
+    # Not weather dependent / someone else's: never considered.
+    await Task(id="t3", user_id="u1", apiary_id="ap1", title="Order", due_date=due).insert()
+    await Task(id="t4", user_id="u2", apiary_id="ap1", title="Other", due_date=due,
+               weather_dependent=True).insert()
+
+    service = TaskScheduleService(weather=_FakeWeather(now))
+    plan = await service.optimize("u1", horizon_hours=48, now=now)
+    assert [s.task_id for s in plan.slots] == ["t1"]
+    assert (plan.slots[0].proposed_end - plan.slots[0].proposed_start) == timedelta(hours=2)
+    assert [u.task_id for u in plan.unplanned] == ["t2"]
+    assert not plan.applied
+    assert (await Task.get("t1")).due_date.replace(tzinfo=timezone.utc) == due.replace(
+        microsecond=due.microsecond // 1000 * 1000)
+
+    plan = await service.optimize("u1", horizon_hours=48, apply=True, now=now)
+    assert plan.updated == 1
+    stored = await Task.get("t1")
+    assert stored.due_date.replace(tzinfo=timezone.utc) == plan.slots[0].proposed_start
+    assert stored.status == TaskStatus.PENDING
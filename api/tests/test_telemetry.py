@@ -0,0 +1,202 @@
+"""Tests for request/DB instrumentation (``app/telemetry``) and
+assistive-core's pool settings and monitor. The listeners are driven with
+stand-in events and explain plans are canned; only the read-preference
+test needs the conftest
+``init_core`` fixture (live test Mongo, skipped when none is reachable)."""
+from types import SimpleNamespace
+
+from app.telemetry import MetricsRegistry, MongoCommandListener, RequestStats, current_request
+from app.telemetry import QueryRecorder, analyze_explain, covering_index, filter_shape, suggest_index
+
+
+def test_filter_shape_strips_values_and_keeps_operators():
+    find = {"find": "tasks", "filter": {"user_id": "u1", "status": {"$in": ["A", "B"]}}}
+    assert filter_shape("find", find) == '{"user_id":"?","status":{"$in":"?"}}'
+    other = {"find": "tasks", "filter": {"user_id": "u2", "status": {"$in": ["C"]}}}
+    assert filter_shape("find", other) == filter_shape("find", find)
+
+    update = {"update": "tasks", "updates": [{"q": {"$or": [{"a": 1}, {"b": 2}]}, "u": {}}]}
+    assert filter_shape("update", update) == '{"$or":[{"a":"?"},{"b":"?"}]}'
+    pipeline = {"aggregate": "inspections", "pipeline": [{"$match": {"hive_id": "h"}}, {"$group": {}}]}
+    assert filter_shape("aggregate", pipeline) == '[{"$match":{"hive_id":"?"}},{"$group":"..."}]'
+    assert filter_shape("insert", {"insert": "tasks"}) == ""
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    registry.observe_request("GET", "/api/hives/{hive_id}", 200, 0.02, 3, 0.004)
+    registry.observe_request("GET", "/api/hives/{hive_id}", 200, 0.3, 1, 0.001)
+    text = registry.render()
+    base = 'method="GET",route="/api/hives/{hive_id}",status="200"'
+    assert f'http_request_duration_seconds_bucket{{{base},le="0.025"}} 1' in text
+    assert f'http_request_duration_seconds_bucket{{{base},le="0.5"}} 2' in text
+    assert f'http_request_duration_seconds_count{{{base}}} 2' in text
+    assert 'http_request_db_commands_bucket{method="GET",route="/api/hives/{hive_id}",le="3"} 2' in text
+
+
+def test_listener_charges_the_current_request_and_ranks_slow_shapes():
+    registry = MetricsRegistry(slow_query_limit=1, shape_capacity=2)
+    listener = MongoCommandListener(registry)
+
+    def run(request_id, command, micros, failed=False):
+        name = next(iter(command))
+        listener.started(SimpleNamespace(
+            command_name=name, command=command, connection_id=("h", 1), request_id=request_id,
+        ))
+        done = SimpleNamespace(
+            command_name=name, connection_id=("h", 1), request_id=request_id,
+            duration_micros=micros,
+        )
+        (listener.failed if failed else listener.succeeded)(done)
+
+    stats = RequestStats()
+    token = current_request.set(stats)
+    try:
+        for i in range(3):
+            run(i, {"find": "hives", "filter": {"_id": f"h{i}"}}, 1000)
+        run(10, {"find": "tasks", "filter": {"user_id": "u"}}, 90000)
+    finally:
+        current_request.reset(token)
+    assert stats.commands == 4 and abs(stats.db_seconds - 0.093) < 1e-9
+    assert registry.slow_queries[("find", "hives", '{"_id":"?"}')].count == 3
+
+    # Outside a request; at capacity the fastest shape (hives) makes room.
+    run(11, {"find": "alerts", "filter": {"x": 1}}, 500, failed=True)
+    assert stats.commands == 4
+    assert set(registry.slow_queries) == {
+        ("find", "tasks", '{"user_id":"?"}'),
+        ("find", "alerts", '{"x":"?"}'),
+    }
+    (slowest,) = registry.slowest()
+    assert (slowest.collection, slowest.max_seconds) == ("tasks", 0.09)
+    assert 'mongodb_command_failures_total{command="find",collection="alerts"} 1' in registry.render()
+
+
+def test_query_recorder_keeps_labelled_reads_by_shape():
+    recorder = QueryRecorder()
+
+    def send(command):
+        name = next(iter(command))
+        recorder.started(SimpleNamespace(
+            command_name=name, command={**command, "$db": "bk", "lsid": {}}, database_name="bk",
+        ))
+
+    send({"find": "tasks", "filter": {"user_id": "u0"}})
+    with recorder.recording("TaskRepository.get_by_user_id"):
+        send({"find": "tasks", "filter": {"user_id": "u1"}})
+        send({"insert": "tasks", "documents": []})
+    with recorder.recording("TaskService.list"):
+        send({"find": "tasks", "filter": {"user_id": "u2"}})
+        send({"find": "tasks", "filter": {"user_id": "u2"}, "sort": {"due_date": 1}})
+    first, sorted_ = recorder.queries.values()
+    assert first.labels == ["TaskRepository.get_by_user_id", "TaskService.list"]
+    assert first.command == {"find": "tasks", "filter": {"user_id": "u1"}}
+    assert (first.database, first.collection) == ("bk", "tasks")
+    assert sorted_.labels == ["TaskService.list"]
+
+
+def test_analyze_explain_flags_collscan_sort_and_selectivity():
+    find = {
+        "queryPlanner": {"winningPlan": {
+            "stage": "SORT",
+            "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "user_id_1"}},
+        }},
+        "executionStats": {"nReturned": 5, "totalKeysExamined": 400, "totalDocsExamined": 400},
+    }
+    stats = analyze_explain(find)
+    assert stats.stages == ["SORT", "FETCH", "IXSCAN"] and stats.indexes == ["user_id_1"]
+    assert stats.flags() == ["in_memory_sort", "poor_selectivity"]
+    assert stats.flags(max_ratio=100) == ["in_memory_sort"]
+
+    aggregate = {
+        "stages": [
+            {"$cursor": {
+                "queryPlanner": {"winningPlan": {"queryPlan": {"stage": "COLLSCAN"}}},
+                "executionStats": {"nReturned": 3, "totalKeysExamined": 0, "totalDocsExamined": 50},
+            }},
+            {"$sort": {"sortKey": {"n": -1}}},
+        ],
+    }
+    stats = analyze_explain(aggregate)
+    assert stats.collscan and stats.in_memory_sort
+    # 50 documents read is below the default min_examined.
+    assert stats.flags() == ["collscan", "in_memory_sort"]
+
+
+def test_suggest_index_orders_equality_sort_range():
+    upcoming = {
+        "find": "tasks",
+        "filter": {"$and": [
+            {"user_id": "u"}, {"due_date": {"$lte": 1}}, {"status": {"$in": ["PENDING"]}},
+        ]},
+        "sort": {"due_date": 1},
+    }
+    assert suggest_index("find", upcoming) == [("user_id", 1), ("due_date", 1), ("status", 1)]
+    unsorted = {"find": "tasks", "filter": {"user_id": "u", "status": {"$in": ["A"]}}}
+    assert suggest_index("find", unsorted) == [("user_id", 1), ("status", 1)]
+    pipeline = {"aggregate": "inspections", "pipeline": [
+        {"$match": {"hive_id": {"$in": ["h"]}}},
+        {"$sort": {"hive_id": 1, "inspection_date": -1}},
+        {"$group": {}},
+    ]}
+    assert suggest_index("aggregate", pipeline) == [("hive_id", 1), ("inspection_date", -1)]
+    assert suggest_index("find", {"find": "apiaries", "filter": {"geo": {"$geoWithin": {}}}}) is None
+    assert suggest_index("find", {"find": "hives", "filter": {}}) is None
+
+    indexes = [[("user_id", 1), ("due_date", 1), ("_id", 1)]]
+    assert covering_index([("user_id", 1), ("due_date", 1)], indexes) is indexes[0]
+    assert covering_index([("user_id", 1), ("status", 1)], indexes) is None
+
+
+def test_pool_monitor_counts_checkouts_and_renders():
+    from pymongo import monitoring
+
+    from assistive_core.pool_monitor import PoolMonitor
+    from app.telemetry.registry import render_pools
+
+    monitor = PoolMonitor("vertical", max_size=10)
+    address = ("db", 27017)
+    ev = SimpleNamespace
+    monitor.pool_created(ev(address=address))
+    for _ in range(3):
+        monitor.connection_created(ev(address=address))
+    monitor.connection_checked_out(ev(address=address, duration=0.002))
+    monitor.connection_checked_out(ev(address=address, duration=0.010))
+    monitor.connection_checked_in(ev(address=address))
+    monitor.connection_check_out_failed(ev(
+        address=address, reason=monitoring.ConnectionCheckOutFailedReason.TIMEOUT, duration=1.0,
+    ))
+    monitor.connection_closed(ev(address=address))
+
+    (stats,) = monitor.snapshot()
+    assert (stats["open"], stats["in_use"], stats["checkouts"]) == (2, 1, 2)
+    assert (stats["checkout_failures"], stats["checkout_timeouts"]) == (1, 1)
+    assert stats["wait_seconds_max"] == 1.0
+    text = render_pools([stats])
+    assert 'mongodb_pool_in_use_connections{client="vertical",address="db:27017"} 1' in text
+    assert 'mongodb_pool_max_size{client="vertical",address="db:27017"} 10' in text
+
+
+def test_client_options_follow_settings(monkeypatch):
+    from assistive_core import db
+
+    monkeypatch.setattr(db.settings, "MONGODB_MIN_POOL_SIZE", 50)
+    monkeypatch.setattr(db.settings, "MONGODB_WAIT_QUEUE_TIMEOUT_MS", 2000)
+    monkeypatch.setattr(db.settings, "MONGODB_COMPRESSORS", "zstd,snappy")
+    options = db.client_options("identity", 20)
+    assert options["maxPoolSize"] == 20 and options["minPoolSize"] == 20
+    assert options["waitQueueTimeoutMS"] == 2000 and options["compressors"] == "zstd,snappy"
+    assert "maxIdleTimeMS" not in options
+    listener, invalidator = options["event_listeners"]
+    assert listener.client == "identity"
+
+
+async def test_read_collection_applies_workload_preference(init_core, monkeypatch):
+    from assistive_core import reads
+    from app.models import Inspection
+
+    assert reads.read_collection(Inspection, "analytics") is not None
+    monkeypatch.setitem(reads.READ_PREFERENCES, "analytics", "secondaryPreferred")
+    collection = reads.read_collection(Inspection, "analytics")
+    assert collection.read_preference.mongos_mode == "secondaryPreferred"
+    assert reads.read_collection(Inspection, "other").read_preference.mongos_mode == "primary"
@@ -0,0 +1,110 @@
+"""Tests for the geohash-bucketed weather cache
+(``assistive_core/clients/weather.py``) and the API's mapping of upstream
+conditions (``app/services/weather_service.py``).
+
+Pure asyncio: the upstream fetch is replaced by a counting fake and the cache
+runs on a fake clock, so nothing here needs the network or Mongo.
+"""
+import asyncio
+
+from assistive_core.clients.weather import WeatherCache, WeatherClient, geohash_cell
+
+from app.schemas import WeatherCondition
+from app.services.weather_service import to_weather_response
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Upstream:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return None if self.fail else {"n": self.calls}
+
+
+def test_geohash_cells():
+    assert geohash_cell(57.64911, 10.40744, 6)[0] == "u4pruy"
+    # ~1 km apart: same 5-char cell, so one shared upstream request.
+    assert geohash_cell(51.480, -0.110, 5)[0] == geohash_cell(51.485, -0.105, 5)[0]
+
+
+async def test_fresh_stale_and_expired():
+    clock = _Clock(3600 * 100)
+    cache = WeatherCache(max_entries=10, stale_seconds=600, clock=clock)
+    upstream = _Upstream()
+
+    assert await cache.get(("k",), 3600, upstream) == {"n": 1}
+    assert await cache.get(("k",), 3600, upstream) == {"n": 1}
+    assert upstream.calls == 1
+
+    # Next bucket, inside the stale window: old value now, refresh behind it.
+    clock.now += 3600 + 60
+    assert await cache.get(("k",), 3600, upstream) == {"n": 1}
+    await asyncio.sleep(0.01)
+    assert upstream.calls == 2
+    assert await cache.get(("k",), 3600, upstream) == {"n": 2}
+
+    # Past the stale window: the caller waits for a fresh fetch.
+    clock.now += 2 * 3600
+    assert await cache.get(("k",), 3600, upstream) == {"n": 3}
+    assert cache.stats["hits"] == 2 and cache.stats["stale"] == 1
+
+
+async def test_concurrent_misses_share_one_request():
+    cache = WeatherCache(max_entries=10, stale_seconds=0, clock=_Clock())
+    upstream = _Upstream(delay=0.01)
+    results = await asyncio.gather(*(cache.get(("k",), 60, upstream) for _ in range(20)))
+    assert upstream.calls == 1
+    assert all(r == {"n": 1} for r in results)
+
+
+async def test_failures_are_not_cached():
+    cache = WeatherCache(max_entries=10, stale_seconds=0, clock=_Clock())
+    failing = _Upstream(fail=True)
+    assert await cache.get(("k",), 60, failing) is None
+    assert await cache.get(("k",), 60, failing) is None
+    assert failing.calls == 2
+
+
+async def test_client_batch_coalesces_nearby_locations(monkeypatch):
+    client = WeatherClient(
+        base_url="http://weather.test",
+        cache=WeatherCache(max_entries=10, stale_seconds=0, clock=_Clock()),
+    )
+    requested = []
+
+    async def fake_fetch(path, params, what):
+        requested.append((path, params["lat"], params["lon"]))
+        await asyncio.sleep(0.01)
+        return {"temperature_c": params["lat"]}
+
+    monkeypatch.setattr(client, "_fetch", fake_fetch)
+    results = await client.get_current_weather_batch(
+        [(51.480, -0.110), (51.485, -0.105), (48.85, 2.35)]
+    )
+    assert len(requested) == 2
+    assert results[0] is results[1]
+    assert results[2] != results[0]
+
+
+def test_upstream_conditions_mapping():
+    response = to_weather_response(
+        {"temperature_c": 20.0, "wind_speed_ms": 2.0, "weather_code": 61,
+         "weather_description": "Light rain", "source": "test"},
+        "ap1",
+    )
+    assert (response.temperature, response.wind_speed) == (68, 4)
+    assert response.condition == WeatherCondition.RAINY
+    assert response.description.startswith("Light rain. Wet weather")
+    assert to_weather_response({}).condition == WeatherCondition.SUNNY
@@ -15,10 +15,20 @@ Multi-DB design:
 from .settings import settings, Settings
 
 # --- db / lifecycle ---
-from .db import init_core, close_core, get_client, CORE_SOCIAL_DOCUMENTS
+from .db import (
+    init_core,
+    close_core,
+    get_client,
+    get_identity_client,
+    read_collection,
+    CORE_SOCIAL_DOCUMENTS,
+)
+from .pool_monitor import pool_metrics
+from .request_cache import request_cache_metrics, request_scope
 
 # --- shared model primitives ---
 from .base import TimestampMixin, utcnow
+from .updates import find_one_and_set
 
 # --- auth (shared identity / SSO) ---
 from .auth import (
@@ -94,10 +104,16 @@ __all__ = [
     "init_core",
     "close_core",
     "get_client",
+    "get_identity_client",
+    "read_collection",
+    "pool_metrics",
+    "request_cache_metrics",
+    "request_scope",
     "CORE_SOCIAL_DOCUMENTS",
     # base
     "TimestampMixin",
     "utcnow",
+    "find_one_and_set",
     # auth
     "User",
     "auth_service",
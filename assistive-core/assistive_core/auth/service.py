@@ -11,6 +11,7 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from .. import request_cache
 from ..settings import settings
 from .models import User
 from .schemas import UserCreate
@@ -76,8 +77,16 @@ async def create_user(user_data: UserCreate) -> User:
 
 
 async def get_user_by_email(email: str) -> Optional[User]:
-    return await User.find_one(User.email == email)
+    """Cached for the request, and the user lands in the identity map, so a
+    later lookup by id (feed authors, follow lists) is free."""
+    async def load():
+        user = await User.find_one(User.email == email)
+        if user is not None:
+            request_cache.remember(user)
+        return user
+
+    return await request_cache.cached_query(User.get_settings().name, ("email", email), load)
 
 
 async def get_user_by_id(user_id: str) -> Optional[User]:
-    return await User.get(user_id)
+    return await request_cache.get_document(User, user_id, lambda: User.get(user_id))
@@ -1,9 +1,10 @@
 """Event repository. Ported from beekeeper api/app/repositories/event_repository.py."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from beanie.operators import In
 
+from ..updates import find_one_and_set
 from .models import Event
 
 
@@ -41,5 +42,12 @@ class EventRepository:
         await event.save()
         return event
 
+    async def update_fields(
+        self, event_id: str, user_id: str, fields: Dict[str, Any]
+    ) -> Optional[Event]:
+        """Set ``fields`` on the user's event in one write; None when the
+        event is missing or someone else's."""
+        return await find_one_and_set(Event, {"_id": event_id, "user_id": user_id}, fields)
+
     async def delete(self, event: Event) -> None:
         await event.delete()
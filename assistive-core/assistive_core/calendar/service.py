@@ -71,22 +71,18 @@ class EventService:
     async def update_event(
         self, event_id: str, event_data: EventUpdate, user_id: str
     ) -> EventResponse:
-        event = await self.repository.get_by_id(event_id)
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
-            )
-        if event.user_id != user_id:
+        update_data = event_data.model_dump(exclude_unset=True)
+        updated = await self.repository.update_fields(event_id, user_id, update_data)
+        if not updated:
+            # Missing or not the caller's; only this path pays a second read.
+            if not await self.repository.get_by_id(event_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to modify this event",
             )
-
-        update_data = event_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(event, key, value)
-
-        updated = await self.repository.update(event)
         return EventResponse.model_validate(updated)
 
     async def delete_event(self, event_id: str, user_id: str) -> None:
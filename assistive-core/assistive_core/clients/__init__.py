@@ -25,14 +25,16 @@ except Exception:  # pragma: no cover
     bunny_storage = None
 
 try:
-    from .weather import WeatherClient, weather_client  # type: ignore
+    from .weather import WeatherCache, WeatherClient, weather_client  # type: ignore
 except Exception:  # pragma: no cover
+    WeatherCache = None  # type: ignore
     WeatherClient = None  # type: ignore
     weather_client = None
 
 __all__ = [
     "BunnyStorageService",
     "bunny_storage",
+    "WeatherCache",
     "WeatherClient",
     "weather_client",
 ]
@@ -9,9 +9,22 @@ to a fixed schema.
 Upstream endpoints (mounted at ``/api/v1/weather`` in the hazard service):
   - GET /current?lat&lon         -> current conditions dict
   - GET /forecast?lat&lon&hours  -> {location, source, hours: [...]}
+
+Caching: weather does not vary within a few kilometres, so requests are keyed
+by the geohash cell of the coordinates (``settings.WEATHER_CACHE_PRECISION``)
+and fetched for the cell centre; nearby apiaries share one upstream call.
+Entries are fresh within their time bucket (``WEATHER_CURRENT_TTL_SECONDS`` /
+``WEATHER_FORECAST_TTL_SECONDS``). For ``WEATHER_STALE_SECONDS`` after that
+the stale value is returned immediately while one background refresh runs
+(stale-while-revalidate). Concurrent misses for the same key share a single
+upstream request.
 """
+import asyncio
 import logging
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
@@ -22,12 +35,119 @@ logger = logging.getLogger(__name__)
 # Base path the hazard-service mounts its weather router under.
 _WEATHER_PREFIX = "/api/v1/weather"
 
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_cell(lat: float, lon: float, precision: int) -> Tuple[str, float, float]:
+    """Geohash of ``(lat, lon)`` at ``precision`` chars, plus the cell centre."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return (
+        "".join(chars),
+        (lat_range[0] + lat_range[1]) / 2,
+        (lon_range[0] + lon_range[1]) / 2,
+    )
+
+
+@dataclass
+class _Entry:
+    value: dict[str, Any]
+    bucket: int
+
+
+class WeatherCache:
+    """Bounded LRU of upstream responses with bucketed freshness,
+    stale-while-revalidate and single-flight fetches."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        stale_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._refreshing: set = set()
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "fetches": 0}
+
+    async def get(
+        self,
+        key: tuple,
+        ttl: float,
+        fetch: Callable[[], Any],
+    ) -> Optional[dict[str, Any]]:
+        now = self.clock()
+        bucket = int(now // ttl)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.bucket == bucket:
+                self.stats["hits"] += 1
+                return entry.value
+            if now < (entry.bucket + 1) * ttl + self.stale_seconds:
+                self.stats["stale"] += 1
+                self._revalidate(key, ttl, fetch)
+                return entry.value
+        self.stats["misses"] += 1
+        return await self._single_flight(key, ttl, fetch)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _single_flight(self, key: tuple, ttl: float, fetch) -> Optional[dict[str, Any]]:
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch(key, ttl, fetch))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller being cancelled must not cancel the others' fetch
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, key: tuple, ttl: float, fetch) -> Optional[dict[str, Any]]:
+        self.stats["fetches"] += 1
+        value = await fetch()
+        if value is not None:
+            # Failures are not cached; a stale entry is kept instead.
+            self._entries[key] = _Entry(value, int(self.clock() // ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _revalidate(self, key: tuple, ttl: float, fetch) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.ensure_future(self._single_flight(key, ttl, fetch))
+        task.add_done_callback(lambda _: self._refreshing.discard(key))
+
 
 class WeatherClient:
     """Thin httpx client for the VRUsafety hazard-service weather API."""
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, cache: Optional[WeatherCache] = None):
         self.base_url = (base_url or settings.WEATHER_SERVICE_URL).rstrip("/")
+        self.precision = settings.WEATHER_CACHE_PRECISION
+        self.cache = cache or WeatherCache(
+            settings.WEATHER_CACHE_MAX_ENTRIES, settings.WEATHER_STALE_SECONDS
+        )
 
     def _url(self, path: str) -> str:
         return f"{self.base_url}{_WEATHER_PREFIX}{path}"
@@ -41,23 +161,18 @@ class WeatherClient:
         ``weather_description``, ``wind_speed_ms``, ``source``,
         ``severity_modifier``), or ``None`` if the service is not configured or
         the request fails. Callers should treat any individual field as optional.
+        Served from the geohash-cell cache when possible.
         """
         if not self.base_url:
             logger.warning("WEATHER_SERVICE_URL not configured; skipping weather fetch")
             return None
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self._url("/current"),
-                    params={"lat": lat, "lon": lon},
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            logger.warning(f"Failed to fetch current weather: {e}")
-            return None
+        cell, c_lat, c_lon = geohash_cell(lat, lon, self.precision)
+        return await self.cache.get(
+            ("current", cell),
+            settings.WEATHER_CURRENT_TTL_SECONDS,
+            lambda: self._fetch("/current", {"lat": c_lat, "lon": c_lon}, "current weather"),
+        )
 
     async def get_forecast(
         self, lat: float, lon: float, hours: int = 24
@@ -66,23 +181,53 @@ class WeatherClient:
 
         Returns the upstream JSON dict (``{location, source, hours: [...]}``),
         or ``None`` if the service is not configured or the request fails.
-        Callers should treat any individual field as optional.
+        Callers should treat any individual field as optional. Served from the
+        geohash-cell cache when possible.
         """
         if not self.base_url:
             logger.warning("WEATHER_SERVICE_URL not configured; skipping forecast fetch")
             return None
 
+        cell, c_lat, c_lon = geohash_cell(lat, lon, self.precision)
+        return await self.cache.get(
+            ("forecast", cell, hours),
+            settings.WEATHER_FORECAST_TTL_SECONDS,
+            lambda: self._fetch(
+                "/forecast", {"lat": c_lat, "lon": c_lon, "hours": hours}, "weather forecast"
+            ),
+        )
+
+    async def get_current_weather_batch(
+        self, coordinates: Iterable[Tuple[float, float]]
+    ) -> List[Optional[dict[str, Any]]]:
+        """``get_current_weather`` for many locations, in input order."""
+        return await self._batch(coordinates, self.get_current_weather)
+
+    async def get_forecast_batch(
+        self, coordinates: Iterable[Tuple[float, float]], hours: int = 24
+    ) -> List[Optional[dict[str, Any]]]:
+        """``get_forecast`` for many locations, in input order."""
+        return await self._batch(coordinates, lambda lat, lon: self.get_forecast(lat, lon, hours))
+
+    async def _batch(self, coordinates, fetch_one) -> List[Optional[dict[str, Any]]]:
+        # Locations in the same cell coalesce in the cache, so the upstream
+        # fan-out is per distinct cell, capped at WEATHER_BATCH_CONCURRENCY.
+        limit = asyncio.Semaphore(settings.WEATHER_BATCH_CONCURRENCY)
+
+        async def one(lat: float, lon: float) -> Optional[dict[str, Any]]:
+            async with limit:
+                return await fetch_one(lat, lon)
+
+        return list(await asyncio.gather(*(one(lat, lon) for lat, lon in coordinates)))
+
+    async def _fetch(self, path: str, params: dict, what: str) -> Optional[dict[str, Any]]:
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self._url("/forecast"),
-                    params={"lat": lat, "lon": lon, "hours": hours},
-                    timeout=10.0,
-                )
+                response = await client.get(self._url(path), params=params, timeout=10.0)
                 response.raise_for_status()
                 return response.json()
         except httpx.HTTPError as e:
-            logger.warning(f"Failed to fetch weather forecast: {e}")
+            logger.warning(f"Failed to fetch {what}: {e}")
             return None
 
 
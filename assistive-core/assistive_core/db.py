@@ -8,10 +8,16 @@ Multi-DB Beanie init:
 
 ``init_core`` is the single entrypoint a vertical's FastAPI lifespan calls. It
 also registers the vertical's feed sources into the feed registry.
+
+Both databases share one client (and pool) unless ``IDENTITY_SEPARATE_POOL``
+is set. Pool size, timeouts and wire compression come from ``settings``;
+``read_collection`` applies the per-workload read preference.
+
+Index creation can be skipped on unchanged schemas with
+``MONGODB_INDEX_SYNC=on_change`` (see ``schema_version``).
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from .auth.models import User
@@ -19,26 +25,63 @@ from .calendar.models import Event
 from .feed.registry import FeedSource, register as register_feed_source
 from .follow.models import Follow
 from .notifications.models import Notification
+from .pool_monitor import monitor_for
+from .reads import read_collection  # noqa: F401  (re-exported)
+from .request_cache import invalidator
+from .schema_version import init_database
 from .settings import settings, JWT_SECRET_PLACEHOLDER
 
 # Core social documents that live in the per-vertical DB alongside domain docs.
 CORE_SOCIAL_DOCUMENTS: list = [Follow, Notification, Event]
 
 _client: Optional[AsyncIOMotorClient] = None
+_identity_client: Optional[AsyncIOMotorClient] = None
+
+
+def client_options(name: str, max_pool_size: int) -> dict:
+    """Keyword arguments for ``AsyncIOMotorClient`` from ``settings``."""
+    options = {
+        "maxPoolSize": max_pool_size,
+        "minPoolSize": min(settings.MONGODB_MIN_POOL_SIZE, max_pool_size),
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "compressors": settings.MONGODB_COMPRESSORS or None,
+        "event_listeners": [monitor_for(name, max_pool_size), invalidator],
+    }
+    return {key: value for key, value in options.items() if value is not None}
 
 
 def get_client() -> AsyncIOMotorClient:
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(settings.MONGODB_URI)
+        _client = AsyncIOMotorClient(
+            settings.MONGODB_URI,
+            **client_options("vertical", settings.MONGODB_MAX_POOL_SIZE),
+        )
     return _client
 
 
+def get_identity_client() -> AsyncIOMotorClient:
+    """Client for the identity DB: the shared client, or a dedicated one
+    with its own pool when ``IDENTITY_SEPARATE_POOL`` is set."""
+    global _identity_client
+    if not settings.IDENTITY_SEPARATE_POOL:
+        return get_client()
+    if _identity_client is None:
+        _identity_client = AsyncIOMotorClient(
+            settings.IDENTITY_MONGODB_URI or settings.MONGODB_URI,
+            **client_options("identity", settings.IDENTITY_MAX_POOL_SIZE),
+        )
+    return _identity_client
+
+
+
 async def init_core(
     *,
     vertical_documents: list,
     feed_sources: List[FeedSource],
-) -> None:
+) -> Dict[str, bool]:
     """Initialise Beanie across both databases and register feed sources.
 
     Args:
@@ -47,6 +90,9 @@ async def init_core(
             per-vertical DB.
         feed_sources: FeedSource instances describing which of those documents
             appear in the social feed / drive notification fan-out.
+
+    Returns:
+        Database name -> whether its indexes were synced on this call.
     """
     # Fail fast in production on the insecure default SSO signing key.
     if settings.ENV == "production" and settings.JWT_SECRET_KEY == JWT_SECRET_PLACEHOLDER:
@@ -56,26 +102,31 @@ async def init_core(
         )
 
     client = get_client()
+    mode = settings.MONGODB_INDEX_SYNC
 
     # Identity DB: shared users collection (SSO).
-    await init_beanie(
-        database=client[settings.IDENTITY_DB],
-        document_models=[User],
-    )
+    synced = {
+        settings.IDENTITY_DB: await init_database(
+            get_identity_client()[settings.IDENTITY_DB], [User], mode
+        )
+    }
 
     # Vertical DB: core social docs + the vertical's own domain docs.
-    await init_beanie(
-        database=client[settings.MONGODB_DB],
-        document_models=[*CORE_SOCIAL_DOCUMENTS, *vertical_documents],
+    synced[settings.MONGODB_DB] = await init_database(
+        client[settings.MONGODB_DB], [*CORE_SOCIAL_DOCUMENTS, *vertical_documents], mode
     )
 
     # Feed-source registry: each vertical declares its public record types.
     for source in feed_sources:
         register_feed_source(source)
+    return synced
 
 
 async def close_core() -> None:
-    global _client
+    global _client, _identity_client
+    if _identity_client is not None:
+        _identity_client.close()
+        _identity_client = None
     if _client is not None:
         _client.close()
         _client = None
@@ -18,6 +18,8 @@ from typing import List, Optional
 from beanie.operators import In
 
 from ..auth.models import User
+from .. import request_cache
+from ..reads import read_collection
 from ..follow import follow_service
 from . import registry
 from .registry import FeedAuthor, FeedItemResponse
@@ -49,11 +51,13 @@ class FeedService:
             if before is not None and src.occurred_at_field:
                 query[src.occurred_at_field] = {"$lt": before}
 
-            finder = src.document.find(query)
+            # Raw cursor so the feed read preference applies (feeds tolerate
+            # replication lag); documents are validated per row below.
+            cursor = read_collection(src.document, "feed").find(query)
             if src.occurred_at_field:
                 # Push ordering + cursor + per-source limit down into the DB.
-                finder = finder.sort("-" + src.occurred_at_field).limit(limit)
-            docs = await finder.to_list()
+                cursor = cursor.sort(src.occurred_at_field, -1).limit(limit)
+            docs = [src.document.model_validate(raw) async for raw in cursor]
 
             for doc in docs:
                 occurred = src.occurred_at(doc)
@@ -75,7 +79,11 @@ class FeedService:
 
         # Denormalise author names in one batched lookup across all items.
         author_ids = list({src.user_id(doc) for src, doc, _ in gathered})
-        users = await User.find(In(User.id, author_ids)).to_list()
+        # Through the identity map: the viewer and recently seen authors are
+        # usually loaded already in this request.
+        users = await request_cache.get_documents(
+            User, author_ids, lambda missing: User.find(In(User.id, missing)).to_list()
+        )
         names = {u.id: u.full_name for u in users}
 
         return [
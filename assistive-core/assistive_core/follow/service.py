@@ -8,6 +8,7 @@ from typing import List
 from beanie.operators import In
 from fastapi import HTTPException, status
 
+from .. import request_cache
 from ..auth.models import User
 from .repository import FollowRepository
 from .models import Follow
@@ -24,7 +25,7 @@ class FollowService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="You cannot follow yourself",
             )
-        target = await User.get(followed_id)
+        target = await request_cache.get_document(User, followed_id, lambda: User.get(followed_id))
         if not target:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
@@ -47,8 +48,15 @@ class FollowService:
             await self.repository.delete(existing)
 
     async def get_following_ids(self, follower_id: str) -> List[str]:
-        follows = await self.repository.get_following(follower_id)
-        return [f.followed_id for f in follows]
+        """Cached for the request (feed and calendar both ask); a follow or
+        unfollow drops it."""
+        async def load():
+            return [f.followed_id for f in await self.repository.get_following(follower_id)]
+
+        ids = await request_cache.cached_query(
+            Follow.get_settings().name, ("following", follower_id), load
+        )
+        return list(ids)
 
     async def get_following(self, follower_id: str) -> List[UserSummary]:
         return await self._summaries(await self.get_following_ids(follower_id))
@@ -75,5 +83,7 @@ class FollowService:
     async def _summaries(self, ids: List[str]) -> List[UserSummary]:
         if not ids:
             return []
-        users = await User.find(In(User.id, ids)).to_list()
+        users = await request_cache.get_documents(
+            User, ids, lambda missing: User.find(In(User.id, missing)).to_list()
+        )
         return [UserSummary(id=u.id, full_name=u.full_name) for u in users]
@@ -0,0 +1,120 @@
+"""Connection-pool utilisation for the Mongo clients built by ``db``.
+
+A ``PoolMonitor`` is attached to each client as a pymongo
+``ConnectionPoolListener``. Pool events arrive on Motor's executor threads,
+so counters are updated under a lock; ``pool_metrics()`` returns a snapshot
+per client and server address for a vertical to export.
+"""
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+from pymongo import monitoring
+
+
+@dataclass
+class PoolStats:
+    client: str
+    address: str
+    max_size: int
+    open: int = 0
+    in_use: int = 0
+    checkouts: int = 0
+    checkout_failures: int = 0
+    checkout_timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    cleared: int = 0
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    def __init__(self, client: str, max_size: int):
+        self.client = client
+        self.max_size = max_size
+        self._pools: Dict[str, PoolStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, address) -> PoolStats:
+        key = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+        stats = self._pools.get(key)
+        if stats is None:
+            stats = self._pools[key] = PoolStats(self.client, key, self.max_size)
+        return stats
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [asdict(stats) for stats in self._pools.values()]
+
+    def pool_created(self, event):
+        with self._lock:
+            self._stats(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._stats(event.address).cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self._stats(event.address).open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.open = max(0, stats.open - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.checkout_failures += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                stats.checkout_timeouts += 1
+            self._waited(stats, event)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.in_use += 1
+            stats.checkouts += 1
+            self._waited(stats, event)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.in_use = max(0, stats.in_use - 1)
+
+    @staticmethod
+    def _waited(stats: PoolStats, event) -> None:
+        # ``duration`` (seconds spent checking out) is pymongo >= 4.7.
+        waited = getattr(event, "duration", None) or 0.0
+        stats.wait_seconds_total += waited
+        stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+
+_monitors: Dict[str, PoolMonitor] = {}
+
+
+def monitor_for(client: str, max_size: int) -> PoolMonitor:
+    """The monitor for a named client, created on first use (it outlives
+    client restarts, so counters are cumulative for the process)."""
+    monitor = _monitors.get(client)
+    if monitor is None:
+        monitor = _monitors[client] = PoolMonitor(client, max_size)
+    monitor.max_size = max_size
+    return monitor
+
+
+def pool_metrics() -> List[dict]:
+    """Per-client, per-server pool counters (see ``PoolStats``)."""
+    return [stats for monitor in _monitors.values() for stats in monitor.snapshot()]
@@ -0,0 +1,28 @@
+"""Per-workload read preferences.
+
+Kept free of package imports so any module (including the feed service,
+which ``db`` depends on indirectly) can use it without an import cycle.
+"""
+from beanie import Document
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+
+from .settings import settings
+
+READ_PREFERENCES = {
+    "feed": settings.MONGODB_FEED_READ_PREFERENCE,
+    "analytics": settings.MONGODB_ANALYTICS_READ_PREFERENCE,
+}
+
+
+def read_collection(document: type[Document], workload: str) -> AsyncIOMotorCollection:
+    """``document``'s collection with the read preference configured for
+    ``workload`` ("feed", "analytics"); the primary for anything else."""
+    collection = document.get_motor_collection()
+    mode = READ_PREFERENCES.get(workload, "primary")
+    if mode == "primary":
+        return collection
+    preference = make_read_preference(
+        read_pref_mode_from_name(mode), None, settings.MONGODB_MAX_STALENESS_SECONDS or -1
+    )
+    return collection.with_options(read_preference=preference)
@@ -0,0 +1,175 @@
+"""Request-scoped identity map and query cache.
+
+Within one request, several layers often read the same rows. Examples are
+the authenticated ``User``, the feed authors, a hive that both the router
+and the service load, and the follow list that feed and calendar each
+need.
+
+While a request runs, a ``RequestCache`` sits in a ContextVar. The
+vertical's middleware opens it with ``request_scope()``. Outside a scope
+(jobs, commands, tests that call services directly) every lookup goes to
+the database.
+
+The cache has two maps:
+
+  - identity map: ``(collection, _id) -> document``, filled by
+    ``get_document`` / ``get_documents`` and by ``remember`` after a save;
+  - query cache: ``(collection, key) -> result`` for read helpers wrapped in
+    ``cached_query``.
+
+``CacheInvalidator`` is attached to every Mongo client. Any insert, update,
+delete or findAndModify on a collection drops that collection's entries for
+the current request, whichever code path issued it. Motor copies the
+caller's context into its executor threads, so the listener sees the
+request's cache. A hit is one round trip saved. Hits, misses and
+invalidations are counted per request (``RequestCache``) and for the
+process (``request_cache_metrics()``).
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from pymongo import monitoring
+
+WRITE_COMMANDS = frozenset({"insert", "update", "delete", "findAndModify"})
+
+_Key = Tuple[str, Hashable]
+
+
+class RequestCache:
+    def __init__(self):
+        self.documents: Dict[_Key, Any] = {}
+        self.queries: Dict[_Key, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self, collection: str) -> None:
+        with _lock:
+            stale = [k for k in (*self.documents, *self.queries) if k[0] == collection]
+            for key in stale:
+                self.documents.pop(key, None)
+                self.queries.pop(key, None)
+            if stale:
+                self.invalidations += 1
+                _totals["invalidations"] += 1
+
+    def _count(self, hits: int, misses: int) -> None:
+        with _lock:
+            self.hits += hits
+            self.misses += misses
+            _totals["hits"] += hits
+            _totals["misses"] += misses
+
+
+_current: ContextVar[Optional[RequestCache]] = ContextVar("request_cache", default=None)
+_totals = {"hits": 0, "misses": 0, "invalidations": 0}
+# Invalidation arrives from Motor's executor threads.
+_lock = threading.Lock()
+
+
+def current() -> Optional[RequestCache]:
+    return _current.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestCache]:
+    """Cache lookups made until the block exits."""
+    cache = RequestCache()
+    token = _current.set(cache)
+    try:
+        yield cache
+    finally:
+        _current.reset(token)
+
+
+def _collection(document) -> str:
+    return document.get_settings().name
+
+
+async def get_document(document, doc_id: Any, load: Callable[[], Awaitable[Any]]):
+    """``load()`` (a get-by-id) through the identity map. Misses that find
+    nothing are not cached."""
+    cache = _current.get()
+    if cache is None:
+        return await load()
+    key = (_collection(document), doc_id)
+    if key in cache.documents:
+        cache._count(1, 0)
+        return cache.documents[key]
+    cache._count(0, 1)
+    found = await load()
+    if found is not None:
+        cache.documents[key] = found
+    return found
+
+
+async def get_documents(
+    document, ids: Iterable[Any], load: Callable[[List[Any]], Awaitable[List[Any]]]
+) -> List[Any]:
+    """Documents for ``ids`` (found ones only, in id order); ``load`` is
+    called once with just the ids not already in the identity map. Only a
+    fully cached batch counts as a hit."""
+    ids = list(dict.fromkeys(ids))
+    cache = _current.get()
+    if cache is None:
+        return await load(ids)
+    collection = _collection(document)
+    missing = [i for i in ids if (collection, i) not in cache.documents]
+    if not missing:
+        cache._count(1, 0)
+    else:
+        cache._count(0, 1)
+        for found in await load(missing):
+            cache.documents[(collection, found.id)] = found
+    return [cache.documents[(collection, i)] for i in ids if (collection, i) in cache.documents]
+
+
+async def cached_query(collection: str, key: Hashable, load: Callable[[], Awaitable[Any]]):
+    """``load()`` at most once per request for ``key``, until a write to
+    ``collection``. Callers must not mutate the returned value."""
+    cache = _current.get()
+    if cache is None:
+        return await load()
+    cache_key = (collection, key)
+    if cache_key in cache.queries:
+        cache._count(1, 0)
+        return cache.queries[cache_key]
+    cache._count(0, 1)
+    result = await load()
+    cache.queries[cache_key] = result
+    return result
+
+
+def remember(document) -> None:
+    """Put a just-saved document in the identity map (the write that saved it
+    dropped its collection's entries)."""
+    cache = _current.get()
+    if cache is not None and document.id is not None:
+        cache.documents[(_collection(type(document)), document.id)] = document
+
+
+class CacheInvalidator(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in WRITE_COMMANDS:
+            return
+        cache = _current.get()
+        collection = event.command.get(event.command_name)
+        if cache is not None and isinstance(collection, str):
+            cache.invalidate(collection)
+
+    def succeeded(self, event) -> None:
+        pass
+
+    def failed(self, event) -> None:
+        pass
+
+
+invalidator = CacheInvalidator()
+
+
+def request_cache_metrics() -> Dict[str, int]:
+    """Process-wide hit / miss / invalidation counts."""
+    with _lock:
+        return dict(_totals)
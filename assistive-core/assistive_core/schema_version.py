@@ -0,0 +1,99 @@
+"""Skip ``createIndexes`` on boots where nothing index-related changed.
+
+``init_beanie`` lists and (re)creates every document's indexes on each start,
+one round trip or more per collection. ``schema_hash`` digests what those
+calls depend on: the Beanie version, and each document's collection name,
+``Settings.indexes`` and ``Indexed()`` fields. ``init_core`` stores the hash
+per database in ``_schema_versions`` after a full sync; with
+``MONGODB_INDEX_SYNC=on_change`` a later boot whose hash matches initialises
+Beanie without touching indexes.
+
+The stored hash only records what was declared, not what the server still
+has: after dropping an index or collection by hand, start once with
+``MONGODB_INDEX_SYNC=always`` (the default).
+"""
+import hashlib
+import json
+from typing import Optional, Sequence
+
+import beanie
+from beanie.odm.utils.init import Initializer
+from beanie.odm.utils.pydantic import get_model_fields
+from beanie.odm.utils.typing import get_index_attributes
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from .base import utcnow
+
+SCHEMA_COLLECTION = "_schema_versions"
+INDEX_SYNC_MODES = ("always", "on_change")
+
+
+def _index_spec(index):
+    # IndexModel carries key, name and options; bare entries are a field
+    # name or a list of (field, direction) pairs.
+    return index.document if isinstance(index, IndexModel) else index
+
+
+def _document_spec(document) -> dict:
+    settings = getattr(document, "Settings", None)
+    indexed_fields = {
+        field.alias or name: attributes
+        for name, field in get_model_fields(document).items()
+        if (attributes := get_index_attributes(field)) is not None
+    }
+    return {
+        "document": f"{document.__module__}.{document.__qualname__}",
+        "collection": getattr(settings, "name", None) or document.__name__,
+        "indexes": [_index_spec(index) for index in getattr(settings, "indexes", None) or []],
+        "indexed_fields": indexed_fields,
+    }
+
+
+def schema_hash(documents: Sequence[type]) -> str:
+    """Stable digest of the index declarations of ``documents``."""
+    spec = {
+        "beanie": beanie.__version__,
+        "documents": sorted(
+            (_document_spec(document) for document in documents), key=lambda s: s["document"]
+        ),
+    }
+    encoded = json.dumps(spec, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def stored_hash(database: AsyncIOMotorDatabase) -> Optional[str]:
+    doc = await database[SCHEMA_COLLECTION].find_one({"_id": database.name})
+    return doc["hash"] if doc else None
+
+
+async def store_hash(database: AsyncIOMotorDatabase, digest: str) -> None:
+    await database[SCHEMA_COLLECTION].update_one(
+        {"_id": database.name},
+        {"$set": {"hash": digest, "synced_at": utcnow(), "beanie": beanie.__version__}},
+        upsert=True,
+    )
+
+
+class SchemaInitializer(Initializer):
+    """Beanie's initializer with index creation optional."""
+
+    def __init__(self, *, sync_indexes: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.sync_indexes = sync_indexes
+
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        if self.sync_indexes:
+            await super().init_indexes(cls, allow_index_dropping)
+
+
+async def init_database(database: AsyncIOMotorDatabase, documents: list, mode: str) -> bool:
+    """``init_beanie`` for one database. Returns whether indexes were synced."""
+    if mode not in INDEX_SYNC_MODES:
+        raise ValueError(f"MONGODB_INDEX_SYNC must be one of {INDEX_SYNC_MODES}, got {mode!r}")
+    digest = schema_hash(documents)
+    sync = mode == "always" or await stored_hash(database) != digest
+    await SchemaInitializer(database=database, document_models=documents, sync_indexes=sync)
+    if sync:
+        await store_hash(database, digest)
+    return sync
@@ -11,6 +11,11 @@ import os
 JWT_SECRET_PLACEHOLDER = "your-secret-key-here-change-in-production"
 
 
+def _optional_int(name: str):
+    value = os.getenv(name, "")
+    return int(value) if value else None
+
+
 class Settings:
     # --- Mongo / identity ---
     # One Mongo deployment; identity DB is shared across all verticals (SSO),
@@ -19,6 +24,39 @@ class Settings:
     IDENTITY_DB: str = os.getenv("IDENTITY_DB", "assistive_identity")
     MONGODB_DB: str = os.getenv("MONGODB_DB", "beekeeper")
 
+    # --- Mongo connection pool ---
+    # Unset values keep the driver defaults (max 100, min 0, no wait timeout).
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    MONGODB_MAX_IDLE_TIME_MS = _optional_int("MONGODB_MAX_IDLE_TIME_MS")
+    # How long a request waits for a free connection before failing.
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS = _optional_int("MONGODB_WAIT_QUEUE_TIMEOUT_MS")
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(
+        os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "30000")
+    )
+    # Wire compression in preference order, e.g. "zstd,snappy,zlib". The
+    # driver skips (with a warning) any whose Python package is missing.
+    MONGODB_COMPRESSORS: str = os.getenv("MONGODB_COMPRESSORS", "")
+    # Read preference per workload ("primary", "secondaryPreferred", ...).
+    # Feed and analytics reads tolerate replication lag; everything else
+    # stays on the primary.
+    MONGODB_FEED_READ_PREFERENCE: str = os.getenv("MONGODB_FEED_READ_PREFERENCE", "primary")
+    MONGODB_ANALYTICS_READ_PREFERENCE: str = os.getenv(
+        "MONGODB_ANALYTICS_READ_PREFERENCE", "primary"
+    )
+    # Secondaries lagging more than this are skipped (>= 90, unset: no limit).
+    MONGODB_MAX_STALENESS_SECONDS = _optional_int("MONGODB_MAX_STALENESS_SECONDS")
+    # Give the identity DB its own client and pool so auth lookups never
+    # queue behind heavy vertical queries. IDENTITY_MONGODB_URI defaults to
+    # MONGODB_URI.
+    IDENTITY_SEPARATE_POOL: bool = os.getenv("IDENTITY_SEPARATE_POOL", "false").lower() == "true"
+    IDENTITY_MONGODB_URI: str = os.getenv("IDENTITY_MONGODB_URI", "")
+    IDENTITY_MAX_POOL_SIZE: int = int(os.getenv("IDENTITY_MAX_POOL_SIZE", "20"))
+    # "always" runs createIndexes for every document on each boot;
+    # "on_change" skips it while the stored schema hash still matches (see
+    # schema_version.py).
+    MONGODB_INDEX_SYNC: str = os.getenv("MONGODB_INDEX_SYNC", "always")
+
     # --- JWT ---
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", JWT_SECRET_PLACEHOLDER)
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
@@ -36,6 +74,15 @@ class Settings:
 
     # --- External services (sibling VRUsafety repo) ---
     WEATHER_SERVICE_URL: str = os.getenv("WEATHER_SERVICE_URL", "")
+    # Weather cache: geohash cell size (5 chars ~ 4.9 x 4.9 km), per-kind
+    # freshness buckets, how long past expiry a stale entry may still be
+    # served while it revalidates, and the batch fan-out limit.
+    WEATHER_CACHE_PRECISION: int = int(os.getenv("WEATHER_CACHE_PRECISION", "5"))
+    WEATHER_CURRENT_TTL_SECONDS: int = int(os.getenv("WEATHER_CURRENT_TTL_SECONDS", "600"))
+    WEATHER_FORECAST_TTL_SECONDS: int = int(os.getenv("WEATHER_FORECAST_TTL_SECONDS", "3600"))
+    WEATHER_STALE_SECONDS: int = int(os.getenv("WEATHER_STALE_SECONDS", "1800"))
+    WEATHER_CACHE_MAX_ENTRIES: int = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "2048"))
+    WEATHER_BATCH_CONCURRENCY: int = int(os.getenv("WEATHER_BATCH_CONCURRENCY", "8"))
 
 
 settings = Settings()
@@ -0,0 +1,50 @@
+"""Single-round-trip partial updates.
+
+Update endpoints receive only the fields the client set. ``find_one_and_set``
+writes exactly those, plus ``updated_at``, with one ``find_one_and_update``.
+Callers put the ownership check in the filter instead of reading the
+document first. Two clients editing different fields of the same document
+no longer overwrite each other with a stale full-document ``save()``.
+"""
+from typing import Any, Mapping, Optional, Type, TypeVar
+
+from beanie import Document
+from pymongo import ReturnDocument
+
+from .base import utcnow
+
+D = TypeVar("D", bound=Document)
+
+
+async def find_one_and_set(
+    document: Type[D],
+    filter: Mapping[str, Any],
+    fields: Mapping[str, Any],
+    *,
+    derived: Optional[Mapping[str, Any]] = None,
+    return_before: bool = False,
+) -> Optional[D]:
+    """``$set`` ``fields`` and ``updated_at`` (unless ``fields`` carries its
+    own) on the document matching ``filter``. Returns the document as stored
+    after the write, or before it with ``return_before``. Returns None when
+    nothing matched.
+
+    ``derived`` maps fields to aggregation expressions evaluated after
+    ``fields`` are applied, e.g. a value computed from two fields of which
+    the request may have changed only one. It turns the write into a
+    pipeline update, with ``fields`` set as literals.
+    """
+    values = {"updated_at": utcnow(), **fields}
+    if derived:
+        update: Any = [
+            {"$set": {name: {"$literal": value} for name, value in values.items()}},
+            {"$set": dict(derived)},
+        ]
+    else:
+        update = {"$set": values}
+    raw = await document.get_motor_collection().find_one_and_update(
+        dict(filter),
+        update,
+        return_document=ReturnDocument.BEFORE if return_before else ReturnDocument.AFTER,
+    )
+    return None if raw is None else document.model_validate(raw)